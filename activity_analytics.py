@@ -0,0 +1,202 @@
+# modules/activity_analytics.py
+import threading
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from modules.activity_model import CATEGORIES, PRIORITIES, STATUS_OPTIONS
+
+# Analitik aktivitas berbasis kolom NumPy; hasilnya di-cache per versi data.
+
+# Variabel konstan
+FIELDS = ["kategori", "prioritas", "status", "deadline", "tanggal_dibuat", "tanggal_diperbarui"]
+DONE = STATUS_OPTIONS.index("Selesai")
+MISSING = -1  # Nilai kolom untuk data kosong/tidak dikenal
+WEEKS = 12  # Jumlah minggu pada grafik mingguan
+# Batas bawah (hari) setiap kelompok lead time; kelompok terakhir tanpa batas atas
+LEAD_TIME_BINS = [0, 1, 3, 7, 14, 30, 60]
+LEAD_TIME_LABELS = ["< 1 hari", "1-2 hari", "3-6 hari", "7-13 hari", "14-29 hari", "30-59 hari", "≥ 60 hari"]
+CACHE_SIZE = 4
+_CODES = {
+    "kategori": {value: i for i, value in enumerate(CATEGORIES)},
+    "prioritas": {value: i for i, value in enumerate(PRIORITIES)},
+    "status": {value: i for i, value in enumerate(STATUS_OPTIONS)},
+}
+
+
+def _codes(values, codes):
+    # Activity menyimpan kode int (cepat); SQLite/nilai tak dikenal berupa teks
+    try:
+        return np.array(values, dtype=np.int8)
+    except (TypeError, ValueError):
+        return np.fromiter(
+            (value if isinstance(value, int) else codes.get(value, MISSING) for value in values),
+            np.int8, len(values),
+        )
+
+
+def _parse_ordinal(value):
+    if isinstance(value, date):
+        return value.toordinal()
+    if isinstance(value, str) and len(value) >= 10:
+        try:
+            return date.fromisoformat(value[:10]).toordinal()
+        except ValueError:
+            pass
+    return MISSING
+
+
+def _ordinals(values):
+    # Tanggal sebagai nomor hari (date.toordinal); teks di-parse dari 10 karakter pertama
+    try:
+        # Nilai kosong diganti date.min (nomor hari 1) lalu dikembalikan ke MISSING
+        ordinals = np.fromiter(
+            map(date.toordinal, [date.min if value is None else value for value in values]),
+            np.int32, len(values),
+        )
+        ordinals[ordinals == 1] = MISSING
+        return ordinals
+    except TypeError:
+        return np.fromiter(map(_parse_ordinal, values), np.int32, len(values))
+
+
+class ActivityColumns:
+    """Field analitik seluruh aktivitas sebagai array NumPy.
+
+    Kategori/prioritas/status berupa kode int8, tanggal berupa nomor hari
+    (``date.toordinal``); data kosong bernilai MISSING. ``completed`` adalah
+    tanggal terakhir diperbarui untuk aktivitas yang sudah selesai.
+    """
+
+    def __init__(self, kategori, prioritas, status, deadline, created, updated):
+        self.kategori = _codes(kategori, _CODES["kategori"])
+        self.prioritas = _codes(prioritas, _CODES["prioritas"])
+        self.status = _codes(status, _CODES["status"])
+        self.deadline = _ordinals(deadline)
+        self.created = _ordinals(created)
+        updated = _ordinals(updated)
+        # Aktivitas selesai yang belum pernah diperbarui dianggap selesai saat dibuat
+        self.done = self.status == DONE
+        self.completed = np.where(self.done, np.where(updated != MISSING, updated, self.created), MISSING)
+
+    # Fungsi untuk membaca kolom dari store
+    @classmethod
+    def from_store(cls, store):
+        return cls(*store.field_columns(FIELDS))
+
+    def __len__(self):
+        return len(self.status)
+
+
+def _rate_table(codes, done, labels):
+    valid = codes != MISSING
+    total = np.bincount(codes[valid], minlength=len(labels))[:len(labels)]
+    selesai = np.bincount(codes[valid & done], minlength=len(labels))[:len(labels)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(total > 0, selesai / np.maximum(total, 1) * 100, 0.0)
+    return pd.DataFrame({"Total": total, "Selesai": selesai, "Persen Selesai": rate.round(1)}, index=labels)
+
+
+# Fungsi untuk menghitung seluruh statistik analitik
+def summarize(columns, today=None):
+    """Ringkasan analitik (dict) dari ActivityColumns.
+
+    - ``per_kategori``/``per_prioritas``: jumlah, selesai, dan persen selesai
+    - ``mingguan``: aktivitas dibuat vs selesai per minggu (WEEKS minggu terakhir)
+    - ``ketepatan``: selesai tepat waktu/terlambat, berjalan/lewat deadline
+    - ``lead_time``: sebaran hari dari dibuat sampai selesai
+    """
+    today = (today or date.today()).toordinal()
+    done = columns.done
+    has_deadline = columns.deadline != MISSING
+
+    # Minggu dimulai hari Senin; indeks 0 adalah minggu paling lama
+    this_monday = today - date.fromordinal(today).weekday()
+    first_monday = this_monday - 7 * (WEEKS - 1)
+    week_starts = [date.fromordinal(first_monday + 7 * i) for i in range(WEEKS)]
+
+    def per_week(ordinals):
+        valid = (ordinals >= first_monday) & (ordinals < this_monday + 7)
+        return np.bincount((ordinals[valid] - first_monday) // 7, minlength=WEEKS)[:WEEKS]
+
+    weekly = pd.DataFrame(
+        {"Dibuat": per_week(columns.created), "Selesai": per_week(columns.completed)},
+        index=pd.Index(week_starts, name="Minggu"),
+    )
+
+    finished = done & has_deadline & (columns.completed != MISSING)
+    open_ = ~done & has_deadline
+    timeliness = {
+        "Selesai tepat waktu": int(np.count_nonzero(finished & (columns.completed <= columns.deadline))),
+        "Selesai terlambat": int(np.count_nonzero(finished & (columns.completed > columns.deadline))),
+        "Berjalan": int(np.count_nonzero(open_ & (columns.deadline >= today))),
+        "Lewat deadline": int(np.count_nonzero(open_ & (columns.deadline < today))),
+    }
+
+    lead = columns.completed - columns.created
+    lead = lead[done & (columns.created != MISSING) & (lead >= 0)]
+    histogram = np.bincount(np.digitize(lead, LEAD_TIME_BINS[1:]), minlength=len(LEAD_TIME_LABELS))
+    lead_time = pd.DataFrame({"Jumlah": histogram}, index=LEAD_TIME_LABELS)
+
+    total = len(columns)
+    completed = int(np.count_nonzero(done))
+    on_time = timeliness["Selesai tepat waktu"]
+    finished_count = on_time + timeliness["Selesai terlambat"]
+    return {
+        "total": total,
+        "selesai": completed,
+        "persen_selesai": completed / total * 100 if total else 0.0,
+        "persen_tepat_waktu": on_time / finished_count * 100 if finished_count else 0.0,
+        "per_kategori": _rate_table(columns.kategori, done, CATEGORIES),
+        "per_prioritas": _rate_table(columns.prioritas, done, PRIORITIES),
+        "mingguan": weekly,
+        "ketepatan": timeliness,
+        "lead_time": lead_time,
+        "lead_time_median": float(np.median(lead)) if len(lead) else None,
+        "lead_time_p90": float(np.percentile(lead, 90)) if len(lead) else None,
+    }
+
+
+class AnalyticsCache:
+    """Cache ringkasan analitik dengan kunci versi data store dan tanggal.
+
+    Store yang tidak melacak versi (``data_version()`` None) selalu dihitung ulang.
+    """
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    # Fungsi untuk mengambil ringkasan dari cache
+    def get(self, store, today=None):
+        today = today or date.today()
+        version = store.data_version()
+        key = (version, today)
+        with self._lock:
+            if version is not None and key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            self.misses += 1
+        summary = summarize(ActivityColumns.from_store(store), today)
+        if version is not None:
+            with self._lock:
+                self.entries[key] = summary
+                while len(self.entries) > self.size:
+                    self.entries.popitem(last=False)
+        return summary
+
+
+# Cache analitik bersama untuk semua sesi dalam proses ini
+analytics_cache = AnalyticsCache()
+
+
+# Fungsi untuk mendapatkan ringkasan analitik store
+def get_summary(store, today=None):
+    """Ringkasan analitik dari cache; dihitung ulang jika data berubah"""
+    return analytics_cache.get(store, today)
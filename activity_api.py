@@ -0,0 +1,238 @@
+# modules/activity_api.py
+import asyncio
+import json
+import sys
+from urllib.parse import parse_qs, urlsplit
+
+from modules import activity_metrics, activity_service
+from modules.activity_store import ConflictError
+
+# API HTTP/JSON asinkron (hanya pustaka standar) di atas activity_service.
+#
+#   GET    /activities?kategori=&status=&prioritas=&q=&limit=&offset=
+#   GET    /activities/upcoming?days=7&limit=
+#   GET    /activities/overdue?limit=
+#   GET    /activities/<id>
+#   POST   /activities              (body: objek aktivitas)
+#   PATCH  /activities/<id>         (body: field yang diubah; header If-Match: <versi>)
+#   DELETE /activities/<id>
+#   GET    /stats
+#   GET    /metrics                 (latensi per operasi, lihat activity_metrics)
+#
+# Header X-User: <pemilik> memilih partisi data pemilik tersebut; tanpa
+# header dipakai partisi bersama (lihat activity_service).
+#
+# Setiap request dijalankan di thread pool (asyncio.to_thread): fsync jurnal,
+# memuat partisi dan penulisan SQLite tidak menahan koneksi lain. Store
+# aman dipakai bersamaan (lock baca/tulis di store JSON, koneksi per thread
+# di SQLite).
+
+# Variabel konstan
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8502
+MAX_BODY_SIZE = 1024 * 1024
+DEFAULT_LIMIT = 25
+MAX_LIMIT = 1000
+FILTER_FIELDS = ["kategori", "status", "prioritas"]
+REASONS = {
+    200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HttpError(Exception):
+    """Error yang dikirim ke klien sebagai respons JSON"""
+
+    def __init__(self, status, message):
+        self.status = status
+        super().__init__(message)
+
+
+# Fungsi untuk mengubah Activity menjadi dict JSON
+def _serialize(activity):
+    return activity.to_dict() if hasattr(activity, "to_dict") else dict(activity)
+
+
+def _int_param(params, name, default, minimum=0, maximum=None):
+    value = params.get(name, [None])[0]
+    if value is None or value == "":
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise HttpError(400, f"Parameter {name} harus berupa angka") from None
+    if value < minimum or (maximum is not None and value > maximum):
+        raise HttpError(400, f"Parameter {name} di luar rentang")
+    return value
+
+
+def _activity_id(text):
+    try:
+        return int(text)
+    except ValueError:
+        raise HttpError(404, "Aktivitas tidak ditemukan") from None
+
+
+def _json_body(body):
+    try:
+        return json.loads(body or b"null")
+    except ValueError:
+        raise HttpError(400, "Body harus berupa JSON yang valid") from None
+
+
+# Fungsi untuk menjalankan satu request
+def handle_request(method, target, headers, body):
+    """Mengembalikan (status, payload JSON atau None) untuk satu request"""
+    url = urlsplit(target)
+    params = parse_qs(url.query)
+    parts = [part for part in url.path.split("/") if part]
+    owner = headers.get("x-user")
+
+    if parts == ["stats"]:
+        if method != "GET":
+            raise HttpError(405, "Method tidak didukung")
+        return 200, activity_service.activity_stats(_int_param(params, "days", 7), owner=owner)
+
+    if parts == ["metrics"]:
+        if method != "GET":
+            raise HttpError(405, "Method tidak didukung")
+        return 200, activity_metrics.snapshot()
+
+    if not parts or parts[0] != "activities" or len(parts) > 2:
+        raise HttpError(404, "Endpoint tidak ditemukan")
+
+    if len(parts) == 1:
+        if method == "GET":
+            filters = {field: params.get(field, [None])[0] for field in FILTER_FIELDS}
+            total, items = activity_service.list_activities(
+                **filters,
+                search=params.get("q", [None])[0],
+                limit=_int_param(params, "limit", DEFAULT_LIMIT, 1, MAX_LIMIT),
+                offset=_int_param(params, "offset", 0),
+                owner=owner,
+            )
+            return 200, {"total": total, "items": [_serialize(a) for a in items]}
+        if method == "POST":
+            activity = activity_service.create_activity(_json_body(body), owner=owner)
+            return 201, _serialize(activity)
+        raise HttpError(405, "Method tidak didukung")
+
+    if parts[1] in ("upcoming", "overdue"):
+        if method != "GET":
+            raise HttpError(405, "Method tidak didukung")
+        limit = _int_param(params, "limit", None, 1, MAX_LIMIT)
+        if parts[1] == "upcoming":
+            items = activity_service.upcoming_activities(_int_param(params, "days", 7), limit, owner=owner)
+        else:
+            items = activity_service.overdue_activities(limit, owner=owner)
+        return 200, {"items": [_serialize(a) for a in items]}
+
+    activity_id = _activity_id(parts[1])
+    if method == "GET":
+        activity = activity_service.get_activity(activity_id, owner=owner)
+        if activity is None:
+            raise HttpError(404, "Aktivitas tidak ditemukan")
+        return 200, _serialize(activity)
+    if method == "PATCH":
+        version = headers.get("if-match")
+        if version is not None:
+            version = _int_param({"If-Match": [version.strip('"')]}, "If-Match", None, 1)
+        activity = activity_service.update_activity(activity_id, _json_body(body), version=version, owner=owner)
+        return 200, _serialize(activity)
+    if method == "DELETE":
+        activity_service.delete_activity(activity_id, owner=owner)
+        return 204, None
+    raise HttpError(405, "Method tidak didukung")
+
+
+# Fungsi untuk menerjemahkan exception layanan menjadi status HTTP
+def dispatch(method, target, headers, body):
+    span = activity_metrics.start(f"api.{method}")
+    try:
+        return handle_request(method, target, headers, body)
+    except HttpError as e:
+        return e.status, {"error": str(e)}
+    except activity_service.ValidationError as e:
+        return 400, {"error": str(e), "field": e.field}
+    except ConflictError as e:
+        return 409, {"error": str(e), "fields": e.fields}
+    except activity_service.NotFoundError:
+        return 404, {"error": "Aktivitas tidak ditemukan"}
+    except Exception as e:
+        return 500, {"error": f"Kesalahan server: {e}"}
+    finally:
+        span.stop()
+
+
+def _response(status, payload, keep_alive):
+    body = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = [
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    if payload is not None:
+        head.append("Content-Type: application/json; charset=utf-8")
+    return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+
+# Fungsi untuk melayani satu koneksi (HTTP/1.1 keep-alive)
+async def handle_connection(reader, writer):
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                writer.write(_response(400, {"error": "Request tidak valid"}, False))
+                break
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                if name:
+                    headers[name.strip().lower()] = value.strip()
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+            length = int(headers.get("content-length", 0) or 0)
+            if length > MAX_BODY_SIZE:
+                writer.write(_response(413, {"error": "Body terlalu besar"}, False))
+                break
+            body = await reader.readexactly(length) if length else b""
+
+            status, payload = await asyncio.to_thread(dispatch, method.upper(), target, headers, body)
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+# Fungsi untuk menjalankan server API
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+    """Menjalankan server sampai dihentikan; `ready` (Event) diset saat siap"""
+    # Store dimuat sebelum menerima koneksi agar request pertama tidak lambat
+    activity_service.get_store()
+    server = await asyncio.start_server(handle_connection, host, port)
+    if ready is not None:
+        ready.set()
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    # python -m modules.activity_api [port] [host]
+    port = int(sys.argv[1]) if len(sys.argv) >= 2 else DEFAULT_PORT
+    host = sys.argv[2] if len(sys.argv) >= 3 else DEFAULT_HOST
+    print(f"API aktivitas berjalan di http://{host}:{port}")
+    try:
+        asyncio.run(serve(host, port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,132 @@
+# modules/activity_cache.py
+import itertools
+import sys
+import threading
+from collections import OrderedDict
+
+
+# Fungsi untuk memperkirakan ukuran memori sebuah objek
+def deep_sizeof(obj, _seen=None):
+    """Perkiraan ukuran (byte) objek beserta isi list/dict di dalamnya"""
+    _seen = set() if _seen is None else _seen
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_sizeof(key, _seen) + deep_sizeof(value, _seen)
+    elif isinstance(obj, (list, tuple, set)):
+        for item in obj:
+            size += deep_sizeof(item, _seen)
+    elif hasattr(obj, "__slots__"):
+        for slot in obj.__slots__:
+            if hasattr(obj, slot):
+                size += deep_sizeof(getattr(obj, slot), _seen)
+    return size
+
+
+# Fungsi untuk memperkirakan ukuran dict besar dari sampel
+def estimate_sizeof(records, sample=1000):
+    """Seperti deep_sizeof(records), tetapi hanya `sample` entri pertama yang ditelusuri"""
+    if len(records) <= sample:
+        return deep_sizeof(records)
+    seen = {id(records)}
+    sampled = sum(
+        deep_sizeof(key, seen) + deep_sizeof(value, seen)
+        for key, value in itertools.islice(records.items(), sample)
+    )
+    return sys.getsizeof(records) + sampled * len(records) // sample
+
+
+class SharedActivityCache:
+    """Cache store aktivitas yang dipakai bersama oleh semua sesi Streamlit.
+
+    Satu store dibuat per kunci (misalnya backend dan pemilik data) untuk
+    seluruh proses. Store yang datanya sudah berubah di disk
+    (``is_stale()``) dimuat ulang sekali, lalu dipakai lagi oleh semua sesi.
+    Dengan `max_entries`, store yang paling lama tidak dipakai dibuang.
+    Store dibuat/dimuat ulang di luar lock cache, sehingga memuat data satu
+    pemilik tidak menahan pemilik lain.
+    """
+
+    def __init__(self, factory, max_entries=None):
+        self.factory = factory
+        self.max_entries = max_entries
+        self.stores = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._generation = 0  # Naik setiap invalidate()
+
+    # Fungsi untuk mengambil store dari cache
+    def get(self, key):
+        """Mengembalikan store untuk `key`, membuat/memuat ulang bila perlu"""
+        with self._lock:
+            store = self.stores.get(key)
+            if store is not None and not store.is_stale():
+                self.hits += 1
+                self.stores.move_to_end(key)
+                return store
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                # Thread lain mungkin sudah membuat/memuat ulang store ini
+                store = self.stores.get(key)
+                generation = self._generation
+            if store is None:
+                store = self.factory(key)
+            elif store.is_stale():
+                self.reloads += 1
+                store.reload()
+            with self._lock:
+                self.misses += 1
+                if generation != self._generation:
+                    # Di-invalidate selama dimuat: data mungkin sudah lama
+                    return store
+                self.stores[key] = store
+                self.stores.move_to_end(key)
+                while self.max_entries and len(self.stores) > self.max_entries:
+                    evicted, _ = self.stores.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+                    self.evictions += 1
+            return store
+
+    # Fungsi untuk store yang sudah ada di cache
+    def peek(self, key):
+        """Store `key` bila sedang di cache (None jika tidak), tanpa membuat,
+        memuat ulang, atau mengubah urutan LRU"""
+        with self._lock:
+            return self.stores.get(key)
+
+    # Fungsi untuk store yang sedang disimpan
+    def items(self):
+        """Salinan pasangan (kunci, store) di cache, tanpa memuat ulang apa pun"""
+        with self._lock:
+            return list(self.stores.items())
+
+    # Fungsi untuk membuang store dari cache
+    def invalidate(self, key=None):
+        """Membuang store `key` (atau semua store) agar dibuat ulang"""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self.stores.clear()
+            else:
+                self.stores.pop(key, None)
+
+    # Fungsi untuk statistik cache
+    def stats(self):
+        """Jumlah hit/miss dan perkiraan ukuran data yang tersimpan di memori"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+                "evictions": self.evictions,
+                "entries": len(self.stores),
+                "resident_bytes": sum(store.resident_size() for store in self.stores.values()),
+            }
@@ -0,0 +1,293 @@
+# modules/activity_history.py
+import json
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from datetime import datetime
+
+from modules.activity_cache import deep_sizeof
+from modules.activity_model import TIMESTAMP_FORMAT
+from modules.file_lock import FileLock
+
+# Riwayat perubahan aktivitas: log JSON Lines append-only berisi delta,
+# bukan salinan utuh record. Satu baris per mutasi (nomor entri = urutan
+# baris yang valid, dimulai dari 1):
+#
+#   insert  {"op", "id", "waktu", "data": record lengkap}
+#   update  {"op", "id", "waktu", "data": nilai baru field yang berubah[, "lengkap": record setelahnya]}
+#   delete  {"op", "id", "waktu"}
+#
+# Nilai None berarti field tidak ada. Nilai lama tidak disimpan: isinya
+# dibangun ulang dari versi sebelumnya. "lengkap" adalah checkpoint, ditulis
+# setiap CHECKPOINT_INTERVAL delta sebuah aktivitas, sehingga versi mana pun
+# cukup dibangun dari checkpoint terdekat ditambah paling banyak
+# CHECKPOINT_INTERVAL delta. Entri pertama aktivitas yang sudah ada sebelum
+# riwayat dicatat juga menyimpan "sebelum" (update: nilai lama, delete:
+# record lengkap), karena versi sebelumnya tidak ada di log.
+
+# Variabel konstan
+HISTORY_FILE = "data/history.jsonl"
+CHECKPOINT_INTERVAL = 16
+
+_tracking = threading.local()
+
+
+# Fungsi untuk mengumpulkan nomor entri yang ditulis oleh thread ini
+@contextmanager
+def track():
+    """Daftar nomor semua entri yang dicatat selama blok ini (untuk undo per sesi)"""
+    previous = getattr(_tracking, 'seqs', None)
+    _tracking.seqs = seqs = []
+    try:
+        yield seqs
+    finally:
+        _tracking.seqs = previous
+
+
+# Fungsi untuk field yang berubah antara dua isi aktivitas
+def diff(before, after):
+    """Nilai baru field yang berbeda; None = field tidak ada lagi"""
+    return {key: after.get(key) for key in {**before, **after} if before.get(key) != after.get(key)}
+
+
+def _apply(state, changes):
+    state = dict(state)
+    for key, value in changes.items():
+        if value is None:
+            state.pop(key, None)
+        else:
+            state[key] = value
+    return state
+
+
+def _is_checkpoint(entry):
+    # Entri yang isi aktivitas sesudahnya diketahui tanpa entri sebelumnya
+    return entry['op'] != "update" or 'lengkap' in entry
+
+
+class ActivityHistory:
+    """Log riwayat satu partisi dengan indeks posisi entri di memori.
+
+    Indeks hanya menyimpan posisi byte setiap entri (array) dan nomor entri
+    per aktivitas; isi entri dibaca dari file saat dibutuhkan. Baris baru
+    dari proses lain dibaca bertahap sebelum setiap operasi, dan penulisan
+    memegang lock file lintas proses.
+    """
+
+    def __init__(self, path=HISTORY_FILE, checkpoint_interval=CHECKPOINT_INTERVAL, fsync=True):
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+        self.fsync = fsync
+        self.lock = FileLock(path + ".lock")
+        self._thread_lock = threading.Lock()
+        self._reset()
+
+    def __len__(self):
+        with self._thread_lock:
+            self._refresh()
+            return len(self._offsets)
+
+    # Fungsi untuk mencatat satu mutasi
+    def record(self, op, activity_id, before=None, after=None):
+        """Mencatat mutasi dari isi sebelum/sesudah (dict); mengembalikan nomor entri"""
+        return self.record_many([(op, activity_id, before, after)])[0]
+
+    # Fungsi untuk mencatat beberapa mutasi dalam satu penulisan
+    def record_many(self, changes):
+        """`changes` berisi (op, id, sebelum, sesudah); mengembalikan daftar nomor entri"""
+        waktu = datetime.now().strftime(TIMESTAMP_FORMAT)
+        with self.lock, self._thread_lock:
+            self._refresh()
+            entries, lines, since = [], [], {}
+            for op, activity_id, before, after in changes:
+                entry = {"op": op, "id": activity_id, "waktu": waktu}
+                # Delta sejak checkpoint terakhir; None jika aktivitas belum punya riwayat
+                count = since.get(activity_id, self._since_checkpoint.get(activity_id))
+                if op == "insert":
+                    entry['data'] = after
+                elif op == "update":
+                    entry['data'] = diff(before, after)
+                    if count is None or count + 1 >= self.checkpoint_interval:
+                        entry['lengkap'] = after
+                    if count is None:
+                        entry['sebelum'] = {key: before.get(key) for key in entry['data']}
+                elif count is None:
+                    entry['sebelum'] = before
+                since[activity_id] = 0 if _is_checkpoint(entry) else count + 1
+                entries.append(entry)
+                lines.append((json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode('utf-8'))
+            first = len(self._offsets) + 1
+            position = self._append(b"".join(lines))
+            # Entri baru diindeks dari baris di memori, tanpa membaca ulang file
+            for entry, line in zip(entries, lines):
+                self._index(entry, position)
+                position += len(line)
+            self._end = position
+        seqs = list(range(first, first + len(lines)))
+        tracked = getattr(_tracking, 'seqs', None)
+        if tracked is not None:
+            tracked.extend(seqs)
+        return seqs
+
+    # Fungsi untuk membaca satu entri beserta nilai lamanya
+    def entry(self, seq):
+        """Entri nomor `seq` dengan "seq" dan "sebelum" terisi; KeyError jika tidak ada.
+
+        "sebelum" berisi nilai lama field yang diubah (update) atau record
+        lengkap yang dihapus (delete).
+        """
+        return self.entries_at([seq])[0][0]
+
+    # Fungsi untuk membaca banyak entri sekaligus (misalnya undo aksi massal)
+    def entries_at(self, seqs):
+        """[(entry(seq), version_at(id, seq)), ...]; KeyError jika ada yang tidak ada"""
+        with self._thread_lock:
+            self._refresh()
+            for seq in seqs:
+                if not 1 <= seq <= len(self._offsets):
+                    raise KeyError(seq)
+        activity_ids = [entry['id'] for entry in self._read(seqs)]
+        return [next(self._walk(activity_id, seq, seq)) for activity_id, seq in zip(activity_ids, seqs)]
+
+    # Fungsi untuk riwayat satu aktivitas
+    def entries(self, activity_id, limit=None):
+        """Entri milik `activity_id` (seperti entry()), terbaru lebih dulu, paling banyak `limit`"""
+        with self._thread_lock:
+            self._refresh()
+            seqs = self._by_id.get(activity_id, [])
+            if not seqs:
+                return []
+            first = seqs[-limit] if limit and limit < len(seqs) else seqs[0]
+        return [entry for entry, _ in self._walk(activity_id, first)][::-1]
+
+    # Fungsi untuk membangun ulang isi aktivitas pada suatu titik riwayat
+    def version_at(self, activity_id, seq=None):
+        """Isi aktivitas setelah entri `seq` (None = terbaru); None jika belum ada/terhapus"""
+        with self._thread_lock:
+            self._refresh()
+            seqs = self._by_id.get(activity_id, [])
+            end = bisect_right(seqs, seq) if seq is not None else len(seqs)
+            if not end:
+                return None
+            last = seqs[end - 1]
+        state = None
+        for _, state in self._walk(activity_id, last, last):
+            pass
+        return state
+
+    # Ukuran data riwayat di memori (untuk statistik cache)
+    def resident_size(self):
+        return (self._offsets.itemsize * len(self._offsets) + deep_sizeof(self._by_id)
+                + deep_sizeof(self._checkpoints))
+
+    def is_stale(self):
+        # Baris baru selalu dibaca sebelum setiap operasi
+        return False
+
+    def reload(self):
+        with self._thread_lock:
+            self._reset()
+            self._refresh()
+
+    def _walk(self, activity_id, first, last=None):
+        # Memutar entri aktivitas dari checkpoint sebelum `first` sampai `last`;
+        # menghasilkan (entri dengan "seq"/"sebelum", isi sesudahnya) untuk first..last
+        with self._thread_lock:
+            seqs = self._by_id[activity_id]
+            lo = bisect_left(seqs, first)
+            hi = bisect_right(seqs, last) if last is not None else len(seqs)
+            start = lo
+            if lo > 0:
+                # Versi sebelum `first` dibangun dari checkpoint terdekat
+                checkpoints = self._checkpoints[activity_id]
+                start = bisect_left(seqs, checkpoints[bisect_right(checkpoints, seqs[lo - 1]) - 1])
+            needed = seqs[start:hi]
+        state = None
+        for seq, entry in zip(needed, self._read(needed)):
+            entry['seq'] = seq
+            if entry['op'] == "insert":
+                after = dict(entry['data'])
+            elif entry['op'] == "delete":
+                entry['sebelum'] = state if state is not None else entry.get('sebelum')
+                after = None
+            else:
+                if state is None and 'sebelum' in entry:
+                    # Entri pertama aktivitas lama: versi sebelumnya dari nilai lama
+                    state = _apply(entry['lengkap'], entry['sebelum'])
+                entry['sebelum'] = {key: state.get(key) for key in entry['data']} if state else {}
+                after = dict(entry['lengkap']) if 'lengkap' in entry else _apply(state or {}, entry['data'])
+            state = after
+            if seq >= first:
+                yield entry, state
+
+    def _reset(self):
+        self._offsets = array('q')  # Posisi byte entri nomor n (indeks n - 1)
+        self._by_id = {}  # ID aktivitas -> [nomor entri, ...]
+        self._checkpoints = {}  # ID aktivitas -> [nomor entri checkpoint, ...]
+        self._since_checkpoint = {}  # ID aktivitas -> jumlah delta sejak checkpoint
+        self._end = 0
+        self._inode = None
+
+    def _append(self, data):
+        # Mengembalikan posisi byte awal `data` di file (dipanggil di bawah self.lock)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'ab') as f:
+            # Baris terpotong dari proses yang mati tidak boleh menyambung
+            if f.tell() > self._end:
+                f.write(b"\n")
+            position = f.tell()
+            f.write(data)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            self._inode = os.fstat(f.fileno()).st_ino
+        return position
+
+    def _refresh(self):
+        # Hanya baris lengkap setelah posisi terakhir yang diindeks
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self._offsets:
+                self._reset()
+            return
+        if stat.st_ino != self._inode or stat.st_size < self._end:
+            # File diganti atau dipotong: indeks dibangun ulang
+            self._reset()
+            self._inode = stat.st_ino
+        if stat.st_size == self._end:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(self._end)
+            data = f.read()
+        position = self._end
+        for line in data[:data.rfind(b"\n") + 1].splitlines(keepends=True):
+            try:
+                self._index(json.loads(line), position)
+            except (ValueError, KeyError, TypeError):
+                pass
+            position += len(line)
+        self._end = position
+
+    def _index(self, entry, position):
+        activity_id = entry['id']
+        self._offsets.append(position)
+        seq = len(self._offsets)
+        self._by_id.setdefault(activity_id, []).append(seq)
+        if _is_checkpoint(entry):
+            self._checkpoints.setdefault(activity_id, []).append(seq)
+            self._since_checkpoint[activity_id] = 0
+        else:
+            self._since_checkpoint[activity_id] = self._since_checkpoint.get(activity_id, 0) + 1
+
+    def _read(self, seqs):
+        entries = []
+        with open(self.path, 'rb') as f:
+            for seq in seqs:
+                f.seek(self._offsets[seq - 1])
+                entries.append(json.loads(f.readline()))
+        return entries
@@ -0,0 +1,264 @@
+# modules/activity_index.py
+import bisect
+import itertools
+from datetime import date, timedelta
+
+from modules.activity_model import deadline_of
+from modules.activity_search import SEARCH_FIELDS, SearchIndex, rank
+
+
+# Field yang dibuatkan index bucket
+INDEX_FIELDS = ["kategori", "status", "prioritas"]
+DONE_STATUS = "Selesai"
+
+
+class DeadlineIndex:
+    """Daftar terurut (deadline, id) untuk aktivitas yang belum selesai.
+
+    Deadline diambil sekali saat aktivitas masuk index, sehingga
+    query rentang tanggal cukup bisect + berhenti setelah `limit` hasil.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._key_by_id = {}
+
+    # Fungsi untuk membangun ulang index sekaligus (sekali sort)
+    def rebuild(self, activities):
+        self._key_by_id = {}
+        for activity in activities:
+            key = self._key(activity)
+            if key is not None:
+                self._key_by_id[activity['id']] = key
+        self._keys = sorted(self._key_by_id.values())
+
+    # Fungsi untuk memasukkan/memperbarui posisi aktivitas
+    def add(self, activity):
+        activity_id = activity['id']
+        self.remove(activity_id)
+        key = self._key(activity)
+        if key is not None:
+            bisect.insort(self._keys, key)
+            self._key_by_id[activity_id] = key
+
+    @staticmethod
+    def _key(activity):
+        if activity.get('status') == DONE_STATUS:
+            return None
+        deadline = deadline_of(activity)
+        if deadline is None:
+            return None
+        return (deadline.toordinal(), activity['id'])
+
+    # Fungsi untuk memasukkan/memperbarui banyak aktivitas sekaligus
+    def add_many(self, activities):
+        """Seperti add() untuk banyak aktivitas, O(n) sekali, bukan O(n) per aktivitas"""
+        activities = list(activities)
+        self.remove_many(activity['id'] for activity in activities)
+        added = []
+        for activity in activities:
+            key = self._key(activity)
+            if key is not None:
+                self._key_by_id[activity['id']] = key
+                added.append(key)
+        # Timsort menggabungkan dua bagian terurut dalam waktu linear
+        self._keys.extend(sorted(added))
+        self._keys.sort()
+
+    # Fungsi untuk mengeluarkan aktivitas dari index
+    def remove(self, activity_id):
+        key = self._key_by_id.pop(activity_id, None)
+        if key is not None:
+            del self._keys[bisect.bisect_left(self._keys, key)]
+
+    # Fungsi untuk mengeluarkan banyak aktivitas sekaligus
+    def remove_many(self, activity_ids):
+        removed = {self._key_by_id.pop(activity_id) for activity_id in activity_ids
+                   if activity_id in self._key_by_id}
+        if removed:
+            self._keys = [key for key in self._keys if key not in removed]
+
+    # Fungsi untuk ID dengan deadline dalam rentang tanggal
+    def window(self, start=None, end=None, limit=None):
+        """ID dengan start <= deadline <= end, urut dari deadline terdekat"""
+        lo = 0 if start is None else bisect.bisect_left(self._keys, (start.toordinal(),))
+        hi = len(self._keys) if end is None else bisect.bisect_left(self._keys, (end.toordinal() + 1,))
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return [activity_id for _, activity_id in self._keys[lo:hi]]
+
+    # Fungsi untuk aktivitas mendatang
+    def upcoming(self, days=7, limit=None, today=None):
+        today = today or date.today()
+        return self.window(today, today + timedelta(days=days), limit)
+
+    # Fungsi untuk aktivitas yang sudah lewat deadline
+    def overdue(self, limit=None, today=None):
+        today = today or date.today()
+        return self.window(None, today - timedelta(days=1), limit)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class ActivityIndex:
+    """Index sekunder di memori untuk kategori, status, dan prioritas.
+
+    Setiap nilai field memiliki satu set ID (bucket), sehingga hasil filter
+    didapat dari irisan set dan jumlah per nilai cukup ``len(bucket)``.
+    Index diperbarui per mutasi tanpa memindai ulang seluruh koleksi.
+    Aktivitas yang belum selesai juga dicatat di ``deadlines`` dan teks
+    nama/deskripsi/catatan di ``text`` (lihat activity_search).
+    """
+
+    def __init__(self, activities=(), fields=INDEX_FIELDS):
+        self.fields = list(fields)
+        self.rebuild(activities)
+
+    # Fungsi untuk membangun ulang index dari awal
+    def rebuild(self, activities):
+        """Mengosongkan index lalu memasukkan semua aktivitas"""
+        self.records = {}
+        self.buckets = {field: {} for field in self.fields}
+        self._values = {}
+        self._seq = {}
+        self._counter = itertools.count()
+        self.deadlines = DeadlineIndex()
+        for activity in activities:
+            self._add_to_buckets(activity)
+        self.deadlines.rebuild(self.records.values())
+        # Index teks baru dibangun saat pencarian pertama
+        self._text = None
+
+    # Fungsi untuk menambahkan aktivitas ke index
+    def add(self, activity):
+        self._add_to_buckets(activity)
+        self.deadlines.add(activity)
+        if self._text is not None:
+            self._text.add(activity)
+
+    # Fungsi untuk menambahkan banyak aktivitas sekaligus
+    def add_many(self, activities):
+        """Seperti add() untuk banyak aktivitas; index deadline digabung sekali"""
+        activities = list(activities)
+        for activity in activities:
+            self._add_to_buckets(activity)
+        self.deadlines.add_many(activities)
+        if self._text is not None:
+            self._text.add_many(activities)
+
+    def _add_to_buckets(self, activity):
+        activity_id = activity['id']
+        if activity_id in self.records:
+            self.remove(activity_id)
+        values = {field: activity.get(field) for field in self.fields}
+        for field, value in values.items():
+            self.buckets[field].setdefault(value, set()).add(activity_id)
+        self.records[activity_id] = activity
+        self._values[activity_id] = values
+        self._seq[activity_id] = next(self._counter)
+
+    # Fungsi untuk menghapus banyak aktivitas sekaligus
+    def remove_many(self, activity_ids):
+        """Seperti remove() untuk banyak ID; mengembalikan record yang dihapus"""
+        activity_ids = [activity_id for activity_id in activity_ids if activity_id in self._values]
+        # Index deadline dibangun sekali, bukan digeser per aktivitas
+        self.deadlines.remove_many(activity_ids)
+        return [self.remove(activity_id) for activity_id in activity_ids]
+
+    # Fungsi untuk menghapus aktivitas dari index
+    def remove(self, activity_id):
+        values = self._values.pop(activity_id, None)
+        if values is None:
+            return None
+        for field, value in values.items():
+            self.buckets[field][value].discard(activity_id)
+        del self._seq[activity_id]
+        self.deadlines.remove(activity_id)
+        if self._text is not None:
+            self._text.remove(activity_id)
+        return self.records.pop(activity_id)
+
+    # Fungsi untuk memperbarui bucket setelah field berubah
+    def update(self, activity_id, changes):
+        """Memindahkan ID ke bucket baru untuk field index yang berubah.
+
+        Dipanggil setelah record aktivitas sendiri diperbarui.
+        """
+        self._update_fields(activity_id, changes)
+        if 'deadline' in changes or 'status' in changes:
+            self.deadlines.add(self.records[activity_id])
+
+    # Fungsi untuk memperbarui index setelah banyak aktivitas berubah
+    def update_many(self, updates):
+        """Seperti update() untuk pasangan (id, perubahan); index deadline diperbarui sekali"""
+        moved = []
+        for activity_id, changes in updates:
+            self._update_fields(activity_id, changes)
+            if 'deadline' in changes or 'status' in changes:
+                moved.append(self.records[activity_id])
+        if moved:
+            self.deadlines.add_many(moved)
+
+    def _update_fields(self, activity_id, changes):
+        values = self._values[activity_id]
+        for field in self.fields:
+            if field in changes and changes[field] != values[field]:
+                self.buckets[field][values[field]].discard(activity_id)
+                self.buckets[field].setdefault(changes[field], set()).add(activity_id)
+                values[field] = changes[field]
+        if self._text is not None and any(field in changes for field in SEARCH_FIELDS):
+            self._text.add(self.records[activity_id])
+
+    # Fungsi untuk mendapatkan ID yang cocok dengan filter
+    def ids(self, **filters):
+        """ID aktivitas yang cocok (urut sesuai urutan penambahan)"""
+        selected = [self.buckets[field].get(value, set())
+                    for field, value in filters.items() if value is not None]
+        if not selected:
+            return list(self.records)
+        selected.sort(key=len)
+        matched = selected[0].intersection(*selected[1:])
+        return sorted(matched, key=self._seq.__getitem__)
+
+    # Fungsi untuk mendapatkan aktivitas yang cocok dengan filter
+    def query(self, **filters):
+        return [self.records[activity_id] for activity_id in self.ids(**filters)]
+
+    @property
+    def text(self):
+        """SearchIndex untuk nama/deskripsi/catatan (dibangun saat pertama dipakai)"""
+        if self._text is None:
+            self._text = SearchIndex(self.records.values())
+        return self._text
+
+    # Fungsi untuk mencari teks dengan filter
+    def search(self, text, limit=None, offset=0, **filters):
+        """(jumlah cocok, ID halaman ini) urut relevansi, lalu urutan penambahan"""
+        scores = self.text.scores(text)
+        ids = scores.keys()
+        for field, value in filters.items():
+            if value is not None:
+                ids = ids & self.buckets[field].get(value, set())
+        return len(ids), rank(scores, ids, self._seq, limit, offset)
+
+    # Fungsi untuk menghitung aktivitas yang cocok dengan filter
+    def count(self, **filters):
+        selected = [self.buckets[field].get(value, set())
+                    for field, value in filters.items() if value is not None]
+        if not selected:
+            return len(self.records)
+        if len(selected) == 1:
+            return len(selected[0])
+        selected.sort(key=len)
+        return len(selected[0].intersection(*selected[1:]))
+
+    # Fungsi untuk jumlah aktivitas per nilai field
+    def count_by(self, field):
+        return {value: len(ids) for value, ids in self.buckets[field].items() if ids}
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, activity_id):
+        return activity_id in self.records
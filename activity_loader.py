@@ -0,0 +1,276 @@
+# modules/activity_loader.py
+import codecs
+import json
+import re
+
+
+# Variabel konstan
+CHUNK_SIZE = 64 * 1024  # Ukuran potongan file yang dibaca sekali baca
+MAX_RECORD_SIZE = 1024 * 1024  # Record lebih besar dari ini dianggap rusak
+RAW_PREVIEW = 200  # Panjang potongan teks record rusak yang disimpan di laporan
+
+_WHITESPACE = re.compile(r"[\s,]*")
+
+
+class RecordError:
+    """Satu record yang tidak dapat dibaca dari file aktivitas"""
+
+    __slots__ = ("path", "line", "message", "raw")
+
+    def __init__(self, path, line, message, raw=""):
+        self.path = path
+        self.line = line
+        self.message = message
+        self.raw = raw[:RAW_PREVIEW]
+
+    def __str__(self):
+        return f"{self.path} baris {self.line}: {self.message}"
+
+    def __repr__(self):
+        return f"RecordError({str(self)!r})"
+
+
+# Fungsi untuk mengenali format file aktivitas
+def detect_format(f):
+    """"array" untuk format JSON lama (satu array), selain itu "jsonl".
+
+    Posisi file dikembalikan ke awal setelah diperiksa.
+    """
+    fmt = "jsonl"
+    while True:
+        char = f.read(1)
+        if not char or not char.isspace():
+            fmt = "array" if char == "[" else "jsonl"
+            break
+    f.seek(0)
+    return fmt
+
+
+# Fungsi untuk membaca record satu per satu dari file
+def iter_records(path, errors=None):
+    """Generator record (dict) dari file JSON Lines atau array JSON lama.
+
+    File dibaca per potongan sehingga memori puncak tidak bergantung pada
+    ukuran file, dan record pertama sudah tersedia sebelum file selesai
+    dibaca. Record yang rusak (termasuk baris yang bukan UTF-8 valid)
+    dicatat ke list `errors` sebagai RecordError lalu dilewati; record lain
+    tetap dimuat.
+    """
+    errors = [] if errors is None else errors
+    with open(path, 'rb') as f:
+        yield from read_records(_DecodedLines(f, path, errors), path, errors)
+
+
+# Fungsi untuk membaca record dari file yang sudah dibuka
+def read_records(f, name, errors=None):
+    """Seperti iter_records, untuk file teks yang sudah dibuka (misalnya upload).
+
+    `name` hanya dipakai di laporan RecordError; file harus bisa di-seek.
+    """
+    errors = [] if errors is None else errors
+    if detect_format(f) == "array":
+        yield from _iter_array(f, name, errors)
+    else:
+        yield from _iter_jsonl(f, name, errors)
+
+
+def _iter_jsonl(f, path, errors):
+    for line_no, line in enumerate(f, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            errors.append(RecordError(path, line_no, f"JSON tidak valid ({e.msg})", line))
+            continue
+        if isinstance(record, dict):
+            yield record
+        else:
+            errors.append(RecordError(path, line_no, "record bukan objek JSON", line))
+
+
+def _iter_array(f, path, errors):
+    decoder = json.JSONDecoder()
+    reader = _ChunkReader(f)
+    # Lewati "[" pembuka (detect_format sudah memastikan ada)
+    pos = reader.buffer.index("[") + 1
+    while True:
+        pos = _WHITESPACE.match(reader.buffer, pos).end()
+        if pos == len(reader.buffer):
+            if reader.eof:
+                errors.append(RecordError(path, reader.line_at(pos), "array tidak ditutup dengan ']'"))
+                return
+            reader.read_more()
+            continue
+        if reader.buffer[pos] == "]":
+            return
+        try:
+            record, end = decoder.raw_decode(reader.buffer, pos)
+            # Nilai yang berakhir tepat di ujung buffer mungkin masih terpotong
+            if end == len(reader.buffer) and not reader.eof:
+                reader.read_more()
+                continue
+        except json.JSONDecodeError as e:
+            if not reader.eof and _maybe_truncated(e, reader.buffer) \
+                    and len(reader.buffer) - pos < MAX_RECORD_SIZE:
+                reader.read_more()
+                continue
+            line = reader.line_at(pos)
+            errors.append(RecordError(path, line, f"JSON tidak valid ({e.msg})",
+                                      reader.buffer[pos:pos + RAW_PREVIEW]))
+            end = reader.find_next_record(pos)
+            if end is None:
+                errors.append(RecordError(path, line, "sisa file setelah record rusak tidak dapat dibaca"))
+                return
+            pos = reader.discard(end)
+            continue
+        if isinstance(record, dict):
+            yield record
+        else:
+            errors.append(RecordError(path, reader.line_at(pos), "record bukan objek JSON",
+                                      reader.buffer[pos:end]))
+        pos = reader.discard(end)
+
+
+def _maybe_truncated(error, buffer):
+    # Error di ujung buffer (atau string yang belum ditutup) bisa berarti data belum lengkap
+    return error.msg.startswith("Unterminated string") or not buffer[error.pos:].strip()
+
+
+class _ChunkReader:
+    """Buffer teks yang diisi per potongan dan dibuang setelah diproses"""
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ""
+        self.eof = False
+        self._line = 1  # Nomor baris untuk karakter pertama buffer
+        self.read_more()
+
+    def read_more(self):
+        chunk = self.f.read(CHUNK_SIZE)
+        if chunk:
+            self.buffer += chunk
+        else:
+            self.eof = True
+
+    def line_at(self, pos):
+        return self._line + self.buffer.count("\n", 0, pos)
+
+    # Fungsi untuk membuang bagian buffer yang sudah diproses
+    def discard(self, pos):
+        """Mengembalikan posisi baru `pos` setelah awal buffer dibuang"""
+        if pos < CHUNK_SIZE:
+            return pos
+        self._line += self.buffer.count("\n", 0, pos)
+        self.buffer = self.buffer[pos:]
+        return 0
+
+    # Fungsi untuk mencari awal record berikutnya setelah record rusak
+    def find_next_record(self, pos):
+        """Posisi awal record berikutnya dengan indentasi yang sama, atau None.
+
+        Untuk array satu baris (tanpa indentasi) dicari pola ``, {``.
+        """
+        line_start = self.buffer.rfind("\n", 0, pos) + 1
+        indent = self.buffer[line_start:pos]
+        if line_start > 0 and not indent.strip():
+            pattern = re.compile("\n" + re.escape(indent) + r"\{")
+            offset = 1
+        else:
+            pattern = re.compile(r",\s*\{")
+            offset = None
+        start = pos + 1
+        while True:
+            match = pattern.search(self.buffer, start)
+            if match:
+                return match.start() + offset if offset else match.end() - 1
+            if self.eof:
+                return None
+            # Sisakan ekor buffer agar pola yang terpotong tetap ditemukan
+            start = max(pos + 1, len(self.buffer) - len(indent) - 2)
+            self.read_more()
+
+
+class _DecodedLines:
+    """File teks baca-saja di atas file biner, di-decode per potongan baris utuh.
+
+    Baris yang bukan UTF-8 valid dicatat sebagai RecordError (sekali,
+    walaupun file di-seek ulang) dan dibaca sebagai baris kosong, sehingga
+    satu byte rusak tidak menggagalkan seluruh file.
+    """
+
+    def __init__(self, f, path, errors):
+        self.f = f
+        self.path = path
+        self.errors = errors
+        self._reported = set()
+        self.seek(0)
+
+    # Fungsi untuk kembali ke awal file (hanya posisi 0 yang didukung)
+    def seek(self, pos):
+        if pos != 0:
+            raise ValueError("_DecodedLines hanya mendukung seek(0)")
+        self.f.seek(0)
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self._buffer = ""
+        self._line_no = 1
+        self._eof = False
+
+    def read(self, size=-1):
+        pieces = [self._buffer]
+        length = len(self._buffer)
+        while not self._eof and (size < 0 or length < size):
+            # Potongan diperpanjang sampai akhir baris agar bisa di-decode per baris
+            raw = self.f.read(CHUNK_SIZE)
+            if raw and not raw.endswith(b"\n"):
+                raw += self.f.readline(CHUNK_SIZE)
+            piece = self._decode(raw)
+            pieces.append(piece)
+            length += len(piece)
+        text = "".join(pieces)
+        if size < 0:
+            size = len(text)
+        self._buffer = text[size:]
+        return text[:size]
+
+    def __iter__(self):
+        rest = ""
+        while True:
+            text = self.read(CHUNK_SIZE)
+            if not text:
+                break
+            lines = (rest + text).split("\n")
+            rest = lines.pop()
+            for line in lines:
+                yield line + "\n"
+        if rest:
+            yield rest
+
+    def _decode(self, raw):
+        try:
+            text = self._decoder.decode(raw, final=not raw)
+        except UnicodeDecodeError:
+            self._decoder.reset()
+            text = "".join(self._decode_lines(raw))
+        self._line_no += raw.count(b"\n")
+        if not raw:
+            self._eof = True
+        return text
+
+    def _decode_lines(self, raw):
+        # Jalur lambat setelah error: setiap baris di-decode sendiri
+        lines = raw.split(b"\n")
+        for i, line in enumerate(lines):
+            last = i == len(lines) - 1
+            try:
+                yield self._decoder.decode(line if last else line + b"\n", final=not raw)
+            except UnicodeDecodeError as e:
+                self._decoder.reset()
+                line_no = self._line_no + i
+                if line_no not in self._reported:
+                    self._reported.add(line_no)
+                    self.errors.append(RecordError(self.path, line_no, f"teks bukan UTF-8 yang valid ({e.reason})",
+                                                   line.decode('utf-8', 'replace')))
+                yield "\n"
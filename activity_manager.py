@@ -1,48 +1,320 @@
 # modules/activity_manager.py
 import streamlit as st
-import json
-import os
-from datetime import datetime
-import time
+import io
+import uuid
+from datetime import date, timedelta
+from streamlit.errors import StreamlitAPIException
 
+from modules import (activity_analytics, activity_history, activity_metrics, activity_recurrence, activity_service,
+                     activity_store, activity_transfer, change_feed)
+from modules.activity_model import CATEGORIES, PRIORITIES, STATUS_OPTIONS, deadline_of
+# Logika data ada di activity_service; modul ini hanya berisi tampilan Streamlit
+from modules.activity_service import STORAGE_BACKEND
 
 # Variabel konstan
-DATA_FILE = "data/activities.json"
-CATEGORIES = ["Akademik", "Organisasi", "Lainnya"]
-PRIORITIES = ["Tinggi", "Sedang", "Rendah"]
-STATUS_OPTIONS = ["Belum Dimulai", "Dalam Proses", "Selesai"]
-
-# Fungsi untuk memuat aktivitas
-def load_activities():
-    """Memuat data aktivitas dari file JSON"""
-    if os.path.exists(DATA_FILE):
+VIEW_MODES = ["Daftar", "Tabel"]
+TABLE_COLUMNS = ["nama", "kategori", "deadline", "prioritas", "status"]
+PAGE_SIZE_OPTIONS = [10, 25, 50, 100]
+DEFAULT_PAGE_SIZE = 25
+LOAD_ERRORS_SHOWN = 10  # Jumlah record rusak yang dirinci di peringatan
+EXPORT_FORMATS = {"CSV": "csv", "JSON Lines": "jsonl"}
+REMINDERS_SHOWN = 3  # Pengingat yang dirinci dalam satu notifikasi
+NO_REPEAT = "Tidak berulang"
+RECURRENCE_WINDOWS = [7, 14, 30]  # Rentang hari kejadian yang ditampilkan
+UNDO_LIMIT = 20  # Perubahan per sesi yang bisa diurungkan
+HISTORY_SHOWN = 10  # Entri riwayat yang ditampilkan per aktivitas
+FEED_CHECK_SECONDS = 2  # Jeda sesi memeriksa perubahan dari sesi/proses lain
+# Aksi massal: field yang diubah beserta pilihannya; None = hapus
+BULK_ACTIONS = {
+    "Ubah Status": ("status", STATUS_OPTIONS),
+    "Ubah Prioritas": ("prioritas", PRIORITIES),
+    "Ubah Kategori": ("kategori", CATEGORIES),
+    "Hapus": None,
+}
+
+# Fungsi untuk pemilik data sesi ini
+def current_owner():
+    """Pemilik partisi data dari query ?user=...; None berarti partisi bersama"""
+    if 'owner' not in st.session_state:
         try:
-            with open(DATA_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Pastikan setiap aktivitas memiliki ID yang valid
-                for activity in data:
-                    if 'id' not in activity:
-                        activity['id'] = int(time.time() * 1000) + data.index(activity)
-                return data
-        except:
-            return []
-    return []
-
-# Fungsi untuk menyimpan aktivitas
-def save_activities(activities):
-    """Menyimpan data aktivitas ke file JSON"""
+            st.session_state.owner = activity_service.normalize_owner(st.query_params.get("user"))
+        except activity_service.ValidationError as e:
+            st.error(f"Pengguna tidak valid: {str(e)}")
+            st.stop()
+    return st.session_state.owner
+
+# Fungsi untuk mendapatkan store aktivitas
+def get_store():
+    """Store partisi pemilik sesi ini dari activity_service; berhenti jika data tidak terbaca.
+
+    Aplikasi dihentikan (bukan memakai data kosong) agar file yang tidak
+    dapat dibaca tidak tertimpa snapshot kosong.
+    """
     try:
-        os.makedirs("data", exist_ok=True)
-        with open(DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(activities, f, indent=4, ensure_ascii=False)
+        return activity_service.get_store(current_owner())
+    except OSError as e:
+        st.error(f"Gagal membaca data aktivitas: {str(e)}")
+        st.stop()
+
+# Fungsi untuk menampilkan record yang gagal dimuat
+def show_load_errors():
+    """Menampilkan peringatan jika ada record rusak saat data dimuat"""
+    if STORAGE_BACKEND != "json":
+        return
+    errors = get_store().journal.load_errors
+    if not errors:
+        return
+    st.warning(
+        f"⚠️ {len(errors)} record aktivitas rusak dan tidak dimuat. "
+        f"Salinan snapshot asli (jika rusak) disimpan dengan akhiran .corrupt."
+    )
+    with st.expander("Detail record rusak"):
+        for error in errors[:LOAD_ERRORS_SHOWN]:
+            st.caption(str(error))
+        if len(errors) > LOAD_ERRORS_SHOWN:
+            st.caption(f"... dan {len(errors) - LOAD_ERRORS_SHOWN} record lainnya")
+
+# Fungsi untuk menampilkan pengingat deadline
+def show_reminders(show_notification_func):
+    """Menjalankan scheduler pengingat lalu meneruskan pengingat baru ke notifikasi.
+
+    Hanya membaca inbox scheduler di memori sehingga rerun tidak tertahan.
+    Sesi dengan pemilik (?user=...) hanya menerima pengingat partisinya.
+    """
+    activity_service.reminders.start()
+    if st.session_state.get('notification'):
+        # Notifikasi lain ditampilkan dulu; pengingat menyusul di rerun berikutnya
+        return
+    reminders = activity_service.reminders.unseen(st.session_state.get('reminder_seq', 0), current_owner())
+    if not reminders:
+        return
+    st.session_state.reminder_seq = reminders[-1]['seq']
+    if len(reminders) == 1:
+        message = f"⏰ Pengingat: {reminders[0]['pesan']}"
+    else:
+        message = f"⏰ {len(reminders)} pengingat deadline: " + "; ".join(
+            reminder['pesan'] for reminder in reminders[:REMINDERS_SHOWN]
+        )
+        if len(reminders) > REMINDERS_SHOWN:
+            message += f" dan {len(reminders) - REMINDERS_SHOWN} lainnya"
+    urgent = any(reminder['hari'] <= 1 for reminder in reminders)
+    show_notification_func(message, "warning" if urgent else "info")
+
+# Fungsi untuk penanda sesi ini di umpan perubahan
+def _session_token():
+    """Token acak per sesi; perubahan sesi ini sendiri tidak memicu rerun di watch_changes"""
+    if 'feed_token' not in st.session_state:
+        st.session_state.feed_token = uuid.uuid4().hex
+    return st.session_state.feed_token
+
+# Fungsi untuk memantau perubahan dari sesi dan proses lain
+@st.fragment(run_every=FEED_CHECK_SECONDS)
+def watch_changes(show_notification_func):
+    """Me-rerun aplikasi jika data partisi sesi ini diubah oleh sesi atau proses lain.
+
+    Fragment ini hanya membaca event umpan di memori; data store sudah
+    diperbarui oleh thread pengamat umpan (lihat change_feed), jadi biaya
+    setiap pemeriksaan tidak bergantung pada jumlah aktivitas.
+    """
+    feed = activity_service.feed
+    feed.start()
+    latest = feed.seq
+    if 'feed_seq' not in st.session_state:
+        st.session_state.feed_seq = latest
+        return
+    events, missed = feed.since(st.session_state.feed_seq, current_owner())
+    st.session_state.feed_seq = max([latest] + [event['seq'] for event in events])
+    token = _session_token()
+    foreign = [event for event in events if event['sesi'] != token]
+    if not foreign and not missed:
+        return
+    deleted = {activity_id for event in foreign for activity_id in event['dihapus']}
+    changed = deleted.union(*(event['ditambah'] + event['diubah'] for event in foreign))
+    for event in foreign:
+        # Status di daftar disimpan langsung, jadi nilai widget lamanya dibuang;
+        # form edit yang terbuka tetap, bentrok dideteksi saat disimpan
+        for activity_id in event['diubah']:
+            st.session_state.pop(f"status_{activity_id}", None)
+    _reset_edit_states(deleted)
+    if changed and not st.session_state.get('notification'):
+        show_notification_func(f"🔄 {len(changed)} aktivitas diubah oleh sesi lain.", "info")
+    st.rerun()
+
+# Fungsi untuk menyimpan satu mutasi
+def _save_mutation(write_func, *args, **kwargs):
+    """Menjalankan satu mutasi store dan menampilkan error jika gagal.
+
+    Entri riwayat yang ditulis mutasi ini menjadi satu langkah undo sesi.
+    """
+    try:
+        with change_feed.session(_session_token()), activity_history.track() as seqs:
+            write_func(*args, **kwargs)
+        _push_change(st.session_state.setdefault('undo_stack', []), seqs)
+        if seqs:
+            st.session_state.redo_stack = []
         return True
+    except activity_store.ConflictError as e:
+        # Form edit dibuka ulang dengan data terbaru
+        _reset_edit_state(e.activity_id)
+        st.error(str(e))
+        return False
+    except activity_service.ValidationError as e:
+        st.error(str(e))
+        return False
     except Exception as e:
         st.error(f"Gagal menyimpan data: {str(e)}")
         return False
 
+# Fungsi untuk menambahkan satu langkah ke tumpukan undo/redo
+def _push_change(stack, seqs):
+    if seqs:
+        stack.append(list(seqs))
+        # Hanya UNDO_LIMIT langkah terakhir yang disimpan per sesi
+        del stack[:-UNDO_LIMIT]
+
+# Fungsi untuk membalik langkah terakhir dari satu tumpukan
+def _revert_last(source, target):
+    """Membalik langkah teratas `source`; pembalikannya masuk ke `target`.
+
+    Biaya satu langkah tetap kecil: satu entri riwayat dan paling banyak
+    CHECKPOINT_INTERVAL delta dibaca, berapa pun panjang riwayatnya.
+    """
+    stack = st.session_state.get(source) or []
+    if not stack:
+        return None
+    try:
+        with change_feed.session(_session_token()), activity_history.track() as reverted:
+            activity_ids = activity_service.revert_changes(stack[-1], owner=current_owner())
+    except activity_store.ConflictError as e:
+        _reset_edit_state(e.activity_id)
+        message = f"Tidak dapat dibatalkan: {str(e)}"
+    except KeyError:
+        message = "Tidak dapat dibatalkan: aktivitas sudah dihapus."
+    except activity_service.ValidationError as e:
+        message = f"Tidak dapat dibatalkan: {str(e)}"
+    else:
+        # Langkah baru diambil dari tumpukan setelah berhasil dibalik
+        stack.pop()
+        _push_change(st.session_state.setdefault(target, []), reverted)
+        _reset_edit_states(activity_ids)
+        return True
+    if reverted:
+        # Sebagian batch sudah terlanjur dibalik: langkah tidak bisa diulang utuh,
+        # tetapi pembalikan yang sudah ditulis tetap dapat diurungkan
+        stack.pop()
+        _push_change(st.session_state.setdefault(target, []), reverted)
+    return message
+
+# Fungsi untuk mengurungkan perubahan terakhir sesi ini
+def undo_last_change(show_notification_func):
+    result = _revert_last('undo_stack', 'redo_stack')
+    if result is None:
+        show_notification_func("Tidak ada perubahan untuk diurungkan.", "info")
+    elif result is True:
+        show_notification_func("Perubahan terakhir diurungkan.", "success")
+    else:
+        show_notification_func(result, "error")
+
+# Fungsi untuk mengulangi perubahan yang terakhir diurungkan
+def redo_last_change(show_notification_func):
+    result = _revert_last('redo_stack', 'undo_stack')
+    if result is None:
+        show_notification_func("Tidak ada perubahan untuk dikembalikan.", "info")
+    elif result is True:
+        show_notification_func("Perubahan dikembalikan.", "success")
+    else:
+        show_notification_func(result, "error")
+
+# Fungsi untuk menampilkan tombol undo/redo
+def display_undo_controls(show_notification_func):
+    """Tombol urungkan/kembalikan untuk perubahan sesi ini (dijalankan sebagai callback)"""
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("↩️ Urungkan", use_container_width=True,
+                  on_click=undo_last_change, args=(show_notification_func,))
+    with col2:
+        st.button("↪️ Kembalikan", use_container_width=True,
+                  on_click=redo_last_change, args=(show_notification_func,))
+
+# Fungsi untuk menyimpan aktivitas baru
+def save_insert(activity):
+    """Menyimpan aktivitas baru tanpa menulis ulang seluruh file"""
+    return _save_mutation(activity_service.create_activity, activity, owner=current_owner())
+
+# Fungsi untuk menyimpan perubahan aktivitas
+def save_update(activity_id, changes, base=None):
+    """Menyimpan field yang berubah pada satu aktivitas.
+
+    `base` adalah isi aktivitas saat mulai diedit, untuk deteksi bentrok.
+    """
+    return _save_mutation(activity_service.update_activity, activity_id, changes, base=base, owner=current_owner())
+
+# Fungsi untuk mendapatkan versi aktivitas saat mulai diedit
+def _edit_base(activity):
+    """Isi aktivitas saat widget edit pertama kali dibuat di sesi ini"""
+    key = f"edit_base_{activity['id']}"
+    if key not in st.session_state:
+        st.session_state[key] = activity.to_dict()
+    return st.session_state[key]
+
+# Fungsi untuk mengakhiri sesi edit satu aktivitas
+def _reset_edit_state(activity_id):
+    """Menghapus base dan nilai widget edit agar data terbaru ditampilkan"""
+    _reset_edit_states([activity_id])
+
+# Fungsi untuk mengakhiri sesi edit banyak aktivitas sekaligus
+def _reset_edit_states(activity_ids):
+    """Seperti _reset_edit_state; session state ditelusuri sekali, bukan sekali per ID"""
+    suffixes = {f"_{activity_id}" for activity_id in activity_ids}
+    if not suffixes:
+        return
+    for key in list(st.session_state.keys()):
+        if isinstance(key, str) and key.startswith(("edit_", "status_")) and key[key.rfind("_"):] in suffixes:
+            del st.session_state[key]
+
+# Fungsi untuk menyelesaikan mutasi di dalam fragment
+def _rerun_after_mutation(message, type, show_notification_func=None, full=False):
+    """Rerun seluruh aplikasi hanya jika bagian di luar fragment ikut berubah.
+
+    Fragment tidak boleh menulis ke sidebar atau ke luar container-nya, jadi
+    penambahan, penghapusan, perubahan status ke/dari "Selesai", dan mutasi
+    saat daftar difilter tetap me-rerun aplikasi (dengan notifikasi di atas
+    halaman). Mutasi lain hanya me-rerun fragment ini dan pesannya
+    ditampilkan di dalam fragment.
+    """
+    if full and show_notification_func:
+        show_notification_func(message, type)
+        st.rerun()
+    st.session_state.fragment_notification = {"message": message, "type": type}
+    if full:
+        st.rerun()
+    _rerun_fragment()
+
+# Fungsi untuk me-rerun fragment yang sedang berjalan
+def _rerun_fragment():
+    # scope="fragment" hanya sah saat fragment di-rerun sendiri; pada rerun
+    # penuh (halaman baru dibuka, AppTest) seluruh aplikasi yang di-rerun
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+# Fungsi untuk menampilkan notifikasi dari rerun fragment
+def _show_fragment_notification():
+    notification = st.session_state.pop('fragment_notification', None)
+    if notification:
+        # Tipe sama dengan show_notification: success, info, warning, error
+        getattr(st, notification["type"])(notification["message"])
+
+# Fungsi untuk menyimpan penghapusan aktivitas
+def save_delete(activity_id):
+    """Menyimpan penghapusan satu aktivitas"""
+    return _save_mutation(activity_service.delete_activity, activity_id, owner=current_owner())
+
 # Fungsi untuk menampilkan form tambah aktivitas
+@st.fragment
 def add_activity_form(show_notification_func=None):
-    """Form untuk menambahkan aktivitas baru"""
+    """Form untuk menambahkan aktivitas baru (fragment: input tidak valid tidak me-rerun halaman)"""
     with st.form("add_activity_form"):
         col1, col2 = st.columns(2)
         
@@ -57,34 +329,56 @@ def add_activity_form(show_notification_func=None):
         deskripsi = st.text_area("Deskripsi Aktivitas")
         catatan = st.text_area("Catatan Tambahan")
         
+        # Aktivitas berulang disimpan sebagai satu aturan; deadline = kejadian pertama
+        with st.expander("🔁 Pengulangan"):
+            col3, col4, col5 = st.columns(3)
+            with col3:
+                frekuensi = st.selectbox("Ulangi", [NO_REPEAT] + list(activity_recurrence.FREQUENCIES))
+            with col4:
+                interval = st.number_input("Setiap (hari/minggu)", min_value=1, value=1, step=1)
+            with col5:
+                sampai = st.date_input("Sampai Tanggal (opsional)", value=None)
+        
         submitted = st.form_submit_button("💾 Simpan Aktivitas")
         
         if submitted:
             if not nama:
-                if show_notification_func:
-                    show_notification_func("Nama aktivitas harus diisi!", "error")
-                else:
-                    st.error("Nama aktivitas harus diisi!")
+                st.error("Nama aktivitas harus diisi!")
                 return
             
-            # Generate ID unik berdasarkan timestamp
-            new_id = int(time.time() * 1000)
+            if frekuensi != NO_REPEAT:
+                rule = {
+                    "nama": nama,
+                    "kategori": kategori,
+                    "prioritas": prioritas,
+                    "deskripsi": deskripsi,
+                    "catatan": catatan,
+                    "mulai": deadline,
+                    "frekuensi": frekuensi,
+                    "interval": int(interval),
+                    "sampai": sampai
+                }
+                if _save_mutation(activity_service.create_recurrence, rule, owner=current_owner()):
+                    message = f"Aktivitas berulang '{nama}' berhasil ditambahkan!"
+                    if show_notification_func:
+                        show_notification_func(message, "success")
+                    else:
+                        st.success(message)
+                    st.rerun()
+                return
             
+            # ID, status awal, dan tanggal dibuat diisi oleh activity_service
             new_activity = {
-                "id": new_id,
                 "nama": nama,
                 "kategori": kategori,
                 "deadline": deadline.strftime("%Y-%m-%d"),
                 "prioritas": prioritas,
                 "deskripsi": deskripsi,
-                "catatan": catatan,
-                "status": "Belum Dimulai",
-                "tanggal_dibuat": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                "catatan": catatan
             }
             
-            st.session_state.activities.append(new_activity)
-            if save_activities(st.session_state.activities):
-                # Tampilkan notifikasi
+            if save_insert(new_activity):
+                # Total aktivitas di sidebar berubah: rerun seluruh aplikasi
                 if show_notification_func:
                     show_notification_func(f"Aktivitas '{nama}' berhasil ditambahkan!", "success")
                 else:
@@ -92,16 +386,107 @@ def add_activity_form(show_notification_func=None):
                 
                 st.rerun()
             else:
-                if show_notification_func:
-                    show_notification_func("Gagal menyimpan aktivitas!", "error")
+                st.error("Gagal menyimpan aktivitas!")
+
+# Fungsi untuk menampilkan form impor banyak aktivitas
+def import_activities_form(show_notification_func=None):
+    """Upload file CSV/JSON Lines lalu simpan semua baris sekaligus"""
+    uploaded = st.file_uploader(
+        "File CSV atau JSON Lines",
+        type=["csv", "jsonl", "json"],
+        help="Kolom: nama, kategori, deadline (YYYY-MM-DD), prioritas, "
+             "deskripsi, catatan, status. Kolom id dan tanggal diabaikan.",
+        key="import_file"
+    )
+    skip_invalid = st.checkbox("Lewati baris yang tidak valid", key="import_skip_invalid")
+    
+    if uploaded is not None and st.button("📥 Impor Aktivitas", key="import_submit"):
+        text = io.TextIOWrapper(uploaded, encoding="utf-8-sig", newline="")
+        try:
+            with change_feed.session(_session_token()):
+                result = activity_transfer.import_activities(
+                    text, activity_transfer.guess_format(uploaded.name), uploaded.name, skip_invalid,
+                    owner=current_owner()
+                )
+        except Exception as e:
+            st.error(f"Gagal mengimpor data: {str(e)}")
+            return
+        finally:
+            text.detach()
+        
+        if result.errors:
+            st.warning(f"⚠️ {result.rejected} baris tidak valid")
+            with st.expander("Detail baris tidak valid"):
+                for error in result.errors[:LOAD_ERRORS_SHOWN]:
+                    st.caption(str(error))
+                if result.rejected > LOAD_ERRORS_SHOWN:
+                    st.caption(f"... dan {result.rejected - LOAD_ERRORS_SHOWN} baris lainnya")
+        
+        if result.imported:
+            message = f"{result.imported} aktivitas berhasil diimpor!"
+            if show_notification_func and not result.errors:
+                # Tanpa peringatan yang perlu dibaca, halaman langsung dimuat ulang
+                show_notification_func(message, "success")
+                st.rerun()
+            st.success(message)
+        elif result.errors and not skip_invalid:
+            st.error("Tidak ada aktivitas yang diimpor. Perbaiki file atau centang "
+                     "'Lewati baris yang tidak valid'.")
+
+# Fungsi untuk menampilkan tombol ekspor aktivitas
+def _export_activities(store, filters, total):
+    """Ekspor aktivitas yang cocok filter; file baru dibuat saat diminta"""
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        export_format = st.selectbox("Format Ekspor", list(EXPORT_FORMATS), key="export_format")
+    fmt = EXPORT_FORMATS[export_format]
+    
+    with col2:
+        # Isi file tidak dibuat di setiap rerun, hanya setelah tombol ditekan
+        if st.button(f"📤 Siapkan Ekspor ({total} aktivitas)", key="export_prepare"):
+            data = "".join(activity_transfer.iter_export(fmt, store.scan(**filters)))
+            st.session_state.export_data = (fmt, data.encode("utf-8"))
+        
+        export = st.session_state.get('export_data')
+        if export and export[0] == fmt:
+            st.download_button(
+                "⬇️ Unduh",
+                data=export[1],
+                file_name=f"aktivitas.{fmt}",
+                mime="text/csv" if fmt == "csv" else "application/x-ndjson",
+                key="export_download"
+            )
 
 # Fungsi untuk menampilkan daftar aktivitas
-def display_activities(activities, show_notification_func=None):
-    """Menampilkan daftar aktivitas dalam format tabel sederhana"""
-    if not activities:
+@st.fragment
+@activity_metrics.timed("ui.display_activities")
+def display_activities(show_notification_func=None):
+    """Menampilkan daftar aktivitas per halaman dalam format tabel sederhana.
+
+    Seluruh tampilan adalah satu fragment: filter dan paginasi hanya me-rerun
+    bagian ini, bukan sidebar. Baris aktivitas yang dipilih (beserta panel
+    kelolanya) adalah fragment di dalamnya, sehingga memilih atau mengubah
+    status hanya me-rerun baris tersebut.
+    """
+    # Aksi massal selesai di callback: langsung satu rerun aplikasi tanpa merender daftar lama
+    if 'bulk_result' in st.session_state:
+        message, type = st.session_state.pop('bulk_result')
+        _rerun_after_mutation(message, type, show_notification_func, full=True)
+    
+    # Store diambil ulang di setiap rerun fragment (argumen fragment disimpan dari rerun penuh)
+    store = get_store()
+    _show_fragment_notification()
+    if store.count() == 0:
         st.info("Belum ada aktivitas yang ditambahkan.")
         return
     
+    # Pencarian teks nama/deskripsi/catatan, digabung dengan filter di bawah
+    search_text = st.text_input(
+        "🔍 Cari Aktivitas",
+        placeholder="Cari nama, deskripsi, atau catatan...",
+        key="search_text"
+    ).strip()
+    
     # Filter berdasarkan kategori
     filter_col1, filter_col2, filter_col3 = st.columns(3)
     
@@ -126,248 +511,541 @@ def display_activities(activities, show_notification_func=None):
             key="filter_priority"
         )
     
-    # Filter data menggunakan looping
-    filtered_activities = []
-    for activity in activities:
-        kategori_match = (filter_kategori == "Semua" or 
-                         activity['kategori'] == filter_kategori)
-        status_match = (filter_status == "Semua" or 
-                       activity['status'] == filter_status)
-        priority_match = (filter_priority == "Semua" or 
-                         activity['prioritas'] == filter_priority)
-        
-        if kategori_match and status_match and priority_match:
-            filtered_activities.append(activity)
+    # Filter data dijalankan oleh store ("Semua" berarti tanpa filter)
+    filters = {
+        'kategori': None if filter_kategori == "Semua" else filter_kategori,
+        'status': None if filter_status == "Semua" else filter_status,
+        'prioritas': None if filter_priority == "Semua" else filter_priority
+    }
+    if search_text:
+        # limit=0: hanya jumlah hasil; skor query disimpan index untuk pemanggilan berikutnya
+        total, _ = store.search(search_text, **filters, limit=0)
+    else:
+        total = store.count(**filters)
     
     # Menampilkan statistik
-    st.subheader(f"📊 Total: {len(filtered_activities)} aktivitas")
+    st.subheader(f"📊 Total: {total} aktivitas")
+    
+    if total == 0:
+        if search_text:
+            st.warning(f"Tidak ada aktivitas yang cocok dengan pencarian \"{search_text}\".")
+        else:
+            st.warning("Tidak ada aktivitas yang sesuai dengan filter.")
+        return
+    
+    # Pengaturan tampilan dan paginasi
+    view_col1, view_col2, view_col3 = st.columns(3)
+    
+    with view_col1:
+        view_mode = st.radio("Tampilan", VIEW_MODES, horizontal=True, key="view_mode")
     
-    # Tampilkan dalam bentuk tabel sederhana
-    if filtered_activities:
-        # Buat header tabel
-        col1, col2, col3, col4, col5 = st.columns([3, 2, 2, 2, 2])
+    with view_col2:
+        page_size = st.selectbox(
+            "Aktivitas per Halaman",
+            PAGE_SIZE_OPTIONS,
+            index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE),
+            key="page_size"
+        )
+    
+    total_pages = (total + page_size - 1) // page_size
+    # Halaman dikembalikan ke batas jika filter membuat jumlah halaman berkurang
+    if st.session_state.get('activity_page', 1) > total_pages:
+        st.session_state.activity_page = total_pages
+    
+    with view_col3:
+        page = st.number_input(
+            f"Halaman (dari {total_pages})",
+            min_value=1,
+            max_value=total_pages,
+            step=1,
+            key="activity_page"
+        )
+    
+    # Hanya aktivitas di halaman ini yang dimuat dari store
+    if search_text:
+        # Hasil pencarian diurutkan dari yang paling relevan
+        _, page_activities = store.search(search_text, **filters, limit=page_size, offset=(page - 1) * page_size)
+    else:
+        page_activities = store.query(**filters, limit=page_size, offset=(page - 1) * page_size)
+    
+    # Aktivitas yang dikelola dipilih sebelum daftar: di tampilan baris,
+    # panel detailnya dirender di fragment baris yang sama
+    activity_options = {f"{act['nama']} (ID: {act['id']})": act['id'] for act in page_activities}
+    selected_activity_key = st.selectbox(
+        "Pilih Aktivitas:",
+        options=list(activity_options.keys()),
+        key="detail_select"
+    )
+    selected_id = activity_options[selected_activity_key]
+    # Tanpa filter/pencarian, mutasi satu aktivitas tidak mengubah isi halaman
+    # ini sehingga cukup fragment barisnya yang di-rerun
+    partial = not search_text and not any(filters.values())
+    
+    if view_mode == "Tabel":
+        st.dataframe(
+            [{field: act.get(field, '') for field in TABLE_COLUMNS} for act in page_activities],
+            use_container_width=True,
+            hide_index=True
+        )
+        # Tabel berada di luar fragment detail: mutasi me-rerun aplikasi
+        st.subheader("📝 Detail dan Kelola Aktivitas")
+        _activity_row(selected_id, selected=True, show_row=False,
+                      show_notification_func=show_notification_func)
+    else:
+        _display_activity_rows(page_activities, selected_id, partial, show_notification_func)
+    
+    with st.expander("☑️ Aksi Massal"):
+        _bulk_actions(page_activities, filters, search_text, total)
+    
+    with st.expander("📤 Ekspor Aktivitas (sesuai filter)"):
+        # Ekspor memakai filter saja, tanpa pencarian teks
+        _export_activities(store, filters, store.count(**filters) if search_text else total)
+
+# Fungsi untuk menampilkan aksi massal
+def _bulk_actions(page_activities, filters, search_text, total):
+    """Memilih banyak aktivitas lalu mengubah status/prioritas/kategori atau menghapusnya.
+
+    Pilihan disimpan sebagai set ID di session state (tetap ada saat pindah
+    halaman); "semua yang cocok" baru diubah menjadi daftar ID saat aksi
+    diterapkan. Setiap aksi adalah satu mutasi batch: satu penulisan store
+    dan riwayat, satu langkah undo, dan satu rerun aplikasi.
+    """
+    selected = st.session_state.setdefault('bulk_selected', set())
+    select_all = st.checkbox(f"Pilih semua {total} aktivitas yang cocok dengan filter/pencarian",
+                             key="bulk_select_all")
+    if not select_all:
+        page_ids = [act['id'] for act in page_activities]
+        names = {act['id']: act['nama'] for act in page_activities}
+        # Nilai widget diisi dari set pilihan setiap rerun (halaman bisa berganti)
+        st.session_state.bulk_page_select = [activity_id for activity_id in page_ids if activity_id in selected]
+        st.multiselect(
+            "Pilih aktivitas di halaman ini",
+            options=page_ids,
+            format_func=lambda activity_id: f"{names[activity_id]} (ID: {activity_id})",
+            key="bulk_page_select",
+            on_change=_sync_bulk_selection,
+            args=(page_ids,)
+        )
+        col1, col2 = st.columns(2)
         with col1:
-            st.markdown("**Nama Aktivitas**")
+            st.button("Pilih semua di halaman ini", key="bulk_select_page",
+                      on_click=selected.update, args=(page_ids,))
         with col2:
-            st.markdown("**Kategori**")
-        with col3:
-            st.markdown("**Deadline**")
-        with col4:
-            st.markdown("**Prioritas**")
-        with col5:
-            st.markdown("**Status**")
-        
-        st.markdown("---")
-        
-        # Tampilkan setiap aktivitas
-        for activity in filtered_activities:
-            col1, col2, col3, col4, col5 = st.columns([3, 2, 2, 2, 2])
-            
-            with col1:
-                st.write(activity['nama'])
-            with col2:
-                st.write(activity['kategori'])
-            with col3:
-                st.write(activity['deadline'])
-            with col4:
-                # Warna berdasarkan prioritas
-                if activity['prioritas'] == 'Tinggi':
-                    st.error(activity['prioritas'])
-                elif activity['prioritas'] == 'Sedang':
-                    st.warning(activity['prioritas'])
-                else:
-                    st.success(activity['prioritas'])
-            with col5:
-                # Warna berdasarkan status
-                if activity['status'] == 'Selesai':
-                    st.success(activity['status'])
-                elif activity['status'] == 'Dalam Proses':
-                    st.info(activity['status'])
-                else:
-                    st.warning(activity['status'])
-            
+            st.button("Kosongkan pilihan", key="bulk_clear", on_click=selected.clear)
+    count = total if select_all else len(selected)
+    st.caption(f"{count} aktivitas dipilih")
+    
+    col3, col4 = st.columns(2)
+    with col3:
+        action = st.selectbox("Aksi", list(BULK_ACTIONS), key="bulk_action")
+    with col4:
+        confirmed = True
+        if BULK_ACTIONS[action]:
+            field, choices = BULK_ACTIONS[action]
+            value = st.selectbox("Nilai Baru", choices, key=f"bulk_value_{field}")
+        else:
+            value = None
+            confirmed = st.checkbox("⚠️ Ya, hapus aktivitas yang dipilih", key="bulk_confirm_delete")
+    st.button(
+        f"✅ Terapkan ke {count} aktivitas",
+        key="bulk_apply",
+        disabled=not count or (value is None and not confirmed),
+        on_click=_apply_bulk_action,
+        args=(filters, search_text)
+    )
+
+# Fungsi untuk menyimpan pilihan multiselect satu halaman ke set pilihan
+def _sync_bulk_selection(page_ids):
+    selected = st.session_state.setdefault('bulk_selected', set())
+    selected.difference_update(page_ids)
+    selected.update(st.session_state.bulk_page_select)
+
+# Fungsi untuk menerapkan aksi massal (callback tombol)
+def _apply_bulk_action(filters, search_text=""):
+    """Satu mutasi batch untuk semua ID terpilih (atau semua yang cocok `filters`).
+
+    Dijalankan sebagai callback agar nilai widget pilihan boleh dikosongkan;
+    aksi dan nilainya dibaca dari session state, bukan dari render terakhir.
+    Rerun aplikasinya dilakukan display_activities lewat 'bulk_result'.
+    """
+    store = get_store()
+    action = st.session_state.bulk_action
+    if st.session_state.get('bulk_select_all'):
+        if search_text:
+            _, activities = store.search(search_text, **filters)
+        else:
+            activities = store.scan(**filters)
+        activity_ids = [activity['id'] for activity in activities]
+    else:
+        activity_ids = sorted(st.session_state.get('bulk_selected', ()))
+    changed = []
+    if BULK_ACTIONS[action] is None:
+        saved = _save_mutation(
+            lambda: changed.extend(activity_service.delete_activities(activity_ids, owner=current_owner()))
+        )
+        message = f"{len(changed)} aktivitas berhasil dihapus!"
+    else:
+        field, _ = BULK_ACTIONS[action]
+        value = st.session_state[f"bulk_value_{field}"]
+        saved = _save_mutation(lambda: changed.extend(
+            activity_service.update_activities(activity_ids, {field: value}, owner=current_owner())
+        ))
+        message = f"{len(changed)} aktivitas berhasil diubah: {field} menjadi '{value}'!"
+    if not saved:
+        return
+    _reset_edit_states(activity_ids)
+    st.session_state.bulk_selected = set()
+    st.session_state.bulk_select_all = False
+    st.session_state.bulk_confirm_delete = False
+    st.session_state.bulk_result = (message, "success")
+
+# Fungsi untuk menampilkan baris-baris tabel aktivitas
+@activity_metrics.timed("ui.activity_rows")
+def _display_activity_rows(activities, selected_id=None, partial=False, show_notification_func=None):
+    """Menampilkan aktivitas satu halaman sebagai baris tabel"""
+    # Buat header tabel
+    col1, col2, col3, col4, col5 = st.columns([3, 2, 2, 2, 2])
+    with col1:
+        st.markdown("**Nama Aktivitas**")
+    with col2:
+        st.markdown("**Kategori**")
+    with col3:
+        st.markdown("**Deadline**")
+    with col4:
+        st.markdown("**Prioritas**")
+    with col5:
+        st.markdown("**Status**")
+    
+    st.markdown("---")
+    
+    # Tampilkan setiap aktivitas; hanya baris yang dipilih yang dapat diubah
+    # sehingga hanya baris itu yang menjadi fragment (setiap fragment menyalin
+    # cursor dan stack container saat dipanggil)
+    for activity in activities:
+        if activity['id'] == selected_id:
+            _activity_row(activity['id'], selected=True, partial=partial,
+                          show_notification_func=show_notification_func)
+        else:
+            _display_activity_row(activity)
             st.markdown("---")
+
+# Fungsi untuk menampilkan satu aktivitas: baris tabel dan panel kelolanya
+@st.fragment
+def _activity_row(activity_id, selected=False, show_row=True, partial=False, show_notification_func=None):
+    """Fragment aktivitas yang dipilih: pilih/update status hanya me-rerun bagian ini.
+
+    Aktivitas dibaca ulang dari store karena argumen fragment berasal dari
+    rerun daftar terakhir. Mutasi yang mengubah isi halaman lain (sidebar,
+    tabel, hasil filter) tetap me-rerun aplikasi, lihat `partial`.
+    """
+    activity = get_store().get(activity_id)
+    if activity is None:
+        return
+    
+    if show_row:
+        _display_activity_row(activity)
+    
+    if selected:
+        _show_fragment_notification()
+        with st.expander("✏️ Edit Aktivitas", expanded=False):
+            _edit_activity_form(activity, show_notification_func, partial=partial)
         
-        # Detail setiap aktivitas menggunakan expander
-        st.subheader("📝 Detail dan Kelola Aktivitas")
-        
-        # Form untuk edit aktivitas
-        with st.expander("✏️ Edit Aktivitas Cepat", expanded=False):
-            st.write("Pilih aktivitas untuk diedit:")
-            
-            # Dropdown untuk memilih aktivitas
-            activity_options = {f"{act['nama']} (ID: {act['id']})": act['id'] for act in filtered_activities}
-            if activity_options:
-                selected_activity_key = st.selectbox(
-                    "Pilih Aktivitas:",
-                    options=list(activity_options.keys()),
-                    key="edit_select"
-                )
-                
-                if selected_activity_key:
-                    selected_id = activity_options[selected_activity_key]
-                    selected_activity = next((act for act in activities if act['id'] == selected_id), None)
-                    
-                    if selected_activity:
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            new_nama = st.text_input("Nama Aktivitas", value=selected_activity['nama'], key=f"edit_nama_{selected_id}")
-                            new_kategori = st.selectbox("Kategori", CATEGORIES, 
-                                                      index=CATEGORIES.index(selected_activity['kategori']),
-                                                      key=f"edit_kategori_{selected_id}")
-                            new_deadline = st.date_input("Deadline", 
-                                                       value=datetime.strptime(selected_activity['deadline'], "%Y-%m-%d"),
-                                                       key=f"edit_deadline_{selected_id}")
-                        
-                        with col2:
-                            new_prioritas = st.selectbox("Prioritas", PRIORITIES, 
-                                                       index=PRIORITIES.index(selected_activity['prioritas']),
-                                                       key=f"edit_prioritas_{selected_id}")
-                            new_status = st.selectbox("Status", STATUS_OPTIONS, 
-                                                    index=STATUS_OPTIONS.index(selected_activity['status']),
-                                                    key=f"edit_status_{selected_id}")
-                            new_deskripsi = st.text_area("Deskripsi", value=selected_activity['deskripsi'], key=f"edit_deskripsi_{selected_id}")
-                        
-                        new_catatan = st.text_area("Catatan", value=selected_activity.get('catatan', ''), key=f"edit_catatan_{selected_id}")
-                        
-                        if st.button("💾 Simpan Perubahan", key=f"edit_save_{selected_id}"):
-                            # Update data
-                            selected_activity['nama'] = new_nama
-                            selected_activity['kategori'] = new_kategori
-                            selected_activity['deadline'] = new_deadline.strftime("%Y-%m-%d")
-                            selected_activity['prioritas'] = new_prioritas
-                            selected_activity['status'] = new_status
-                            selected_activity['deskripsi'] = new_deskripsi
-                            selected_activity['catatan'] = new_catatan
-                            selected_activity['tanggal_diperbarui'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            
-                            if save_activities(st.session_state.activities):
-                                # Tampilkan notifikasi
-                                if show_notification_func:
-                                    show_notification_func(f"Aktivitas '{new_nama}' berhasil diperbarui!", "success")
-                                else:
-                                    st.success(f"Aktivitas '{new_nama}' berhasil diperbarui!")
-                                
-                                st.rerun()
-            else:
-                st.info("Tidak ada aktivitas untuk diedit")
+        with st.expander(f"{activity['nama']} - {activity['status']}", expanded=True):
+            _display_activity_detail(activity, show_notification_func, partial=partial)
         
+        with st.expander("🕘 Riwayat Perubahan", expanded=False):
+            _display_history(activity)
+    
+    if show_row:
         st.markdown("---")
+
+# Fungsi untuk menampilkan kolom-kolom satu baris aktivitas
+def _display_activity_row(activity):
+    col1, col2, col3, col4, col5 = st.columns([3, 2, 2, 2, 2])
+    
+    with col1:
+        st.write(activity['nama'])
+    with col2:
+        st.write(activity['kategori'])
+    with col3:
+        st.write(activity['deadline'])
+    with col4:
+        # Warna berdasarkan prioritas
+        if activity['prioritas'] == 'Tinggi':
+            st.error(activity['prioritas'])
+        elif activity['prioritas'] == 'Sedang':
+            st.warning(activity['prioritas'])
+        else:
+            st.success(activity['prioritas'])
+    with col5:
+        # Warna berdasarkan status
+        if activity['status'] == 'Selesai':
+            st.success(activity['status'])
+        elif activity['status'] == 'Dalam Proses':
+            st.info(activity['status'])
+        else:
+            st.warning(activity['status'])
+
+# Fungsi untuk menampilkan form edit aktivitas
+def _edit_activity_form(selected_activity, show_notification_func=None, partial=False):
+    """Form edit untuk satu aktivitas yang dipilih"""
+    selected_id = selected_activity['id']
+    base = _edit_base(selected_activity)
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        new_nama = st.text_input("Nama Aktivitas", value=selected_activity['nama'], key=f"edit_nama_{selected_id}")
+        new_kategori = st.selectbox("Kategori", CATEGORIES, 
+                                  index=CATEGORIES.index(selected_activity['kategori']),
+                                  key=f"edit_kategori_{selected_id}")
+        new_deadline = st.date_input("Deadline", 
+                                   value=deadline_of(selected_activity),
+                                   key=f"edit_deadline_{selected_id}")
+    
+    with col2:
+        new_prioritas = st.selectbox("Prioritas", PRIORITIES, 
+                                   index=PRIORITIES.index(selected_activity['prioritas']),
+                                   key=f"edit_prioritas_{selected_id}")
+        new_status = st.selectbox("Status", STATUS_OPTIONS, 
+                                index=STATUS_OPTIONS.index(selected_activity['status']),
+                                key=f"edit_status_{selected_id}")
+        new_deskripsi = st.text_area("Deskripsi", value=selected_activity['deskripsi'], key=f"edit_deskripsi_{selected_id}")
+    
+    new_catatan = st.text_area("Catatan", value=selected_activity.get('catatan', ''), key=f"edit_catatan_{selected_id}")
+    
+    if st.button("💾 Simpan Perubahan", key=f"edit_save_{selected_id}"):
+        # Update data
+        changes = {
+            'nama': new_nama,
+            'kategori': new_kategori,
+            'deadline': new_deadline.strftime("%Y-%m-%d"),
+            'prioritas': new_prioritas,
+            'status': new_status,
+            'deskripsi': new_deskripsi,
+            'catatan': new_catatan
+        }
         
-        # Detail individual setiap aktivitas
-        for i, activity in enumerate(filtered_activities):
-            with st.expander(f"{i+1}. {activity['nama']} - {activity['status']}"):
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.write(f"**ID:** {activity['id']}")
-                    st.write(f"**Kategori:** {activity['kategori']}")
-                    st.write(f"**Prioritas:** {activity['prioritas']}")
-                    st.write(f"**Deadline:** {activity['deadline']}")
-                    st.write(f"**Tanggal Dibuat:** {activity.get('tanggal_dibuat', '-')}")
-                    if 'tanggal_diperbarui' in activity:
-                        st.write(f"**Terakhir Diperbarui:** {activity['tanggal_diperbarui']}")
+        if save_update(selected_id, changes, base=base):
+            _reset_edit_state(selected_id)
+            done = activity_store.DONE_STATUS
+            # Nama juga tampil di "Pilih Aktivitas" yang berada di luar fragment baris
+            full = (not partial or new_nama != selected_activity['nama']
+                    or (selected_activity['status'] == done) != (new_status == done))
+            _rerun_after_mutation(
+                f"Aktivitas '{new_nama}' berhasil diperbarui!", "success", show_notification_func, full=full
+            )
+
+# Fungsi untuk menampilkan detail dan aksi satu aktivitas
+def _display_activity_detail(activity, show_notification_func=None, partial=False):
+    """Detail, update status, dan hapus untuk satu aktivitas"""
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write(f"**ID:** {activity['id']}")
+        st.write(f"**Kategori:** {activity['kategori']}")
+        st.write(f"**Prioritas:** {activity['prioritas']}")
+        st.write(f"**Deadline:** {activity['deadline']}")
+        st.write(f"**Tanggal Dibuat:** {activity.get('tanggal_dibuat', '-')}")
+        if 'tanggal_diperbarui' in activity:
+            st.write(f"**Terakhir Diperbarui:** {activity['tanggal_diperbarui']}")
+    
+    with col2:
+        # Update status langsung
+        base = _edit_base(activity)
+        current_status = activity['status']
+        new_status = st.selectbox(
+            f"Update Status",
+            STATUS_OPTIONS,
+            index=STATUS_OPTIONS.index(current_status),
+            key=f"status_{activity['id']}"
+        )
+        
+        if new_status != current_status:
+            if st.button("Update Status", key=f"update_{activity['id']}"):
+                changes = {'status': new_status}
                 
-                with col2:
-                    # Update status langsung
-                    current_status = activity['status']
-                    new_status = st.selectbox(
-                        f"Update Status",
-                        STATUS_OPTIONS,
-                        index=STATUS_OPTIONS.index(current_status),
-                        key=f"status_{activity['id']}_{i}"
+                if save_update(activity['id'], changes, base=base):
+                    _reset_edit_state(activity['id'])
+                    _rerun_after_mutation(
+                        f"Status aktivitas '{activity['nama']}' berhasil diubah menjadi '{new_status}'!",
+                        "info", show_notification_func,
+                        full=not partial or activity_store.DONE_STATUS in (current_status, new_status)
                     )
-                    
-                    if new_status != current_status:
-                        if st.button("Update Status", key=f"update_{activity['id']}_{i}"):
-                            activity['status'] = new_status
-                            activity['tanggal_diperbarui'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            
-                            if save_activities(st.session_state.activities):
-                                # Tampilkan notifikasi
-                                if show_notification_func:
-                                    show_notification_func(
-                                        f"Status aktivitas '{activity['nama']}' berhasil diubah menjadi '{new_status}'!", 
-                                        "info"
-                                    )
-                                else:
-                                    st.success(f"Status berhasil diupdate!")
-                                
-                                st.rerun()
-                
-                st.write(f"**Deskripsi:** {activity.get('deskripsi', '-')}")
-                st.write(f"**Catatan:** {activity.get('catatan', '-')}")
-                
-                # Tombol hapus - PERBAIKAN DI SINI
-                st.markdown("---")
-                col_del1, col_del2, col_del3 = st.columns([2, 1, 2])
-                with col_del2:
-                    # Gunakan session state untuk konfirmasi hapus
-                    if st.button("🗑️ Hapus Aktivitas", key=f"delete_btn_{activity['id']}_{i}", type="secondary"):
-                        # Set session state untuk konfirmasi
-                        st.session_state.confirm_delete_id = activity['id']
-                        st.rerun()
+    
+    st.write(f"**Deskripsi:** {activity.get('deskripsi', '-')}")
+    st.write(f"**Catatan:** {activity.get('catatan', '-')}")
+    
+    # Tombol hapus
+    st.markdown("---")
+    col_del1, col_del2, col_del3 = st.columns([2, 1, 2])
+    with col_del2:
+        # Gunakan session state untuk konfirmasi hapus
+        if st.button("🗑️ Hapus Aktivitas", key=f"delete_btn_{activity['id']}", type="secondary"):
+            # Set session state untuk konfirmasi
+            st.session_state.confirm_delete_id = activity['id']
+            _rerun_fragment()
+    
+    # Tampilkan konfirmasi hapus jika ID sesuai
+    if st.session_state.get('confirm_delete_id') == activity['id']:
+        st.warning("⚠️ **Konfirmasi Penghapusan**")
+        st.write(f"Apakah Anda yakin ingin menghapus aktivitas **'{activity['nama']}'**?")
+        
+        col_conf1, col_conf2, col_conf3 = st.columns([1, 1, 1])
+        with col_conf1:
+            if st.button("✅ Ya, Hapus", key=f"confirm_yes_{activity['id']}"):
+                activity_name = activity['nama']
                 
-                # Tampilkan konfirmasi hapus jika ID sesuai
-                if st.session_state.get('confirm_delete_id') == activity['id']:
-                    st.warning("⚠️ **Konfirmasi Penghapusan**")
-                    st.write(f"Apakah Anda yakin ingin menghapus aktivitas **'{activity['nama']}'**?")
-                    
-                    col_conf1, col_conf2, col_conf3 = st.columns([1, 1, 1])
-                    with col_conf1:
-                        if st.button("✅ Ya, Hapus", key=f"confirm_yes_{activity['id']}_{i}"):
-                            activity_name = activity['nama']
-                            
-                            # Hapus aktivitas dari session state
-                            st.session_state.activities = [
-                                a for a in st.session_state.activities 
-                                if a['id'] != activity['id']
-                            ]
-                            
-                            # Simpan ke file
-                            if save_activities(st.session_state.activities):
-                                # Reset konfirmasi
-                                st.session_state.confirm_delete_id = None
-                                
-                                # Tampilkan notifikasi
-                                if show_notification_func:
-                                    show_notification_func(
-                                        f"Aktivitas '{activity_name}' berhasil dihapus!", 
-                                        "warning"
-                                    )
-                                else:
-                                    st.success("Aktivitas berhasil dihapus!")
-                                
-                                st.rerun()
-                    
-                    with col_conf2:
-                        if st.button("❌ Batal", key=f"confirm_no_{activity['id']}_{i}"):
-                            # Reset konfirmasi
-                            st.session_state.confirm_delete_id = None
-                            st.rerun()
-    else:
-        st.warning("Tidak ada aktivitas yang sesuai dengan filter.")
+                # Hapus aktivitas dari store
+                if save_delete(activity['id']):
+                    # Reset konfirmasi
+                    st.session_state.confirm_delete_id = None
+                    _rerun_after_mutation(
+                        f"Aktivitas '{activity_name}' berhasil dihapus!", "warning", show_notification_func,
+                        full=True
+                    )
+        
+        with col_conf2:
+            if st.button("❌ Batal", key=f"confirm_no_{activity['id']}"):
+                # Reset konfirmasi
+                st.session_state.confirm_delete_id = None
+                _rerun_fragment()
 
-# Fungsi untuk mendapatkan aktivitas mendatang
-def get_upcoming_activities(activities, days=7):
-    """Mendapatkan aktivitas yang mendatang"""
-    from datetime import datetime, timedelta
+# Fungsi untuk keterangan satu entri riwayat
+def _describe_change(entry):
+    if entry['op'] == "insert":
+        return "Dibuat"
+    if entry['op'] == "delete":
+        return "Dihapus"
+    changed = [f"{key}: {entry['sebelum'].get(key) or '-'} → {value or '-'}"
+               for key, value in entry['data'].items() if key in activity_service.EDITABLE_FIELDS]
+    return "; ".join(changed) or "Disimpan tanpa perubahan"
+
+# Fungsi untuk menampilkan riwayat perubahan satu aktivitas
+def _display_history(activity):
+    """Perubahan terakhir (hanya field yang berubah) dan isi aktivitas pada versi yang dipilih"""
+    history = activity_service.get_history(current_owner())
+    entries = history.entries(activity['id'], limit=HISTORY_SHOWN)
+    if not entries:
+        st.caption("Belum ada perubahan yang tercatat.")
+        return
+    for entry in entries:
+        st.write(f"**{entry['waktu']}** — {_describe_change(entry)}")
+    
+    seq = st.selectbox(
+        "Lihat versi setelah perubahan",
+        [entry['seq'] for entry in entries],
+        format_func=lambda seq: next(entry['waktu'] for entry in entries if entry['seq'] == seq),
+        key=f"history_version_{activity['id']}"
+    )
+    st.json(history.version_at(activity['id'], seq), expanded=False)
+
+# Fungsi untuk menampilkan aktivitas berulang
+@st.fragment
+@activity_metrics.timed("ui.display_recurrences")
+def display_recurrences():
+    """Aturan berulang beserta kejadiannya di rentang tanggal yang dipilih.
+
+    Kejadian hanya dibuat untuk rentang itu, berapa pun panjang aturannya.
+    Mengubah status atau melewati kejadian hanya me-rerun fragment ini.
+    """
+    try:
+        recurrences = activity_service.get_recurrences(current_owner())
+    except OSError as e:
+        st.error(f"Gagal membaca aktivitas berulang: {str(e)}")
+        return
+    rules = recurrences.all()
+    if not rules:
+        st.info("Belum ada aktivitas berulang. Tambahkan lewat bagian Pengulangan di halaman Tambah Aktivitas.")
+        return
     
-    upcoming = []
-    today = datetime.now().date()
+    col1, col2 = st.columns(2)
+    with col1:
+        start = st.date_input("Dari Tanggal", value=date.today(), key="recurrence_start")
+    with col2:
+        window = st.selectbox("Rentang", RECURRENCE_WINDOWS, format_func=lambda days: f"{days} hari",
+                              key="recurrence_window")
+    end = start + timedelta(days=window - 1)
     
-    for activity in activities:
-        try:
-            deadline = datetime.strptime(activity['deadline'], "%Y-%m-%d").date()
-            days_diff = (deadline - today).days
+    for rule in rules:
+        with st.expander(f"🔁 {rule['nama']} ({rule['kategori']}, {activity_recurrence.describe(rule)})"):
+            days = list(activity_recurrence.occurrence_dates(rule, start, end))
+            if not days:
+                st.caption("Tidak ada kejadian di rentang ini.")
+            for day in days:
+                _display_occurrence(rule, day)
             
-            # Logika if untuk menentukan aktivitas mendatang
-            if 0 <= days_diff <= days and activity['status'] != "Selesai":
-                upcoming.append(activity)
-        except:
-            continue
-    
-    # Urutkan berdasarkan deadline terdekat
-    upcoming.sort(key=lambda x: x['deadline'])
-    return upcoming
\ No newline at end of file
+            st.button("🗑️ Hapus Aturan", key=f"delete_rule_{rule['id']}",
+                      on_click=_save_mutation, args=(activity_service.delete_recurrence, rule['id']),
+                      kwargs={"owner": current_owner()})
+
+# Fungsi untuk menampilkan satu kejadian aktivitas berulang
+def _display_occurrence(rule, day):
+    col1, col2, col3 = st.columns([2, 2, 1])
+    key = f"occurrence_{rule['id']}_{day.isoformat()}"
+    with col1:
+        st.write(day.isoformat())
+    with col2:
+        # Disimpan oleh callback sebelum fragment di-rerun (hanya kejadian ini yang dicatat)
+        st.selectbox(
+            "Status",
+            STATUS_OPTIONS,
+            index=STATUS_OPTIONS.index(activity_recurrence.occurrence_status(rule, day)),
+            key=key,
+            label_visibility="collapsed",
+            on_change=lambda: _save_mutation(
+                activity_service.set_occurrence_status, rule['id'], day, st.session_state[key],
+                owner=current_owner()
+            )
+        )
+    with col3:
+        st.button("Lewati", key=f"skip_{rule['id']}_{day.isoformat()}",
+                  on_click=_save_mutation, args=(activity_service.skip_occurrence, rule['id'], day),
+                  kwargs={"owner": current_owner()})
+
+# Fungsi untuk aktivitas mendatang milik pengguna sesi ini
+def upcoming_activities(days=7, limit=None):
+    """Aktivitas dan kejadian aktivitas berulang yang belum selesai (lihat activity_service)"""
+    return activity_service.upcoming_activities(days, limit, owner=current_owner())
+
+# Fungsi untuk menampilkan dashboard analitik
+@activity_metrics.timed("ui.display_analytics")
+def display_analytics(store):
+    """Statistik penyelesaian, tren mingguan, ketepatan waktu, dan lead time"""
+    summary = activity_analytics.get_summary(store)
+    if summary["total"] == 0:
+        st.info("Belum ada data untuk dianalisis.")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Persen Selesai", f"{summary['persen_selesai']:.1f}%")
+    with col2:
+        st.metric("Selesai Tepat Waktu", f"{summary['persen_tepat_waktu']:.1f}%")
+    with col3:
+        st.metric("Lewat Deadline", summary["ketepatan"]["Lewat deadline"])
+    with col4:
+        median = summary["lead_time_median"]
+        st.metric("Median Lead Time", "-" if median is None else f"{median:.0f} hari")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Persen selesai per kategori**")
+        st.bar_chart(summary["per_kategori"]["Persen Selesai"])
+    with col2:
+        st.markdown("**Persen selesai per prioritas**")
+        st.bar_chart(summary["per_prioritas"]["Persen Selesai"])
+    
+    st.markdown(f"**Dibuat vs selesai per minggu ({activity_analytics.WEEKS} minggu terakhir)**")
+    st.line_chart(summary["mingguan"])
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Ketepatan waktu**")
+        st.dataframe(
+            [{"Keterangan": key, "Jumlah": value} for key, value in summary["ketepatan"].items()],
+            use_container_width=True,
+            hide_index=True
+        )
+    with col2:
+        st.markdown("**Sebaran lead time (dibuat → selesai)**")
+        st.bar_chart(summary["lead_time"])
\ No newline at end of file
@@ -0,0 +1,219 @@
+# modules/activity_metrics.py
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Instrumentasi ringan: latensi, jumlah panggilan, record, dan byte per operasi.
+#
+#   @activity_metrics.timed("json.query", records=len)
+#   def query(...): ...
+#
+#   with activity_metrics.timer("journal.append") as span:
+#       ...
+#       span.bytes = n
+#
+# Saat tidak aktif, decorator hanya memeriksa satu flag lalu memanggil fungsi.
+
+# Variabel konstan
+BUCKETS_PER_OCTAVE = 4  # Resolusi histogram: 4 bucket per kelipatan dua (~19%)
+BUCKET_COUNT = BUCKETS_PER_OCTAVE * 28  # 1 mikrodetik .. ~268 detik
+PERCENTILES = [50, 95, 99]
+
+# Aktif jika ACTIVITY_METRICS=1; bisa diubah saat berjalan lewat enable()/disable()
+_enabled = os.environ.get("ACTIVITY_METRICS", "0") == "1"
+_lock = threading.Lock()
+_operations = {}
+_since = datetime.now()
+
+
+class OperationStats:
+    """Statistik satu operasi: histogram latensi log-skala dan penghitung"""
+
+    __slots__ = ("calls", "errors", "total", "max", "records", "bytes", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.records = 0
+        self.bytes = 0
+        self.buckets = [0] * BUCKET_COUNT
+
+    def add(self, seconds, records=0, nbytes=0, error=False):
+        micros = seconds * 1e6
+        bucket = int(math.log2(micros) * BUCKETS_PER_OCTAVE) if micros > 1 else 0
+        self.buckets[min(bucket, BUCKET_COUNT - 1)] += 1
+        self.calls += 1
+        self.errors += error
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.records += records
+        self.bytes += nbytes
+
+    # Fungsi untuk perkiraan persentil dari histogram
+    def percentile(self, p):
+        """Latensi (detik) persentil `p`: batas atas bucket yang memuatnya"""
+        if not self.calls:
+            return None
+        rank = math.ceil(self.calls * p / 100)
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                upper = 2 ** ((bucket + 1) / BUCKETS_PER_OCTAVE) / 1e6
+                return min(upper, self.max)
+        return self.max
+
+    def to_dict(self):
+        data = {
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean_ms": round(self.total / self.calls * 1000, 4) if self.calls else None,
+        }
+        for p in PERCENTILES:
+            value = self.percentile(p)
+            data[f"p{p}_ms"] = None if value is None else round(value * 1000, 4)
+        data["max_ms"] = round(self.max * 1000, 4)
+        data["records"] = self.records
+        data["bytes"] = self.bytes
+        return data
+
+
+class Span:
+    """Satu pengukuran yang sedang berjalan; `records`/`bytes` boleh diisi pemanggil"""
+
+    __slots__ = ("name", "records", "bytes", "_start")
+
+    def __init__(self, name):
+        self.name = name
+        self.records = 0
+        self.bytes = 0
+        self._start = time.perf_counter()
+
+    # Fungsi untuk menyelesaikan pengukuran
+    def stop(self, error=False):
+        record(self.name, time.perf_counter() - self._start, self.records, self.bytes, error)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop(error=exc_type is not None)
+        return False
+
+
+class _NullSpan:
+    # Dipakai saat instrumentasi tidak aktif: tidak mengukur apa pun
+    __slots__ = ()
+    records = 0
+    bytes = 0
+
+    def stop(self, error=False):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+# Fungsi untuk status instrumentasi
+def is_enabled():
+    return _enabled
+
+
+# Fungsi untuk mengaktifkan instrumentasi
+def enable():
+    global _enabled
+    _enabled = True
+
+
+# Fungsi untuk menonaktifkan instrumentasi
+def disable():
+    global _enabled
+    _enabled = False
+
+
+# Fungsi untuk mencatat satu pengukuran
+def record(name, seconds, records=0, nbytes=0, error=False):
+    with _lock:
+        stats = _operations.get(name)
+        if stats is None:
+            stats = _operations[name] = OperationStats()
+        stats.add(seconds, records, nbytes, error)
+
+
+# Fungsi untuk mulai mengukur (hentikan dengan .stop() atau pakai sebagai context manager)
+def start(name):
+    return Span(name) if _enabled else _NULL_SPAN
+
+
+# Fungsi untuk context manager pengukuran
+def timer(name):
+    """``with timer("nama") as span:`` mengukur isi blok; sama dengan start()"""
+    return start(name)
+
+
+# Fungsi untuk decorator pengukuran
+def timed(name, records=None):
+    """Decorator yang mengukur setiap panggilan fungsi.
+
+    `records` (opsional) menghitung jumlah record dari nilai kembalian,
+    misalnya ``len``.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            begin = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                record(name, time.perf_counter() - begin, error=True)
+                raise
+            record(name, time.perf_counter() - begin, records(result) if records else 0)
+            return result
+        return wrapper
+    return decorator
+
+
+# Fungsi untuk ringkasan semua operasi
+def snapshot():
+    """Dict siap-JSON: status, waktu mulai, dan statistik per operasi (urut nama)"""
+    with _lock:
+        operations = {name: _operations[name].to_dict() for name in sorted(_operations)}
+    return {
+        "enabled": _enabled,
+        "since": _since.isoformat(timespec="seconds"),
+        "pid": os.getpid(),
+        "operations": operations,
+    }
+
+
+# Fungsi untuk menulis ringkasan sebagai JSON
+def dump(f=None):
+    """Menulis snapshot() ke file teks `f` (bawaan stdout)"""
+    json.dump(snapshot(), f or sys.stdout, indent=2)
+
+
+# Fungsi untuk mengosongkan semua statistik
+def reset():
+    global _since
+    with _lock:
+        _operations.clear()
+        _since = datetime.now()
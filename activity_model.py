@@ -0,0 +1,198 @@
+# modules/activity_model.py
+from datetime import date, datetime
+from operator import attrgetter
+
+
+# Variabel konstan (dipakai juga oleh activity_manager)
+CATEGORIES = ["Akademik", "Organisasi", "Lainnya"]
+PRIORITIES = ["Tinggi", "Sedang", "Rendah"]
+STATUS_OPTIONS = ["Belum Dimulai", "Dalam Proses", "Selesai"]
+
+DATE_FORMAT = "%Y-%m-%d"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Urutan field sesuai format JSON yang sudah ada
+FIELDS = [
+    "id", "nama", "kategori", "deadline", "prioritas", "deskripsi",
+    "catatan", "status", "tanggal_dibuat", "tanggal_diperbarui", "versi",
+]
+# Field yang disimpan sebagai indeks ke daftar konstan
+_CODED = {
+    "kategori": CATEGORIES,
+    "prioritas": PRIORITIES,
+    "status": STATUS_OPTIONS,
+}
+_CODES = {field: {value: i for i, value in enumerate(values)} for field, values in _CODED.items()}
+
+
+def _parse_date(value):
+    # Hanya teks "YYYY-MM-DD" yang di-parse agar serialisasi balik identik;
+    # bentuk ISO lain ("20250101", "2025-W01-1") disimpan apa adanya
+    if isinstance(value, str) and len(value) == 10:
+        try:
+            parsed = date.fromisoformat(value)
+        except ValueError:
+            return value
+        if parsed.isoformat() == value:
+            return parsed
+    return value
+
+
+def _parse_timestamp(value):
+    # Hanya "YYYY-MM-DD HH:MM:SS"; misalnya pemisah "T" disimpan apa adanya
+    if isinstance(value, str) and len(value) == 19:
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+        if parsed.isoformat(" ") == value:
+            return parsed
+    return value
+
+
+def _format(value, fmt):
+    if not isinstance(value, date):
+        return value
+    # isoformat() jauh lebih cepat dari strftime() dan hasilnya sama untuk kedua format
+    if isinstance(value, datetime):
+        return value.isoformat(" ") if fmt == TIMESTAMP_FORMAT and not value.microsecond else value.strftime(fmt)
+    return value.isoformat() if fmt == DATE_FORMAT else value.strftime(fmt)
+
+
+class Activity:
+    """Record aktivitas ringkas dengan ``__slots__``.
+
+    Kategori, prioritas, dan status disimpan sebagai indeks ke CATEGORIES,
+    PRIORITIES, dan STATUS_OPTIONS; tanggal disimpan sebagai objek
+    date/datetime yang di-parse sekali saat dimuat. Nilai yang tidak
+    dikenal disimpan apa adanya supaya ``to_dict()`` tetap identik dengan
+    JSON asal. Akses gaya dict (``activity['nama']``, ``.get()``) tetap
+    mengembalikan nilai dalam format JSON.
+
+    Slot bernilai None berarti field tidak ada; field yang diisi null secara
+    eksplisit juga dicatat di ``extra`` agar tetap muncul di ``to_dict()``.
+    """
+
+    __slots__ = ("id", "nama", "kategori", "deadline", "prioritas", "deskripsi",
+                 "catatan", "status", "tanggal_dibuat", "tanggal_diperbarui", "versi", "extra")
+
+    def __init__(self, **fields):
+        for slot in self.__slots__:
+            object.__setattr__(self, slot, None)
+        self.update(fields)
+
+    # Fungsi untuk membuat Activity dari dict JSON
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    # Fungsi untuk menerima dict maupun Activity
+    @classmethod
+    def coerce(cls, activity):
+        return activity if isinstance(activity, cls) else cls.from_dict(activity)
+
+    # Fungsi untuk mengubah Activity ke dict JSON
+    def to_dict(self):
+        data = {}
+        for field in FIELDS:
+            value = object.__getattribute__(self, field)
+            if value is None:
+                if self.extra and field in self.extra:
+                    data[field] = None
+                continue
+            if field in _CODED:
+                if isinstance(value, int):
+                    value = _CODED[field][value]
+            elif field == "deadline":
+                value = _format(value, DATE_FORMAT)
+            elif field in ("tanggal_dibuat", "tanggal_diperbarui"):
+                value = _format(value, TIMESTAMP_FORMAT)
+            data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    # Fungsi untuk salinan dangkal (tanpa mem-parse ulang field)
+    def copy(self):
+        clone = object.__new__(Activity)
+        for slot, value in zip(self.__slots__, _slot_values(self)):
+            setattr(clone, slot, value)
+        if self.extra:
+            clone.extra = dict(self.extra)
+        return clone
+
+    # Fungsi untuk mengubah beberapa field sekaligus
+    def update(self, changes):
+        for key, value in changes.items():
+            self[key] = value
+
+    def __setitem__(self, key, value):
+        if key in FIELDS and self.extra:
+            self.extra.pop(key, None)
+        if value is None and key in FIELDS:
+            # Null eksplisit: slot tetap None, kunci dicatat di extra
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = None
+        elif key in _CODES:
+            value = _CODES[key].get(value, value)
+        elif key == "deadline":
+            value = _parse_date(value)
+        elif key in ("tanggal_dibuat", "tanggal_diperbarui"):
+            value = _parse_timestamp(value)
+        elif key not in FIELDS:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+            return
+        object.__setattr__(self, key, value)
+
+    def __getitem__(self, key):
+        if key in FIELDS:
+            value = object.__getattribute__(self, key)
+            if value is None:
+                if self.extra and key in self.extra:
+                    return None
+                raise KeyError(key)
+            if key in _CODED:
+                return _CODED[key][value] if isinstance(value, int) else value
+            if key == "deadline":
+                return _format(value, DATE_FORMAT)
+            if key in ("tanggal_dibuat", "tanggal_diperbarui"):
+                return _format(value, TIMESTAMP_FORMAT)
+            return value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        if key in FIELDS and object.__getattribute__(self, key) is not None:
+            return True
+        return bool(self.extra) and key in self.extra
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def __eq__(self, other):
+        if isinstance(other, Activity):
+            other = other.to_dict()
+        return isinstance(other, dict) and self.to_dict() == other
+
+    def __repr__(self):
+        return f"Activity({self.to_dict()!r})"
+
+
+_slot_values = attrgetter(*Activity.__slots__)
+
+
+# Fungsi untuk mendapatkan deadline sebagai objek date
+def deadline_of(activity):
+    """Deadline aktivitas (Activity atau dict) sebagai date, atau None"""
+    value = activity.deadline if isinstance(activity, Activity) else _parse_date(activity.get('deadline'))
+    return value if isinstance(value, date) else None
@@ -0,0 +1,258 @@
+# modules/activity_recurrence.py
+import heapq
+import json
+import os
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from itertools import islice
+from operator import attrgetter
+
+from modules.activity_cache import deep_sizeof
+from modules.activity_model import STATUS_OPTIONS, Activity
+from modules.activity_store import DONE_STATUS, IdGenerator
+from modules.file_lock import FileLock
+
+# Aktivitas berulang (kuliah mingguan, rapat rutin, ...) disimpan sebagai
+# satu aturan, bukan satu aktivitas per kejadian. Kejadian dibuat lazy oleh
+# generator hanya untuk rentang tanggal yang sedang dilihat, dan status per
+# kejadian disimpan jarang: hanya tanggal yang statusnya sudah diubah.
+#
+# Aturan (JSON): id, nama, kategori, prioritas, deskripsi, catatan, mulai,
+# frekuensi, interval, sampai (opsional), pengecualian (tanggal yang
+# dilewati), status_kejadian ({tanggal: status}), tanggal_dibuat.
+
+# Variabel konstan
+FREQUENCIES = {"Harian": 1, "Mingguan": 7}  # Hari per satuan interval
+DEFAULT_STATUS = STATUS_OPTIONS[0]  # Status kejadian yang belum diubah
+RECURRENCE_FILE = "data/recurrences.jsonl"
+
+
+# Fungsi untuk jarak hari antar kejadian sebuah aturan
+def step_days(rule):
+    return FREQUENCIES[rule['frekuensi']] * rule.get('interval', 1)
+
+
+# Fungsi untuk keterangan singkat sebuah aturan
+def describe(rule):
+    """Misalnya "setiap 2 minggu, 2026-09-01 s.d. 2026-12-20" """
+    interval = rule.get('interval', 1)
+    unit = "hari" if rule['frekuensi'] == "Harian" else "minggu"
+    text = f"setiap {unit}" if interval == 1 else f"setiap {interval} {unit}"
+    text += f", {rule['mulai']}"
+    if rule.get('sampai'):
+        text += f" s.d. {rule['sampai']}"
+    return text
+
+
+# Fungsi untuk tanggal-tanggal kejadian sebuah aturan
+def occurrence_dates(rule, start=None, end=None):
+    """Generator tanggal kejadian `rule` dengan start <= tanggal <= end.
+
+    Kejadian sebelum `start` dilompati dengan aritmetika, bukan diiterasi,
+    sehingga biayanya sebanding dengan jumlah kejadian di rentang itu.
+    `end` None berarti sampai tanggal akhir aturan (atau tanpa batas).
+    """
+    first = date.fromisoformat(rule['mulai'])
+    step = step_days(rule)
+    last = date.fromisoformat(rule['sampai']) if rule.get('sampai') else None
+    if last is not None and (end is None or last < end):
+        end = last
+    skipped = set(rule.get('pengecualian', ()))
+    day = first
+    if start is not None and start > first:
+        day = first + timedelta(days=-(-(start - first).days // step) * step)
+    while end is None or day <= end:
+        if day.isoformat() not in skipped:
+            yield day
+        day += timedelta(days=step)
+
+
+# Fungsi untuk status satu kejadian
+def occurrence_status(rule, day):
+    return rule.get('status_kejadian', {}).get(day.isoformat(), DEFAULT_STATUS)
+
+
+# Fungsi untuk satu kejadian aturan sebagai Activity
+def occurrence(rule, day):
+    """Activity tanpa ID dengan deadline `day`; field `aturan` berisi ID aturan"""
+    return Activity(
+        nama=rule['nama'],
+        kategori=rule['kategori'],
+        deadline=day,
+        prioritas=rule['prioritas'],
+        deskripsi=rule.get('deskripsi', ""),
+        catatan=rule.get('catatan', ""),
+        status=occurrence_status(rule, day),
+        aturan=rule['id'],
+    )
+
+
+def _stream(rule, start, end, include_done):
+    # Activity lengkap dibuat sekali per aturan; kejadian berikutnya hanya
+    # salinan dengan deadline dan status sendiri
+    overrides = rule.get('status_kejadian', {})
+    template = None
+    for day in occurrence_dates(rule, start, end):
+        status = overrides.get(day.isoformat(), DEFAULT_STATUS)
+        if not include_done and status == DONE_STATUS:
+            continue
+        if template is None:
+            template = occurrence(rule, day)
+        activity = template.copy()
+        activity.deadline = day
+        activity['status'] = status
+        yield activity
+
+
+# Fungsi untuk kejadian banyak aturan, urut tanggal
+def expand(rules, start=None, end=None, include_done=True):
+    """Generator Activity kejadian dari `rules`, diurutkan berdasarkan deadline.
+
+    Generator setiap aturan digabung dengan heapq.merge, jadi hanya kejadian
+    yang benar-benar dibaca pemanggil yang dibuat. Tanpa `end`, aturan tanpa
+    tanggal akhir tidak pernah habis: batasi dengan islice.
+    """
+    return heapq.merge(*(_stream(rule, start, end, include_done) for rule in rules), key=attrgetter('deadline'))
+
+
+def _day(value):
+    return value.isoformat() if isinstance(value, date) else date.fromisoformat(value).isoformat()
+
+
+class RecurrenceStore:
+    """Aturan berulang satu partisi, disimpan sebagai file JSON Lines kecil.
+
+    Semua aturan dimuat ke memori (jumlahnya sedikit dibanding kejadian);
+    setiap perubahan menulis ulang file secara atomik di bawah lock file,
+    dengan biaya sebanding jumlah aturan. Perubahan dari proses lain
+    terdeteksi lewat stat file (``is_stale()``), sehingga store ini bisa
+    disimpan di SharedActivityCache seperti store aktivitas. Aturan tidak
+    pernah diubah di tempat (copy-on-write), jadi pembaca tidak perlu lock.
+    """
+
+    def __init__(self, path=RECURRENCE_FILE):
+        self.path = path
+        self.lock = FileLock(path + ".lock")
+        self.rules = {}
+        self.id_generator = IdGenerator()
+        self._stat = None
+        self.reload()
+
+    def __len__(self):
+        return len(self.rules)
+
+    # Fungsi untuk semua aturan (urutan dibuat)
+    def all(self):
+        return list(self.rules.values())
+
+    def get(self, rule_id):
+        return self.rules.get(rule_id)
+
+    # Fungsi untuk menambahkan aturan baru
+    def add(self, rule):
+        """Menyimpan aturan yang sudah divalidasi; ID diberikan di sini"""
+        with self._mutation() as rules:
+            rule = dict(rule, id=self.id_generator.next())
+            rules[rule['id']] = rule
+        return rule
+
+    # Fungsi untuk menghapus aturan beserta semua kejadiannya
+    def delete(self, rule_id):
+        """KeyError jika ID tidak ada"""
+        with self._mutation() as rules:
+            del rules[rule_id]
+
+    # Fungsi untuk mengubah status satu kejadian
+    def set_status(self, rule_id, day, status):
+        """Status awal menghapus catatan kejadian itu (penyimpanan tetap jarang)"""
+        day = _day(day)
+        with self._mutation() as rules:
+            rule = dict(rules[rule_id])
+            overrides = dict(rule.get('status_kejadian', {}))
+            if status == DEFAULT_STATUS:
+                overrides.pop(day, None)
+            else:
+                overrides[day] = status
+            rule['status_kejadian'] = overrides
+            rules[rule_id] = rule
+        return rule
+
+    # Fungsi untuk melewati satu kejadian (misalnya libur)
+    def skip(self, rule_id, day):
+        day = _day(day)
+        with self._mutation() as rules:
+            rule = dict(rules[rule_id])
+            rule['pengecualian'] = sorted(set(rule.get('pengecualian', ())) | {day})
+            overrides = dict(rule.get('status_kejadian', {}))
+            overrides.pop(day, None)
+            rule['status_kejadian'] = overrides
+            rules[rule_id] = rule
+        return rule
+
+    # Fungsi untuk kejadian semua aturan dalam sebuah rentang
+    def occurrences(self, start, end, include_done=True, limit=None):
+        return list(islice(expand(self.all(), start, end, include_done), limit))
+
+    # Fungsi untuk kejadian mendatang yang belum selesai
+    def upcoming(self, days=7, limit=None, today=None):
+        """Seperti ActivityStore.upcoming: deadline 0..days hari ke depan"""
+        today = today or datetime.now().date()
+        return self.occurrences(today, today + timedelta(days=days), include_done=False, limit=limit)
+
+    def is_stale(self):
+        return self._file_stat() != self._stat
+
+    def reload(self):
+        if self._file_stat() is None:
+            # Belum ada file (misalnya pemilik yang belum terdaftar): lock file
+            # tidak perlu dibuat, dan tidak ada yang dapat tertimpa
+            self._read()
+            return
+        with self.lock:
+            self._read()
+
+    def resident_size(self):
+        return deep_sizeof(self.rules)
+
+    @contextmanager
+    def _mutation(self):
+        # Dibaca ulang di bawah lock agar perubahan proses lain tidak
+        # tertimpa; dict baru dipasang setelah file selesai ditulis
+        with self.lock:
+            if self.is_stale():
+                self._read()
+            rules = dict(self.rules)
+            yield rules
+            self._write(rules)
+            self.rules = rules
+
+    def _read(self):
+        rules = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        rule = json.loads(line)
+                        rules[rule['id']] = rule
+        except FileNotFoundError:
+            pass
+        self.rules = rules
+        self._stat = self._file_stat()
+        self.id_generator.observe(max(rules, default=0))
+
+    def _write(self, rules):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_file = self.path + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write("".join(json.dumps(rule, ensure_ascii=False) + "\n" for rule in rules.values()))
+        os.replace(tmp_file, self.path)
+        self._stat = self._file_stat()
+
+    def _file_stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
@@ -0,0 +1,291 @@
+# modules/activity_search.py
+import bisect
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+
+# Pencarian teks nama/deskripsi/catatan dengan inverted index di memori.
+
+# Variabel konstan
+# Bobot setiap field teks; kecocokan di nama lebih penting
+SEARCH_FIELDS = {"nama": 3, "deskripsi": 1, "catatan": 1}
+MIN_PREFIX = 3  # Kata terakhir yang lebih pendek hanya dicocokkan utuh
+MAX_EXPANSIONS = 64  # Batas jumlah kata untuk satu awalan
+PREFIX_WEIGHT = 0.5  # Skor kecocokan awalan dibanding kata utuh
+BM25_K1 = 1.2
+QUERY_CACHE_SIZE = 8
+WORD_CACHE_SIZE = 65536
+STOPWORDS = frozenset("""
+    ada adalah agar akan antara atau bagi bahwa belum dalam dan dari dengan di
+    hingga ini itu juga kah ke kami karena kita lah maupun nya oleh pada para
+    pun saat saja saya sebagai secara serta sudah supaya telah tentang tersebut
+    untuk yaitu yang
+""".split())
+# Partikel dan kata ganti milik yang menempel di akhir kata (bukunya, rapatlah)
+SUFFIXES = ("lah", "kah", "pun", "nya")
+MIN_STEM = 4
+_WORD = re.compile(r"[0-9a-z]+(?:-[0-9a-z]+)*")
+
+
+# Fungsi untuk menyeragamkan teks (huruf kecil, tanpa aksen)
+def normalize(text):
+    if text.isascii():
+        return text.lower()
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in text if not unicodedata.combining(char)).lower()
+
+
+# Fungsi untuk memotong partikel/kata ganti di akhir kata
+def stem(word):
+    """Kata dasar sederhana: "rapatnya" -> "rapat", "bukukah" -> "buku"."""
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            word = word[:-len(suffix)]
+    return word
+
+
+# Fungsi untuk memecah teks menjadi kata dasar
+def tokenize(text):
+    """Daftar kata dasar dari teks.
+
+    Kata ulang (``tugas-tugas``, ``buku-bukunya``) dihitung satu kata,
+    kata majemuk berhubung (``tanya-jawab``) dipecah. Stopword tetap
+    dikembalikan; penyaringannya diatur pemanggil.
+    """
+    tokens = []
+    for word in _WORD.findall(normalize(text)):
+        parts = [stem(part) for part in word.split("-")]
+        if len(set(parts)) == 1:
+            parts = parts[:1]
+        tokens.extend(parts)
+    return tokens
+
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def _word_terms(word):
+    # Kosakata aktivitas kecil, jadi hasil per kata di-cache
+    terms = []
+    for part in word.split("-"):
+        for term in (part, stem(part)):
+            if term not in STOPWORDS and term not in terms:
+                terms.append(term)
+    return tuple(terms)
+
+
+# Fungsi untuk kata yang diindeks dari satu teks
+def text_terms(text):
+    """Kata dari teks (bentuk asli dan kata dasar, tanpa stopword).
+
+    Bentuk asli kata ("bukunya") ikut disimpan di samping kata dasarnya
+    agar awalan yang sedang diketik ("bukuny") tetap cocok.
+    """
+    if not text or not isinstance(text, str):
+        return []
+    return [term for word in _WORD.findall(normalize(text)) for term in _word_terms(word)]
+
+
+# Fungsi untuk kata yang dimasukkan ke index dari satu aktivitas
+def document_terms(activity):
+    """{kata: bobot} dari field teks aktivitas (dict maupun Activity)"""
+    terms = {}
+    for field, weight in SEARCH_FIELDS.items():
+        for term in text_terms(activity.get(field)):
+            terms[term] = terms.get(term, 0) + weight
+    return terms
+
+
+# Fungsi untuk token query pencarian
+def query_terms(text):
+    """Token unik dari teks query; stopword dibuang kecuali hanya itu isinya"""
+    tokens = list(dict.fromkeys(tokenize(text)))
+    return [token for token in tokens if token not in STOPWORDS] or tokens
+
+
+# Fungsi untuk query MATCH SQLite FTS5 dengan aturan yang sama
+def fts_query(text):
+    """Ekspresi MATCH FTS5 (semua token harus cocok), atau None jika kosong"""
+    tokens = query_terms(text)
+    if not tokens:
+        return None
+    # Token hanya berisi huruf/angka sehingga aman diberi tanda kutip
+    terms = [f'"{token}"' for token in tokens]
+    if len(tokens[-1]) >= MIN_PREFIX:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+class SearchIndex:
+    """Inverted index kata -> {ID aktivitas: bobot} untuk pencarian teks.
+
+    Kosakata disimpan terurut sehingga pencarian awalan cukup bisect.
+    Semua token query harus cocok (AND) dan token terakhir juga cocok
+    sebagai awalan. Skor per token memakai BM25 (tanpa normalisasi
+    panjang); kecocokan awalan diberi bobot lebih kecil dari kata utuh.
+
+    Sesi Streamlit memakai index dari thread berbeda: perubahan index,
+    penilaian, dan cache hasil memakai satu lock, sehingga hasil yang
+    dihitung sebelum index berubah tidak pernah masuk cache.
+    """
+
+    def __init__(self, activities=()):
+        self._lock = threading.RLock()
+        self.rebuild(activities)
+
+    # Fungsi untuk membangun ulang index sekaligus (kosakata diurutkan sekali)
+    def rebuild(self, activities):
+        with self._lock:
+            self.postings = {}
+            self._terms_by_id = {}
+            self._vocabulary = []
+            self._cache = OrderedDict()
+            self.add_many(activities)
+
+    # Fungsi untuk memasukkan/memperbarui satu aktivitas
+    def add(self, activity):
+        activity_id = activity['id']
+        terms = document_terms(activity)
+        with self._lock:
+            self.remove(activity_id)
+            self._terms_by_id[activity_id] = tuple(terms)
+            for term, weight in terms.items():
+                postings = self.postings.get(term)
+                if postings is None:
+                    postings = self.postings[term] = {}
+                    bisect.insort(self._vocabulary, term)
+                postings[activity_id] = weight
+
+    # Fungsi untuk memasukkan banyak aktivitas sekaligus
+    def add_many(self, activities):
+        with self._lock:
+            self._cache.clear()
+            new_terms = False
+            for activity in activities:
+                activity_id = activity['id']
+                self.remove(activity_id)
+                terms = document_terms(activity)
+                self._terms_by_id[activity_id] = tuple(terms)
+                for term, weight in terms.items():
+                    postings = self.postings.get(term)
+                    if postings is None:
+                        postings = self.postings[term] = {}
+                        new_terms = True
+                    postings[activity_id] = weight
+            if new_terms:
+                self._vocabulary = sorted(self.postings)
+
+    # Fungsi untuk mengeluarkan aktivitas dari index
+    def remove(self, activity_id):
+        with self._lock:
+            self._cache.clear()
+            for term in self._terms_by_id.pop(activity_id, ()):
+                postings = self.postings[term]
+                del postings[activity_id]
+                if not postings:
+                    del self.postings[term]
+                    del self._vocabulary[bisect.bisect_left(self._vocabulary, term)]
+
+    # Fungsi untuk kata di kosakata yang cocok dengan token query
+    def expand(self, token, prefix=True):
+        """Token itu sendiri (jika ada) lalu kata berawalan token, maksimal MAX_EXPANSIONS"""
+        if not prefix or len(token) < MIN_PREFIX:
+            return [token] if token in self.postings else []
+        with self._lock:
+            start = bisect.bisect_left(self._vocabulary, token)
+            end = bisect.bisect_left(self._vocabulary, token + "\uffff", start,
+                                     min(start + MAX_EXPANSIONS, len(self._vocabulary)))
+            return self._vocabulary[start:end]
+
+    # Fungsi untuk skor semua aktivitas yang cocok dengan query
+    def scores(self, text):
+        """{ID: skor} untuk aktivitas yang memuat semua token query.
+
+        Hasil disimpan untuk beberapa query terakhir (rerun dengan query
+        yang sama, misalnya saat pindah halaman) sampai index berubah.
+        """
+        tokens = tuple(query_terms(text))
+        with self._lock:
+            cached = self._cache.get(tokens)
+            if cached is not None:
+                self._cache.move_to_end(tokens)
+                return cached
+            result = self._score(tokens)
+            self._cache[tokens] = result
+            if len(self._cache) > QUERY_CACHE_SIZE:
+                self._cache.popitem(last=False)
+            return result
+
+    def _score(self, tokens):
+        if not tokens:
+            return {}
+        n = len(self._terms_by_id)
+        groups = []
+        for position, token in enumerate(tokens, start=1):
+            weights = []
+            # Hanya kata terakhir (yang mungkin sedang diketik) dicocokkan sebagai awalan
+            for term in self.expand(token, prefix=position == len(tokens)):
+                postings = self.postings[term]
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                weights.append((postings, idf * (1.0 if term == token else PREFIX_WEIGHT)))
+            if not weights:
+                return {}
+            if len(weights) == 1:
+                ids = weights[0][0].keys()
+            else:
+                ids = set().union(*(postings for postings, _ in weights))
+            groups.append((ids, weights))
+
+        # Irisan ID semua token dulu (token paling jarang lebih dulu), baru diberi skor
+        groups.sort(key=lambda group: len(group[0]))
+        matched = groups[0][0]
+        for ids, _ in groups[1:]:
+            matched = {activity_id for activity_id in matched if activity_id in ids}
+        if len(groups) == 1 and len(groups[0][1]) == 1:
+            # Satu kata saja: skor langsung dari postings
+            postings, factor = groups[0][1][0]
+            table = _score_table(postings, factor)
+            return {activity_id: table[tf] for activity_id, tf in postings.items()}
+
+        result = None
+        for _, weights in groups:
+            best = {}
+            for postings, factor in weights:
+                table = _score_table(postings, factor)
+                candidates = matched if result is None else result
+                if len(postings) <= len(candidates):
+                    pairs = [(i, tf) for i, tf in postings.items() if i in candidates]
+                else:
+                    pairs = [(i, postings[i]) for i in candidates if i in postings]
+                for activity_id, tf in pairs:
+                    score = table[tf]
+                    # Kata asli dan kata dasarnya bisa sama-sama cocok: ambil skor terbaik
+                    if score > best.get(activity_id, 0.0):
+                        best[activity_id] = score
+            if result is None:
+                result = best
+            else:
+                for activity_id, score in best.items():
+                    result[activity_id] += score
+        return result
+
+    def __len__(self):
+        return len(self._terms_by_id)
+
+
+def _score_table(postings, factor):
+    # Skor BM25 hanya bergantung pada bobot kata (bilangan kecil), jadi dihitung per bobot
+    return {tf: factor * tf * (BM25_K1 + 1) / (tf + BM25_K1) for tf in set(postings.values())}
+
+
+# Fungsi untuk mengurutkan hasil pencarian
+def rank(scores, ids, order, limit=None, offset=0):
+    """ID dari `ids` urut skor tertinggi; skor sama diurutkan dengan ``order[id]``"""
+    # Pengurutan Python stabil: urutkan dengan `order` dulu, lalu dengan skor;
+    # ID yang sudah tidak ada di `order` (dihapus di tengah pencarian) dilewati
+    ids = sorted((activity_id for activity_id in ids if activity_id in order), key=order.__getitem__)
+    if limit is None:
+        return sorted(ids, key=scores.__getitem__, reverse=True)[offset:]
+    return heapq.nlargest(offset + limit, ids, key=scores.__getitem__)[offset:]
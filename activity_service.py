@@ -0,0 +1,603 @@
+# modules/activity_service.py
+import heapq
+import os
+from datetime import date, datetime
+from functools import partial
+from itertools import islice
+
+from modules import (activity_cache, activity_history, activity_metrics, activity_recurrence, activity_shards,
+                     activity_store, change_feed, journal_store, reminder_scheduler)
+from modules.activity_model import CATEGORIES, PRIORITIES, STATUS_OPTIONS, TIMESTAMP_FORMAT, Activity, deadline_of
+
+# Layanan aktivitas tanpa Streamlit: dipakai oleh UI, API HTTP, dan skrip.
+# Semua error dilempar sebagai exception; penampilannya diatur pemanggil.
+#
+# Data dipartisi per pemilik (`owner`, lihat activity_shards). Tanpa pemilik
+# dipakai file di DATA_DIR seperti sebelum ada partisi; setiap pemilik
+# punya file snapshot/jurnal atau database sendiri di TENANTS_DIR. Pemilik
+# baru didaftarkan saat pertama kali menulis; pembacaan partisi pemilik yang
+# belum terdaftar mengembalikan data kosong tanpa membuat file apa pun.
+
+# Variabel konstan
+DATA_DIR = os.environ.get("ACTIVITY_DATA_DIR", "data")
+DATA_FILE = os.path.join(DATA_DIR, "activities.jsonl")
+# Format array JSON lama, dibaca selama DATA_FILE belum ada
+LEGACY_DATA_FILE = os.path.join(DATA_DIR, "activities.json")
+JOURNAL_FILE = os.path.join(DATA_DIR, "activities.journal")
+SQLITE_FILE = os.path.join(DATA_DIR, "activities.db")
+# Aturan aktivitas berulang (untuk kedua backend, lihat activity_recurrence)
+RECURRENCE_FILE = os.path.join(DATA_DIR, "recurrences.jsonl")
+# Riwayat perubahan (delta per mutasi, untuk undo dan panel riwayat)
+HISTORY_FILE = os.path.join(DATA_DIR, "history.jsonl")
+# Shard per pemilik dan direktori pemilik -> shard
+TENANTS_DIR = os.path.join(DATA_DIR, "tenants")
+SHARD_DIRECTORY_FILE = os.path.join(DATA_DIR, "shards.jsonl")
+# Jumlah store (partisi) yang disimpan di memori; yang paling lama tidak dipakai dibuang
+STORE_CACHE_SIZE = int(os.environ.get("ACTIVITY_STORE_CACHE_SIZE", "256"))
+# Pengingat deadline yang terkirim (JSON Lines) dan kursor scheduler
+REMINDER_OUTBOX_FILE = os.path.join(DATA_DIR, "reminders.jsonl")
+REMINDER_STATE_FILE = os.path.join(DATA_DIR, "reminders.state.json")
+# Store yang dibuka scheduler untuk partisi yang tidak sedang di cache bersama
+REMINDER_STORE_CACHE_SIZE = int(os.environ.get("ACTIVITY_REMINDER_STORE_CACHE_SIZE", "8"))
+# Hari sebelum deadline untuk pengingat, misalnya "7,1,-1" (-1 = terlambat)
+REMINDER_OFFSETS = [int(days) for days in os.environ.get("ACTIVITY_REMINDER_OFFSETS", "7,1,-1").split(",")]
+# Jeda (detik) thread umpan perubahan membaca perubahan dari proses lain
+FEED_POLL_SECONDS = float(os.environ.get("ACTIVITY_FEED_POLL_SECONDS", "0.5"))
+# Backend penyimpanan: "json" (snapshot + jurnal) atau "sqlite"
+STORAGE_BACKEND = os.environ.get("ACTIVITY_STORAGE", "json")
+DEFAULT_STATUS = "Belum Dimulai"
+# Field yang boleh diisi/diubah oleh pengguna
+EDITABLE_FIELDS = ["nama", "kategori", "deadline", "prioritas", "deskripsi", "catatan", "status"]
+REQUIRED_FIELDS = ["nama", "kategori", "deadline", "prioritas"]
+# Field aturan berulang; status diatur per kejadian, bukan per aturan
+RECURRENCE_FIELDS = ["nama", "kategori", "prioritas", "deskripsi", "catatan",
+                     "mulai", "frekuensi", "interval", "sampai", "pengecualian"]
+RECURRENCE_REQUIRED_FIELDS = ["nama", "kategori", "prioritas", "mulai", "frekuensi"]
+_CHOICES = {"kategori": CATEGORIES, "prioritas": PRIORITIES, "status": STATUS_OPTIONS}
+
+# Penyimpanan snapshot + jurnal append-only (partisi tanpa pemilik)
+journal = journal_store.ActivityJournal(DATA_FILE, JOURNAL_FILE)
+shards = activity_shards.ShardDirectory(SHARD_DIRECTORY_FILE, TENANTS_DIR)
+
+
+class ValidationError(ValueError):
+    """Data aktivitas dari pengguna tidak valid"""
+
+    def __init__(self, field, message):
+        self.field = field
+        super().__init__(message)
+
+
+class NotFoundError(KeyError):
+    """Aktivitas dengan ID yang diminta tidak ada (turunan KeyError)"""
+
+    def __init__(self, activity_id):
+        self.activity_id = activity_id
+        super().__init__(activity_id)
+
+
+# Fungsi untuk waktu sekarang dalam format penyimpanan
+def now():
+    return datetime.now().strftime(TIMESTAMP_FORMAT)
+
+
+# Fungsi untuk menormalkan pemilik data dari pengguna
+def normalize_owner(owner):
+    """Pemilik yang sudah dinormalkan atau None; ValidationError jika tidak valid"""
+    try:
+        return activity_shards.normalize_owner(owner)
+    except ValueError as e:
+        raise ValidationError('owner', str(e)) from None
+
+
+# Fungsi untuk memeriksa apakah partisi seorang pemilik sudah ada
+def _registered(owner, create=False):
+    """True untuk partisi tanpa pemilik dan pemilik terdaftar; `create` mendaftarkan pemilik baru"""
+    return owner is None or shards.shard_for(owner, create=create) is not None
+
+
+# Fungsi untuk file tambahan (aturan berulang, riwayat) satu partisi
+def partition_file(path, owner=None):
+    """`path` di DATA_DIR untuk partisi tanpa pemilik, atau file bernama sama di shard `owner`.
+
+    Pemilik tidak didaftarkan di sini; untuk pemilik yang belum terdaftar
+    dikembalikan path yang akan dipakai setelah ia didaftarkan.
+    """
+    if owner is None:
+        return path
+    shard = shards.shard_for(owner, create=False) or activity_shards.shard_name(owner)
+    return os.path.join(shards.path(shard), os.path.basename(path))
+
+
+# Fungsi untuk file-file data satu partisi
+def partition_files(owner=None):
+    """(snapshot, jurnal, database SQLite) milik `owner` yang sudah dinormalkan"""
+    return tuple(partition_file(path, owner) for path in (DATA_FILE, JOURNAL_FILE, SQLITE_FILE))
+
+
+# Fungsi untuk jurnal satu partisi
+def get_journal(owner=None):
+    """Jurnal partisi `owner` (objek baru untuk partisi milik seorang pemilik)"""
+    owner = normalize_owner(owner)
+    if owner is None:
+        return journal
+    data_file, journal_file, _ = partition_files(owner)
+    return journal_store.ActivityJournal(data_file, journal_file)
+
+
+# Fungsi untuk memuat aktivitas
+@activity_metrics.timed("service.load_activities", records=len)
+def load_activities(owner=None, activity_journal=None):
+    """Memuat data aktivitas satu partisi dari snapshot dan jurnal perubahan.
+
+    Record yang rusak dilewati dan dicatat di ``load_errors`` jurnalnya;
+    record tanpa ID diberi ID oleh jurnal. File yang tidak dapat dibaca
+    melempar OSError.
+    """
+    return (activity_journal or get_journal(owner)).load(Activity.from_dict)
+
+
+# Fungsi untuk menyimpan seluruh aktivitas
+@activity_metrics.timed("service.save_activities")
+def save_activities(activities, owner=None):
+    """Menulis seluruh data aktivitas satu partisi sebagai snapshot penuh"""
+    owner = normalize_owner(owner)
+    _registered(owner, create=True)
+    get_journal(owner).write_snapshot(activities)
+    # Semua pemakai store harus melihat data yang baru ditulis
+    store_cache.invalidate((STORAGE_BACKEND, owner))
+    reminder_store_cache.invalidate(owner)
+    feed.publish(owner, activity_store.LOCAL_CHANGE, reload=True)
+    reminders.notify(owner)
+
+
+# Fungsi untuk membuat store sesuai backend yang dipilih
+def create_store(backend=None, owner=None):
+    """Membuat ActivityStore JSON atau SQLite untuk partisi `owner`"""
+    backend = backend or STORAGE_BACKEND
+    owner = normalize_owner(owner)
+    data_file, journal_file, sqlite_file = partition_files(owner)
+    if backend == "sqlite":
+        # Migrasi satu kali dari file JSON lama jika database belum ada
+        legacy_file = partition_file(LEGACY_DATA_FILE, owner)
+        if not os.path.exists(sqlite_file) and (os.path.exists(data_file) or os.path.exists(legacy_file)):
+            activity_store.migrate_json_to_sqlite(data_file, sqlite_file, journal_file)
+        return activity_store.SQLiteActivityStore(sqlite_file, listener=partial(feed.publish, owner))
+    store_journal = get_journal(owner)
+    return activity_store.JsonActivityStore(store_journal, load_activities(activity_journal=store_journal),
+                                            listener=partial(feed.publish, owner))
+
+
+# Cache store bersama untuk semua pemakai dalam proses ini, kunci (backend, pemilik)
+store_cache = activity_cache.SharedActivityCache(lambda key: create_store(*key), STORE_CACHE_SIZE)
+
+# Umpan perubahan semua partisi di cache, termasuk dari proses lain
+# (thread pengamat dijalankan oleh aplikasi lewat feed.start())
+feed = change_feed.ChangeFeed(lambda: [store for _, store in store_cache.items()], FEED_POLL_SECONDS)
+
+
+# Fungsi untuk mendapatkan store aktivitas
+def get_store(owner=None, create=False):
+    """Mengembalikan store partisi `owner` yang dipakai bersama dalam proses ini.
+
+    Pemilik yang belum terdaftar mendapat store kosong yang tidak di-cache
+    dan tidak menyentuh disk; operasi tulis memakai `create=True`, yang
+    mendaftarkan pemilik itu.
+    """
+    owner = normalize_owner(owner)
+    if not _registered(owner, create):
+        data_file, journal_file, _ = partition_files(owner)
+        return activity_store.JsonActivityStore(journal_store.ActivityJournal(data_file, journal_file), [])
+    return store_cache.get((STORAGE_BACKEND, owner))
+
+
+# Fungsi untuk file aturan berulang satu partisi
+def recurrence_file(owner=None):
+    return partition_file(RECURRENCE_FILE, owner)
+
+
+# Cache aturan berulang per pemilik (dimuat ulang jika file diubah proses lain)
+recurrence_cache = activity_cache.SharedActivityCache(
+    lambda owner: activity_recurrence.RecurrenceStore(recurrence_file(owner)), STORE_CACHE_SIZE
+)
+
+
+# Riwayat perubahan per pemilik; baris baru dari proses lain dibaca bertahap
+history_cache = activity_cache.SharedActivityCache(
+    lambda owner: activity_history.ActivityHistory(partition_file(HISTORY_FILE, owner)), STORE_CACHE_SIZE
+)
+
+
+# Fungsi untuk mendapatkan riwayat perubahan
+def get_history(owner=None):
+    """ActivityHistory partisi `owner` yang dipakai bersama dalam proses ini.
+
+    Riwayat pemilik yang belum terdaftar kosong dan tidak di-cache.
+    """
+    owner = normalize_owner(owner)
+    if not _registered(owner):
+        return activity_history.ActivityHistory(partition_file(HISTORY_FILE, owner))
+    return history_cache.get(owner)
+
+
+# Fungsi untuk mendapatkan aturan berulang
+def get_recurrences(owner=None, create=False):
+    """RecurrenceStore partisi `owner` yang dipakai bersama dalam proses ini.
+
+    Seperti get_store: tanpa `create`, pemilik yang belum terdaftar
+    mendapat aturan kosong yang tidak di-cache.
+    """
+    owner = normalize_owner(owner)
+    if not _registered(owner, create):
+        return activity_recurrence.RecurrenceStore(recurrence_file(owner))
+    return recurrence_cache.get(owner)
+
+
+# Cache kecil terpisah untuk scheduler: memeriksa pengingat partisi yang
+# tidak sedang dipakai tidak mendesak store sesi aktif keluar dari store_cache
+reminder_store_cache = activity_cache.SharedActivityCache(lambda owner: create_store(owner=owner),
+                                                          REMINDER_STORE_CACHE_SIZE)
+
+
+# Fungsi untuk store yang dibaca scheduler pengingat
+def reminder_store(owner=None):
+    """Store di cache bersama bila sudah dimuat (disinkronkan oleh feed), selain itu dari reminder_store_cache"""
+    store = store_cache.peek((STORAGE_BACKEND, owner))
+    return store if store is not None else reminder_store_cache.get(owner)
+
+
+# Scheduler pengingat deadline untuk partisi tanpa pemilik dan semua pemilik terdaftar
+# (thread dijalankan oleh aplikasi lewat reminders.start())
+reminders = reminder_scheduler.ReminderScheduler(
+    reminder_store, REMINDER_OUTBOX_FILE, REMINDER_STATE_FILE, REMINDER_OFFSETS,
+    get_owners=lambda: [None, *shards.owners()]
+)
+
+
+# Fungsi untuk statistik cache
+def cache_stats():
+    """Jumlah hit/miss cache dan ukuran data di memori"""
+    return store_cache.stats()
+
+
+# Fungsi untuk memvalidasi data aktivitas dari pengguna
+def validate_activity(data, partial=False):
+    """Mengembalikan salinan field yang boleh diubah, sudah divalidasi.
+
+    Dengan `partial=True` (untuk update) field wajib boleh tidak ada.
+    """
+    if not isinstance(data, dict):
+        raise ValidationError(None, "Data aktivitas harus berupa objek")
+    unknown = sorted(set(data) - set(EDITABLE_FIELDS))
+    if unknown:
+        raise ValidationError(unknown[0], f"Field tidak dikenal: {', '.join(unknown)}")
+    cleaned = dict(data)
+    if not partial:
+        for field in REQUIRED_FIELDS:
+            if field not in cleaned:
+                raise ValidationError(field, f"Field {field} harus diisi")
+    if 'nama' in cleaned:
+        if not isinstance(cleaned['nama'], str) or not cleaned['nama'].strip():
+            raise ValidationError('nama', "Nama aktivitas harus diisi!")
+    if 'deadline' in cleaned:
+        cleaned['deadline'] = _validate_date(cleaned['deadline'], 'deadline', "Deadline")
+    for field, choices in _CHOICES.items():
+        if field in cleaned and cleaned[field] not in choices:
+            raise ValidationError(field, f"{field} harus salah satu dari: {', '.join(choices)}")
+    for field in ('deskripsi', 'catatan'):
+        if field in cleaned and not isinstance(cleaned[field], str):
+            raise ValidationError(field, f"{field} harus berupa teks")
+    return cleaned
+
+
+# Fungsi untuk memvalidasi satu tanggal YYYY-MM-DD
+def _validate_date(value, field, label):
+    if isinstance(value, date):
+        return value.strftime("%Y-%m-%d")
+    try:
+        # fromisoformat juga menerima "20250101" dan "2025-W01-1": hanya bentuk kanonis
+        valid = date.fromisoformat(value).isoformat() == value
+    except (TypeError, ValueError):
+        valid = False
+    if not valid:
+        raise ValidationError(field, f"{label} harus berformat YYYY-MM-DD")
+    return value
+
+
+# Fungsi untuk memvalidasi aturan aktivitas berulang
+def validate_recurrence(data):
+    """Mengembalikan salinan aturan yang sudah divalidasi (lihat activity_recurrence)"""
+    if not isinstance(data, dict):
+        raise ValidationError(None, "Data aturan harus berupa objek")
+    unknown = sorted(set(data) - set(RECURRENCE_FIELDS))
+    if unknown:
+        raise ValidationError(unknown[0], f"Field tidak dikenal: {', '.join(unknown)}")
+    for field in RECURRENCE_REQUIRED_FIELDS:
+        if field not in data:
+            raise ValidationError(field, f"Field {field} harus diisi")
+    cleaned = validate_activity({field: data[field] for field in data if field in EDITABLE_FIELDS}, partial=True)
+    cleaned['mulai'] = _validate_date(data['mulai'], 'mulai', "Tanggal mulai")
+    if data.get('sampai') is not None:
+        cleaned['sampai'] = _validate_date(data['sampai'], 'sampai', "Tanggal akhir")
+        if cleaned['sampai'] < cleaned['mulai']:
+            raise ValidationError('sampai', "Tanggal akhir tidak boleh sebelum tanggal mulai")
+    if data['frekuensi'] not in activity_recurrence.FREQUENCIES:
+        raise ValidationError('frekuensi', f"frekuensi harus salah satu dari: "
+                                           f"{', '.join(activity_recurrence.FREQUENCIES)}")
+    cleaned['frekuensi'] = data['frekuensi']
+    interval = data.get('interval', 1)
+    if not isinstance(interval, int) or isinstance(interval, bool) or interval < 1:
+        raise ValidationError('interval', "Interval harus bilangan bulat >= 1")
+    cleaned['interval'] = interval
+    if data.get('pengecualian'):
+        if not isinstance(data['pengecualian'], list):
+            raise ValidationError('pengecualian', "Pengecualian harus berupa daftar tanggal")
+        cleaned['pengecualian'] = sorted(
+            {_validate_date(day, 'pengecualian', "Tanggal pengecualian") for day in data['pengecualian']}
+        )
+    return cleaned
+
+
+# Fungsi untuk daftar aktivitas per halaman
+def list_activities(kategori=None, status=None, prioritas=None, limit=None, offset=0, search=None, owner=None):
+    """Mengembalikan (jumlah total yang cocok, aktivitas di halaman ini).
+
+    Dengan `search` (teks), hasil diurutkan dari yang paling relevan.
+    """
+    store = get_store(owner)
+    filters = {'kategori': kategori, 'status': status, 'prioritas': prioritas}
+    if search and search.strip():
+        return store.search(search, **filters, limit=limit, offset=offset)
+    return store.count(**filters), store.query(**filters, limit=limit, offset=offset)
+
+
+# Fungsi untuk mendapatkan satu aktivitas
+def get_activity(activity_id, owner=None):
+    return get_store(owner).get(activity_id)
+
+
+# Fungsi untuk menambahkan aktivitas baru
+def create_activity(data, owner=None):
+    """Memvalidasi lalu menyimpan aktivitas baru; ID diberikan oleh store (unik per partisi)"""
+    activity = validate_activity(data)
+    activity.setdefault('deskripsi', "")
+    activity.setdefault('catatan', "")
+    activity.setdefault('status', DEFAULT_STATUS)
+    activity['tanggal_dibuat'] = now()
+    owner = normalize_owner(owner)
+    activity = get_store(owner, create=True).add(activity)
+    get_history(owner).record("insert", activity['id'], after=activity.to_dict())
+    reminders.activity_changed(activity['id'], owner)
+    return activity
+
+
+# Fungsi untuk mengubah aktivitas
+def update_activity(activity_id, changes, base=None, version=None, owner=None):
+    """Menyimpan field yang berubah lalu mengembalikan aktivitas terbaru.
+
+    `base` adalah isi aktivitas saat mulai diedit (perubahan pihak lain pada
+    field lain tetap digabung). `version` menuntut versi yang sama persis,
+    misalnya dari header If-Match API. NotFoundError jika ID tidak ada,
+    ConflictError jika bentrok.
+    """
+    changes = validate_activity(changes, partial=True)
+    changes['tanggal_diperbarui'] = now()
+    if base is None and version is not None:
+        # Base tanpa isi field: setiap perubahan pihak lain dianggap bentrok
+        base = {'id': activity_id, 'versi': version}
+    owner = normalize_owner(owner)
+    store = get_store(owner)
+    current = store.get(activity_id)
+    if current is None:
+        raise NotFoundError(activity_id)
+    before = current.to_dict()
+    store.update(activity_id, changes, base=base)
+    activity = store.get(activity_id)
+    get_history(owner).record("update", activity_id, before, activity.to_dict())
+    if 'deadline' in changes:
+        reminders.activity_changed(activity_id, owner)
+    return activity
+
+
+# Fungsi untuk mengubah status aktivitas
+def set_status(activity_id, status, base=None, owner=None):
+    return update_activity(activity_id, {'status': status}, base=base, owner=owner)
+
+
+# Fungsi untuk mengubah banyak aktivitas sekaligus (aksi massal)
+def update_activities(activity_ids, changes, owner=None):
+    """Menerapkan `changes` yang sama ke semua `activity_ids` sebagai satu batch.
+
+    Store dan riwayat masing-masing ditulis satu kali. ID yang sudah tidak
+    ada dilewati; mengembalikan aktivitas yang diubah.
+    """
+    changes = validate_activity(changes, partial=True)
+    if not changes:
+        raise ValidationError(None, "Tidak ada field yang diubah")
+    changes['tanggal_diperbarui'] = now()
+    return _update_many(normalize_owner(owner), dict.fromkeys(activity_ids, changes))
+
+
+def _update_many(owner, changes, bases=None):
+    # changes: {id: perubahan yang sudah divalidasi}; satu update_many store + satu record_many riwayat
+    store = get_store(owner)
+    before = {activity_id: activity.to_dict() for activity_id, activity in store.get_many(changes).items()}
+    if not before:
+        # Tidak ada yang ditulis (dan tidak ada lock file yang diambil)
+        return []
+    updated = store.update_many({activity_id: changes[activity_id] for activity_id in before}, bases)
+    get_history(owner).record_many([
+        ("update", activity['id'], before[activity['id']], activity.to_dict()) for activity in updated
+    ])
+    for activity in updated:
+        if 'deadline' in changes[activity['id']]:
+            reminders.activity_changed(activity['id'], owner)
+    return updated
+
+
+# Fungsi untuk menghapus aktivitas
+def delete_activity(activity_id, owner=None):
+    """Menghapus aktivitas; NotFoundError jika ID tidak ada"""
+    owner = normalize_owner(owner)
+    store = get_store(owner)
+    activity = store.get(activity_id)
+    if activity is None:
+        raise NotFoundError(activity_id)
+    before = activity.to_dict()
+    store.delete(activity_id)
+    get_history(owner).record("delete", activity_id, before=before)
+
+
+# Fungsi untuk menghapus banyak aktivitas sekaligus (aksi massal)
+def delete_activities(activity_ids, owner=None):
+    """Menghapus `activity_ids` dalam satu penulisan; ID yang tidak ada dilewati.
+
+    Mengembalikan ID yang dihapus.
+    """
+    owner = normalize_owner(owner)
+    store = get_store(owner)
+    before = {activity_id: activity.to_dict() for activity_id, activity in store.get_many(activity_ids).items()}
+    if not before:
+        return []
+    deleted = store.delete_many(list(before))
+    get_history(owner).record_many([("delete", activity_id, before[activity_id], None) for activity_id in deleted])
+    return deleted
+
+
+# Fungsi untuk membatalkan satu perubahan dari riwayat
+def revert_change(seq, owner=None):
+    """Membalik entri riwayat `seq` sebagai mutasi baru (yang juga tercatat).
+
+    Insert dibalik dengan menghapus, delete dengan memulihkan record dengan
+    ID yang sama, dan update dengan mengembalikan nilai lama field yang
+    diubah. Membalik entri hasil pembalikan berarti redo. Mengembalikan ID
+    aktivitasnya; ConflictError jika field yang sama sudah diubah lagi
+    sejak entri itu, NotFoundError jika aktivitasnya sudah tidak ada.
+    """
+    return revert_changes([seq], owner)[0]
+
+
+# Fungsi untuk membatalkan beberapa perubahan sekaligus (satu langkah undo)
+def revert_changes(seqs, owner=None):
+    """Seperti revert_change untuk semua `seqs`, dibalik dari entri terbaru.
+
+    Entri berurutan dengan operasi yang sama dibalik sebagai satu batch,
+    sehingga membatalkan aksi massal menulis store dan riwayat sekali per
+    batch, bukan sekali per aktivitas. Setiap batch diperiksa dulu
+    (ConflictError/NotFoundError) sebelum ditulis.
+    """
+    owner = normalize_owner(owner)
+    history = get_history(owner)
+    activity_ids = []
+    for batch in _revert_batches(history.entries_at(list(reversed(seqs)))):
+        _revert_batch(batch, owner, history)
+        activity_ids.extend(entry['id'] for entry, _ in batch)
+    return activity_ids
+
+
+def _revert_batches(entries):
+    # (entri, isi sesudahnya) berurutan dengan op sama; ID yang muncul lagi memulai batch baru
+    batch, ids = [], set()
+    for entry, after in entries:
+        if batch and (entry['op'] != batch[0][0]['op'] or entry['id'] in ids):
+            yield batch
+            batch, ids = [], set()
+        batch.append((entry, after))
+        ids.add(entry['id'])
+    if batch:
+        yield batch
+
+
+def _revert_batch(batch, owner, history):
+    store = get_store(owner)
+    op = batch[0][0]['op']
+    ids = [entry['id'] for entry, _ in batch]
+    existing = store.get_many(ids)
+    if op == "delete":
+        if existing:
+            raise activity_store.ConflictError(next(iter(existing)), ['id'])
+        restored = [Activity.from_dict(entry['sebelum']) for entry, _ in batch]
+        store.add_many(restored)
+        history.record_many([("insert", activity['id'], None, activity.to_dict()) for activity in restored])
+        for activity_id in ids:
+            reminders.activity_changed(activity_id, owner)
+        return
+    missing = [activity_id for activity_id in ids if activity_id not in existing]
+    if missing:
+        raise NotFoundError(missing[0])
+    if op == "insert":
+        delete_activities(ids, owner=owner)
+        return
+    changes, bases = {}, {}
+    for entry, after in batch:
+        activity_changes = validate_activity({key: "" if value is None else value
+                                              for key, value in entry['sebelum'].items() if key in EDITABLE_FIELDS},
+                                             partial=True)
+        activity_changes['tanggal_diperbarui'] = now()
+        changes[entry['id']] = activity_changes
+        # Isi aktivitas tepat setelah entri ini menjadi base deteksi bentrok
+        bases[entry['id']] = after
+    _update_many(owner, changes, bases)
+
+
+# Fungsi untuk aktivitas mendatang
+def upcoming_activities(days=7, limit=None, owner=None, today=None):
+    """Aktivitas dan kejadian aktivitas berulang yang belum selesai, urut deadline.
+
+    Kejadian hanya dibuat untuk `days` hari ke depan (paling banyak `limit`).
+    `today` (bawaan hari ini) untuk tanggal acuan tetap, misalnya benchmark.
+    """
+    activities = get_store(owner).upcoming(days=days, limit=limit, today=today)
+    occurrences = get_recurrences(owner).upcoming(days=days, limit=limit, today=today)
+    if not occurrences:
+        return activities
+    return list(islice(heapq.merge(activities, occurrences, key=deadline_of), limit))
+
+
+# Fungsi untuk menambahkan aktivitas berulang
+def create_recurrence(data, owner=None):
+    """Memvalidasi lalu menyimpan satu aturan berulang"""
+    rule = validate_recurrence(data)
+    rule.setdefault('deskripsi', "")
+    rule.setdefault('catatan', "")
+    rule['tanggal_dibuat'] = now()
+    return get_recurrences(owner, create=True).add(rule)
+
+
+# Fungsi untuk menghapus aturan berulang
+def delete_recurrence(rule_id, owner=None):
+    """Menghapus aturan beserta semua kejadiannya; KeyError jika ID tidak ada"""
+    get_recurrences(owner).delete(rule_id)
+
+
+# Fungsi untuk mengubah status satu kejadian aktivitas berulang
+def set_occurrence_status(rule_id, day, status, owner=None):
+    """Hanya kejadian `day` (date atau YYYY-MM-DD) yang berubah; KeyError jika ID tidak ada"""
+    if status not in STATUS_OPTIONS:
+        raise ValidationError('status', f"status harus salah satu dari: {', '.join(STATUS_OPTIONS)}")
+    return get_recurrences(owner).set_status(rule_id, _validate_date(day, 'tanggal', "Tanggal"), status)
+
+
+# Fungsi untuk melewati satu kejadian aktivitas berulang
+def skip_occurrence(rule_id, day, owner=None):
+    return get_recurrences(owner).skip(rule_id, _validate_date(day, 'tanggal', "Tanggal"))
+
+
+# Fungsi untuk aktivitas yang sudah lewat deadline
+def overdue_activities(limit=None, owner=None):
+    return get_store(owner).overdue(limit=limit)
+
+
+# Fungsi untuk ringkasan statistik aktivitas
+def activity_stats(days=7, owner=None):
+    """Jumlah aktivitas total, per kategori/status/prioritas, dan per deadline"""
+    store = get_store(owner)
+    return {
+        'total': store.count(),
+        'per_kategori': store.count_by('kategori'),
+        'per_status': store.count_by('status'),
+        'per_prioritas': store.count_by('prioritas'),
+        'mendatang': len(upcoming_activities(days=days, owner=owner)),
+        'aturan_berulang': len(get_recurrences(owner)),
+        'terlambat': len(store.overdue()),
+    }
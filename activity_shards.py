@@ -0,0 +1,128 @@
+# modules/activity_shards.py
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+
+from modules.activity_model import TIMESTAMP_FORMAT
+from modules.file_lock import FileLock
+
+# Partisi data per pemilik (tenant). Setiap pemilik punya direktori shard
+# sendiri berisi snapshot + jurnal atau database SQLite miliknya, sehingga
+# biaya load/filter/simpan hanya bergantung pada data pemilik itu.
+#
+# Direktori shard adalah file JSON Lines kecil yang hanya ditambah: satu
+# baris {"owner", "shard", "dibuat"} per pemilik. Nama pengguna bebas tidak
+# pernah dipakai langsung sebagai path.
+
+# Variabel konstan
+MAX_OWNER_LENGTH = 100
+SLUG_LENGTH = 32  # Bagian nama shard yang masih terbaca dari nama pemilik
+HASH_LENGTH = 12
+
+
+# Fungsi untuk menormalkan nama pemilik
+def normalize_owner(owner):
+    """Nama pemilik tanpa spasi di tepi dan huruf kecil; None jika kosong.
+
+    ValueError jika terlalu panjang atau berisi karakter kontrol.
+    """
+    if owner is None:
+        return None
+    if not isinstance(owner, str):
+        raise ValueError("Pemilik harus berupa teks")
+    owner = owner.strip().casefold()
+    if not owner:
+        return None
+    if len(owner) > MAX_OWNER_LENGTH:
+        raise ValueError(f"Pemilik maksimal {MAX_OWNER_LENGTH} karakter")
+    if any(ord(char) < 32 for char in owner):
+        raise ValueError("Pemilik tidak boleh berisi karakter kontrol")
+    return owner
+
+
+# Fungsi untuk nama direktori shard seorang pemilik
+def shard_name(owner):
+    """Slug nama pemilik + potongan hash (unik, aman dipakai sebagai nama direktori)"""
+    slug = re.sub(r"[^a-z0-9]+", "-", owner)[:SLUG_LENGTH].strip("-") or "user"
+    digest = hashlib.sha1(owner.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+    return f"{slug}-{digest}"
+
+
+class ShardDirectory:
+    """Direktori pemilik -> shard, dipakai bersama oleh semua proses.
+
+    Isi file disimpan di memori; pencarian pemilik yang sudah dikenal tidak
+    menyentuh disk, berapa pun jumlah tenant. Pemilik yang belum dikenal
+    membaca baris baru dari file (pendaftaran oleh proses lain) lalu, jika
+    tetap tidak ada, didaftarkan di bawah lock file.
+    """
+
+    def __init__(self, directory_file, root):
+        self.directory_file = directory_file
+        self.root = root
+        self.lock = FileLock(directory_file + ".lock")
+        self._owners = {}
+        self._offset = 0
+        self._thread_lock = threading.Lock()
+
+    def __len__(self):
+        with self._thread_lock:
+            self._refresh()
+            return len(self._owners)
+
+    # Fungsi untuk path direktori sebuah shard
+    def path(self, shard):
+        return os.path.join(self.root, shard)
+
+    # Fungsi untuk mencari (atau mendaftarkan) shard seorang pemilik
+    def shard_for(self, owner, create=True):
+        """Nama shard `owner` yang sudah dinormalkan; None jika belum terdaftar dan create=False"""
+        with self._thread_lock:
+            shard = self._owners.get(owner)
+            if shard is None:
+                self._refresh()
+                shard = self._owners.get(owner)
+        if shard is None and create:
+            shard = self._register(owner)
+        return shard
+
+    # Fungsi untuk semua pemilik yang terdaftar
+    def owners(self):
+        """Salinan {pemilik: shard}"""
+        with self._thread_lock:
+            self._refresh()
+            return dict(self._owners)
+
+    def _register(self, owner):
+        with self.lock, self._thread_lock:
+            self._refresh()
+            if owner in self._owners:
+                return self._owners[owner]
+            shard = shard_name(owner)
+            os.makedirs(self.path(shard), exist_ok=True)
+            entry = {"owner": owner, "shard": shard, "dibuat": datetime.now().strftime(TIMESTAMP_FORMAT)}
+            with open(self.directory_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._refresh()
+            return shard
+
+    def _refresh(self):
+        # Hanya baris lengkap setelah posisi terakhir yang dibaca; baris yang
+        # sedang ditulis proses lain menunggu pembacaan berikutnya
+        try:
+            with open(self.directory_file, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line)
+                self._owners[entry['owner']] = entry['shard']
+            except (ValueError, KeyError, TypeError):
+                continue
+        self._offset += end
@@ -0,0 +1,999 @@
+# modules/activity_store.py
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from operator import attrgetter
+from datetime import datetime, timedelta
+
+from modules import activity_metrics, activity_search, journal_store
+from modules.activity_cache import estimate_sizeof
+from modules.file_lock import ReadWriteLock
+from modules.activity_index import ActivityIndex
+from modules.activity_model import Activity, deadline_of
+
+
+# Kolom yang disimpan sebagai kolom SQL; field lain masuk ke kolom `extra`
+COLUMNS = [
+    "id", "nama", "kategori", "deadline", "prioritas", "deskripsi",
+    "catatan", "status", "tanggal_dibuat", "tanggal_diperbarui", "versi",
+]
+FILTER_FIELDS = ["kategori", "status", "prioritas"]
+DONE_STATUS = "Selesai"
+# Field pencatatan yang tidak dianggap bentrok saat penggabungan perubahan
+BOOKKEEPING_FIELDS = {"versi", "tanggal_diperbarui"}
+SEARCH_FIELDS = activity_search.SEARCH_FIELDS
+# Nomor versi data store JSON, unik untuk semua store dalam proses
+_DATA_VERSIONS = itertools.count(1)
+# Asal perubahan yang dilaporkan ke listener store (lihat change_feed)
+LOCAL_CHANGE = "lokal"
+REMOTE_CHANGE = "replika"
+# Baris tabel changes SQLite yang disimpan untuk pembaca yang tertinggal
+CHANGE_LOG_SIZE = 10000
+# ID per query "IN (...)" SQLite, di bawah batas parameter versi lama (999)
+SQL_BATCH_SIZE = 500
+
+
+class ConflictError(Exception):
+    """Aktivitas sudah diubah pihak lain pada field yang sama"""
+
+    def __init__(self, activity_id, fields):
+        self.activity_id = activity_id
+        self.fields = fields
+        super().__init__(
+            f"Aktivitas {activity_id} sudah diubah oleh pengguna lain "
+            f"(field: {', '.join(fields)}). Muat ulang lalu coba lagi."
+        )
+
+
+def _search_records(result):
+    # Jumlah record dari hasil search(): (total, aktivitas halaman ini)
+    return len(result[1])
+
+
+def _column_records(columns):
+    return len(columns[0]) if columns else 0
+
+
+def _search_terms(text):
+    # Fungsi SQL search_terms(): kata yang diindeks dari satu kolom teks
+    return " ".join(activity_search.text_terms(text))
+
+
+# Fungsi untuk menggabungkan perubahan dengan versi terbaru
+def merge_changes(current, base, changes):
+    """Perubahan yang aman diterapkan ke `current`.
+
+    `base` adalah isi aktivitas saat pengguna mulai mengedit. Jika versinya
+    sudah tertinggal, perubahan tetap digabung selama field yang diubah
+    pengguna tidak ikut diubah pihak lain; jika bentrok, ConflictError.
+    """
+    if base is None or base.get('versi', 1) == current.get('versi', 1):
+        return dict(changes)
+    ours = {key: value for key, value in changes.items()
+            if key in BOOKKEEPING_FIELDS or base.get(key) != value}
+    theirs = {key for key in set(base.keys()) | set(current.keys())
+              if key not in BOOKKEEPING_FIELDS and base.get(key) != current.get(key)}
+    clash = sorted(key for key in ours if key in theirs)
+    if clash:
+        raise ConflictError(current['id'], clash)
+    return ours
+
+
+# Fungsi untuk memilih aktivitas mendatang dari sebuah daftar
+def upcoming_from_list(activities, days=7, today=None):
+    """Aktivitas belum selesai dengan deadline 0..days hari dari hari ini"""
+    upcoming = []
+    today = today or datetime.now().date()
+
+    for activity in activities:
+        deadline = deadline_of(activity)
+        if deadline is None:
+            continue
+        days_diff = (deadline - today).days
+        if 0 <= days_diff <= days and activity['status'] != DONE_STATUS:
+            upcoming.append(activity)
+
+    # Urutkan berdasarkan deadline terdekat
+    upcoming.sort(key=deadline_of)
+    return upcoming
+
+
+class IdGenerator:
+    """ID aktivitas berbasis milidetik yang selalu naik.
+
+    Dua permintaan pada milidetik yang sama mendapat ID berurutan, bukan
+    ID yang sama seperti ``int(time.time() * 1000)``.
+    """
+
+    def __init__(self, last_id=0):
+        self.last_id = last_id
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            self.last_id = max(int(time.time() * 1000), self.last_id + 1)
+            return self.last_id
+
+    def observe(self, activity_id):
+        """Memastikan ID berikutnya lebih besar dari `activity_id`"""
+        with self._lock:
+            self.last_id = max(self.last_id, activity_id)
+
+
+class ActivityStore:
+    """Antarmuka penyimpanan aktivitas.
+
+    Filter bernilai ``None`` berarti "Semua". Setiap mutasi langsung
+    dipersistenkan oleh implementasi store. Setiap record membawa ``versi``
+    yang naik pada setiap update; ``update(..., base=...)`` memakai versi
+    ini untuk mendeteksi perubahan bersamaan (lihat merge_changes).
+
+    ``listener`` (jika ada) dipanggil dengan (asal, ID ditambah, ID diubah,
+    ID dihapus, muat_ulang) untuk setiap perubahan yang diterapkan store,
+    baik dari proses ini (LOCAL_CHANGE) maupun proses lain (REMOTE_CHANGE).
+    Listener bisa dipanggil saat lock store dipegang, jadi harus cepat.
+    """
+
+    listener = None
+
+    def all(self):
+        return self.query()
+
+    def new_id(self):
+        """ID unik untuk aktivitas baru"""
+        return self.id_generator.next()
+
+    def get(self, activity_id):
+        raise NotImplementedError
+
+    def get_many(self, activity_ids):
+        """{id: aktivitas} untuk ID yang ada, urut sesuai `activity_ids`"""
+        activities = ((activity_id, self.get(activity_id)) for activity_id in activity_ids)
+        return {activity_id: activity for activity_id, activity in activities if activity is not None}
+
+    def add(self, activity):
+        """Menyimpan aktivitas baru; ID diberikan store jika belum ada"""
+        raise NotImplementedError
+
+    def add_many(self, activities):
+        """Menyimpan banyak aktivitas sekaligus dalam satu penulisan.
+
+        ID diberikan untuk aktivitas yang belum punya; mengembalikan jumlah
+        aktivitas yang disimpan.
+        """
+        count = 0
+        for activity in activities:
+            self.add(activity)
+            count += 1
+        return count
+
+    def update(self, activity_id, changes, base=None):
+        raise NotImplementedError
+
+    def update_many(self, changes, bases=None):
+        """Menyimpan perubahan banyak aktivitas ({id: perubahan}) dalam satu penulisan.
+
+        `bases` ({id: isi saat mulai diedit}) seperti base pada update();
+        bentrok pada satu aktivitas (ConflictError) membatalkan seluruh batch.
+        ID yang tidak ada dilewati; mengembalikan aktivitas yang diubah.
+        """
+        updated = []
+        for activity_id, activity_changes in changes.items():
+            try:
+                self.update(activity_id, activity_changes, base=(bases or {}).get(activity_id))
+            except KeyError:
+                continue
+            updated.append(self.get(activity_id))
+        return updated
+
+    def delete(self, activity_id):
+        raise NotImplementedError
+
+    def delete_many(self, activity_ids):
+        """Menghapus banyak aktivitas dalam satu penulisan; mengembalikan ID yang dihapus"""
+        deleted = []
+        for activity_id in activity_ids:
+            try:
+                self.delete(activity_id)
+            except KeyError:
+                continue
+            deleted.append(activity_id)
+        return deleted
+
+    def query(self, kategori=None, status=None, prioritas=None, limit=None, offset=0):
+        raise NotImplementedError
+
+    def search(self, text, kategori=None, status=None, prioritas=None, limit=None, offset=0):
+        """Pencarian teks nama/deskripsi/catatan (lihat activity_search).
+
+        Mengembalikan (jumlah yang cocok, aktivitas di halaman ini) urut
+        relevansi. Setiap kata query harus cocok; kata terakhir juga cocok
+        sebagai awalan (pencarian sambil mengetik).
+        """
+        raise NotImplementedError
+
+    def scan(self, kategori=None, status=None, prioritas=None, batch_size=1000):
+        """Generator semua aktivitas yang cocok dengan filter (untuk ekspor)"""
+        offset = 0
+        while True:
+            batch = self.query(kategori, status, prioritas, limit=batch_size, offset=offset)
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            offset += batch_size
+
+    def count(self, kategori=None, status=None, prioritas=None):
+        raise NotImplementedError
+
+    def count_by(self, field):
+        """Jumlah aktivitas per nilai `field` (kategori/status/prioritas)"""
+        raise NotImplementedError
+
+    def upcoming(self, days=7, limit=None, today=None):
+        """Aktivitas belum selesai dengan deadline 0..days hari ke depan"""
+        today = today or datetime.now().date()
+        return self.due_between(today, today + timedelta(days=days), limit)
+
+    def overdue(self, limit=None, today=None):
+        """Aktivitas belum selesai yang deadline-nya sudah lewat"""
+        today = today or datetime.now().date()
+        return self.due_between(None, today - timedelta(days=1), limit)
+
+    def due_between(self, start=None, end=None, limit=None):
+        """Aktivitas belum selesai dengan start <= deadline <= end (tanggal)"""
+        raise NotImplementedError
+
+    def field_columns(self, fields):
+        """Nilai mentah `fields` sebagai satu list per field (untuk analitik).
+
+        Nilai bisa berupa kode/objek tanggal (Activity) atau teks (SQLite).
+        """
+        activities = list(self.scan())
+        return [list(map(attrgetter(field), activities)) for field in fields]
+
+    def data_version(self):
+        """Nilai yang berubah setiap kali data berubah, atau None jika tidak dilacak"""
+        return None
+
+    def is_stale(self):
+        """True jika data di disk berubah di luar store ini"""
+        return False
+
+    def reload(self):
+        """Memuat ulang data yang disimpan di memori"""
+
+    def sync_changes(self):
+        """Menerapkan perubahan dari proses lain sekarang (dilaporkan ke ``listener``)"""
+        if self.is_stale():
+            self.reload()
+
+    def resident_size(self):
+        """Perkiraan byte data aktivitas yang disimpan di memori"""
+        return 0
+
+    def _notify(self, origin, added=(), updated=(), deleted=(), reload=False):
+        if self.listener is None or not (added or updated or deleted or reload):
+            return
+        # Hanya hasil akhir setiap ID: yang dihapus tidak dilaporkan ditambah/diubah,
+        # yang baru ditambah tidak dilaporkan diubah
+        deleted = list(deleted)
+        gone = set(deleted)
+        added = [activity_id for activity_id in added if activity_id not in gone]
+        skipped = gone.union(added)
+        updated = [activity_id for activity_id in updated if activity_id not in skipped]
+        self.listener(origin, added, updated, deleted, reload)
+
+
+class JsonActivityStore(ActivityStore):
+    """Store berbasis snapshot JSON + jurnal (lihat journal_store).
+
+    Aktivitas disimpan di memori sebagai objek Activity. Store dipakai
+    bersama oleh semua sesi (dan thread umpan perubahan), jadi index hanya
+    diubah di bawah lock tulis dan dibaca di bawah lock baca; ID yang hilang
+    di antara dua langkah baca dilewati.
+    """
+
+    def __init__(self, journal=None, activities=None, listener=None):
+        self.listener = listener
+        self.journal = journal or journal_store.ActivityJournal()
+        self._lock = ReadWriteLock()
+        # `activities` (jika diberikan) harus hasil journal.load() terakhir
+        if activities is None:
+            activities = self.journal.load(Activity.from_dict)
+        self.index = ActivityIndex(Activity.coerce(a) for a in activities)
+        self.id_generator = IdGenerator(max(self.index.records, default=0))
+        self._version = next(_DATA_VERSIONS)
+        self._resident_size = None
+
+    @property
+    def activities(self):
+        with self._lock.read():
+            return list(self.index.records.values())
+
+    def is_stale(self):
+        return self.journal.has_foreign_changes()
+
+    def data_version(self):
+        return self._version
+
+    @activity_metrics.timed("json.field_columns", records=_column_records)
+    def field_columns(self, fields):
+        # Atribut slot dibaca langsung dengan attrgetter, satu list per field
+        with self._lock.read():
+            activities = list(self.index.records.values())
+        return [list(map(attrgetter(field), activities)) for field in fields]
+
+    def reload(self):
+        with self.journal.lock, self._lock.write():
+            self._sync()
+
+    def _sync(self):
+        # Menerapkan entri jurnal dari proses lain; load penuh jika dirotasi
+        entries = self.journal.read_new_entries()
+        if entries is None:
+            self.index.rebuild(self.journal.load(Activity.from_dict))
+            self.id_generator.observe(max(self.index.records, default=0))
+            self._version = next(_DATA_VERSIONS)
+            self._notify(REMOTE_CHANGE, reload=True)
+            return
+        if entries:
+            self._version = next(_DATA_VERSIONS)
+        # ID yang berubah, dalam urutan entri dan tanpa duplikat
+        added, updated, deleted = {}, {}, {}
+        for entry in entries:
+            op = entry.get('op')
+            if op == "insert":
+                activity = Activity.from_dict(entry['data'])
+                self.index.add(activity)
+                self.id_generator.observe(activity.id)
+                added[activity.id] = None
+            elif op == "insert_many":
+                activities = [Activity.from_dict(a) for a in entry['data']]
+                self.index.add_many(activities)
+                self.id_generator.observe(max(a.id for a in activities))
+                added.update(dict.fromkeys(a.id for a in activities))
+            elif op == "update" and entry['id'] in self.index:
+                self.index.records[entry['id']].update(entry['data'])
+                self.index.update(entry['id'], entry['data'])
+                updated[entry['id']] = None
+            elif op == "update_many":
+                batch = [(activity_id, changes) for activity_id, changes in entry['data']
+                         if activity_id in self.index]
+                for activity_id, changes in batch:
+                    self.index.records[activity_id].update(changes)
+                self.index.update_many(batch)
+                updated.update(dict.fromkeys(activity_id for activity_id, _ in batch))
+            elif op == "delete":
+                self.index.remove(entry['id'])
+                # ID yang sudah dihapus tidak boleh dipakai ulang
+                self.id_generator.observe(entry['id'])
+                deleted[entry['id']] = None
+            elif op == "delete_many" and entry['data']:
+                self.index.remove_many(entry['data'])
+                self.id_generator.observe(max(entry['data']))
+                deleted.update(dict.fromkeys(entry['data']))
+        self._notify(REMOTE_CHANGE, added, updated, deleted)
+
+    def resident_size(self):
+        # Menelusuri semua record terlalu lambat untuk setiap rerun: perkiraan
+        # dari sampel, dihitung ulang hanya jika data berubah
+        if self._resident_size is None or self._resident_size[0] != self._version:
+            with self._lock.read():
+                self._resident_size = (self._version, estimate_sizeof(self.index.records))
+        return self._resident_size[1]
+
+    @activity_metrics.timed("json.get")
+    def get(self, activity_id):
+        with self._lock.read():
+            return self.index.records.get(activity_id)
+
+    def _records(self, activity_ids):
+        # Record untuk ID dari index; ID yang sudah dihapus dilewati
+        records = self.index.records
+        return [records[activity_id] for activity_id in activity_ids if activity_id in records]
+
+    @activity_metrics.timed("json.add")
+    def add(self, activity):
+        activity = Activity.coerce(activity)
+        with self.journal.lock, self._lock.write():
+            self._sync()
+            if activity.id is None:
+                activity['id'] = self.id_generator.next()
+            elif activity.id in self.index:
+                raise ValueError(f"ID aktivitas sudah dipakai: {activity.id}")
+            if activity.versi is None:
+                activity['versi'] = 1
+            self.journal.insert(activity)
+            self.index.add(activity)
+            self._version = next(_DATA_VERSIONS)
+        self._notify(LOCAL_CHANGE, added=[activity.id])
+        return activity
+
+    @activity_metrics.timed("json.add_many")
+    def add_many(self, activities):
+        with self.journal.lock, self._lock.write():
+            self._sync()
+            batch, ids = [], set()
+            for activity in activities:
+                activity = Activity.coerce(activity)
+                if activity.id is None:
+                    activity['id'] = self.id_generator.next()
+                elif activity.id in self.index or activity.id in ids:
+                    raise ValueError(f"ID aktivitas sudah dipakai: {activity.id}")
+                else:
+                    self.id_generator.observe(activity.id)
+                if activity.versi is None:
+                    activity['versi'] = 1
+                ids.add(activity.id)
+                batch.append(activity)
+            self.journal.insert_many(batch)
+            self.index.add_many(batch)
+            self._version = next(_DATA_VERSIONS)
+        self._notify(LOCAL_CHANGE, added=[activity.id for activity in batch])
+        return len(batch)
+
+    @activity_metrics.timed("json.update")
+    def update(self, activity_id, changes, base=None):
+        with self.journal.lock, self._lock.write():
+            self._sync()
+            activity = self.get(activity_id)
+            if activity is None:
+                raise KeyError(activity_id)
+            changes = merge_changes(activity, base, changes)
+            changes['versi'] = activity.get('versi', 1) + 1
+            self.journal.update(activity_id, changes)
+            activity.update(changes)
+            self.index.update(activity_id, changes)
+            self._version = next(_DATA_VERSIONS)
+        self._notify(LOCAL_CHANGE, updated=[activity_id])
+
+    @activity_metrics.timed("json.update_many", records=len)
+    def update_many(self, changes, bases=None):
+        with self.journal.lock, self._lock.write():
+            self._sync()
+            batch = []
+            # Semua bentrok diperiksa sebelum ada yang ditulis
+            for activity_id, activity_changes in changes.items():
+                activity = self.get(activity_id)
+                if activity is None:
+                    continue
+                merged = merge_changes(activity, (bases or {}).get(activity_id), activity_changes)
+                merged['versi'] = activity.get('versi', 1) + 1
+                batch.append((activity_id, merged))
+            if not batch:
+                return []
+            self.journal.update_many(batch)
+            for activity_id, merged in batch:
+                self.index.records[activity_id].update(merged)
+            self.index.update_many(batch)
+            self._version = next(_DATA_VERSIONS)
+            updated = [self.index.records[activity_id] for activity_id, _ in batch]
+        self._notify(LOCAL_CHANGE, updated=[activity_id for activity_id, _ in batch])
+        return updated
+
+    @activity_metrics.timed("json.delete")
+    def delete(self, activity_id):
+        with self.journal.lock, self._lock.write():
+            self._sync()
+            if activity_id not in self.index:
+                raise KeyError(activity_id)
+            self.journal.delete(activity_id)
+            self.index.remove(activity_id)
+            self._version = next(_DATA_VERSIONS)
+        self._notify(LOCAL_CHANGE, deleted=[activity_id])
+
+    @activity_metrics.timed("json.delete_many")
+    def delete_many(self, activity_ids):
+        with self.journal.lock, self._lock.write():
+            self._sync()
+            activity_ids = [activity_id for activity_id in dict.fromkeys(activity_ids) if activity_id in self.index]
+            if not activity_ids:
+                return []
+            self.journal.delete_many(activity_ids)
+            self.index.remove_many(activity_ids)
+            self._version = next(_DATA_VERSIONS)
+        self._notify(LOCAL_CHANGE, deleted=activity_ids)
+        return activity_ids
+
+    @activity_metrics.timed("json.query", records=len)
+    def query(self, kategori=None, status=None, prioritas=None, limit=None, offset=0):
+        end = None if limit is None else offset + limit
+        with self._lock.read():
+            if kategori is None and status is None and prioritas is None:
+                # Tanpa filter: cukup ambil potongan halaman dari koleksi terurut
+                return list(itertools.islice(self.index.records.values(), offset, end))
+            ids = self.index.ids(kategori=kategori, status=status, prioritas=prioritas)
+            return self._records(ids[offset:end])
+
+    @activity_metrics.timed("json.search", records=_search_records)
+    def search(self, text, kategori=None, status=None, prioritas=None, limit=None, offset=0):
+        with self._lock.read():
+            total, ids = self.index.search(text, limit, offset, kategori=kategori, status=status,
+                                           prioritas=prioritas)
+            return total, self._records(ids)
+
+    def scan(self, kategori=None, status=None, prioritas=None, batch_size=1000):
+        # ID dihitung sekali; record yang dihapus selama ekspor dilewati
+        with self._lock.read():
+            ids = self.index.ids(kategori=kategori, status=status, prioritas=prioritas)
+        for start in range(0, len(ids), batch_size):
+            with self._lock.read():
+                batch = self._records(ids[start:start + batch_size])
+            yield from batch
+
+    @activity_metrics.timed("json.count")
+    def count(self, kategori=None, status=None, prioritas=None):
+        with self._lock.read():
+            return self.index.count(kategori=kategori, status=status, prioritas=prioritas)
+
+    @activity_metrics.timed("json.count_by")
+    def count_by(self, field):
+        with self._lock.read():
+            if field in self.index.fields:
+                return self.index.count_by(field)
+            activities = list(self.index.records.values())
+        counts = {}
+        for activity in activities:
+            value = activity.get(field)
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+
+    @activity_metrics.timed("json.due_between", records=len)
+    def due_between(self, start=None, end=None, limit=None):
+        with self._lock.read():
+            return self._records(self.index.deadlines.window(start, end, limit))
+
+
+class SQLiteActivityStore(ActivityStore):
+    """Store SQLite (mode WAL) dengan index untuk filter dan deadline"""
+
+    def __init__(self, db_file="data/activities.db", listener=None):
+        self.db_file = db_file
+        self.listener = listener
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Streamlit menjalankan setiap sesi di thread berbeda
+        self._local = threading.local()
+        # Posisi terakhir di tabel changes yang sudah dilaporkan ke listener
+        self._change_seq = None
+        self._changes_lock = threading.Lock()
+        self._create_schema()
+        conn = self._connect()
+        last_id = conn.execute("SELECT value FROM meta WHERE key = 'last_id'").fetchone()[0]
+        self.id_generator = IdGenerator(last_id)
+        self._change_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Transaksi diatur manual (BEGIN IMMEDIATE) di _write_transaction
+            conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            # Tokenisasi pencarian dijalankan di Python agar sama dengan store JSON
+            conn.create_function("search_terms", 1, _search_terms, deterministic=True)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write_transaction(self):
+        # BEGIN IMMEDIATE mengambil lock tulis di awal, sehingga
+        # baca-ubah-tulis tidak bisa disela proses lain
+        # Perubahan proses lain sebelum transaksi ini dan perubahan transaksi
+        # ini sendiri dilaporkan ke listener setelah COMMIT
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        tracking = self._change_seq is not None
+        foreign = own = None
+        try:
+            if tracking:
+                with self._changes_lock:
+                    foreign = self._consume_changes(conn)
+            yield conn
+            # Setiap transaksi tulis menaikkan versi data (lihat data_version)
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+            if tracking:
+                own = self._read_changes(conn, self._change_seq)
+                if own:
+                    conn.execute("DELETE FROM changes WHERE seq <= ?", (own[-1][0] - CHANGE_LOG_SIZE,))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            self._report(REMOTE_CHANGE, foreign)
+            raise
+        with self._changes_lock:
+            conn.execute("COMMIT")
+            if own:
+                self._change_seq = own[-1][0]
+        self._report(REMOTE_CHANGE, foreign)
+        self._report(LOCAL_CHANGE, (False, own))
+
+    @staticmethod
+    def _read_changes(conn, after):
+        return conn.execute("SELECT seq, op, id FROM changes WHERE seq > ? ORDER BY seq", (after,)).fetchall()
+
+    def _consume_changes(self, conn):
+        # Baris changes baru dari proses lain; (terlewat, baris) dan posisi dimajukan.
+        # Dipanggil dengan _changes_lock dipegang
+        rows = self._read_changes(conn, self._change_seq)
+        # Baris yang sudah dipangkas berarti ada perubahan yang tidak bisa dirinci
+        missed = bool(rows) and rows[0][0] != self._change_seq + 1
+        if rows:
+            self._change_seq = rows[-1][0]
+        return missed, rows
+
+    def _report(self, origin, changes):
+        if not changes:
+            return
+        missed, rows = changes
+        added, updated, deleted = {}, {}, {}
+        for _, op, activity_id in rows or ():
+            {"insert": added, "update": updated, "delete": deleted}[op][activity_id] = None
+        self._notify(origin, added, updated, deleted, reload=missed)
+
+    def sync_changes(self):
+        # Tabel changes (diisi trigger) dibaca dari posisi terakhir
+        with self._changes_lock:
+            changes = self._consume_changes(self._connect())
+        self._report(REMOTE_CHANGE, changes)
+
+    def _create_schema(self):
+        with self._write_transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS activities (
+                    id INTEGER PRIMARY KEY,
+                    nama TEXT NOT NULL,
+                    kategori TEXT,
+                    deadline TEXT,
+                    prioritas TEXT,
+                    deskripsi TEXT,
+                    catatan TEXT,
+                    status TEXT,
+                    tanggal_dibuat TEXT,
+                    tanggal_diperbarui TEXT,
+                    versi INTEGER,
+                    extra TEXT
+                )
+            """)
+            # Database lama belum memiliki kolom versi
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(activities)")}
+            if "versi" not in existing:
+                conn.execute("ALTER TABLE activities ADD COLUMN versi INTEGER")
+            for field in FILTER_FIELDS + ["deadline"]:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_activities_{field} ON activities ({field})"
+                )
+            # ID terbesar yang pernah dibagikan, agar ID yang dihapus tidak dipakai ulang
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+            conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) "
+                "SELECT 'last_id', COALESCE(MAX(id), 0) FROM activities"
+            )
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0)")
+            # Umpan perubahan bernomor urut untuk replika lain (lihat change_feed)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS changes (seq INTEGER PRIMARY KEY AUTOINCREMENT, op TEXT, id INTEGER)"
+            )
+            for op, event, row in (("insert", "INSERT", "NEW"), ("update", "UPDATE", "NEW"),
+                                   ("delete", "DELETE", "OLD")):
+                conn.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS activities_{op}_change AFTER {event} ON activities "
+                    f"BEGIN INSERT INTO changes (op, id) VALUES ('{op}', {row}.id); END"
+                )
+            # Index pencarian FTS5 berisi kata hasil activity_search, rowid = ID aktivitas
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'activities_search'"
+            ).fetchone()
+            try:
+                conn.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS activities_search USING fts5({', '.join(SEARCH_FIELDS)})"
+                )
+            except sqlite3.OperationalError:
+                # SQLite tanpa FTS5: pencarian memakai LIKE
+                self.fts = False
+                return
+            self.fts = True
+            if not exists:
+                self._index_text(conn)
+
+    def _index_text(self, conn, activity_ids=None):
+        # Memperbarui baris pencarian untuk ID tertentu (None = semua aktivitas)
+        if not self.fts:
+            return
+        columns = ", ".join(SEARCH_FIELDS)
+        values = ", ".join(f"search_terms({field})" for field in SEARCH_FIELDS)
+        sql = f"INSERT OR REPLACE INTO activities_search (rowid, {columns}) SELECT id, {values} FROM activities"
+        if activity_ids is None:
+            conn.execute(sql)
+        else:
+            conn.executemany(sql + " WHERE id = ?", ((activity_id,) for activity_id in activity_ids))
+
+    @staticmethod
+    def _to_row(activity):
+        if isinstance(activity, Activity):
+            activity = activity.to_dict()
+        extra = {k: v for k, v in activity.items() if k not in COLUMNS}
+        return [activity.get(col) for col in COLUMNS] + [json.dumps(extra, ensure_ascii=False) if extra else None]
+
+    @staticmethod
+    def _from_row(row):
+        activity = {col: row[col] for col in COLUMNS if row[col] is not None}
+        if row["extra"]:
+            activity.update(json.loads(row["extra"]))
+        return Activity.from_dict(activity)
+
+    @staticmethod
+    def _where(kategori, status, prioritas):
+        clauses, params = [], []
+        for field, value in (("kategori", kategori), ("status", status), ("prioritas", prioritas)):
+            if value is not None:
+                clauses.append(f"{field} = ?")
+                params.append(value)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        return where, params
+
+    @activity_metrics.timed("sqlite.get")
+    def get(self, activity_id):
+        row = self._connect().execute(
+            "SELECT * FROM activities WHERE id = ?", (activity_id,)
+        ).fetchone()
+        return self._from_row(row) if row else None
+
+    @activity_metrics.timed("sqlite.get_many", records=len)
+    def get_many(self, activity_ids):
+        activity_ids = list(dict.fromkeys(activity_ids))
+        found = {}
+        conn = self._connect()
+        for start in range(0, len(activity_ids), SQL_BATCH_SIZE):
+            chunk = activity_ids[start:start + SQL_BATCH_SIZE]
+            rows = conn.execute(f"SELECT * FROM activities WHERE id IN ({', '.join('?' for _ in chunk)})", chunk)
+            found.update((row['id'], self._from_row(row)) for row in rows)
+        return {activity_id: found[activity_id] for activity_id in activity_ids if activity_id in found}
+
+    @activity_metrics.timed("sqlite.add")
+    def add(self, activity):
+        activity = Activity.coerce(activity)
+        placeholders = ", ".join("?" for _ in range(len(COLUMNS) + 1))
+        with self._write_transaction() as conn:
+            if activity.id is None:
+                last_id = conn.execute("SELECT value FROM meta WHERE key = 'last_id'").fetchone()[0]
+                self.id_generator.observe(last_id)
+                activity['id'] = self.id_generator.next()
+            conn.execute(
+                "UPDATE meta SET value = MAX(value, ?) WHERE key = 'last_id'", (activity.id,)
+            )
+            if activity.versi is None:
+                activity['versi'] = 1
+            # INSERT biasa: ID yang sudah dipakai memicu IntegrityError
+            conn.execute(
+                f"INSERT INTO activities ({', '.join(COLUMNS)}, extra) VALUES ({placeholders})",
+                self._to_row(activity),
+            )
+            self._index_text(conn, [activity.id])
+        return activity
+
+    @activity_metrics.timed("sqlite.add_many")
+    def add_many(self, activities):
+        # Juga dipakai migrasi: ID yang sudah ada ditimpa (INSERT OR REPLACE)
+        placeholders = ", ".join("?" for _ in range(len(COLUMNS) + 1))
+        ids = []
+
+        def rows():
+            for activity in activities:
+                activity = Activity.coerce(activity)
+                if activity.id is None:
+                    activity['id'] = self.id_generator.next()
+                if activity.versi is None:
+                    activity['versi'] = 1
+                ids.append(activity.id)
+                yield self._to_row(activity)
+
+        with self._write_transaction() as conn:
+            last_id = conn.execute("SELECT value FROM meta WHERE key = 'last_id'").fetchone()[0]
+            self.id_generator.observe(last_id)
+            conn.executemany(
+                f"INSERT OR REPLACE INTO activities ({', '.join(COLUMNS)}, extra) VALUES ({placeholders})",
+                rows(),
+            )
+            conn.execute(
+                "UPDATE meta SET value = MAX(value, (SELECT COALESCE(MAX(id), 0) FROM activities)) "
+                "WHERE key = 'last_id'"
+            )
+            self._index_text(conn, ids)
+        return len(ids)
+
+    @activity_metrics.timed("sqlite.update")
+    def update(self, activity_id, changes, base=None):
+        with self._write_transaction() as conn:
+            row = conn.execute(
+                "SELECT * FROM activities WHERE id = ?", (activity_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(activity_id)
+            activity = self._from_row(row)
+            changes = merge_changes(activity, base, changes)
+            changes['versi'] = activity.get('versi', 1) + 1
+            activity.update(changes)
+            values = self._to_row(activity)
+            assignments = ", ".join(f"{col} = ?" for col in COLUMNS[1:] + ["extra"])
+            conn.execute(
+                f"UPDATE activities SET {assignments} WHERE id = ?",
+                values[1:] + [activity_id],
+            )
+            if any(field in changes for field in SEARCH_FIELDS):
+                self._index_text(conn, [activity_id])
+
+    @activity_metrics.timed("sqlite.update_many", records=len)
+    def update_many(self, changes, bases=None):
+        assignments = ", ".join(f"{col} = ?" for col in COLUMNS[1:] + ["extra"])
+        updated, reindex = [], []
+        with self._write_transaction() as conn:
+            # Dibaca di dalam transaksi tulis (koneksi yang sama), per potongan ID
+            rows = []
+            for activity_id, activity in self.get_many(changes).items():
+                merged = merge_changes(activity, (bases or {}).get(activity_id), changes[activity_id])
+                merged['versi'] = activity.get('versi', 1) + 1
+                activity.update(merged)
+                rows.append(self._to_row(activity)[1:] + [activity_id])
+                updated.append(activity)
+                if any(field in merged for field in SEARCH_FIELDS):
+                    reindex.append(activity_id)
+            conn.executemany(f"UPDATE activities SET {assignments} WHERE id = ?", rows)
+            if reindex:
+                self._index_text(conn, reindex)
+        return updated
+
+    @activity_metrics.timed("sqlite.delete")
+    def delete(self, activity_id):
+        with self._write_transaction() as conn:
+            deleted = conn.execute("DELETE FROM activities WHERE id = ?", (activity_id,)).rowcount
+            if self.fts:
+                conn.execute("DELETE FROM activities_search WHERE rowid = ?", (activity_id,))
+        if not deleted:
+            raise KeyError(activity_id)
+
+    @activity_metrics.timed("sqlite.delete_many")
+    def delete_many(self, activity_ids):
+        activity_ids = list(dict.fromkeys(activity_ids))
+        deleted = []
+        with self._write_transaction() as conn:
+            for start in range(0, len(activity_ids), SQL_BATCH_SIZE):
+                chunk = activity_ids[start:start + SQL_BATCH_SIZE]
+                marks = ", ".join("?" for _ in chunk)
+                deleted.extend(row[0] for row in conn.execute(
+                    f"SELECT id FROM activities WHERE id IN ({marks})", chunk
+                ))
+                conn.execute(f"DELETE FROM activities WHERE id IN ({marks})", chunk)
+                if self.fts:
+                    conn.execute(f"DELETE FROM activities_search WHERE rowid IN ({marks})", chunk)
+        return deleted
+
+    @activity_metrics.timed("sqlite.query", records=len)
+    def query(self, kategori=None, status=None, prioritas=None, limit=None, offset=0):
+        where, params = self._where(kategori, status, prioritas)
+        sql = f"SELECT * FROM activities{where} ORDER BY rowid"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        elif offset:
+            sql += " LIMIT -1 OFFSET ?"
+            params.append(offset)
+        return [self._from_row(row) for row in self._connect().execute(sql, params)]
+
+    @activity_metrics.timed("sqlite.search", records=_search_records)
+    def search(self, text, kategori=None, status=None, prioritas=None, limit=None, offset=0):
+        where, params = self._where(kategori, status, prioritas)
+        if self.fts:
+            match = activity_search.fts_query(text)
+            if match is None:
+                return 0, []
+            # bm25() FTS5: makin kecil makin relevan; bobot kolom sama dengan store JSON
+            weights = ", ".join(str(float(weight)) for weight in SEARCH_FIELDS.values())
+            # CROSS JOIN: SQLite wajib membaca hasil FTS dulu, bukan memindai tabel per filter
+            source = "activities_search s CROSS JOIN activities ON activities.id = s.rowid"
+            where = " WHERE activities_search MATCH ?" + where.replace(" WHERE ", " AND ")
+            params = [match] + params
+            order = f"bm25(activities_search, {weights}), activities.rowid"
+        else:
+            tokens = activity_search.query_terms(text)
+            if not tokens:
+                return 0, []
+            source = "activities"
+            clauses = [where[len(" WHERE "):]] if where else []
+            for token in tokens:
+                clauses.append("(" + " OR ".join(f"{field} LIKE ?" for field in SEARCH_FIELDS) + ")")
+                params += [f"%{token}%"] * len(SEARCH_FIELDS)
+            where = " WHERE " + " AND ".join(clauses)
+            order = "activities.rowid"
+        conn = self._connect()
+        total = conn.execute(f"SELECT COUNT(*) FROM {source}{where}", params).fetchone()[0]
+        sql = f"SELECT activities.* FROM {source}{where} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        elif offset:
+            sql += " LIMIT -1 OFFSET ?"
+            params.append(offset)
+        return total, [self._from_row(row) for row in conn.execute(sql, params)]
+
+    def data_version(self):
+        # Versi di tabel meta ikut naik untuk perubahan dari proses lain
+        version = self._connect().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+        return (self.db_file, version)
+
+    @activity_metrics.timed("sqlite.field_columns", records=_column_records)
+    def field_columns(self, fields):
+        unknown = [field for field in fields if field not in COLUMNS]
+        if unknown:
+            raise ValueError(f"Bukan kolom SQL: {', '.join(unknown)}")
+        cursor = self._connect().cursor()
+        # Tuple biasa (bukan sqlite3.Row) lalu ditransposisi menjadi kolom
+        cursor.row_factory = None
+        rows = cursor.execute(f"SELECT {', '.join(fields)} FROM activities ORDER BY rowid").fetchall()
+        return [list(column) for column in zip(*rows)] if rows else [[] for _ in fields]
+
+    def scan(self, kategori=None, status=None, prioritas=None, batch_size=1000):
+        # Cursor dibaca per batch sehingga hasil tidak dimuat sekaligus
+        where, params = self._where(kategori, status, prioritas)
+        cursor = self._connect().execute(f"SELECT * FROM activities{where} ORDER BY rowid", params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield self._from_row(row)
+
+    @activity_metrics.timed("sqlite.count")
+    def count(self, kategori=None, status=None, prioritas=None):
+        where, params = self._where(kategori, status, prioritas)
+        return self._connect().execute(f"SELECT COUNT(*) FROM activities{where}", params).fetchone()[0]
+
+    @activity_metrics.timed("sqlite.count_by")
+    def count_by(self, field):
+        if field not in FILTER_FIELDS:
+            raise ValueError(f"Field tidak dapat dikelompokkan: {field}")
+        rows = self._connect().execute(
+            f"SELECT {field}, COUNT(*) FROM activities GROUP BY {field}"
+        )
+        return {value: count for value, count in rows}
+
+    @activity_metrics.timed("sqlite.due_between", records=len)
+    def due_between(self, start=None, end=None, limit=None):
+        # Record tanpa status (NULL) belum selesai, sama seperti DeadlineIndex
+        clauses, params = ["(status IS NULL OR status != ?)"], [DONE_STATUS]
+        if start is not None:
+            clauses.append("deadline >= ?")
+            params.append(start.strftime("%Y-%m-%d"))
+        if end is not None:
+            clauses.append("deadline <= ?")
+            params.append(end.strftime("%Y-%m-%d"))
+        sql = f"SELECT * FROM activities WHERE {' AND '.join(clauses)} ORDER BY deadline, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._from_row(row) for row in self._connect().execute(sql, params)]
+
+
+# Fungsi untuk migrasi satu kali dari JSON ke SQLite
+def migrate_json_to_sqlite(json_file=journal_store.SNAPSHOT_FILE, db_file="data/activities.db",
+                           journal_file=journal_store.JOURNAL_FILE):
+    """Menyalin seluruh aktivitas (snapshot + jurnal) ke database SQLite"""
+    activities = journal_store.ActivityJournal(json_file, journal_file).load()
+    store = SQLiteActivityStore(db_file)
+    store.add_many(activities)
+    return len(activities)
+
+
+if __name__ == "__main__":
+    # python -m modules.activity_store migrate [json_file] [db_file]
+    if len(sys.argv) >= 2 and sys.argv[1] == "migrate":
+        migrated = migrate_json_to_sqlite(*sys.argv[2:4])
+        print(f"{migrated} aktivitas dimigrasikan ke SQLite")
+    else:
+        print("Penggunaan: python -m modules.activity_store migrate [json_file] [db_file]")
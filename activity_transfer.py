@@ -0,0 +1,170 @@
+# modules/activity_transfer.py
+import csv
+import io
+import json
+import sys
+
+from modules import activity_service
+from modules.activity_loader import RecordError, read_records
+from modules.activity_model import FIELDS
+
+# Impor/ekspor banyak aktivitas (CSV dan JSON Lines) tanpa Streamlit.
+
+# Variabel konstan
+FORMATS = ["csv", "jsonl"]
+# Kolom hasil ekspor yang diabaikan saat diimpor ulang (diisi ulang oleh store)
+IGNORED_FIELDS = {"id", "versi", "tanggal_dibuat", "tanggal_diperbarui"}
+OPTIONAL_FIELDS = ["deskripsi", "catatan", "status"]
+
+
+class ImportResult:
+    """Hasil impor: jumlah aktivitas tersimpan dan baris yang ditolak"""
+
+    def __init__(self, imported, rejected, errors):
+        self.imported = imported
+        self.rejected = rejected
+        self.errors = errors
+
+    def __repr__(self):
+        return f"ImportResult(imported={self.imported}, rejected={self.rejected})"
+
+
+# Fungsi untuk menebak format dari nama file
+def guess_format(filename):
+    """"csv" untuk *.csv, selain itu "jsonl" (JSON Lines atau array JSON)"""
+    return "csv" if filename.lower().endswith(".csv") else "jsonl"
+
+
+def _iter_csv(f, name, errors):
+    reader = csv.DictReader(f)
+    for row in reader:
+        if None in row:
+            errors.append(RecordError(name, reader.line_num, "jumlah kolom melebihi header"))
+            continue
+        yield reader.line_num, row
+
+
+def _iter_json(f, name, errors):
+    # Nomor baris JSON sudah dicatat di RecordError oleh loader
+    for i, record in enumerate(read_records(f, name, errors), start=1):
+        yield i, record
+
+
+# Fungsi untuk membaca baris yang valid dari file impor
+def iter_valid_rows(f, fmt, name="upload", errors=None):
+    """Generator (nomor baris/record, dict tervalidasi) dari file teks.
+
+    Baris yang tidak valid dicatat ke `errors` sebagai RecordError.
+    """
+    errors = [] if errors is None else errors
+    rows = _iter_csv(f, name, errors) if fmt == "csv" else _iter_json(f, name, errors)
+    for line, row in rows:
+        data = {key: value for key, value in row.items() if key not in IGNORED_FIELDS}
+        if fmt == "csv":
+            # Kolom CSV kosong berarti memakai nilai bawaan
+            data = {key.strip(): value.strip() for key, value in data.items()
+                    if value is not None and value.strip() != ""}
+        try:
+            yield line, activity_service.validate_activity(data)
+        except activity_service.ValidationError as e:
+            errors.append(RecordError(name, line, str(e), json.dumps(row, ensure_ascii=False)))
+
+
+# Fungsi untuk mengimpor aktivitas dari file
+def import_activities(f, fmt, name="upload", skip_invalid=False, store=None, owner=None):
+    """Memvalidasi seluruh file lalu menyimpan semua baris dalam satu penulisan.
+
+    File dibaca dua kali (validasi, lalu simpan) sehingga baris tidak perlu
+    ditahan di memori; karena itu `f` harus bisa di-seek. Jika ada baris
+    tidak valid dan `skip_invalid` False, tidak ada yang disimpan. Tanpa
+    `store`, data disimpan ke partisi `owner`.
+    """
+    errors = []
+    valid = sum(1 for _ in iter_valid_rows(f, fmt, name, errors))
+    if not valid or (errors and not skip_invalid):
+        return ImportResult(0, len(errors), errors)
+
+    f.seek(0)
+    created = activity_service.now()
+
+    def activities():
+        for _, data in iter_valid_rows(f, fmt, name):
+            for field in OPTIONAL_FIELDS:
+                data.setdefault(field, activity_service.DEFAULT_STATUS if field == "status" else "")
+            data['tanggal_dibuat'] = created
+            yield data
+
+    store = store or activity_service.get_store(owner, create=True)
+    imported = store.add_many(activities())
+    if imported:
+        activity_service.reminders.notify(activity_service.normalize_owner(owner))
+    return ImportResult(imported, len(errors), errors)
+
+
+# Fungsi untuk mengimpor file di disk
+def import_file(path, fmt=None, skip_invalid=False, store=None, owner=None):
+    fmt = fmt or guess_format(path)
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return import_activities(f, fmt, path, skip_invalid, store, owner)
+
+
+# Fungsi untuk mengubah aktivitas menjadi teks ekspor secara streaming
+def iter_export(fmt, activities):
+    """Generator potongan teks CSV/JSON Lines, satu potongan per aktivitas"""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for activity in activities:
+            writer.writerow(activity.to_dict())
+            # Buffer dikosongkan setiap baris agar memori tetap kecil
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+    else:
+        for activity in activities:
+            yield json.dumps(activity.to_dict(), ensure_ascii=False) + "\n"
+
+
+# Fungsi untuk mengekspor aktivitas yang cocok filter ke file
+def export_activities(f, fmt, kategori=None, status=None, prioritas=None, store=None, owner=None):
+    """Menulis ekspor ke file teks `f`; mengembalikan jumlah aktivitas"""
+    store = store or activity_service.get_store(owner)
+    count = 0
+
+    def activities():
+        nonlocal count
+        for activity in store.scan(kategori=kategori, status=status, prioritas=prioritas):
+            count += 1
+            yield activity
+
+    for chunk in iter_export(fmt, activities()):
+        f.write(chunk)
+    return count
+
+
+if __name__ == "__main__":
+    # python -m modules.activity_transfer import <file> [--skip-invalid] [owner=...]
+    # python -m modules.activity_transfer export <file> [kategori=...] [status=...] [prioritas=...] [owner=...]
+    args = sys.argv[1:]
+    if len(args) >= 2 and args[0] == "import":
+        options = dict(arg.split("=", 1) for arg in args[2:] if "=" in arg)
+        result = import_file(args[1], skip_invalid="--skip-invalid" in args, owner=options.get("owner"))
+        for error in result.errors[:20]:
+            print(error)
+        if result.rejected > 20:
+            print(f"... dan {result.rejected - 20} baris lainnya")
+        print(f"{result.imported} aktivitas diimpor, {result.rejected} baris ditolak")
+        sys.exit(1 if result.rejected and not result.imported else 0)
+    elif len(args) >= 2 and args[0] == "export":
+        filters = dict(arg.split("=", 1) for arg in args[2:] if "=" in arg)
+        with open(args[1], 'w', encoding='utf-8', newline='') as f:
+            exported = export_activities(f, guess_format(args[1]), **filters)
+        print(f"{exported} aktivitas diekspor ke {args[1]}")
+    else:
+        print("Penggunaan: python -m modules.activity_transfer import <file.csv|file.jsonl> [--skip-invalid] "
+              "[owner=...]")
+        print("            python -m modules.activity_transfer export <file.csv|file.jsonl> [kategori=...] "
+              "[status=...] [prioritas=...] [owner=...]")
@@ -6,7 +6,7 @@ from datetime import datetime
 
 
 # Import modul yang dibuat
-from modules import activity_manager, tips_manager
+from modules import activity_manager, activity_metrics, activity_service, profiling_manager, tips_manager
 # Tambahkan di app.py setelah import
 # Konfigurasi halaman
 st.set_page_config(
@@ -15,9 +15,12 @@ st.set_page_config(
     layout="wide"
 )
 
-# Inisialisasi session state
-if 'activities' not in st.session_state:
-    st.session_state.activities = activity_manager.load_activities()
+# Waktu satu kali render seluruh halaman (lihat halaman Profiling)
+rerun_timer = activity_metrics.start("app.rerun")
+
+# Store aktivitas (JSON atau SQLite) partisi pengguna ?user=..., dipakai bersama oleh semua sesinya
+store = activity_manager.get_store()
+activity_manager.show_load_errors()
 
 if 'current_page' not in st.session_state:
     st.session_state.current_page = "Beranda"
@@ -43,6 +46,12 @@ def show_notification(message, type="success"):
     """Menampilkan notifikasi di bagian atas halaman"""
     st.session_state.notification = {"message": message, "type": type}
 
+# Pengingat deadline dari scheduler latar belakang
+activity_manager.show_reminders(show_notification)
+
+# Perubahan data dari sesi atau proses aplikasi lain
+activity_manager.watch_changes(show_notification)
+
 # Sidebar untuk navigasi
 with st.sidebar:
     st.title("📊 Menu Navigasi")
@@ -61,16 +70,33 @@ with st.sidebar:
     if st.button("💡 Tips & Trik", use_container_width=True):
         navigate_to("Tips & Trik")
     
+    # Menu admin hanya muncul jika aplikasi dibuka dengan ?admin=1
+    if profiling_manager.is_admin():
+        if st.button("🛠️ Profiling", use_container_width=True):
+            navigate_to("Profiling")
+    
+    st.markdown("---")
+    
+    # Undo/redo perubahan sesi ini
+    activity_manager.display_undo_controls(show_notification)
+    
     st.markdown("---")
     
     # Statistik
-    total_activities = len(st.session_state.activities)
-    completed = sum(1 for act in st.session_state.activities if act.get('status') == 'Selesai')
+    total_activities = store.count()
+    completed = store.count(status='Selesai')
     
     st.metric("Total Aktivitas", total_activities)
     st.metric("Selesai", completed)
     
     st.markdown("---")
+    cache = activity_service.cache_stats()
+    st.caption(
+        f"Cache: {cache['hits']} hit / {cache['misses']} miss | "
+        f"{cache['resident_bytes'] / 1024:.1f} KB"
+    )
+    if activity_manager.current_owner():
+        st.caption(f"👤 Pengguna: {activity_manager.current_owner()}")
     st.caption(f"Versi 1.0 | {datetime.now().year}")
 
 # Header aplikasi
@@ -95,37 +121,47 @@ if st.session_state.notification:
 
 # Routing berdasarkan halaman yang dipilih
 current_page = st.session_state.current_page
+page_timer = activity_metrics.start(f"page.{current_page}")
 
 # Logika if untuk routing halaman
 if current_page == "Beranda":
     st.header("🏠 Dashboard Beranda")
     
+    category_counts = store.count_by('kategori')
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.info("📚 Aktivitas Akademik")
-        academic_count = sum(1 for act in st.session_state.activities if act.get('kategori') == 'Akademik')
+        academic_count = category_counts.get('Akademik', 0)
         st.metric("Jumlah", academic_count)
     
     with col2:
         st.success("🏃 Aktivitas Organisasi")
-        org_count = sum(1 for act in st.session_state.activities if act.get('kategori') == 'Organisasi')
+        org_count = category_counts.get('Organisasi', 0)
         st.metric("Jumlah", org_count)
     
     with col3:
         st.warning("⚡ Aktivitas Lainnya")
-        other_count = sum(1 for act in st.session_state.activities if act.get('kategori') == 'Lainnya')
+        other_count = category_counts.get('Lainnya', 0)
         st.metric("Jumlah", other_count)
     
     st.markdown("---")
     
+    # Analitik aktivitas
+    st.subheader("📈 Analitik Aktivitas")
+    activity_manager.display_analytics(store)
+    
+    st.markdown("---")
+    
     # Aktivitas mendatang
     st.subheader("⏰ Aktivitas Mendatang (7 hari ke depan)")
-    upcoming = activity_manager.get_upcoming_activities(st.session_state.activities)
+    upcoming = activity_manager.upcoming_activities(days=7, limit=5)
     
     if upcoming:
-        for activity in upcoming[:5]:
-            with st.expander(f"{activity['nama']} - {activity['deadline']}"):
+        for activity in upcoming:
+            # Kejadian aktivitas berulang ditandai 🔁
+            prefix = "🔁 " if activity.get('aturan') else ""
+            with st.expander(f"{prefix}{activity['nama']} - {activity['deadline']}"):
                 st.write(f"**Kategori:** {activity['kategori']}")
                 st.write(f"**Prioritas:** {activity['prioritas']}")
                 st.write(f"**Status:** {activity['status']}")
@@ -142,14 +178,29 @@ if current_page == "Beranda":
 elif current_page == "Tambah Aktivitas":
     st.header("➕ Tambah Aktivitas Baru")
     activity_manager.add_activity_form(show_notification)
+    
+    st.markdown("---")
+    st.subheader("📥 Impor Banyak Aktivitas")
+    activity_manager.import_activities_form(show_notification)
 
 elif current_page == "Daftar Aktivitas":
     st.header("📋 Daftar Semua Aktivitas")
-    activity_manager.display_activities(st.session_state.activities, show_notification)
+    activity_manager.display_activities(show_notification)
+    
+    st.markdown("---")
+    st.subheader("🔁 Aktivitas Berulang")
+    activity_manager.display_recurrences()
 
 elif current_page == "Tips & Trik":
     st.header("💡 Tips & Trik Manajemen Aktivitas")
     tips_manager.display_tips_page()
 
+elif current_page == "Profiling" and profiling_manager.is_admin():
+    st.header("🛠️ Profiling")
+    profiling_manager.display_profiling_page()
+
 else:
-    st.error("Halaman tidak ditemukan!")
\ No newline at end of file
+    st.error("Halaman tidak ditemukan!")
+
+page_timer.stop()
+rerun_timer.stop()
\ No newline at end of file
@@ -0,0 +1,67 @@
+# benchmarks/bench_analytics.py
+"""Mengukur waktu analitik dashboard: bangun kolom, hitung ringkasan, dan cache.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_analytics.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_activities
+from modules import activity_analytics
+from modules.activity_index import ActivityIndex
+from modules.activity_model import Activity
+from modules.activity_store import JsonActivityStore
+
+SIZES = [1000, 10000, 100000]
+REPEAT = 20
+
+
+class _MemoryJournal:
+    # Jurnal palsu supaya store bisa dibuat tanpa file
+    def has_foreign_changes(self):
+        return False
+
+
+# Fungsi untuk membuat data dengan tanggal diperbarui acak
+def make_history(n):
+    rng = random.Random(7)
+    activities = make_activities(n)
+    for activity in activities:
+        activity['tanggal_dibuat'] = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 08:00:00"
+        if activity['status'] == "Selesai":
+            activity['tanggal_diperbarui'] = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 17:00:00"
+    return activities
+
+
+# Fungsi untuk rata-rata waktu (ms) pemanggilan func
+def timed(func, repeat=REPEAT):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    print(f"{'records':>8} {'kolom ms':>9} {'ringkasan ms':>13} {'cache ms':>9}")
+    for n in SIZES:
+        store = JsonActivityStore.__new__(JsonActivityStore)
+        store.journal = _MemoryJournal()
+        store.index = ActivityIndex(Activity.from_dict(a) for a in make_history(n))
+        store._version = 1
+
+        columns, columns_ms = timed(lambda: activity_analytics.ActivityColumns.from_store(store), 3)
+        summary, summary_ms = timed(lambda: activity_analytics.summarize(columns))
+        cache = activity_analytics.AnalyticsCache()
+        cache.get(store)
+        _, cached_ms = timed(lambda: cache.get(store), 1000)
+        assert summary["total"] == n
+        print(f"{n:>8} {columns_ms:>9.1f} {summary_ms:>13.2f} {cached_ms:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
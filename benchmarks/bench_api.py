@@ -0,0 +1,119 @@
+# benchmarks/bench_api.py
+"""Mengukur throughput API HTTP (request/detik) untuk list, filter, dan mutasi.
+
+Server dijalankan di proses terpisah dengan data sintetis di folder
+sementara; klien asyncio memakai beberapa koneksi keep-alive sekaligus.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_api.py [jumlah_aktivitas] [koneksi] [detik]
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Folder data harus ditentukan sebelum activity_service diimpor
+os.environ.setdefault("ACTIVITY_DATA_DIR", tempfile.mkdtemp())
+
+from benchmarks.synthetic import make_activities
+from modules import activity_api, activity_service
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+
+def run_server(ready):
+    asyncio.run(activity_api.serve(HOST, PORT, ready))
+
+
+# Fungsi untuk mengirim satu request dan membaca responsnya
+async def request(reader, writer, method, path, payload=None):
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1")
+        + body
+    )
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    data = await reader.readexactly(length) if length else b""
+    return status, json.loads(data) if data else None
+
+
+# Skenario: setiap fungsi menjalankan satu "operasi" lewat satu koneksi
+async def list_page(reader, writer, i):
+    status, _ = await request(reader, writer, "GET", f"/activities?limit=25&offset={(i % 40) * 25}")
+    assert status == 200
+
+
+async def filter_page(reader, writer, i):
+    status, _ = await request(reader, writer, "GET",
+                              "/activities?kategori=Akademik&status=Dalam%20Proses&prioritas=Tinggi&limit=25")
+    assert status == 200
+
+
+async def mutate(reader, writer, i):
+    # Satu operasi = tambah, ubah status, lalu hapus (3 request)
+    status, created = await request(reader, writer, "POST", "/activities", {
+        "nama": f"Bench {i}", "kategori": "Akademik", "deadline": "2026-01-01", "prioritas": "Sedang",
+    })
+    assert status == 201, created
+    path = f"/activities/{created['id']}"
+    status, _ = await request(reader, writer, "PATCH", path, {"status": "Dalam Proses"})
+    assert status == 200
+    status, _ = await request(reader, writer, "DELETE", path)
+    assert status == 204
+
+
+SCENARIOS = [("list", list_page, 1), ("filter", filter_page, 1), ("mutasi", mutate, 3)]
+
+
+async def run_clients(operation, connections, seconds):
+    deadline = time.perf_counter() + seconds
+    counts = []
+
+    async def client(worker):
+        reader, writer = await asyncio.open_connection(HOST, PORT)
+        done = 0
+        while time.perf_counter() < deadline:
+            await operation(reader, writer, worker * 1000000 + done)
+            done += 1
+        writer.close()
+        counts.append(done)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(worker) for worker in range(connections)))
+    return sum(counts), time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) >= 2 else 10000
+    connections = int(sys.argv[2]) if len(sys.argv) >= 3 else 8
+    seconds = float(sys.argv[3]) if len(sys.argv) >= 4 else 3
+
+    activity_service.save_activities(make_activities(n))
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=run_server, args=(ready,), daemon=True)
+    server.start()
+    try:
+        if not ready.wait(60):
+            raise RuntimeError("Server API tidak siap")
+        print(f"aktivitas: {n}, koneksi: {connections}, durasi: {seconds} detik, "
+              f"backend: {activity_service.STORAGE_BACKEND}")
+        for name, operation, requests_per_op in SCENARIOS:
+            ops, elapsed = asyncio.run(run_clients(operation, connections, seconds))
+            print(f"{name:<7}: {ops * requests_per_op / elapsed:9.0f} request/detik")
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# benchmarks/bench_bulk.py
+"""Aksi massal: satu mutasi batch vs. satu mutasi per aktivitas.
+
+Untuk setiap jumlah aktivitas terpilih, proses terpisah (data dir
+sementara, --size aktivitas sintetis) mengukur lewat activity_service:
+
+- loop.update    update_activity per aktivitas (cara lama: satu penulisan
+                 store dan riwayat per aktivitas); paling banyak --loop-max
+                 aktivitas diukur, total diproyeksikan dari rata-ratanya
+- batch.update   update_activities (status) untuk seluruh pilihan
+- batch.delete   delete_activities untuk seluruh pilihan
+- batch.undo     revert_changes untuk langkah undo delete tersebut
+
+Jalankan dari root proyek:
+    python benchmarks/bench_bulk.py [--selected 100 1000 10000] [--size 50000] [--backend json]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_realistic_activities
+
+SELECTED = [100, 1000, 10000]
+SIZE = 50000
+LOOP_MAX = 500
+SEED = 42
+
+
+# Fungsi untuk waktu satu pemanggilan dalam milidetik
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+# Fungsi untuk seluruh pengukuran satu jumlah pilihan (dijalankan di proses worker)
+def run_worker(selected, size, loop_max, seed):
+    # Diimpor di sini: activity_service membaca ACTIVITY_DATA_DIR saat diimpor
+    from modules import activity_history, activity_service
+
+    activity_service.save_activities(make_realistic_activities(size, seed))
+    ids = [activity['id'] for activity in activity_service.get_store().all()]
+    chosen = random.Random(seed).sample(ids, selected)
+
+    looped = chosen[:loop_max]
+    loop_ms, _ = timed(lambda: [activity_service.update_activity(activity_id, {"status": "Dalam Proses"})
+                                for activity_id in looped])
+    update_ms, updated = timed(lambda: activity_service.update_activities(chosen, {"status": "Selesai"}))
+    with activity_history.track() as seqs:
+        delete_ms, deleted = timed(lambda: activity_service.delete_activities(chosen))
+    undo_ms, restored = timed(lambda: activity_service.revert_changes(seqs))
+    assert len(updated) == len(deleted) == len(restored) == selected
+    return {
+        "selected": selected,
+        "size": size,
+        "loop_measured": len(looped),
+        "loop.update_ms": loop_ms * selected / len(looped),
+        "batch.update_ms": update_ms,
+        "batch.delete_ms": delete_ms,
+        "batch.undo_ms": undo_ms,
+    }
+
+
+# Fungsi untuk menjalankan satu jumlah pilihan di proses terpisah
+def run_selected(selected, args):
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "result.json")
+        env = dict(os.environ, ACTIVITY_DATA_DIR=directory, ACTIVITY_STORAGE=args.backend, ACTIVITY_METRICS="0")
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", str(selected), "--size", str(args.size),
+             "--loop-max", str(args.loop_max), "--seed", str(args.seed), "--worker-output", output],
+            env=env, cwd=ROOT, check=True
+        )
+        with open(output, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aksi massal: batch vs. per aktivitas")
+    parser.add_argument("--selected", type=int, nargs="+", default=SELECTED)
+    parser.add_argument("--size", type=int, default=SIZE)
+    parser.add_argument("--loop-max", type=int, default=LOOP_MAX)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        result = run_worker(args.worker, args.size, args.loop_max, args.seed)
+        with open(args.worker_output, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return
+
+    results = [run_selected(selected, args) for selected in args.selected]
+    names = ["loop.update_ms", "batch.update_ms", "batch.delete_ms", "batch.undo_ms"]
+    print(f"ms per aksi, {args.size} aktivitas, backend {args.backend} (loop diproyeksikan dari "
+          f"paling banyak {args.loop_max} aktivitas)")
+    print(f"  {'aksi':<16}" + "".join(f"{result['selected']:>12}" for result in results))
+    for name in names:
+        print(f"  {name[:-3]:<16}" + "".join(f"{result[name]:12.1f}" for result in results))
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# benchmarks/bench_feed.py
+"""Propagasi perubahan antar proses aplikasi (umpan perubahan, change_feed).
+
+Untuk setiap jumlah aktivitas, data dir sementara diisi data sintetis lalu
+dua proses dijalankan bersamaan:
+
+- reader   memuat store lewat activity_service, menjalankan thread umpan
+           (poll setiap --poll detik) dan mencatat kapan setiap ID yang
+           diubah proses lain tiba sebagai event "replika"
+- writer   mengubah --changes aktivitas acak satu per satu (update_activity),
+           dengan jeda --interval detik, dan mencatat waktu setiap commit
+
+Yang dilaporkan:
+
+- latency      waktu commit writer sampai event tiba di reader (median, p95)
+- cpu/change   CPU reader (process_time) per perubahan, setelah dikurangi
+               CPU saat menganggur
+- idle cpu     CPU reader per detik tanpa perubahan (biaya polling)
+- full reload  waktu membuat store baru dari disk, yaitu biaya per perubahan
+               jika replika memuat ulang seluruh data
+
+latency dan cpu/change seharusnya tidak bergantung pada jumlah aktivitas;
+full reload tumbuh bersama data.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_feed.py [--sizes 1000 10000 100000] [--backend json sqlite]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_realistic_activities
+
+SIZES = [1000, 10000, 100000]
+BACKENDS = ["json", "sqlite"]
+CHANGES = 50
+INTERVAL = 0.1  # Jeda antar perubahan writer (detik)
+POLL = 0.05  # Jeda poll thread umpan di reader (detik)
+IDLE_SECONDS = 2.0
+TIMEOUT = 60
+SEED = 42
+
+
+# Fungsi untuk mengisi data dir dengan aktivitas sintetis (proses seed)
+def run_seed(size, seed):
+    from modules import activity_service
+
+    activity_service.save_activities(make_realistic_activities(size, seed))
+    # Store dibuat sekali agar migrasi SQLite tidak terjadi saat pengukuran
+    activity_service.get_store()
+
+
+# Fungsi untuk proses reader
+def run_reader(args):
+    from modules import activity_service
+    from modules.activity_store import REMOTE_CHANGE
+
+    started = time.perf_counter()
+    store = activity_service.create_store()
+    full_reload_ms = (time.perf_counter() - started) * 1000
+    store = activity_service.get_store()
+
+    arrivals = {}
+    reloads = []
+    done = threading.Event()
+
+    def on_event(event):
+        if event['asal'] != REMOTE_CHANGE:
+            return
+        now = time.time()
+        reloads.append(event['muat_ulang'])
+        for activity_id in event['diubah']:
+            arrivals.setdefault(activity_id, now)
+        if len(arrivals) >= args.changes:
+            done.set()
+
+    activity_service.feed.subscribe(on_event)
+    activity_service.feed.start()
+
+    cpu = time.process_time()
+    time.sleep(IDLE_SECONDS)
+    idle_cpu = (time.process_time() - cpu) / IDLE_SECONDS
+
+    with open(args.ready_file, 'w', encoding='utf-8') as f:
+        f.write("siap")
+    cpu, wall = time.process_time(), time.time()
+    done.wait(TIMEOUT)
+    busy_cpu = time.process_time() - cpu - idle_cpu * (time.time() - wall)
+    activity_service.feed.stop()
+
+    while not os.path.exists(args.writes_file):
+        time.sleep(0.01)
+    with open(args.writes_file, 'r', encoding='utf-8') as f:
+        writes = json.load(f)
+    # Data di memori reader harus sudah berisi nilai dari writer
+    consistent = all(store.get(int(activity_id))['catatan'] == write['catatan']
+                     for activity_id, write in writes.items())
+    latencies = sorted((arrivals[int(activity_id)] - write['waktu']) * 1000
+                       for activity_id, write in writes.items() if int(activity_id) in arrivals)
+    return {
+        "received": len(latencies),
+        "consistent": consistent,
+        "full_reloads": sum(reloads),
+        "latency_median_ms": statistics.median(latencies) if latencies else None,
+        "latency_p95_ms": latencies[int(len(latencies) * 0.95) - 1] if latencies else None,
+        "cpu_per_change_ms": max(busy_cpu, 0) * 1000 / max(len(latencies), 1),
+        "idle_cpu_ms_per_s": idle_cpu * 1000,
+        "full_reload_ms": full_reload_ms,
+    }
+
+
+# Fungsi untuk proses writer
+def run_writer(args):
+    from modules import activity_service
+
+    rng = random.Random(args.seed)
+    ids = rng.sample([activity['id'] for activity in activity_service.get_store().all()], args.changes)
+    while not os.path.exists(args.ready_file):
+        time.sleep(0.01)
+    writes = {}
+    for i, activity_id in enumerate(ids):
+        catatan = f"diubah writer {i}"
+        activity_service.update_activity(activity_id, {"catatan": catatan})
+        writes[activity_id] = {"catatan": catatan, "waktu": time.time()}
+        time.sleep(args.interval)
+    # Ditulis atomik: reader menunggu file ini muncul
+    tmp_file = args.writes_file + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(writes, f)
+    os.replace(tmp_file, args.writes_file)
+
+
+# Fungsi untuk satu jumlah aktivitas dan satu backend
+def run_size(size, backend, args):
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, ACTIVITY_DATA_DIR=directory, ACTIVITY_STORAGE=backend, ACTIVITY_METRICS="0",
+                   ACTIVITY_FEED_POLL_SECONDS=str(args.poll))
+        files = ["--ready-file", os.path.join(directory, "ready"), "--writes-file",
+                 os.path.join(directory, "writes.json"), "--changes", str(args.changes),
+                 "--interval", str(args.interval), "--seed", str(args.seed)]
+        script = os.path.abspath(__file__)
+        subprocess.run([sys.executable, script, "--role", "seed", "--sizes", str(size)] + files,
+                       env=env, cwd=ROOT, check=True)
+        output = os.path.join(directory, "result.json")
+        reader = subprocess.Popen([sys.executable, script, "--role", "reader", "--output", output] + files,
+                                  env=env, cwd=ROOT)
+        subprocess.run([sys.executable, script, "--role", "writer"] + files, env=env, cwd=ROOT, check=True)
+        if reader.wait() != 0:
+            raise RuntimeError("reader gagal")
+        with open(output, 'r', encoding='utf-8') as f:
+            return dict(json.load(f), size=size, backend=backend)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Propagasi perubahan antar proses")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--backend", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--changes", type=int, default=CHANGES)
+    parser.add_argument("--interval", type=float, default=INTERVAL)
+    parser.add_argument("--poll", type=float, default=POLL)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--role", choices=["seed", "reader", "writer"], help=argparse.SUPPRESS)
+    parser.add_argument("--ready-file", help=argparse.SUPPRESS)
+    parser.add_argument("--writes-file", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.role == "seed":
+        run_seed(args.sizes[0], args.seed)
+        return
+    if args.role == "writer":
+        run_writer(args)
+        return
+    if args.role == "reader":
+        result = run_reader(args)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return
+
+    results = [run_size(size, backend, args) for backend in args.backend for size in args.sizes]
+    print(f"{args.changes} perubahan, jeda {args.interval}s, poll {args.poll}s")
+    print(f"  {'backend':<8} {'aktivitas':>9} {'diterima':>9} {'latency':>9} {'p95':>9} "
+          f"{'cpu/ubah':>9} {'idle/s':>8} {'full reload':>12}")
+    for result in results:
+        print(f"  {result['backend']:<8} {result['size']:>9} {result['received']:>9} "
+              f"{result['latency_median_ms']:>7.1f}ms {result['latency_p95_ms']:>7.1f}ms "
+              f"{result['cpu_per_change_ms']:>7.2f}ms {result['idle_cpu_ms_per_s']:>6.2f}ms "
+              f"{result['full_reload_ms']:>10.1f}ms"
+              + ("" if result['consistent'] else "  (data reader tidak sama!)"))
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
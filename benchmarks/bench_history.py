@@ -0,0 +1,134 @@
+# benchmarks/bench_history.py
+"""Riwayat perubahan: log delta + checkpoint vs. salinan utuh per perubahan.
+
+Sejumlah aktivitas sintetis masing-masing diubah berkali-kali (satu atau
+dua field per perubahan, seperti edit status/catatan di UI). Diukur:
+
+- ukuran log delta (activity_history) vs. log yang menyimpan salinan utuh
+  record setiap perubahan
+- record          menulis satu entri riwayat
+- version_at      membangun ulang versi acak satu aktivitas, dengan
+                  checkpoint (CHECKPOINT_INTERVAL) dan tanpa checkpoint
+- undo            membalik satu perubahan lewat activity_service.revert_change
+
+Dengan checkpoint, version_at tidak bergantung pada jumlah perubahan per
+aktivitas; tanpa checkpoint tumbuh linear.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_history.py [--activities 200] [--changes 10 100 1000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_suite import measure
+from benchmarks.synthetic import make_realistic_activities
+from modules import activity_history
+from modules.activity_model import STATUS_OPTIONS
+
+ACTIVITIES = 200
+CHANGES = [10, 100, 1000]  # Perubahan per aktivitas
+SEED = 42
+NO_CHECKPOINT = 10 ** 9
+
+
+# Fungsi untuk satu perubahan acak pada sebuah aktivitas
+def change(activity, rng, k):
+    after = dict(activity)
+    if rng.random() < 0.5:
+        after['status'] = rng.choice(STATUS_OPTIONS)
+    else:
+        after['catatan'] = f"Catatan revisi {k}"
+    after['versi'] = activity.get('versi', 1) + 1
+    after['tanggal_diperbarui'] = f"2026-10-{1 + k % 28:02d} 10:00:00"
+    return after
+
+
+# Fungsi untuk mengisi riwayat dan mengukur satu jumlah perubahan
+def run_changes(n, changes, directory):
+    rng = random.Random(SEED)
+    activities = make_realistic_activities(n, SEED)
+    histories = {
+        "checkpoint": activity_history.ActivityHistory(os.path.join(directory, f"delta-{changes}.jsonl"), fsync=False),
+        "no_checkpoint": activity_history.ActivityHistory(os.path.join(directory, f"plain-{changes}.jsonl"),
+                                                          NO_CHECKPOINT, fsync=False),
+    }
+    full_bytes = 0
+    for history in histories.values():
+        history.record_many(("insert", a['id'], None, a) for a in activities)
+    for k in range(changes):
+        batch = []
+        for i, activity in enumerate(activities):
+            after = change(activity, rng, k)
+            batch.append(("update", activity['id'], activity, after))
+            activities[i] = after
+            full_bytes += len(json.dumps(after, ensure_ascii=False).encode("utf-8")) + 1
+        for history in histories.values():
+            history.record_many(batch)
+
+    def pick():
+        activity = rng.choice(activities)
+        return activity['id'], rng.randrange(1, len(histories["checkpoint"]) + 1)
+
+    def record():
+        activity = rng.choice(activities)
+        return activity, change(activity, rng, changes)
+
+    return {
+        "changes_per_activity": changes,
+        "delta_bytes": os.path.getsize(histories["checkpoint"].path),
+        "full_copy_bytes": full_bytes,
+        "record": measure(lambda args: histories["checkpoint"].record("update", args[0]['id'], *args),
+                          setup=record),
+        "version_at": measure(lambda args: histories["checkpoint"].version_at(*args), setup=pick),
+        "version_at_no_checkpoint": measure(lambda args: histories["no_checkpoint"].version_at(*args), setup=pick),
+    }
+
+
+# Fungsi untuk latensi undo lewat activity_service (proses ini, data dir sementara)
+def run_undo(n):
+    from modules import activity_service
+
+    rng = random.Random(SEED)
+    activity_service.save_activities(make_realistic_activities(n, SEED))
+    ids = [activity['id'] for activity in activity_service.get_store().query(limit=n)]
+
+    def edit():
+        with activity_history.track() as seqs:
+            activity_service.update_activity(rng.choice(ids), {'catatan': f"edit {rng.random()}"})
+        return seqs[0]
+
+    return measure(lambda seq: activity_service.revert_change(seq), setup=edit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Riwayat delta vs. salinan utuh")
+    parser.add_argument("--activities", type=int, default=ACTIVITIES)
+    parser.add_argument("--changes", type=int, nargs="+", default=CHANGES)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # activity_service membaca ACTIVITY_DATA_DIR saat diimpor
+        os.environ["ACTIVITY_DATA_DIR"] = directory
+        os.environ["ACTIVITY_METRICS"] = "0"
+        results = [run_changes(args.activities, changes, directory) for changes in args.changes]
+        undo = run_undo(args.activities)
+
+    print(f"{args.activities} aktivitas, interval checkpoint {activity_history.CHECKPOINT_INTERVAL}")
+    print(f"  {'perubahan':>9} | {'delta':>9} {'salinan':>9} | {'record':>8} {'versi':>8} {'versi tanpa cp':>14}")
+    for result in results:
+        print(f"  {result['changes_per_activity']:>9} | {result['delta_bytes'] / 1024:>7.0f}KB "
+              f"{result['full_copy_bytes'] / 1024:>7.0f}KB | {result['record']['median_ms']:>6.3f}ms "
+              f"{result['version_at']['median_ms']:>6.3f}ms {result['version_at_no_checkpoint']['median_ms']:>12.3f}ms")
+    print(f"  undo (revert_change): {undo['median_ms']:.3f} ms")
+    print(json.dumps({"history": results, "undo": undo}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_index.py
+"""Membandingkan filter, hitung, dan aktivitas mendatang: looping vs index.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_index.py
+"""
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import CATEGORIES, make_activities
+from modules.activity_index import ActivityIndex
+from modules.activity_store import upcoming_from_list
+
+SIZES = [10000, 100000]
+REPEAT = 20
+TODAY = date(2025, 6, 1)
+FILTERS = {"kategori": "Akademik", "status": "Dalam Proses", "prioritas": "Tinggi"}
+
+
+# Fungsi untuk satu render halaman dengan cara lama (looping penuh)
+def render_with_loops(activities):
+    filtered = [
+        a for a in activities
+        if a['kategori'] == FILTERS['kategori']
+        and a['status'] == FILTERS['status']
+        and a['prioritas'] == FILTERS['prioritas']
+    ]
+    completed = sum(1 for a in activities if a.get('status') == 'Selesai')
+    per_category = [sum(1 for a in activities if a.get('kategori') == c) for c in CATEGORIES]
+    return len(filtered), completed, per_category
+
+
+# Fungsi untuk satu render halaman menggunakan index
+def render_with_index(index):
+    filtered = index.query(**FILTERS)
+    completed = index.count(status='Selesai')
+    by_category = index.count_by('kategori')
+    per_category = [by_category.get(c, 0) for c in CATEGORIES]
+    return len(filtered), completed, per_category
+
+
+# Fungsi untuk 5 aktivitas mendatang dengan cara lama (parse + sort)
+def upcoming_with_loops(activities):
+    return [a['id'] for a in upcoming_from_list(activities, 7, TODAY)[:5]]
+
+
+# Fungsi untuk 5 aktivitas mendatang dari index deadline
+def upcoming_with_index(index):
+    return index.deadlines.upcoming(7, 5, TODAY)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = func(*args)
+    return (time.perf_counter() - start) / REPEAT, result
+
+
+def main():
+    print(f"{'n':>8} {'loops (ms)':>12} {'index (ms)':>12} {'upcoming loop (ms)':>19} "
+          f"{'upcoming index (ms)':>20} {'build (ms)':>12} {'mutate (us)':>12}")
+    for n in SIZES:
+        activities = make_activities(n)
+        start = time.perf_counter()
+        index = ActivityIndex(activities)
+        build = time.perf_counter() - start
+
+        loops, expected = timed(render_with_loops, activities)
+        indexed, result = timed(render_with_index, index)
+        assert result == expected
+        upcoming_loops, expected = timed(upcoming_with_loops, activities)
+        upcoming_indexed, result = timed(upcoming_with_index, index)
+        assert len(result) == len(expected)
+
+        start = time.perf_counter()
+        for activity in activities[:1000]:
+            index.update(activity['id'], {"status": "Selesai"})
+        mutate = (time.perf_counter() - start) / 1000
+
+        print(f"{n:>8} {loops * 1000:>12.3f} {indexed * 1000:>12.3f} "
+              f"{upcoming_loops * 1000:>19.3f} {upcoming_indexed * 1000:>20.4f} "
+              f"{build * 1000:>12.1f} {mutate * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
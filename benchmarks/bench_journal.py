@@ -0,0 +1,60 @@
+# benchmarks/bench_journal.py
+"""Membandingkan biaya tulis per mutasi: tulis ulang penuh vs jurnal append.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_journal.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_activities
+from modules import journal_store
+
+SIZES = [1000, 10000, 50000]
+MUTATIONS = 50
+
+
+# Fungsi untuk mengukur tulis ulang seluruh file (perilaku lama)
+def bench_full_rewrite(activities, path):
+    start = time.perf_counter()
+    for i in range(MUTATIONS):
+        activities[i]['status'] = "Selesai"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(activities, f, indent=4, ensure_ascii=False)
+    return (time.perf_counter() - start) / MUTATIONS
+
+
+# Fungsi untuk mengukur penulisan lewat jurnal
+def bench_journal(activities, directory, fsync):
+    journal = journal_store.ActivityJournal(
+        os.path.join(directory, "activities.json"),
+        os.path.join(directory, "activities.journal"),
+        compact_threshold=10 ** 9,
+        fsync=fsync,
+    )
+    journal.write_snapshot(activities)
+    start = time.perf_counter()
+    for i in range(MUTATIONS):
+        journal.update(activities[i]['id'], {"status": "Selesai"})
+    return (time.perf_counter() - start) / MUTATIONS
+
+
+def main():
+    print(f"{'n':>8} {'rewrite (ms)':>14} {'journal (ms)':>14} {'journal+fsync (ms)':>20}")
+    for n in SIZES:
+        activities = make_activities(n)
+        with tempfile.TemporaryDirectory() as directory:
+            rewrite = bench_full_rewrite(activities, os.path.join(directory, "full.json"))
+            append = bench_journal(activities, directory, fsync=False)
+        with tempfile.TemporaryDirectory() as directory:
+            append_fsync = bench_journal(activities, directory, fsync=True)
+        print(f"{n:>8} {rewrite * 1000:>14.3f} {append * 1000:>14.3f} {append_fsync * 1000:>20.3f}")
+
+
+if __name__ == "__main__":
+    main()
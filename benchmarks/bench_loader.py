@@ -0,0 +1,99 @@
+# benchmarks/bench_loader.py
+"""Membandingkan json.load penuh dengan loader streaming (array lama & JSON Lines).
+
+Mengukur waktu sampai halaman pertama (25 record) siap, waktu muat penuh,
+dan memori puncak saat memuat seluruh file menjadi objek Activity.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_loader.py
+"""
+import gc
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_activities
+from modules.activity_loader import iter_records
+from modules.activity_model import Activity
+
+SIZES = [1000, 10000, 100000]
+PAGE_SIZE = 25
+
+
+# Fungsi untuk cara lama: json.load seluruh file lalu konversi
+def load_full(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [Activity.from_dict(d) for d in json.load(f)]
+
+
+# Fungsi untuk loader streaming
+def load_stream(path):
+    return [Activity.from_dict(d) for d in iter_records(path)]
+
+
+# Fungsi untuk halaman pertama dengan cara lama
+def first_page_full(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)[:PAGE_SIZE]
+
+
+# Fungsi untuk halaman pertama dengan loader streaming
+def first_page_stream(path):
+    return list(itertools.islice(iter_records(path), PAGE_SIZE))
+
+
+# Fungsi untuk mengukur waktu (ms)
+def measure_time(func, path):
+    gc.collect()
+    start = time.perf_counter()
+    result = func(path)
+    return result, (time.perf_counter() - start) * 1000
+
+
+# Fungsi untuk mengukur memori puncak (MB); dipisah karena tracemalloc memperlambat
+def measure_peak(func, path):
+    gc.collect()
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    print(f"{'records':>8} {'format':<7} {'loader':<7} {'hal.1 ms':>9} "
+          f"{'penuh ms':>9} {'puncak MB':>10}")
+    for n in SIZES:
+        activities = make_activities(n)
+        array_file = os.path.join(directory, f"activities_{n}.json")
+        jsonl_file = os.path.join(directory, f"activities_{n}.jsonl")
+        with open(array_file, 'w', encoding='utf-8') as f:
+            json.dump(activities, f, indent=4, ensure_ascii=False)
+        with open(jsonl_file, 'w', encoding='utf-8') as f:
+            for activity in activities:
+                f.write(json.dumps(activity, ensure_ascii=False) + "\n")
+        del activities
+
+        rows = [
+            ("array", "json", array_file, first_page_full, load_full),
+            ("array", "stream", array_file, first_page_stream, load_stream),
+            ("jsonl", "stream", jsonl_file, first_page_stream, load_stream),
+        ]
+        for fmt, name, path, first_page, load in rows:
+            _, first_ms = measure_time(first_page, path)
+            records, full_ms = measure_time(load, path)
+            assert len(records) == n
+            del records
+            peak_mb = measure_peak(load, path)
+            print(f"{n:>8} {fmt:<7} {name:<7} {first_ms:>9.2f} {full_ms:>9.1f} {peak_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# benchmarks/bench_memory.py
+"""Mengukur memori per record: dict JSON vs Activity (__slots__).
+
+Jalankan dari root proyek:
+    python benchmarks/bench_memory.py
+"""
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_activities
+from modules.activity_model import Activity
+
+N = 100000
+
+
+# Fungsi untuk mengukur memori yang dialokasikan oleh builder()
+def measure(builder):
+    gc.collect()
+    tracemalloc.start()
+    result = builder()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    # Data dibaca dari teks JSON seperti load_activities
+    raw = json.dumps(make_activities(N))
+
+    dicts, dict_bytes = measure(lambda: json.loads(raw))
+    records, record_bytes = measure(lambda: [Activity.from_dict(d) for d in json.loads(raw)])
+    assert [r.to_dict() for r in records[:1000]] == dicts[:1000]
+
+    print(f"records            : {N}")
+    print(f"dict per record    : {dict_bytes / N:8.1f} byte")
+    print(f"Activity per record: {record_bytes / N:8.1f} byte")
+    print(f"penghematan        : {(1 - record_bytes / dict_bytes) * 100:8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
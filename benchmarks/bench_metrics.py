@@ -0,0 +1,55 @@
+# benchmarks/bench_metrics.py
+"""Mengukur overhead instrumentasi (activity_metrics) pada operasi store.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_metrics.py [jumlah_aktivitas]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_activities
+from modules import activity_metrics
+from modules.activity_store import JsonActivityStore
+
+REPEAT = 20000
+FILTERS = {"kategori": "Akademik", "status": "Dalam Proses"}
+
+
+# Fungsi untuk store JSON di memori (operasi baca tidak menyentuh jurnal)
+def make_store(n):
+    return JsonActivityStore(journal=object(), activities=make_activities(n))
+
+
+def per_call_us(func, *args, **kwargs):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func(*args, **kwargs)
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) >= 2 else 10000
+    store = make_store(n)
+    operations = [
+        ("count", store.count, (), FILTERS),
+        ("query 25", store.query, (), {**FILTERS, "limit": 25}),
+        ("get", store.get, (n // 2,), {}),
+    ]
+    print(f"aktivitas: {n}, {REPEAT} panggilan per operasi")
+    for name, func, args, kwargs in operations:
+        raw = per_call_us(func.__wrapped__, store, *args, **kwargs)
+        activity_metrics.disable()
+        disabled = per_call_us(func, *args, **kwargs)
+        activity_metrics.enable()
+        enabled = per_call_us(func, *args, **kwargs)
+        print(f"  {name:<9} tanpa decorator {raw:7.2f} us  nonaktif {disabled:7.2f} us  "
+              f"aktif {enabled:7.2f} us")
+    activity_metrics.dump()
+    print()
+
+
+if __name__ == "__main__":
+    main()
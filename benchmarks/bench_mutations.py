@@ -0,0 +1,90 @@
+# benchmarks/bench_mutations.py
+"""Latensi add/edit/delete terhadap ukuran koleksi: scan list vs store.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_mutations.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_activities
+from modules import activity_store, journal_store
+
+SIZES = [1000, 10000, 100000]
+OPS = 200
+
+
+# Fungsi untuk mutasi dengan cara lama (pencarian linear di list)
+def bench_list(activities):
+    ids = [a['id'] for a in activities[-OPS:]]
+    timings = {}
+
+    start = time.perf_counter()
+    for activity_id in ids:
+        activity = next(a for a in activities if a['id'] == activity_id)
+        activity['status'] = "Selesai"
+    timings['edit'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for activity_id in ids:
+        activities = [a for a in activities if a['id'] != activity_id]
+    timings['delete'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(OPS):
+        activities.append({"id": -i, "nama": "baru"})
+    timings['add'] = time.perf_counter() - start
+    return timings
+
+
+# Fungsi untuk mutasi lewat JsonActivityStore (peta ID + index)
+def bench_store(activities, directory):
+    journal = journal_store.ActivityJournal(
+        os.path.join(directory, "activities.json"),
+        os.path.join(directory, "activities.journal"),
+        compact_threshold=10 ** 9,
+        fsync=False,
+    )
+    journal.write_snapshot(activities)
+    store = activity_store.JsonActivityStore(journal)
+    ids = [a['id'] for a in activities[-OPS:]]
+    timings = {}
+
+    start = time.perf_counter()
+    for activity_id in ids:
+        store.update(activity_id, {"status": "Selesai"})
+    timings['edit'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for activity_id in ids:
+        store.delete(activity_id)
+    timings['delete'] = time.perf_counter() - start
+
+    template = dict(activities[0])
+    start = time.perf_counter()
+    for _ in range(OPS):
+        store.add({**template, "id": store.new_id()})
+    timings['add'] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    print(f"{'n':>8} {'mode':>6} {'add (us)':>10} {'edit (us)':>10} {'delete (us)':>12}")
+    for n in SIZES:
+        for mode in ("list", "store"):
+            activities = make_activities(n)
+            if mode == "list":
+                timings = bench_list(activities)
+            else:
+                with tempfile.TemporaryDirectory() as directory:
+                    timings = bench_store(activities, directory)
+            print(f"{n:>8} {mode:>6} {timings['add'] / OPS * 1e6:>10.1f} "
+                  f"{timings['edit'] / OPS * 1e6:>10.1f} {timings['delete'] / OPS * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
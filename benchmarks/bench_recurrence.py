@@ -0,0 +1,131 @@
+# benchmarks/bench_recurrence.py
+"""Aktivitas berulang: aturan + kejadian lazy vs. satu aktivitas per kejadian.
+
+Sejumlah aturan sintetis (harian, mingguan, setiap N hari) dibuat dengan
+seed tetap untuk beberapa panjang periode. Untuk setiap periode dibandingkan:
+
+- materialized   setiap kejadian disimpan sebagai aktivitas (cara lama lewat
+                 add_activity_form): ukuran JSON, ukuran di memori, dan
+                 JsonActivityStore.upcoming 7 hari
+- rules          RecurrenceStore: ukuran file, ukuran di memori,
+                 upcoming 7 hari dan kejadian satu jendela 30 hari
+
+Angka rules seharusnya sama untuk semua periode (sebanding jumlah aturan);
+angka materialized tumbuh bersama jumlah kejadian.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_recurrence.py [--rules 50] [--periods 120 365 1460]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_suite import measure
+from modules import activity_recurrence, activity_store, journal_store
+from modules.activity_cache import deep_sizeof
+from modules.activity_model import CATEGORIES, PRIORITIES, STATUS_OPTIONS
+
+RULES = 50
+PERIODS = [120, 365, 1460]  # Satu semester, satu tahun, empat tahun (hari)
+STEPS = [("Harian", 1), ("Harian", 3), ("Mingguan", 1), ("Mingguan", 2)]
+SEED = 42
+TODAY = date(2026, 9, 15)  # Tanggal acuan tetap agar hasil dapat diulang
+
+
+# Fungsi untuk membuat aturan sintetis
+def make_rules(n, period, seed=SEED):
+    rng = random.Random(seed)
+    start = TODAY - timedelta(days=period // 2)
+    rules = []
+    for i in range(n):
+        frequency, interval = rng.choice(STEPS)
+        rules.append({
+            "nama": f"Kegiatan rutin {i}",
+            "kategori": rng.choice(CATEGORIES),
+            "prioritas": rng.choice(PRIORITIES),
+            "deskripsi": "Kegiatan yang berulang sepanjang periode",
+            "catatan": "",
+            "mulai": (start + timedelta(days=rng.randrange(7))).isoformat(),
+            "frekuensi": frequency,
+            "interval": interval,
+            "sampai": (start + timedelta(days=period)).isoformat(),
+            "tanggal_dibuat": "2026-01-01 08:00:00",
+        })
+    return rules
+
+
+# Fungsi untuk mengukur satu panjang periode
+def run_period(n, period, directory):
+    path = os.path.join(directory, f"recurrences-{period}.jsonl")
+    store = activity_recurrence.RecurrenceStore(path)
+    for rule in make_rules(n, period):
+        store.add(rule)
+    rng = random.Random(SEED)
+    # Sebagian kejadian lampau sudah selesai (status disimpan jarang)
+    for rule in store.all():
+        for day in activity_recurrence.occurrence_dates(rule, end=TODAY):
+            if rng.random() < 0.5:
+                store.set_status(rule['id'], day, rng.choice(STATUS_OPTIONS[1:]))
+
+    # Cara lama: setiap kejadian satu aktivitas
+    materialized = []
+    for occurrence in activity_recurrence.expand(store.all()):
+        activity = occurrence.to_dict()
+        activity.pop('aturan')
+        activity['id'] = len(materialized) + 1
+        materialized.append(activity)
+    window_end = TODAY + timedelta(days=29)
+    # Aktivitas per kejadian lewat store JSON yang dipakai aplikasi (index deadline)
+    journal = journal_store.ActivityJournal(os.path.join(directory, f"activities-{period}.jsonl"),
+                                            os.path.join(directory, f"activities-{period}.journal"), fsync=False)
+    journal.write_snapshot(materialized)
+    activities = activity_store.JsonActivityStore(journal)
+
+    return {
+        "period_days": period,
+        "rules": len(store),
+        "occurrences": len(materialized),
+        "materialized": {
+            "json_bytes": len(json.dumps(materialized, ensure_ascii=False).encode("utf-8")),
+            "resident_bytes": deep_sizeof(materialized),
+            "upcoming": measure(lambda: activities.upcoming(7, today=TODAY)),
+        },
+        "rules_store": {
+            "json_bytes": os.path.getsize(path),
+            "resident_bytes": store.resident_size(),
+            "upcoming": measure(lambda: store.upcoming(7, today=TODAY)),
+            "window_30d": measure(lambda: store.occurrences(TODAY, window_end)),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aturan berulang vs. aktivitas per kejadian")
+    parser.add_argument("--rules", type=int, default=RULES)
+    parser.add_argument("--periods", type=int, nargs="+", default=PERIODS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = [run_period(args.rules, period, directory) for period in args.periods]
+
+    print(f"{args.rules} aturan, tanggal acuan {TODAY}")
+    print(f"  {'periode':>8} {'kejadian':>9} | {'JSON lama':>10} {'upcoming':>9} | "
+          f"{'JSON aturan':>11} {'upcoming':>9} {'30 hari':>9}")
+    for result in results:
+        old, new = result["materialized"], result["rules_store"]
+        print(f"  {result['period_days']:>8} {result['occurrences']:>9} | "
+              f"{old['json_bytes'] / 1024:>8.1f}KB {old['upcoming']['median_ms']:>7.3f}ms | "
+              f"{new['json_bytes'] / 1024:>9.1f}KB {new['upcoming']['median_ms']:>7.3f}ms "
+              f"{new['window_30d']['median_ms']:>7.3f}ms")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
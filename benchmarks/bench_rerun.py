@@ -0,0 +1,232 @@
+# benchmarks/bench_rerun.py
+"""Mengukur waktu rerun dan ukuran payload websocket per interaksi di halaman daftar.
+
+Menjalankan `streamlit run app.py` headless dengan data sintetis, lalu
+bertindak sebagai browser lewat websocket /_stcore/stream: membuka halaman
+Daftar Aktivitas, pindah halaman daftar, memilih status baru, dan menekan
+"Update Status" bergantian antara dua status yang tidak menyentuh "Selesai".
+Untuk setiap aksi dicatat waktu sampai script selesai, jumlah ForwardMsg,
+dan byte yang diterima. Widget di dalam fragment dikirim dengan
+fragment_id-nya (fragment terdalam), sama seperti frontend Streamlit.
+
+Jalankan dari root proyek (Streamlit >= 1.37):
+    python benchmarks/bench_rerun.py [--size 10000] [--repeat 10] [--app PATH]
+
+Untuk perbandingan sebelum/sesudah, jalankan dengan --app ke app.py milik
+checkout lain (misalnya git worktree commit sebelumnya).
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.websocket import websocket_connect
+
+from benchmarks.synthetic import make_realistic_activities
+from modules import journal_store
+from modules.activity_model import STATUS_OPTIONS
+
+APP_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+STATUSES = ["Belum Dimulai", "Dalam Proses"]
+STARTUP_TIMEOUT = 60
+RUN_TIMEOUT = 120
+
+
+# Fungsi untuk port TCP yang sedang bebas
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# Fungsi untuk menulis data sintetis ke direktori data sementara
+def write_data(directory, n):
+    activities = make_realistic_activities(n)
+    # Aktivitas pertama di halaman pertama dipakai untuk perubahan status
+    activities[0]["status"] = STATUSES[0]
+    journal = journal_store.ActivityJournal(
+        os.path.join(directory, "activities.jsonl"), os.path.join(directory, "activities.journal")
+    )
+    journal.write_snapshot(activities)
+
+
+class BrowserSession:
+    """Klien websocket minimal yang meniru frontend Streamlit"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.widgets = {}  # id widget -> (jenis elemen, label, fragment_id)
+        self.values = {}  # id widget -> WidgetState terakhir yang dikirim
+
+    # Fungsi untuk mencari id widget dari key pengguna (yang terakhir dirender)
+    def widget_id(self, key):
+        for widget_id in reversed(self.widgets):
+            if widget_id.endswith(f"-{key}"):
+                return widget_id
+        raise KeyError(key)
+
+    def widget_with_prefix(self, prefix):
+        for widget_id in reversed(self.widgets):
+            if f"-{prefix}" in widget_id:
+                return widget_id
+        raise KeyError(prefix)
+
+    def widget_with_label(self, label):
+        for widget_id, (_, widget_label, _) in self.widgets.items():
+            if widget_label == label:
+                return widget_id
+        raise KeyError(label)
+
+    # Fungsi untuk satu rerun: kirim status widget, tunggu script selesai
+    async def rerun(self, trigger=None, **values):
+        """`values`: id widget -> (nama field WidgetState, nilai)"""
+        for widget_id, (field, value) in values.items():
+            self.values[widget_id] = (field, value)
+        message = BackMsg()
+        client = message.rerun_script
+        client.SetInParent()
+        fragment_ids = set()
+        for widget_id, (field, value) in self.values.items():
+            state = client.widget_states.widgets.add(id=widget_id)
+            setattr(state, field, value)
+        if trigger:
+            client.widget_states.widgets.add(id=trigger, trigger_value=True)
+        for widget_id in [*values, trigger]:
+            if widget_id in self.widgets and self.widgets[widget_id][2]:
+                fragment_ids.add(self.widgets[widget_id][2])
+        if fragment_ids:
+            client.fragment_id = fragment_ids.pop()
+
+        start = time.perf_counter()
+        await self.connection.write_message(message.SerializeToString(), binary=True)
+        count = size = 0
+        while True:
+            data = await asyncio.wait_for(self.connection.read_message(), RUN_TIMEOUT)
+            if data is None:
+                raise ConnectionError("Websocket ditutup oleh server")
+            count += 1
+            size += len(data)
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof("type")
+            if kind == "delta":
+                self._record_widget(forward.delta)
+            elif kind == "script_finished" and forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                break
+        return {"ms": (time.perf_counter() - start) * 1000, "messages": count, "bytes": size,
+                "fragment": bool(client.fragment_id)}
+
+    def _record_widget(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        widget = getattr(element, kind, None)
+        widget_id = getattr(widget, "id", "")
+        if widget_id.startswith("$$ID-"):
+            # Id widget ikut berubah jika parameternya berubah (misalnya index
+            # default setelah status disimpan); urutan dict = urutan render
+            self.widgets.pop(widget_id, None)
+            self.widgets[widget_id] = (kind, widget.label, delta.fragment_id)
+
+
+# Fungsi untuk skenario interaksi pada server yang sedang berjalan
+async def run_scenario(port, repeat):
+    connection = await websocket_connect(f"ws://127.0.0.1:{port}/_stcore/stream")
+    session = BrowserSession(connection)
+    results = {"buka aplikasi": [], "buka halaman daftar": [], "pindah halaman daftar": [],
+               "pilih status": [], "update status": []}
+    results["buka aplikasi"].append(await session.rerun())
+    nav = session.widget_with_label("📋 Daftar Aktivitas")
+    results["buka halaman daftar"].append(await session.rerun(trigger=nav))
+
+    page = session.widget_id("activity_page")
+    for i in range(repeat):
+        results["pindah halaman daftar"].append(await session.rerun(**{page: ("int_value", 2)}))
+        results["pindah halaman daftar"].append(await session.rerun(**{page: ("int_value", 1)}))
+
+    for i in range(repeat):
+        status = session.widget_with_prefix("status_1")
+        target = STATUSES[(i + 1) % 2]
+        results["pilih status"].append(
+            await session.rerun(**{status: ("int_value", STATUS_OPTIONS.index(target))})
+        )
+        update = session.widget_id("update_1")
+        results["update status"].append(await session.rerun(trigger=update))
+        # Setelah disimpan, widget status dibuat ulang dengan nilai baru
+        session.values.pop(status, None)
+        session.widgets.pop(status, None)
+        session.widgets.pop(update, None)
+    connection.close()
+    return results
+
+
+# Fungsi untuk menunggu server Streamlit siap
+def wait_for_server(port, process):
+    deadline = time.time() + STARTUP_TIMEOUT
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Server Streamlit berhenti saat dijalankan")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError("Server Streamlit tidak siap")
+
+
+def summarize(runs):
+    return {
+        "runs": len(runs),
+        "median_ms": round(statistics.median(run["ms"] for run in runs), 2),
+        "median_bytes": int(statistics.median(run["bytes"] for run in runs)),
+        "median_messages": int(statistics.median(run["messages"] for run in runs)),
+        "fragment": any(run["fragment"] for run in runs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Waktu rerun dan payload websocket halaman daftar")
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--app", default=APP_FILE, help="app.py yang diukur")
+    args = parser.parse_args()
+    app_file, n, repeat = os.path.abspath(args.app), args.size, args.repeat
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_data(directory, n)
+        port = free_port()
+        env = dict(os.environ, ACTIVITY_DATA_DIR=directory, ACTIVITY_METRICS="0")
+        process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", app_file,
+             "--server.headless", "true", "--server.port", str(port),
+             "--server.enableXsrfProtection", "false", "--browser.gatherUsageStats", "false"],
+            cwd=os.path.dirname(app_file), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_for_server(port, process)
+            results = asyncio.run(run_scenario(port, repeat))
+        finally:
+            process.terminate()
+            process.wait()
+
+    print(f"aplikasi: {app_file}, aktivitas: {n}, ulangan: {repeat}")
+    summary = {action: summarize(runs) for action, runs in results.items()}
+    for action, stats in summary.items():
+        print(f"  {action:<22} median {stats['median_ms']:8.2f} ms  {stats['median_bytes']:8d} byte  "
+              f"{stats['median_messages']:4d} pesan  {'fragment' if stats['fragment'] else 'aplikasi'}")
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
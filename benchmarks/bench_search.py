@@ -0,0 +1,120 @@
+# benchmarks/bench_search.py
+"""Mengukur pencarian teks: pemindaian substring vs inverted index vs FTS5.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_search.py [jumlah_aktivitas ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_activities
+from modules.activity_index import ActivityIndex
+from modules.activity_model import Activity
+from modules.activity_store import SQLiteActivityStore
+
+SIZES = [10000, 100000]
+REPEAT = 20
+WORDS = """
+    rapat anggota laporan keuangan tugas kuliah praktikum kimia fisika biologi
+    ujian tengah semester akhir seminar proposal skripsi bimbingan dosen
+    kepanitiaan acara pentas seni lomba debat bahasa inggris olahraga futsal
+    basket latihan rutin kajian diskusi kelompok presentasi makalah jurnal
+    penelitian lapangan pengabdian masyarakat desa bakti sosial donor darah
+    pelatihan kepemimpinan organisasi himpunan mahasiswa evaluasi program kerja
+    anggaran dana sponsor publikasi desain poster video dokumentasi absensi
+    piket kebersihan kelas asistensi responsi kuis remedial magang kantor
+    wawancara beasiswa pendaftaran berkas administrasi surat izin peminjaman
+    ruangan aula gedung perpustakaan buku referensi revisi bab metode hasil
+""".split()
+# Kata pengisi yang sering muncul (termasuk stopword)
+FILLERS = "dan untuk yang di ke dari dengan bersama minggu ini besok pagi siang malam".split()
+QUERIES = ["rapat", "laporan keuangan", "pres", "skripsi bab", "lomba debat inggris", "lomba debat ing"]
+
+
+# Fungsi untuk membuat aktivitas dengan teks yang bervariasi
+def make_text_activities(n, seed=7):
+    rng = random.Random(seed)
+    activities = make_activities(n, seed)
+    for activity in activities:
+        activity['nama'] = " ".join(rng.choices(WORDS, k=rng.randint(2, 4)))
+        activity['deskripsi'] = " ".join(rng.choices(WORDS + FILLERS, k=rng.randint(6, 20)))
+        activity['catatan'] = " ".join(rng.choices(WORDS + FILLERS, k=rng.randint(0, 8)))
+    return activities
+
+
+# Fungsi untuk mencari dengan pemindaian substring (cara tanpa index)
+def search_with_scan(activities, text):
+    words = text.lower().split()
+    return [
+        a['id'] for a in activities
+        if all(any(word in (a.get(field) or "").lower() for field in ("nama", "deskripsi", "catatan"))
+               for word in words)
+    ]
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = func(*args, **kwargs)
+    return (time.perf_counter() - start) / REPEAT * 1000, result
+
+
+# Fungsi untuk query baru (skor belum ada di cache index)
+def fresh_search(index, query, **kwargs):
+    index.text._cache.clear()
+    return index.search(query, **kwargs)
+
+
+def bench_memory(n, activities):
+    index = ActivityIndex(activities)
+    start = time.perf_counter()
+    index.text
+    build = (time.perf_counter() - start) * 1000
+    print(f"[memori] aktivitas: {n}, bangun index teks: {build:.0f} ms, kosakata: {len(index.text.postings)}")
+    for query in QUERIES:
+        scan_ms, _ = timed(search_with_scan, activities, query)
+        fresh_ms, (total, _) = timed(fresh_search, index, query, limit=25)
+        page_ms, _ = timed(index.search, query, limit=25, offset=25)
+        filtered_ms, _ = timed(fresh_search, index, query, kategori="Akademik", status="Dalam Proses", limit=25)
+        print(f"  {query!r:<24} cocok {total:>6}  scan {scan_ms:7.1f} ms  index {fresh_ms:6.2f} ms  "
+              f"halaman 2 {page_ms:5.2f} ms  +filter {filtered_ms:6.2f} ms")
+
+    # Mutasi: index diperbarui per aktivitas, bukan dibangun ulang
+    activity = activities[n // 2]
+    start = time.perf_counter()
+    for i in range(REPEAT):
+        activity['deskripsi'] = f"revisi laporan keuangan ke-{i}"
+        index.update(activity['id'], {'deskripsi': activity['deskripsi']})
+    update_ms = (time.perf_counter() - start) / REPEAT * 1000
+    print(f"  update satu aktivitas: {update_ms:.3f} ms")
+
+
+def bench_sqlite(n, activities):
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteActivityStore(os.path.join(directory, "activities.db"))
+        start = time.perf_counter()
+        store.add_many(activities)
+        build = (time.perf_counter() - start) * 1000
+        print(f"[sqlite] aktivitas: {n}, simpan + index FTS5: {build:.0f} ms")
+        for query in QUERIES:
+            search_ms, (total, _) = timed(store.search, query, limit=25)
+            filtered_ms, _ = timed(store.search, query, kategori="Akademik", status="Dalam Proses", limit=25)
+            print(f"  {query!r:<24} cocok {total:>6}  FTS5 {search_ms:7.2f} ms  +filter {filtered_ms:7.2f} ms")
+        store._connect().close()
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    for n in sizes:
+        raw = make_text_activities(n)
+        bench_memory(n, [Activity.from_dict(a) for a in raw])
+        bench_sqlite(n, raw)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+# benchmarks/bench_suite.py
+"""Suite benchmark yang dapat diulang: skala aplikasi pada 1k..1M aktivitas.
+
+Untuk setiap ukuran data, proses terpisah (data dir sementara) membuat
+aktivitas sintetis realistis dengan seed tetap, lalu mengukur:
+
+- save_activities / load_activities (snapshot + jurnal)
+- membuka store dari cache bersama (dingin)
+- filter kategori/status/prioritas: loop list lama vs. store.count + query
+- upcoming_activities (layanan, termasuk aturan berulang) vs. store.upcoming
+- satu rerun headless setiap halaman lewat Streamlit AppTest
+
+Hasil ditulis sebagai JSON (median/min/max ms per operasi) beserta commit,
+versi Python/Streamlit, seed, dan tanggal acuan, sehingga dua hasil dapat
+dibandingkan dengan --compare untuk menangkap regresi. Tanggal acuan
+bawaan tetap (TODAY), jadi data sintetis sama di hari apa pun; filter
+upcoming memakai tanggal acuan, halaman AppTest memakai tanggal sebenarnya.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_suite.py [--sizes 1000 10000] [--backend json|sqlite]
+                                     [--output hasil.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_realistic_activities
+
+SIZES = [1000, 10000, 100000, 1000000]
+SEED = 42
+TODAY = "2026-09-15"  # Tanggal acuan tetap agar hasil dari hari berbeda dapat dibandingkan
+APP_FILE = os.path.join(ROOT, "app.py")
+PAGES = ["Beranda", "Tambah Aktivitas", "Daftar Aktivitas", "Tips & Trik", "Profiling"]
+FILTERS = {
+    "semua": {},
+    "kategori": {"kategori": "Akademik"},
+    "kategori+status": {"kategori": "Organisasi", "status": "Dalam Proses"},
+    "status+prioritas": {"status": "Selesai", "prioritas": "Tinggi"},
+}
+PAGE_SIZE = 25
+MAX_RUNS = 15
+TIME_BUDGET = 3.0  # Detik per operasi; operasi lambat cukup diukur sekali
+APPTEST_TIMEOUT = 900
+# Median lebih lambat dari ambang ini (dan dari selisih minimum) dianggap regresi
+REGRESSION_THRESHOLD = 0.20
+REGRESSION_MIN_MS = 0.5
+
+
+# Fungsi untuk mengukur satu operasi berulang kali
+def measure(func, setup=None):
+    """Menjalankan `func` hingga MAX_RUNS kali atau TIME_BUDGET detik.
+
+    `setup` (opsional) dipanggil sebelum setiap run tanpa diukur, dan
+    hasilnya diberikan ke `func`.
+    """
+    times = []
+    started = time.perf_counter()
+    while len(times) < MAX_RUNS and (not times or time.perf_counter() - started < TIME_BUDGET):
+        args = (setup(),) if setup else ()
+        begin = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - begin)
+    return {
+        "runs": len(times),
+        "median_ms": round(statistics.median(times) * 1000, 4),
+        "min_ms": round(min(times) * 1000, 4),
+        "max_ms": round(max(times) * 1000, 4),
+    }
+
+
+# Fungsi untuk filter cara lama: loop atas seluruh list aktivitas
+def filter_list(activities, filters):
+    matched = [a for a in activities if all(a.get(field) == value for field, value in filters.items())]
+    return len(matched), matched[:PAGE_SIZE]
+
+
+# Fungsi untuk satu rerun halaman lewat AppTest
+def new_app_test(page):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP_FILE, default_timeout=APPTEST_TIMEOUT)
+    app.session_state["current_page"] = page
+    app.session_state["admin_mode"] = True
+    return app
+
+
+def cold_app_test(page):
+    from modules import activity_service
+
+    activity_service.store_cache.invalidate()
+    return new_app_test(page)
+
+
+def run_app_test(app):
+    app.run()
+    if app.exception:
+        raise RuntimeError(f"Halaman gagal dirender: {app.exception[0].value}")
+
+
+# Fungsi untuk seluruh pengukuran pada satu ukuran data (dijalankan di proses worker)
+def run_worker(n, seed, today):
+    # Diimpor di sini: activity_service membaca ACTIVITY_DATA_DIR saat diimpor
+    from modules import activity_service
+
+    results = {}
+    activities = make_realistic_activities(n, seed, today)
+
+    # Data diikat sebagai default lambda agar bisa dibuang dengan del setelah diukur
+    results["save_activities"] = measure(lambda activities=activities: activity_service.save_activities(activities))
+    snapshot_bytes = os.path.getsize(activity_service.DATA_FILE)
+    results["load_activities"] = measure(activity_service.load_activities)
+    loaded = activity_service.load_activities()
+    del activities
+
+    results["store.open"] = measure(lambda _: activity_service.get_store(), setup=activity_service.store_cache.invalidate)
+    store = activity_service.get_store()
+
+    for name, filters in FILTERS.items():
+        results[f"filter.list.{name}"] = measure(lambda loaded=loaded: filter_list(loaded, filters))
+        results[f"filter.store.{name}"] = measure(
+            lambda: (store.count(**filters), store.query(**filters, limit=PAGE_SIZE))
+        )
+
+    # Jalur yang dipakai Beranda dan API: store + kejadian aturan berulang
+    results["upcoming_activities"] = measure(lambda: activity_service.upcoming_activities(7, today=today))
+    results["store.upcoming"] = measure(lambda: store.upcoming(days=7, today=today))
+    del loaded
+
+    # Rerun setelah cache store dikosongkan: termasuk memuat data dari disk
+    results["app.cold_start"] = measure(run_app_test, setup=lambda: cold_app_test("Beranda"))
+    for page in PAGES:
+        results[f"page.{page}"] = measure(run_app_test, setup=lambda: new_app_test(page))
+
+    return {"records": n, "snapshot_bytes": snapshot_bytes, "operations": results}
+
+
+# Fungsi untuk menjalankan satu ukuran data di proses terpisah
+def run_size(n, args):
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "result.json")
+        env = dict(os.environ, ACTIVITY_DATA_DIR=directory, ACTIVITY_STORAGE=args.backend, ACTIVITY_METRICS="0")
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", str(n), "--seed", str(args.seed),
+             "--today", args.today, "--worker-output", output],
+            env=env, cwd=ROOT, check=True
+        )
+        with open(output, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+# Fungsi untuk informasi lingkungan agar hasil dapat dibandingkan
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    import streamlit
+    return {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "streamlit": streamlit.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+# Fungsi untuk membandingkan hasil dengan baseline
+def compare(results, baseline):
+    """Mengembalikan daftar regresi (ukuran, operasi, ms lama, ms baru)"""
+    regressions = []
+    for size, current in results["sizes"].items():
+        previous = baseline.get("sizes", {}).get(size)
+        if not previous:
+            continue
+        for name, stats in current["operations"].items():
+            old = previous["operations"].get(name)
+            if not old:
+                continue
+            new_ms, old_ms = stats["median_ms"], old["median_ms"]
+            if new_ms > old_ms * (1 + REGRESSION_THRESHOLD) and new_ms - old_ms > REGRESSION_MIN_MS:
+                regressions.append((size, name, old_ms, new_ms))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite benchmark aktivitas mahasiswa")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--today", default=TODAY, help="Tanggal acuan sebaran deadline (YYYY-MM-DD)")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="File JSON hasil sebelumnya")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        result = run_worker(args.worker, args.seed, date.fromisoformat(args.today))
+        with open(args.worker_output, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return
+
+    results = {
+        "suite": "activity-bench",
+        "format": 1,
+        "seed": args.seed,
+        "today": args.today,
+        "backend": args.backend,
+        "environment": environment(),
+        "sizes": {},
+    }
+    for n in args.sizes:
+        print(f"aktivitas: {n}", flush=True)
+        result = results["sizes"][str(n)] = run_size(n, args)
+        for name, stats in result["operations"].items():
+            print(f"  {name:<30} median {stats['median_ms']:10.2f} ms  "
+                  f"min {stats['min_ms']:10.2f} ms  ({stats['runs']}x)", flush=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"hasil ditulis ke {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if (baseline.get("seed"), baseline.get("today")) != (args.seed, args.today):
+            # Data sintetis berbeda: angka tidak dapat dibandingkan
+            sys.exit(f"seed/tanggal acuan baseline ({baseline.get('seed')}, {baseline.get('today')}) berbeda "
+                     f"dari run ini ({args.seed}, {args.today}); jalankan dengan --seed/--today yang sama")
+        if baseline.get("backend") != args.backend:
+            print("peringatan: backend baseline berbeda, perbandingan kurang bermakna")
+        regressions = compare(results, baseline)
+        for size, name, old_ms, new_ms in regressions:
+            print(f"REGRESI {size:>8} {name:<30} {old_ms:10.2f} ms -> {new_ms:10.2f} ms")
+        if regressions:
+            sys.exit(1)
+        print(f"tidak ada regresi dibanding {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
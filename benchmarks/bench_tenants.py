@@ -0,0 +1,132 @@
+# benchmarks/bench_tenants.py
+"""Latensi per request untuk banyak tenant (partisi data per pemilik).
+
+Untuk setiap jumlah tenant, proses terpisah (data dir sementara) mengisi
+setiap tenant dengan aktivitas sintetis, lalu mengukur request milik satu
+tenant acak dari sekumpulan tenant aktif (store sudah di cache):
+
+- directory.lookup   pencarian shard pemilik
+- request.list       list_activities(status=..., limit=25)
+- request.stats      activity_stats()
+- request.create     create_activity() (satu entri jurnal)
+- tenant.open        membuka store satu tenant dari disk (cache dibuang)
+- global.list        filter yang sama pada satu partisi berisi data semua
+                     tenant, seperti sebelum ada partisi
+
+Angka request.* dan tenant.open seharusnya tidak bergantung pada jumlah
+tenant; global.list tumbuh bersama total data.
+
+Jalankan dari root proyek:
+    python benchmarks/bench_tenants.py [--tenants 10 100 1000 5000] [--per-tenant 100]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_suite import measure
+from benchmarks.synthetic import make_realistic_activities
+
+TENANTS = [10, 100, 1000, 5000]
+PER_TENANT = 100
+ACTIVE_TENANTS = 100  # Tenant yang sedang aktif (store-nya ada di cache)
+SEED = 42
+NEW_ACTIVITY = {"nama": "Tugas baru", "kategori": "Akademik", "deadline": "2030-01-01", "prioritas": "Sedang"}
+
+
+# Fungsi untuk nama pemilik tenant ke-i
+def owner_name(i):
+    return f"mahasiswa{i:05d}@kampus.ac.id"
+
+
+# Fungsi untuk seluruh pengukuran pada satu jumlah tenant (dijalankan di proses worker)
+def run_worker(tenants, per_tenant, seed):
+    # Diimpor di sini: activity_service membaca ACTIVITY_DATA_DIR saat diimpor
+    from modules import activity_service
+
+    rng = random.Random(seed)
+    everyone = []
+    for i in range(tenants):
+        activities = make_realistic_activities(per_tenant, seed + i)
+        activity_service.save_activities(activities, owner=owner_name(i))
+        everyone.extend(activities)
+    # Partisi bersama berisi data semua tenant (model sebelum partisi), ID dibuat unik
+    for new_id, activity in enumerate(everyone, 1):
+        activity['id'] = new_id
+    activity_service.save_activities(everyone)
+    del everyone
+
+    active = [owner_name(i) for i in rng.sample(range(tenants), min(tenants, ACTIVE_TENANTS))]
+    for owner in active:
+        activity_service.get_store(owner)
+
+    def pick():
+        return rng.choice(active)
+
+    def open_tenant():
+        owner = owner_name(rng.randrange(tenants))
+        activity_service.store_cache.invalidate((activity_service.STORAGE_BACKEND, owner))
+        return owner
+
+    results = {
+        "directory.lookup": measure(lambda owner: activity_service.shards.shard_for(owner), setup=pick),
+        "request.list": measure(
+            lambda owner: activity_service.list_activities(status="Dalam Proses", limit=25, owner=owner), setup=pick
+        ),
+        "request.stats": measure(lambda owner: activity_service.activity_stats(owner=owner), setup=pick),
+        "request.create": measure(lambda owner: activity_service.create_activity(NEW_ACTIVITY, owner=owner),
+                                  setup=pick),
+        "tenant.open": measure(lambda owner: activity_service.get_store(owner), setup=open_tenant),
+    }
+    activity_service.get_store()
+    results["global.list"] = measure(lambda: activity_service.list_activities(status="Dalam Proses", limit=25))
+    return {"tenants": tenants, "per_tenant": per_tenant, "operations": results}
+
+
+# Fungsi untuk menjalankan satu jumlah tenant di proses terpisah
+def run_tenants(tenants, args):
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "result.json")
+        env = dict(os.environ, ACTIVITY_DATA_DIR=directory, ACTIVITY_STORAGE=args.backend, ACTIVITY_METRICS="0")
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", str(tenants), "--per-tenant",
+             str(args.per_tenant), "--seed", str(args.seed), "--worker-output", output],
+            env=env, cwd=ROOT, check=True
+        )
+        with open(output, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latensi request per tenant")
+    parser.add_argument("--tenants", type=int, nargs="+", default=TENANTS)
+    parser.add_argument("--per-tenant", type=int, default=PER_TENANT)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        result = run_worker(args.worker, args.per_tenant, args.seed)
+        with open(args.worker_output, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return
+
+    results = [run_tenants(tenants, args) for tenants in args.tenants]
+    names = list(results[0]["operations"])
+    print(f"median ms per request, {args.per_tenant} aktivitas per tenant, backend {args.backend}")
+    print(f"  {'operasi':<18}" + "".join(f"{result['tenants']:>12}" for result in results))
+    for name in names:
+        print(f"  {name:<18}" + "".join(f"{result['operations'][name]['median_ms']:12.3f}" for result in results))
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
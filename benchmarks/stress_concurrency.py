@@ -0,0 +1,142 @@
+# benchmarks/stress_concurrency.py
+"""Uji beban penulisan bersamaan: banyak proses x thread pada satu store.
+
+Setiap worker menjalankan campuran mutasi: menaikkan satu penghitung
+bersama (baca-ubah-tulis dengan deteksi bentrok + retry), menambah,
+mengubah, dan menghapus aktivitasnya sendiri. Di akhir, data dimuat ulang
+dari disk dan diperiksa bahwa tidak ada update yang hilang.
+
+Jalankan dari root proyek:
+    python benchmarks/stress_concurrency.py [json|sqlite] [proses] [thread] [operasi]
+"""
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import activity_store, journal_store
+
+COUNTER_ID = 1
+
+
+# Fungsi untuk membuat store pada direktori uji
+def open_store(backend, directory):
+    if backend == "sqlite":
+        return activity_store.SQLiteActivityStore(os.path.join(directory, "activities.db"))
+    journal = journal_store.ActivityJournal(
+        os.path.join(directory, "activities.json"),
+        os.path.join(directory, "activities.journal"),
+        compact_threshold=200,
+        fsync=False,
+    )
+    return activity_store.JsonActivityStore(journal)
+
+
+def new_activity(name):
+    return {
+        "nama": name, "kategori": "Akademik", "deadline": "2025-06-01",
+        "prioritas": "Sedang", "deskripsi": "", "catatan": "",
+        "status": "Belum Dimulai", "tanggal_dibuat": "2025-01-01 08:00:00",
+    }
+
+
+# Fungsi untuk satu thread worker
+def run_thread(store, seed, operations, result):
+    rng = random.Random(seed)
+    own_ids, deleted = [], []
+    increments = conflicts = 0
+    for _ in range(operations):
+        roll = rng.random()
+        if roll < 0.4:
+            # Penghitung bersama: retry sampai tidak bentrok
+            while True:
+                store.reload()
+                base = store.get(COUNTER_ID).to_dict()
+                try:
+                    store.update(COUNTER_ID, {"catatan": str(int(base['catatan']) + 1)}, base=base)
+                    increments += 1
+                    break
+                except activity_store.ConflictError:
+                    conflicts += 1
+        elif roll < 0.7 or not own_ids:
+            own_ids.append(store.add(new_activity(f"worker-{seed}"))['id'])
+        elif roll < 0.85:
+            store.update(rng.choice(own_ids), {"status": "Dalam Proses"})
+        else:
+            activity_id = own_ids.pop(rng.randrange(len(own_ids)))
+            store.delete(activity_id)
+            deleted.append(activity_id)
+    result.update(own_ids=own_ids, deleted=deleted, increments=increments,
+                  conflicts=conflicts, operations=operations)
+
+
+# Fungsi untuk satu proses worker (beberapa thread berbagi satu store)
+def run_process(backend, directory, process_no, threads, operations, queue):
+    store = open_store(backend, directory)
+    results = [{} for _ in range(threads)]
+    workers = [
+        threading.Thread(target=run_thread, args=(store, process_no * 1000 + i, operations, results[i]))
+        for i in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    queue.put(results)
+
+
+def main():
+    backend = sys.argv[1] if len(sys.argv) > 1 else "json"
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    operations = int(sys.argv[4]) if len(sys.argv) > 4 else 200
+
+    with tempfile.TemporaryDirectory() as directory:
+        counter = new_activity("penghitung")
+        counter.update(id=COUNTER_ID, catatan="0")
+        open_store(backend, directory).add(counter)
+
+        queue = multiprocessing.Queue()
+        start = time.perf_counter()
+        workers = [
+            multiprocessing.Process(target=run_process,
+                                    args=(backend, directory, p, threads, operations, queue))
+            for p in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        results = [r for _ in workers for r in queue.get()]
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+
+        # Verifikasi dari store yang baru dimuat dari disk
+        store = open_store(backend, directory)
+        increments = sum(r['increments'] for r in results)
+        surviving = [i for r in results for i in r['own_ids']]
+        deleted = [i for r in results for i in r['deleted']]
+        counter_value = int(store.get(COUNTER_ID)['catatan'])
+        missing = [i for i in surviving if store.get(i) is None]
+        resurrected = [i for i in deleted if store.get(i) is not None]
+        total_ops = sum(r['operations'] for r in results)
+
+        print(f"backend          : {backend} ({processes} proses x {threads} thread)")
+        print(f"operasi          : {total_ops} dalam {elapsed:.2f} s "
+              f"({total_ops / elapsed:.0f} operasi/detik)")
+        print(f"bentrok (retry)  : {sum(r['conflicts'] for r in results)}")
+        print(f"penghitung       : {counter_value} (diharapkan {increments})")
+        print(f"jumlah aktivitas : {store.count()} (diharapkan {len(surviving) + 1})")
+        print(f"hilang / muncul lagi: {len(missing)} / {len(resurrected)}")
+        ok = (counter_value == increments and not missing and not resurrected
+              and store.count() == len(surviving) + 1)
+        print("HASIL            :", "OK, tidak ada update yang hilang" if ok else "GAGAL")
+        sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
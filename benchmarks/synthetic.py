@@ -0,0 +1,104 @@
+# benchmarks/synthetic.py
+"""Generator data aktivitas sintetis (deterministik berdasarkan seed)."""
+import itertools
+import random
+from datetime import date, datetime, timedelta
+
+CATEGORIES = ["Akademik", "Organisasi", "Lainnya"]
+PRIORITIES = ["Tinggi", "Sedang", "Rendah"]
+STATUS_OPTIONS = ["Belum Dimulai", "Dalam Proses", "Selesai"]
+
+
+# Fungsi untuk membuat data aktivitas sintetis
+def make_activities(n, seed=42):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "nama": f"Aktivitas {i}",
+            "kategori": rng.choice(CATEGORIES),
+            "deadline": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "prioritas": rng.choice(PRIORITIES),
+            "deskripsi": "Deskripsi aktivitas",
+            "catatan": "",
+            "status": rng.choice(STATUS_OPTIONS),
+            "tanggal_dibuat": "2025-01-01 08:00:00",
+        }
+        for i in range(n)
+    ]
+
+
+# Variabel konstan untuk data realistis
+CATEGORY_WEIGHTS = [55, 30, 15]
+PRIORITY_WEIGHTS = [25, 50, 25]
+SUBJECTS = [
+    "Kalkulus", "Fisika Dasar", "Kimia", "Biologi", "Statistika", "Basis Data",
+    "Pemrograman", "Jaringan Komputer", "Bahasa Inggris", "Metodologi Penelitian",
+]
+ORGANIZATIONS = ["BEM", "Himpunan", "UKM Seni", "UKM Olahraga", "Panitia Dies Natalis", "Pers Mahasiswa"]
+NAME_TEMPLATES = {
+    "Akademik": ["Tugas {}", "Kuis {}", "Praktikum {}", "Laporan {}", "Ujian {}", "Presentasi {}"],
+    "Organisasi": ["Rapat {}", "Proposal acara {}", "Laporan keuangan {}", "Evaluasi program {}"],
+    "Lainnya": ["Latihan futsal", "Les bahasa", "Kerja paruh waktu", "Servis motor", "Daftar beasiswa"],
+}
+DESCRIPTION_WORDS = (
+    "kerjakan bab revisi kelompok dosen materi jadwal ruang kumpulkan draf data "
+    "anggaran peserta dokumentasi sponsor kampus online bahan slide catat"
+).split()
+# Sebaran deadline relatif terhadap tanggal acuan: (bobot, hari minimum, hari maksimum)
+DEADLINE_SPREAD = [(25, -180, -1), (15, 0, 7), (30, 8, 30), (30, 31, 365)]
+# Status berdasarkan deadline: sudah lewat, 7 hari ke depan, lebih jauh
+STATUS_WEIGHTS = {"lewat": [10, 20, 70], "dekat": [35, 50, 15], "jauh": [60, 30, 10]}
+
+
+# Fungsi untuk membuat data aktivitas sintetis yang realistis
+def make_realistic_activities(n, seed=42, today=None):
+    """Aktivitas dengan nama, teks, sebaran deadline, dan status yang wajar.
+
+    Deadline disebar di sekitar `today` (bawaan hari ini): sebagian sudah
+    lewat, sebagian dalam 7 hari, sisanya hingga setahun ke depan. Status
+    mengikuti deadline dan tanggal dibuat/diperbarui tidak pernah melewati
+    `today`. Hasil sama persis untuk `n`, `seed`, dan `today` yang sama.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    now = datetime.combine(today, datetime.min.time()) + timedelta(hours=12)
+    spreads = [(lo, hi) for _, lo, hi in DEADLINE_SPREAD]
+    # Bobot kumulatif dihitung sekali agar rng.choices tidak mengulanginya per record
+    spread_weights = list(itertools.accumulate(weight for weight, _, _ in DEADLINE_SPREAD))
+    category_weights = list(itertools.accumulate(CATEGORY_WEIGHTS))
+    priority_weights = list(itertools.accumulate(PRIORITY_WEIGHTS))
+    status_weights = {when: list(itertools.accumulate(weights)) for when, weights in STATUS_WEIGHTS.items()}
+    midnight = datetime.min.time()
+    activities = []
+    for i in range(1, n + 1):
+        kategori = rng.choices(CATEGORIES, cum_weights=category_weights)[0]
+        template = rng.choice(NAME_TEMPLATES[kategori])
+        topic = rng.choice(SUBJECTS if kategori == "Akademik" else ORGANIZATIONS)
+        lo, hi = rng.choices(spreads, cum_weights=spread_weights)[0]
+        offset = rng.randint(lo, hi)
+        deadline = today + timedelta(days=offset)
+        when = "lewat" if offset < 0 else "dekat" if offset <= 7 else "jauh"
+        status = rng.choices(STATUS_OPTIONS, cum_weights=status_weights[when])[0]
+        created = min(
+            datetime.combine(deadline, midnight)
+            - timedelta(days=rng.randint(1, 60), minutes=rng.randint(0, 1439)),
+            now - timedelta(minutes=rng.randint(1, 1439)),
+        )
+        activity = {
+            "id": i,
+            "nama": template.format(topic),
+            "kategori": kategori,
+            "deadline": deadline.isoformat(),
+            "prioritas": rng.choices(PRIORITIES, cum_weights=priority_weights)[0],
+            "deskripsi": " ".join(rng.sample(DESCRIPTION_WORDS, rng.randint(3, 8))) if rng.random() < 0.6 else "",
+            "catatan": " ".join(rng.sample(DESCRIPTION_WORDS, rng.randint(2, 5))) if rng.random() < 0.3 else "",
+            "status": status,
+            "tanggal_dibuat": created.isoformat(" "),
+        }
+        if status != "Belum Dimulai":
+            span = max(int((now - created).total_seconds() // 60), 1)
+            updated = created + timedelta(minutes=rng.randint(1, span))
+            activity["tanggal_diperbarui"] = updated.isoformat(" ")
+        activities.append(activity)
+    return activities
@@ -0,0 +1,152 @@
+# modules/change_feed.py
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from modules.activity_store import LOCAL_CHANGE
+
+# Umpan perubahan untuk beberapa proses aplikasi (replika) yang memakai
+# data yang sama. Setiap store di cache melaporkan ID yang ditambah, diubah,
+# dan dihapus ke umpan ini (listener store); perubahan dari proses lain
+# dibaca bertahap oleh thread pengamat: sisa jurnal JSON (dideteksi lewat
+# stat file) atau baris baru tabel changes SQLite. Biayanya sebanding dengan
+# jumlah perubahan, bukan jumlah aktivitas.
+#
+# Event: seq, owner, asal (LOCAL_CHANGE/REMOTE_CHANGE), sesi, ditambah,
+# diubah, dihapus, muat_ulang (perubahan tidak bisa dirinci), waktu.
+# Sesi Streamlit membaca event dengan since(seq) seperti inbox pengingat.
+
+# Variabel konstan
+FEED_SIZE = 1000  # Event terakhir yang disimpan untuk sesi yang tertinggal
+POLL_SECONDS = 0.5
+
+_session = threading.local()
+
+
+# Fungsi untuk menandai perubahan yang dibuat oleh sebuah sesi
+@contextmanager
+def session(token):
+    """Event yang diterbitkan thread ini selama blok berisi ``sesi`` = `token`"""
+    previous = getattr(_session, 'token', None)
+    _session.token = token
+    try:
+        yield
+    finally:
+        _session.token = previous
+
+
+class ChangeFeed:
+    """Event perubahan aktivitas dalam proses ini, bernomor urut.
+
+    `get_stores` mengembalikan store yang sedang di cache; thread pengamat
+    memanggil ``sync_changes()`` setiap store itu tiap `poll_seconds`,
+    sehingga perubahan dari proses lain masuk ke data di memori dan ke umpan
+    tanpa menunggu request berikutnya. `subscribe` untuk pemakai yang ingin
+    didorong (callback dipanggil di thread penerbit, harus cepat).
+    """
+
+    def __init__(self, get_stores=None, poll_seconds=POLL_SECONDS, size=FEED_SIZE):
+        self.get_stores = get_stores
+        self.poll_seconds = poll_seconds
+        self.events = deque(maxlen=size)
+        # Nomor event terakhir yang terbuang dari `events`, per owner
+        self._dropped = {}
+        self.last_error = None
+        self._seq = 0
+        self._subscribers = []
+        self._stopping = False
+        self._thread = None
+        self._condition = threading.Condition()
+
+    @property
+    def seq(self):
+        """Nomor event terakhir"""
+        with self._condition:
+            return self._seq
+
+    # Fungsi untuk menerbitkan perubahan satu partisi (listener store)
+    def publish(self, owner, origin, added=(), updated=(), deleted=(), reload=False):
+        with self._condition:
+            self._seq += 1
+            event = {
+                'seq': self._seq,
+                'owner': owner,
+                'asal': origin,
+                'sesi': getattr(_session, 'token', None) if origin == LOCAL_CHANGE else None,
+                'ditambah': list(added),
+                'diubah': list(updated),
+                'dihapus': list(deleted),
+                'muat_ulang': reload,
+                'waktu': time.time(),
+            }
+            if len(self.events) == self.events.maxlen:
+                self._dropped[self.events[0]['owner']] = self.events[0]['seq']
+            self.events.append(event)
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(event)
+        return event
+
+    # Fungsi untuk berlangganan event baru
+    def subscribe(self, callback):
+        """Mengembalikan fungsi untuk berhenti berlangganan"""
+        with self._condition:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._condition:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    # Fungsi untuk event yang belum dilihat sebuah sesi
+    def since(self, seq, owner=None):
+        """(event milik `owner` dengan nomor > `seq`, True jika ada event `owner` yang sudah terbuang)"""
+        with self._condition:
+            # Event partisi lain yang terbuang tidak membuat sesi ini memuat ulang
+            missed = self._dropped.get(owner, 0) > seq
+            return [event for event in self.events if event['seq'] > seq and event['owner'] == owner], missed
+
+    # Fungsi untuk menjalankan thread pengamat (aman dipanggil berulang kali)
+    def start(self):
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="change-feed", daemon=True)
+            self._thread.start()
+
+    # Fungsi untuk menghentikan thread pengamat
+    def stop(self, timeout=None):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    # Fungsi untuk satu putaran pengamat
+    def poll(self):
+        """Membaca perubahan dari proses lain untuk semua store di cache"""
+        for store in self.get_stores():
+            store.sync_changes()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._stopping:
+                    self._condition.wait(self.poll_seconds)
+                if self._stopping:
+                    return
+            try:
+                self.poll()
+                self.last_error = None
+            except Exception as e:
+                # Misalnya file sedang diganti atau database terkunci: coba lagi
+                self.last_error = e
+
+
+# Fungsi untuk jumlah aktivitas yang disebut sebuah event
+def changed_count(event):
+    return len(event['ditambah']) + len(event['diubah']) + len(event['dihapus'])
+
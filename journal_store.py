@@ -0,0 +1,440 @@
+# modules/journal_store.py
+import json
+import os
+import shutil
+import threading
+import time
+
+from modules import activity_metrics
+from modules.activity_loader import RecordError, iter_records
+from modules.file_lock import FileLock
+
+
+# Variabel konstan
+SNAPSHOT_FILE = "data/activities.jsonl"
+JOURNAL_FILE = "data/activities.journal"
+COMPACT_THRESHOLD = 1000  # Jumlah entri jurnal sebelum snapshot dipadatkan
+
+
+def _json_default(obj):
+    # Record bertipe (misalnya Activity) diserialisasi lewat to_dict()
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Objek {type(obj).__name__} tidak dapat diserialisasi ke JSON")
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, default=_json_default)
+
+
+def _batch_chunks(op, activities):
+    # Satu entri JSON {"op": ..., "data": [...]} yang di-encode per aktivitas
+    yield f'{{"op": "{op}", "data": ['
+    for i, activity in enumerate(activities):
+        yield (", " if i else "") + _dumps(activity)
+    yield "]}"
+
+
+class ActivityJournal:
+    """Penyimpanan aktivitas berbasis snapshot + jurnal append-only.
+
+    Setiap mutasi (insert/update/delete) ditambahkan sebagai satu baris JSON
+    ke file jurnal, sehingga biaya tulis per mutasi tetap konstan berapa pun
+    jumlah aktivitasnya. Snapshot dipadatkan ulang di background setelah
+    jurnal mencapai ``compact_threshold`` entri.
+
+    Snapshot ``.jsonl`` ditulis satu aktivitas per baris; nama lain memakai
+    format array JSON lama. Selama snapshot ``.jsonl`` belum ada, file
+    ``.json`` lama dengan nama yang sama dibaca sebagai gantinya. Snapshot
+    dibaca secara streaming, dan record yang rusak dicatat di
+    ``load_errors`` tanpa membuang record lain.
+
+    Semua penulisan memegang lock file lintas proses. Journal mencatat
+    posisi baca terakhirnya, sehingga entri yang ditulis proses lain bisa
+    diambil lewat ``read_new_entries()`` tanpa memuat ulang semuanya.
+    """
+
+    def __init__(self, snapshot_file=SNAPSHOT_FILE, journal_file=JOURNAL_FILE,
+                 compact_threshold=COMPACT_THRESHOLD, fsync=True):
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file
+        # Jurnal yang sedang dipadatkan dipindahkan ke file ini
+        self.rotated_file = journal_file + ".1"
+        self.legacy_file = snapshot_file[:-1] if snapshot_file.endswith(".jsonl") else None
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+        self.journal_entries = 0
+        self.lock = FileLock(journal_file + ".lock")
+        self._compact_lock = FileLock(journal_file + ".compact.lock")
+        self._compact_thread = None
+        # Posisi file yang sudah dibaca/ditulis oleh objek ini
+        self._identity = None
+        self._offset = 0
+        self._pending = []
+        self._needs_reload = False
+        self.load_errors = []
+
+    # Fungsi untuk memuat snapshot lalu memutar ulang jurnal
+    def load(self, factory=None):
+        """Mengembalikan daftar aktivitas dari snapshot + jurnal.
+
+        `factory` (misalnya Activity.from_dict) dipanggil untuk setiap record
+        saat dibaca, sehingga dict mentah tidak perlu disimpan seluruhnya.
+        Record yang rusak dicatat di ``load_errors``. Record lama tanpa ID
+        diberi ID baru yang langsung ditulis ke snapshot, agar jurnal dan
+        pemadatan berikutnya memakai ID yang sama.
+        """
+        activities, missing = self._load(factory)
+        if missing:
+            self._assign_missing_ids()
+            activities, _ = self._load(factory)
+        return activities
+
+    def _load(self, factory):
+        # Mengembalikan (aktivitas, True jika snapshot berisi record tanpa ID)
+        with self.lock, activity_metrics.timer("journal.load") as span:
+            errors = []
+            by_id = self._read_snapshot(errors, factory)
+            missing = None in by_id
+            self._replay(by_id, self._read_journal(self.rotated_file, errors=errors)[0], factory)
+            entries, offset = self._read_journal(self.journal_file, errors=errors)
+            self._replay(by_id, entries, factory)
+            self.load_errors = errors
+            self.journal_entries = len(entries)
+            self._mark_position(offset)
+            span.records = len(by_id)
+            return list(by_id.values()), missing
+
+    # Fungsi untuk membaca entri baru dari proses lain
+    def read_new_entries(self):
+        """Entri jurnal yang belum dibaca sejak load()/pembacaan terakhir.
+
+        Mengembalikan None jika snapshot atau jurnal sudah dirotasi oleh
+        proses lain, sehingga pemanggil harus memanggil load() lagi.
+        """
+        with self.lock:
+            if self._needs_reload or not self._same_files():
+                return None
+            entries, self._pending = self._pending, []
+            new_entries, offset = self._read_journal(self.journal_file, self._offset)
+            entries.extend(new_entries)
+            self.journal_entries += len(new_entries)
+            self._mark_position(offset)
+            return entries
+
+    # Fungsi untuk memeriksa perubahan oleh proses lain tanpa lock
+    def has_foreign_changes(self):
+        """True jika file di disk berbeda dari posisi terakhir objek ini"""
+        if self._pending or self._needs_reload or not self._same_files():
+            return True
+        return self._file_size(self.journal_file) != self._offset
+
+    # Fungsi untuk mencatat aktivitas baru
+    def insert(self, activity):
+        """Menambahkan entri insert ke jurnal"""
+        self._append({"op": "insert", "data": activity})
+
+    # Fungsi untuk mencatat banyak aktivitas baru sekaligus
+    def insert_many(self, activities):
+        """Menambahkan satu entri untuk seluruh batch.
+
+        Batch ditulis sebagai satu baris (di-encode bertahap), sehingga jika
+        proses mati saat menulis, baris terpotong dibuang dan tidak ada
+        aktivitas batch yang setengah tersimpan.
+        """
+        activities = list(activities)
+        if activities:
+            self._append(_batch_chunks("insert_many", activities), weight=len(activities))
+
+    # Fungsi untuk mencatat perubahan field aktivitas
+    def update(self, activity_id, changes):
+        """Menambahkan entri update (hanya field yang berubah) ke jurnal"""
+        self._append({"op": "update", "id": activity_id, "data": changes})
+
+    # Fungsi untuk mencatat perubahan banyak aktivitas sekaligus
+    def update_many(self, updates):
+        """Satu entri (satu baris) untuk pasangan (id, perubahan), seperti insert_many"""
+        updates = [[activity_id, changes] for activity_id, changes in updates]
+        if updates:
+            self._append(_batch_chunks("update_many", updates), weight=len(updates))
+
+    # Fungsi untuk mencatat penghapusan aktivitas
+    def delete(self, activity_id):
+        """Menambahkan entri delete ke jurnal"""
+        self._append({"op": "delete", "id": activity_id})
+
+    # Fungsi untuk mencatat penghapusan banyak aktivitas sekaligus
+    def delete_many(self, activity_ids):
+        activity_ids = list(activity_ids)
+        if activity_ids:
+            self._append({"op": "delete_many", "data": activity_ids}, weight=len(activity_ids))
+
+    # Fungsi untuk menulis snapshot penuh
+    def write_snapshot(self, activities):
+        """Menulis seluruh aktivitas ke snapshot dan mengosongkan jurnal"""
+        with self._compact_lock, self.lock:
+            self._write_snapshot_file(activities)
+            for path in (self.rotated_file, self.journal_file):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.journal_entries = 0
+            self._pending = []
+            self._needs_reload = False
+            self._mark_position(0)
+
+    # Fungsi untuk memadatkan jurnal ke snapshot
+    @activity_metrics.timed("journal.compact")
+    def compact(self):
+        """Menggabungkan snapshot + jurnal menjadi snapshot baru"""
+        # Hanya satu proses yang memadatkan; proses lain cukup melewatinya
+        if not self._compact_lock.acquire(blocking=False):
+            return
+        try:
+            with self.lock:
+                # Jurnal hasil rotasi yang gagal dipadatkan tetap dipakai ulang
+                if not os.path.exists(self.rotated_file):
+                    if not os.path.exists(self.journal_file):
+                        return
+                    self._catch_up_before_write()
+                    os.replace(self.journal_file, self.rotated_file)
+                    self.journal_entries = 0
+                    self._offset = 0
+                    self._after_own_rotation()
+
+            # Snapshot baru dibangun di luar lock agar mutasi tidak tertahan
+            by_id = self._read_snapshot([])
+            self._replay(by_id, self._read_journal(self.rotated_file)[0])
+            tmp_file = self._write_tmp(list(by_id.values()))
+
+            with self.lock:
+                self._catch_up_before_write()
+                os.replace(tmp_file, self.snapshot_file)
+                os.remove(self.rotated_file)
+                self._after_own_rotation()
+        finally:
+            self._compact_lock.release()
+
+    # Fungsi untuk memadatkan jurnal di background
+    def compact_in_background(self):
+        """Menjalankan compact() di thread daemon jika belum berjalan"""
+        if self._compact_thread is not None and self._compact_thread.is_alive():
+            return self._compact_thread
+        self._compact_thread = threading.Thread(
+            target=self._compact_safely, name="journal-compaction", daemon=True
+        )
+        self._compact_thread.start()
+        return self._compact_thread
+
+    def _assign_missing_ids(self):
+        # Urutan lock sama dengan write_snapshot() dan compact()
+        with self._compact_lock, self.lock:
+            path = self._snapshot_path()
+            snapshot = list(iter_records(path)) if os.path.exists(path) else []
+            missing = [activity for activity in snapshot if activity.get('id') is None]
+            if not missing:
+                return
+            # ID unik, lebih besar dari semua ID angka yang sudah ada
+            next_id = max([int(time.time() * 1000)] + [
+                activity['id'] + 1 for activity in snapshot
+                if isinstance(activity.get('id'), int)
+            ])
+            for offset, activity in enumerate(missing):
+                activity['id'] = next_id + offset
+            self._write_snapshot_file(snapshot)
+
+    def _compact_safely(self):
+        try:
+            self.compact()
+        except OSError:
+            # Jurnal rotasi dibiarkan dan digabung lagi pada pemadatan berikutnya
+            pass
+
+    def _append(self, entry, weight=1):
+        # Entri berupa dict, atau potongan teks (batch) agar tidak dibuat utuh di memori
+        chunks = [_dumps(entry)] if isinstance(entry, dict) else entry
+        with self.lock, activity_metrics.timer("journal.append") as span:
+            self._catch_up_before_write()
+            self._ensure_dir(self.journal_file)
+            with open(self.journal_file, 'ab') as f:
+                start = f.tell()
+                # Baris terpotong dari proses yang mati tidak boleh menyambung
+                if start > 0 and not self._ends_with_newline():
+                    f.write(b"\n")
+                for chunk in chunks:
+                    f.write(chunk.encode('utf-8'))
+                f.write(b"\n")
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+                offset = f.tell()
+            span.records = weight
+            span.bytes = offset - start
+            self.journal_entries += weight
+            self._mark_position(offset)
+            should_compact = self.journal_entries >= self.compact_threshold
+        if should_compact:
+            self.compact_in_background()
+
+    def _catch_up_before_write(self):
+        # Entri proses lain disimpan dulu agar posisi baca tidak melompatinya
+        if not self._same_files():
+            self._needs_reload = True
+        elif self._file_size(self.journal_file) != self._offset:
+            entries, offset = self._read_journal(self.journal_file, self._offset)
+            self._pending.extend(entries)
+            self.journal_entries += len(entries)
+            self._offset = offset
+
+    def _ends_with_newline(self):
+        with open(self.journal_file, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _files(self):
+        return (self._stat_key(self.snapshot_file), self._inode(self.rotated_file),
+                self._inode(self.journal_file))
+
+    def _same_files(self):
+        if self._identity is None:
+            return False
+        snapshot, rotated, journal = self._files()
+        # Jurnal yang baru dibuat (sebelumnya tidak ada) masih bisa dibaca dari awal
+        journal_ok = journal == self._identity[2] or self._identity[2] is None
+        return (snapshot, rotated) == self._identity[:2] and journal_ok
+
+    def _mark_position(self, offset):
+        self._identity = self._files()
+        self._offset = offset
+
+    def _after_own_rotation(self):
+        # Rotasi/penggantian snapshot oleh proses ini tidak perlu load ulang
+        if not self._needs_reload:
+            self._identity = self._files()
+
+    @staticmethod
+    def _stat_key(path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _inode(path):
+        try:
+            return os.stat(path).st_ino
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _file_size(path):
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    def _snapshot_path(self):
+        if self.legacy_file and not os.path.exists(self.snapshot_file) \
+                and os.path.exists(self.legacy_file):
+            return self.legacy_file
+        return self.snapshot_file
+
+    def _read_snapshot(self, errors, factory=None):
+        # Mengembalikan {id: aktivitas}; record rusak masuk ke `errors`
+        path = self._snapshot_path()
+        by_id = {}
+        if not os.path.exists(path):
+            return by_id
+        snapshot_errors = []
+        for activity in iter_records(path, snapshot_errors):
+            if factory is not None:
+                activity = factory(activity)
+            by_id[activity.get('id')] = activity
+        if snapshot_errors:
+            errors.extend(snapshot_errors)
+            self._preserve_corrupt(path)
+        return by_id
+
+    @staticmethod
+    def _preserve_corrupt(path):
+        # Salinan asli disimpan sebelum snapshot ditulis ulang tanpa record rusak
+        backup = path + ".corrupt"
+        if not os.path.exists(backup):
+            shutil.copyfile(path, backup)
+
+    def _read_journal(self, path, offset=0, errors=None):
+        # Mengembalikan (entri, posisi byte setelah baris lengkap terakhir)
+        if not os.path.exists(path):
+            return [], 0
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        entries = []
+        for line_no, line in enumerate(data[:end].splitlines(), start=1):
+            try:
+                entries.append(json.loads(line))
+            except ValueError as e:
+                # Baris bisa terpotong jika proses mati saat menulis
+                if errors is not None and line.strip():
+                    errors.append(RecordError(path, line_no, f"entri jurnal tidak valid ({e})",
+                                              line.decode('utf-8', 'replace')))
+                continue
+        return entries, offset + end
+
+    def _replay(self, by_id, entries, factory=None):
+        # Pemutaran ulang bersifat idempoten: aman diulang di atas snapshot baru
+        for entry in entries:
+            op = entry.get('op')
+            if op == "insert":
+                activity = entry['data']
+                if factory is not None:
+                    activity = factory(activity)
+                by_id[activity.get('id')] = activity
+            elif op == "insert_many":
+                for activity in entry['data']:
+                    if factory is not None:
+                        activity = factory(activity)
+                    by_id[activity.get('id')] = activity
+            elif op == "update":
+                activity = by_id.get(entry['id'])
+                if activity is not None:
+                    activity.update(entry['data'])
+            elif op == "update_many":
+                for activity_id, changes in entry['data']:
+                    activity = by_id.get(activity_id)
+                    if activity is not None:
+                        activity.update(changes)
+            elif op == "delete":
+                by_id.pop(entry['id'], None)
+            elif op == "delete_many":
+                for activity_id in entry['data']:
+                    by_id.pop(activity_id, None)
+
+    def _write_snapshot_file(self, activities):
+        os.replace(self._write_tmp(activities), self.snapshot_file)
+
+    def _write_tmp(self, activities):
+        self._ensure_dir(self.snapshot_file)
+        tmp_file = f"{self.snapshot_file}.{os.getpid()}.tmp"
+        with activity_metrics.timer("journal.write_snapshot") as span, open(tmp_file, 'w', encoding='utf-8') as f:
+            if self.snapshot_file.endswith(".jsonl"):
+                count = 0
+                for activity in activities:
+                    f.write(json.dumps(activity, ensure_ascii=False, default=_json_default) + "\n")
+                    count += 1
+                span.records = count
+            else:
+                json.dump(activities, f, indent=4, ensure_ascii=False, default=_json_default)
+                span.records = len(activities)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            span.bytes = f.tell()
+        return tmp_file
+
+    @staticmethod
+    def _ensure_dir(path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
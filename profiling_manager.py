@@ -0,0 +1,67 @@
+# modules/profiling_manager.py
+import streamlit as st
+import json
+
+from modules import activity_metrics
+
+# Halaman admin tersembunyi: buka aplikasi dengan ?admin=1 agar menu muncul
+
+# Variabel konstan
+TABLE_COLUMNS = ["calls", "errors", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "records", "bytes"]
+
+
+# Fungsi untuk memeriksa mode admin
+def is_admin():
+    """True jika sesi ini pernah dibuka dengan query ?admin=1"""
+    if not st.session_state.get("admin_mode"):
+        st.session_state.admin_mode = st.query_params.get("admin") == "1"
+    return st.session_state.admin_mode
+
+
+# Fungsi untuk menampilkan halaman profiling
+def display_profiling_page():
+    """Latensi p50/p95/p99, jumlah panggilan, record, dan byte per operasi"""
+    enabled = st.toggle(
+        "Aktifkan instrumentasi",
+        value=activity_metrics.is_enabled(),
+        help="Berlaku untuk seluruh proses (semua sesi). Saat nonaktif overhead hampir nol."
+    )
+    if enabled != activity_metrics.is_enabled():
+        if enabled:
+            activity_metrics.enable()
+        else:
+            activity_metrics.disable()
+        st.rerun()
+
+    snapshot = activity_metrics.snapshot()
+    operations = snapshot["operations"]
+    st.caption(f"Data sejak {snapshot['since']} | PID {snapshot['pid']}")
+
+    if not operations:
+        st.info("Belum ada data. Aktifkan instrumentasi lalu gunakan aplikasi seperti biasa.")
+    else:
+        st.dataframe(
+            [{"operasi": name, **{column: stats[column] for column in TABLE_COLUMNS}}
+             for name, stats in operations.items()],
+            use_container_width=True,
+            hide_index=True
+        )
+
+        # Operasi paling lambat (p95) sebagai grafik
+        slowest = sorted(operations.items(), key=lambda item: item[1]["p95_ms"] or 0, reverse=True)[:10]
+        st.markdown("**10 operasi dengan p95 tertinggi (ms)**")
+        st.bar_chart([{"operasi": name, "p95_ms": stats["p95_ms"]} for name, stats in slowest],
+                     x="operasi", y="p95_ms")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "⬇️ Unduh JSON",
+            data=json.dumps(snapshot, indent=2),
+            file_name="metrics.json",
+            mime="application/json"
+        )
+    with col2:
+        if st.button("🗑️ Reset Statistik"):
+            activity_metrics.reset()
+            st.rerun()
@@ -0,0 +1,349 @@
+# modules/reminder_scheduler.py
+import heapq
+import json
+import os
+import threading
+from collections import deque
+from datetime import datetime, time, timedelta
+
+from modules.activity_model import TIMESTAMP_FORMAT, deadline_of
+from modules.activity_store import DONE_STATUS
+from modules.file_lock import FileLock
+
+# Pengingat deadline di thread latar belakang, tanpa Streamlit.
+#
+# Setiap partisi (pemilik) dan offset (H-7, H-1, terlambat, ...) punya
+# kursor: deadline terakhir yang sudah diingatkan. Min-heap berisi satu
+# entri per partisi dan offset, yaitu waktu pengingat berikutnya yang
+# dihitung dari deadline terdekat setelah kursor lewat store.due_between
+# (index deadline, O(log n)). Thread tidur pada Condition sampai entri
+# teratas jatuh tempo atau ada perubahan data, lalu hanya memeriksa
+# partisi yang jatuh tempo atau berubah.
+#
+# Kursor dan waktu pengingat berikutnya setiap partisi disimpan di file
+# status yang dipakai bersama semua proses/replika: setiap tick membaca
+# ulang kursor di bawah lock file, mengirim pengingat, lalu menyimpan kursor
+# sebelum lock dilepas, sehingga satu pengingat hanya dikirim satu proses.
+# Saat mulai dan setiap RESYNC_SECONDS heap diisi dari file status; hanya
+# partisi yang jatuh tempo atau belum punya jadwal yang dibuka storenya.
+
+# Variabel konstan
+DEFAULT_OFFSETS = [7, 1, -1]  # Hari sebelum deadline; -1 = sehari setelah deadline (terlambat)
+REMINDER_TIME = time(8, 0)  # Jam pengingat dikirim setiap hari
+INBOX_SIZE = 100  # Pengingat terakhir yang disimpan untuk notifikasi di aplikasi
+# Batas tidur: perubahan dari proses lain (dan pemilik baru) tidak membangunkan thread
+RESYNC_SECONDS = 3600
+RETRY_SECONDS = 60
+NEXT_KEY = "berikutnya"  # Kunci waktu pengingat berikutnya di kursor file status
+
+
+# Fungsi untuk label offset pengingat
+def offset_label(days):
+    if days > 0:
+        return f"H-{days}"
+    if days == 0:
+        return "H"
+    return "terlambat" if days == -1 else f"H+{-days}"
+
+
+# Fungsi untuk keterangan sisa waktu sampai deadline
+def offset_text(days):
+    if days > 1:
+        return f"{days} hari lagi"
+    if days == 1:
+        return "besok"
+    if days == 0:
+        return "hari ini"
+    return "sudah lewat deadline"
+
+
+class ReminderScheduler:
+    """Mengirim pengingat deadline ke notifikasi aplikasi dan file outbox.
+
+    `get_owners()` mengembalikan partisi yang dipantau (None = partisi tanpa
+    pemilik) dan `get_store(owner)` store partisi itu; get_store hanya
+    dipanggil untuk partisi yang diperiksa, di luar lock file status, sehingga
+    pemilik baru dan data yang dimuat ulang ikut terbaca. Pengingat dikirim pada
+    REMINDER_TIME di hari (deadline - offset) untuk aktivitas yang belum
+    selesai. Biaya setiap partisi yang diperiksa O(log n + jumlah pengingat
+    yang dikirim).
+    """
+
+    def __init__(self, get_store, outbox_file, state_file, offsets=None, reminder_time=REMINDER_TIME,
+                 get_owners=None):
+        self.get_store = get_store
+        self.get_owners = get_owners or (lambda: [None])
+        self.outbox_file = outbox_file
+        self.state_file = state_file
+        self.lock = FileLock(state_file + ".lock")
+        self.offsets = sorted(set(DEFAULT_OFFSETS if offsets is None else offsets), reverse=True)
+        self.reminder_time = reminder_time
+        self.last_error = None
+        self._inboxes = {}  # Pemilik -> pengingat terakhir
+        self._cursors = {}  # Pemilik -> {offset: tanggal}
+        self._upcoming = {}  # Pemilik -> [(waktu pengingat berikutnya, offset)]
+        self._heap = []
+        self._changed = []
+        self._pending = set()
+        self._resync_at = datetime.min
+        self._dirty = True
+        self._seq = 0
+        self._stopping = False
+        self._thread = None
+        self._condition = threading.Condition()
+
+    # Fungsi untuk menjalankan thread scheduler (aman dipanggil berulang kali)
+    def start(self):
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._dirty = True
+            self._resync_at = datetime.min
+            self._thread = threading.Thread(target=self._run, name="reminder-scheduler", daemon=True)
+            self._thread.start()
+
+    # Fungsi untuk menghentikan thread scheduler
+    def stop(self, timeout=None):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    # Fungsi untuk memberi tahu scheduler bahwa data sebuah partisi berubah
+    def notify(self, owner=None):
+        """Memeriksa ulang partisi `owner` pada kesempatan pertama (misalnya setelah impor)"""
+        with self._condition:
+            self._pending.add(owner)
+            self._dirty = True
+            self._condition.notify()
+
+    # Fungsi untuk aktivitas yang baru dibuat atau deadline-nya diubah
+    def activity_changed(self, activity_id, owner=None):
+        """Mengirim pengingat yang sudah terlewati (misalnya deadline besok) saat tick berikutnya"""
+        with self._condition:
+            if self._thread is None:
+                # Scheduler tidak dijalankan di proses ini (misalnya skrip impor)
+                return
+            self._changed.append((owner, activity_id))
+            self._dirty = True
+            self._condition.notify()
+
+    # Fungsi untuk pengingat yang belum dilihat sebuah sesi
+    def unseen(self, since=0, owner=None):
+        """Pengingat partisi `owner` di inbox dengan nomor urut `seq` > `since` (urut lama ke baru)"""
+        with self._condition:
+            return [reminder for reminder in self._inboxes.get(owner, ()) if reminder['seq'] > since]
+
+    # Fungsi untuk hari pengingat terakhir yang jamnya sudah lewat
+    def _reminder_day(self, now):
+        day = now.date()
+        return day if now.time() >= self.reminder_time else day - timedelta(days=1)
+
+    # Fungsi untuk menunggu tick berikutnya
+    def _wait(self):
+        """Tidur sampai entri heap teratas jatuh tempo, ada perubahan, atau waktu resync.
+
+        Mengembalikan (perubahan, partisi yang diperiksa); None berarti resync dari file status.
+        """
+        with self._condition:
+            while not self._stopping and not self._dirty:
+                wake_at = min(self._heap[0][0], self._resync_at) if self._heap else self._resync_at
+                timeout = (wake_at - datetime.now()).total_seconds()
+                if timeout <= 0:
+                    break
+                self._condition.wait(timeout)
+            now = datetime.now()
+            changed, self._changed = self._changed, []
+            owners, self._pending = self._pending, set()
+            self._dirty = False
+            if now >= self._resync_at:
+                self._resync_at = now + timedelta(seconds=RESYNC_SECONDS)
+                return changed, None
+            owners.update(owner for fire_at, _, _, owner in self._heap if fire_at <= now)
+            return changed, owners
+
+    def _run(self):
+        while True:
+            changed, owners = self._wait()
+            if self._stopping:
+                return
+            try:
+                self.tick(changed, owners=owners)
+                self.last_error = None
+            except Exception as e:
+                # Misalnya store sedang dimuat ulang atau file terkunci: coba lagi nanti
+                self.last_error = e
+                with self._condition:
+                    self._changed[:0] = changed
+                    if owners is None:
+                        self._resync_at = datetime.min
+                    else:
+                        self._pending.update(owners)
+                    self._condition.wait(RETRY_SECONDS)
+                    self._dirty = True
+
+    # Fungsi untuk satu putaran scheduler
+    def tick(self, changed=(), now=None, owners=None):
+        """Mengirim pengingat yang jatuh tempo lalu menghitung ulang heap.
+
+        `changed` berisi (pemilik, ID) aktivitas yang baru dibuat/diubah;
+        `owners` adalah partisi yang diperiksa; None = resync: partisi yang
+        jatuh tempo atau belum punya jadwal di file status.
+        """
+        now = now or datetime.now()
+        day = self._reminder_day(now)
+        changed_ids = {}
+        for owner, activity_id in changed:
+            changed_ids.setdefault(owner, []).append(activity_id)
+        if owners is None:
+            owners = self._due_owners(self._load_state(), now)
+        # Store dibuka sebelum lock file: memuat satu partisi tidak menahan proses lain
+        stores = {owner: self.get_store(owner) for owner in set(owners) | set(changed_ids)}
+
+        reminders = []
+        with self.lock:
+            # Proses lain mungkin sudah mengirim pengingat dan memajukan kursor
+            saved = self._load_state()
+            for owner, store in stores.items():
+                cursors = self._merge_cursors(owner, day, saved.get(owner, {}))
+                for activity_id in changed_ids.get(owner, ()):
+                    activity = store.get(activity_id)
+                    reminder = self._missed_reminder(activity, cursors, owner, now) if activity is not None else None
+                    if reminder:
+                        reminders.append(reminder)
+
+                for days in self.offsets:
+                    due = day + timedelta(days=days)
+                    cursor = cursors[days]
+                    if due <= cursor:
+                        continue
+                    for activity in store.due_between(cursor + timedelta(days=1), due):
+                        reminders.append(self._reminder(activity, days, owner, now))
+                    cursors[days] = due
+
+                upcoming = []
+                for days in self.offsets:
+                    nearest = store.due_between(cursors[days] + timedelta(days=1), None, limit=1)
+                    if nearest:
+                        fire_day = deadline_of(nearest[0]) - timedelta(days=days)
+                        upcoming.append((datetime.combine(fire_day, self.reminder_time), days))
+                self._upcoming[owner] = upcoming
+
+            if reminders:
+                self._deliver(reminders)
+            entries = {owner: self._state_entry(owner) for owner in stores}
+            if any(saved.get(owner) != entry for owner, entry in entries.items()):
+                saved.update(entries)
+                self._save_state(saved)
+
+        # Pemilik berupa teks tidak kosong: "" memisahkan partisi tanpa pemilik saat diurutkan
+        heap = [(fire_at, days, owner or "", owner)
+                for owner, upcoming in self._upcoming.items() for fire_at, days in upcoming]
+        heapq.heapify(heap)
+        with self._condition:
+            self._heap = heap
+        return reminders
+
+    # Fungsi untuk partisi yang perlu dibuka saat resync
+    def _due_owners(self, saved, now):
+        """Partisi yang jatuh tempo atau belum punya jadwal di file status.
+
+        Jadwal partisi lain (mungkin dihitung proses lain) langsung masuk ke
+        heap tanpa membuka storenya.
+        """
+        owners = []
+        for owner in self.get_owners():
+            try:
+                upcoming = [(datetime.fromisoformat(fire_at), days) for fire_at, days in saved[owner][NEXT_KEY]]
+            except (KeyError, TypeError, ValueError):
+                owners.append(owner)
+                continue
+            if upcoming and min(upcoming)[0] <= now:
+                owners.append(owner)
+            else:
+                self._upcoming[owner] = upcoming
+        return owners
+
+    # Fungsi untuk pengingat yang terlewat karena aktivitas baru dibuat/diubah
+    def _missed_reminder(self, activity, cursors, owner, now):
+        # Offset paling mendesak yang kursornya sudah melewati deadline ini;
+        # offset yang belum lewat akan dikirim oleh tick biasa
+        deadline = deadline_of(activity)
+        if deadline is None or activity.get('status') == DONE_STATUS:
+            return None
+        passed = [days for days in self.offsets if deadline <= cursors[days]]
+        return self._reminder(activity, min(passed), owner, now) if passed else None
+
+    def _reminder(self, activity, days, owner, now):
+        # Sisa hari dihitung dari tanggal sebenarnya, bukan offset, karena
+        # pengingat yang terlewat bisa dikirim setelah harinya
+        remaining = (deadline_of(activity) - now.date()).days
+        return {
+            'waktu': now.strftime(TIMESTAMP_FORMAT),
+            'pemilik': owner,
+            'jenis': offset_label(days),
+            'hari': remaining,
+            'id': activity['id'],
+            'nama': activity['nama'],
+            'deadline': activity['deadline'],
+            'pesan': f"{activity['nama']} - deadline {activity['deadline']} ({offset_text(remaining)})",
+        }
+
+    # Fungsi untuk mengirim pengingat ke inbox dan file outbox
+    def _deliver(self, reminders):
+        with self._condition:
+            for reminder in reminders:
+                self._seq += 1
+                reminder['seq'] = self._seq
+                inbox = self._inboxes.get(reminder['pemilik'])
+                if inbox is None:
+                    inbox = self._inboxes[reminder['pemilik']] = deque(maxlen=INBOX_SIZE)
+                inbox.append(reminder)
+        with open(self.outbox_file, 'a', encoding='utf-8') as f:
+            f.write("".join(json.dumps(reminder, ensure_ascii=False) + "\n" for reminder in reminders))
+
+    # Fungsi untuk membaca kursor semua partisi dari file status (dipanggil di bawah self.lock)
+    def _load_state(self):
+        """{pemilik: {offset (teks): tanggal YYYY-MM-DD}}; partisi tanpa pemilik berkunci None"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            saved = dict(state.get('pemilik', {}))
+            saved[None] = state.get('cursors', {})
+        except (OSError, ValueError, AttributeError, TypeError):
+            saved = {}
+        return saved
+
+    # Fungsi untuk kursor satu partisi setelah digabung dengan file status
+    def _merge_cursors(self, owner, day, saved):
+        # Tanpa kursor tersimpan hanya pengingat hari ini yang dikirim, bukan
+        # seluruh pengingat yang pernah terlewat; kursor tidak pernah mundur
+        cursors = self._cursors.setdefault(owner, {})
+        for days in self.offsets:
+            cursor = day + timedelta(days=days - 1)
+            if days in cursors:
+                cursor = max(cursor, cursors[days])
+            try:
+                cursor = max(cursor, datetime.strptime(saved[str(days)], "%Y-%m-%d").date())
+            except (KeyError, TypeError, ValueError):
+                pass
+            cursors[days] = cursor
+        return cursors
+
+    # Fungsi untuk isi file status satu partisi
+    def _state_entry(self, owner):
+        entry = {str(days): cursor.isoformat() for days, cursor in self._cursors[owner].items()}
+        entry[NEXT_KEY] = [[fire_at.isoformat(), days] for fire_at, days in self._upcoming[owner]]
+        return entry
+
+    # Fungsi untuk menyimpan kursor agar pengingat tidak terkirim dua kali
+    def _save_state(self, saved):
+        # Kursor partisi yang tidak diperiksa tick ini tetap dari file (mungkin
+        # sudah dimajukan proses lain)
+        state = {'cursors': saved.pop(None, {}), 'pemilik': saved}
+        tmp_file = self.state_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_file, self.state_file)
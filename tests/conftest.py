@@ -0,0 +1,10 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+
+# Tes dijalankan dari root proyek, seperti skrip di benchmarks/
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# activity_service membaca direktori data saat diimpor: jangan pernah memakai data/ asli
+os.environ["ACTIVITY_DATA_DIR"] = tempfile.mkdtemp(prefix="activity-tests-")
@@ -0,0 +1,59 @@
+# tests/test_activity_analytics.py
+from datetime import date
+
+import pytest
+
+from modules.activity_analytics import AnalyticsCache, ActivityColumns, summarize
+from modules.activity_store import JsonActivityStore, SQLiteActivityStore
+from modules.journal_store import ActivityJournal
+
+TODAY = date(2024, 5, 15)
+ACTIVITIES = [
+    # Selesai tepat waktu, 2 hari setelah dibuat
+    {"id": 1, "nama": "A", "kategori": "Akademik", "prioritas": "Tinggi", "status": "Selesai",
+     "deadline": "2024-05-10", "tanggal_dibuat": "2024-05-01 08:00:00", "tanggal_diperbarui": "2024-05-03 09:00:00"},
+    # Selesai terlambat
+    {"id": 2, "nama": "B", "kategori": "Akademik", "prioritas": "Sedang", "status": "Selesai",
+     "deadline": "2024-05-02", "tanggal_dibuat": "2024-05-01 08:00:00", "tanggal_diperbarui": "2024-05-09 09:00:00"},
+    # Lewat deadline
+    {"id": 3, "nama": "C", "kategori": "Organisasi", "prioritas": "Tinggi", "status": "Dalam Proses",
+     "deadline": "2024-05-14", "tanggal_dibuat": "2024-05-13 08:00:00"},
+    # Berjalan, kategori tidak dikenal dan deadline kosong tetap dihitung
+    {"id": 4, "nama": "D", "kategori": "Lainnya", "prioritas": "Rendah", "status": "Belum Dimulai",
+     "deadline": "2024-05-20", "tanggal_dibuat": "2024-05-14 08:00:00"},
+    {"id": 5, "nama": "E", "kategori": "Hobi", "status": "Belum Dimulai"},
+]
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        store = JsonActivityStore(ActivityJournal(str(tmp_path / "activities.jsonl"),
+                                                  str(tmp_path / "activities.journal"), fsync=False))
+    else:
+        store = SQLiteActivityStore(str(tmp_path / "activities.db"))
+    store.add_many(ACTIVITIES)
+    return store
+
+
+def test_summary_counts(store):
+    summary = summarize(ActivityColumns.from_store(store), TODAY)
+
+    assert (summary['total'], summary['selesai'], summary['persen_selesai']) == (5, 2, 40.0)
+    assert summary['ketepatan'] == {"Selesai tepat waktu": 1, "Selesai terlambat": 1,
+                                    "Berjalan": 1, "Lewat deadline": 1}
+    assert summary['per_kategori'].loc["Akademik", "Persen Selesai"] == 100.0
+    assert summary['per_kategori']["Total"].sum() == 4
+    assert summary['lead_time_median'] == 5.0
+    # Minggu ini (mulai Senin 13 Mei): dua aktivitas dibuat
+    assert summary['mingguan'].iloc[-1].tolist() == [2, 0]
+
+
+def test_cache_recomputes_only_after_a_write(store):
+    cache = AnalyticsCache()
+    first = cache.get(store, TODAY)
+
+    assert cache.get(store, TODAY) is first
+    store.update(4, {"status": "Selesai", "tanggal_diperbarui": "2024-05-15 10:00:00"})
+    assert cache.get(store, TODAY)['selesai'] == 3
+    assert (cache.hits, cache.misses) == (1, 2)
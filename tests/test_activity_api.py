@@ -0,0 +1,46 @@
+# tests/test_activity_api.py
+import json
+
+from modules import activity_service
+from modules.activity_api import dispatch
+
+ACTIVITY = {"nama": "Presentasi", "kategori": "Organisasi", "deadline": "2030-01-01", "prioritas": "Sedang"}
+
+
+# Fungsi untuk satu request JSON ke API tanpa membuka socket
+def request(method, target, payload=None, headers=None):
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    return dispatch(method, target, headers or {}, body)
+
+
+def test_create_get_patch_delete():
+    status, created = request("POST", "/activities", ACTIVITY)
+    assert status == 201 and created['status'] == "Belum Dimulai"
+
+    path = f"/activities/{created['id']}"
+    assert request("GET", path) == (200, created)
+    status, patched = request("PATCH", path, {"status": "Selesai"}, {"if-match": '"1"'})
+    assert status == 200 and patched['versi'] == 2
+    assert request("DELETE", path) == (204, None)
+    assert request("GET", path)[0] == 404
+
+
+def test_errors_map_to_http_status():
+    _, created = request("POST", "/activities", ACTIVITY)
+    path = f"/activities/{created['id']}"
+    request("PATCH", path, {"catatan": "pertama"})
+
+    assert request("PATCH", path, {"catatan": "kedua"}, {"if-match": "1"})[0] == 409
+    status, error = request("POST", "/activities", dict(ACTIVITY, prioritas="Penting"))
+    assert (status, error['field']) == (400, 'prioritas')
+    assert request("DELETE", "/activities/999999")[0] == 404
+    assert request("GET", "/tidak-ada")[0] == 404
+    assert request("PUT", "/activities")[0] == 405
+
+
+def test_internal_key_error_is_not_reported_as_not_found(monkeypatch):
+    def broken(*args, **kwargs):
+        raise KeyError('deadline')
+    monkeypatch.setattr(activity_service, "list_activities", broken)
+
+    assert request("GET", "/activities")[0] == 500
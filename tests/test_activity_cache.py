@@ -0,0 +1,49 @@
+# tests/test_activity_cache.py
+from modules.activity_cache import SharedActivityCache, deep_sizeof
+from modules.activity_store import JsonActivityStore
+from modules.journal_store import ActivityJournal
+
+
+# Fungsi untuk jurnal di direktori sementara
+def make_journal(tmp_path):
+    return ActivityJournal(str(tmp_path / "activities.json"), str(tmp_path / "activities.journal"), fsync=False)
+
+
+# Fungsi untuk cache yang membuat store JSON di direktori sementara
+def make_cache(tmp_path):
+    return SharedActivityCache(lambda key: JsonActivityStore(make_journal(tmp_path)))
+
+
+def test_sessions_share_one_store(tmp_path):
+    cache = make_cache(tmp_path)
+    store = cache.get("json")
+    store.add({"id": 1, "nama": "A"})
+
+    # Tulisan store itu sendiri tidak membuatnya dianggap basi
+    assert cache.get("json") is store
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_external_write_reloads_once(tmp_path):
+    cache = make_cache(tmp_path)
+    store = cache.get("json")
+    make_journal(tmp_path).insert({"id": 2, "nama": "Dari proses lain"})
+
+    assert cache.get("json").get(2)["nama"] == "Dari proses lain"
+    cache.get("json")
+    assert cache.stats()["reloads"] == 1
+    assert cache.get("json") is store
+
+
+def test_invalidate_recreates_store(tmp_path):
+    cache = make_cache(tmp_path)
+    store = cache.get("json")
+    cache.invalidate("json")
+
+    assert cache.get("json") is not store
+
+
+def test_deep_sizeof_counts_nested_data():
+    small = [{"nama": "A"}]
+    large = [{"nama": "A", "deskripsi": "x" * 1000}]
+    assert deep_sizeof(large) > deep_sizeof(small) + 1000
@@ -0,0 +1,66 @@
+# tests/test_activity_history.py
+from modules.activity_history import ActivityHistory, track
+
+
+def make_history(tmp_path, checkpoint_interval=4):
+    return ActivityHistory(str(tmp_path / "history.jsonl"), checkpoint_interval, fsync=False)
+
+
+# Fungsi untuk indeks riwayat yang dapat dibandingkan
+def index_of(history):
+    len(history)  # Membaca baris baru dari file
+    return list(history._offsets), history._by_id, history._checkpoints, history._since_checkpoint
+
+
+def test_updates_store_only_changed_fields(tmp_path):
+    history = make_history(tmp_path)
+    first = {"id": 1, "nama": "Laporan", "status": "Belum Dimulai", "versi": 1}
+    second = dict(first, status="Selesai", versi=2)
+    history.record("insert", 1, after=first)
+    seq = history.record("update", 1, before=first, after=second)
+
+    entry = history.entry(seq)
+    assert entry['data'] == {"status": "Selesai", "versi": 2}
+    assert entry['sebelum'] == {"status": "Belum Dimulai", "versi": 1}
+    assert history.version_at(1, 1) == first and history.version_at(1) == second
+
+
+def test_versions_replay_from_checkpoints(tmp_path):
+    history = make_history(tmp_path)
+    states = [{"id": 1, "catatan": "", "versi": 1}]
+    history.record("insert", 1, after=states[0])
+    for version in range(2, 12):
+        states.append(dict(states[-1], catatan=f"v{version}", versi=version))
+        history.record("update", 1, before=states[-2], after=states[-1])
+    history.record("delete", 1, before=states[-1])
+
+    reopened = make_history(tmp_path)
+    assert [reopened.version_at(1, seq) for seq in range(1, 12)] == states
+    assert reopened.version_at(1) is None
+    assert reopened.entry(12)['sebelum'] == states[-1]
+    assert [entry['op'] for entry in reopened.entries(1, limit=2)] == ["delete", "update"]
+
+
+def test_track_collects_seqs_of_this_block(tmp_path):
+    history = make_history(tmp_path)
+    history.record("insert", 1, after={"id": 1})
+    with track() as seqs:
+        history.record_many([("insert", 2, None, {"id": 2}), ("delete", 1, {"id": 1}, None)])
+
+    assert seqs == [2, 3]
+    assert len(history) == 3
+
+
+def test_index_after_record_many_matches_file(tmp_path):
+    path = str(tmp_path / "history.jsonl")
+    history = ActivityHistory(path, checkpoint_interval=3, fsync=False)
+    history.record_many([("insert", i, None, {"id": i, "nama": f"Tugas {i}"}) for i in range(5)])
+    # Baris terpotong dari proses yang mati di tengah penulisan
+    with open(path, 'ab') as f:
+        f.write(b'{"op":"update","id":1,')
+    for n in range(4):
+        history.record_many([("update", 1, {"id": 1, "nama": f"v{n}"}, {"id": 1, "nama": f"v{n + 1}"})])
+
+    assert index_of(history) == index_of(ActivityHistory(path))
+    assert history.version_at(1) == {"id": 1, "nama": "v4"}
+    assert [entry['sebelum'] for entry in history.entries(1, limit=2)] == [{"nama": "v3"}, {"nama": "v2"}]
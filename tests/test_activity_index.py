@@ -0,0 +1,113 @@
+# tests/test_activity_index.py
+from datetime import date
+
+from modules.activity_index import ActivityIndex, DeadlineIndex
+
+
+TODAY = date(2024, 5, 1)
+
+
+# Fungsi untuk aktivitas contoh
+def make_activity(activity_id, kategori="Akademik", status="Belum Dimulai", prioritas="Sedang"):
+    return {"id": activity_id, "kategori": kategori, "status": status, "prioritas": prioritas}
+
+
+# Fungsi untuk index berisi empat aktivitas
+def make_index():
+    return ActivityIndex([
+        make_activity(1),
+        make_activity(2, kategori="Organisasi"),
+        make_activity(3, status="Selesai"),
+        make_activity(4, kategori="Organisasi", status="Selesai", prioritas="Tinggi"),
+    ])
+
+
+def test_filters_intersect_buckets_in_insertion_order():
+    index = make_index()
+
+    assert index.ids() == [1, 2, 3, 4]
+    assert index.ids(kategori="Organisasi") == [2, 4]
+    assert index.ids(kategori="Organisasi", status="Selesai", prioritas=None) == [4]
+    assert index.ids(kategori="Lainnya") == []
+    assert index.count(status="Selesai") == 2
+    assert index.count(kategori="Akademik", status="Selesai") == 1
+    assert index.count_by("kategori") == {"Akademik": 2, "Organisasi": 2}
+
+
+def test_update_moves_only_changed_fields():
+    index = make_index()
+    index.records[1].update({"status": "Selesai", "nama": "tidak diindex"})
+    index.update(1, {"status": "Selesai", "nama": "tidak diindex"})
+
+    assert index.ids(status="Selesai") == [1, 3, 4]
+    assert index.count_by("status") == {"Selesai": 3, "Belum Dimulai": 1}
+
+
+def test_remove_and_re_add():
+    index = make_index()
+    assert index.remove(2)["id"] == 2
+    assert index.remove(2) is None
+    index.add(make_activity(1, kategori="Lainnya"))
+
+    assert 2 not in index and len(index) == 3
+    # ID yang ditambahkan ulang pindah ke akhir urutan
+    assert index.ids() == [3, 4, 1]
+    assert index.count_by("kategori") == {"Akademik": 1, "Organisasi": 1, "Lainnya": 1}
+
+
+def test_deadline_index_skips_done_and_unparseable():
+    deadlines = DeadlineIndex()
+    deadlines.rebuild([
+        {"id": 1, "deadline": "2024-05-03", "status": "Belum Dimulai"},
+        {"id": 2, "deadline": "2024-05-01", "status": "Selesai"},
+        {"id": 3, "deadline": "bukan tanggal"},
+        {"id": 4, "deadline": "2024-04-20"},
+        {"id": 5, "deadline": "2024-05-01"},
+    ])
+
+    assert len(deadlines) == 3
+    assert deadlines.upcoming(days=7, today=TODAY) == [5, 1]
+    assert deadlines.upcoming(days=7, limit=1, today=TODAY) == [5]
+    assert deadlines.overdue(today=TODAY) == [4]
+
+
+def test_index_keeps_deadlines_in_step_with_updates():
+    index = ActivityIndex([
+        {"id": 1, "deadline": "2024-05-03", "status": "Belum Dimulai"},
+        {"id": 2, "deadline": "2024-05-02", "status": "Belum Dimulai"},
+    ])
+    # Record diperbarui lebih dulu, lalu index
+    index.records[2]["status"] = "Selesai"
+    index.update(2, {"status": "Selesai"})
+    index.add({"id": 3, "deadline": "2024-05-01", "status": "Dalam Proses"})
+    index.records[1]["deadline"] = "2024-04-01"
+    index.update(1, {"deadline": "2024-04-01"})
+
+    assert index.deadlines.upcoming(days=7, today=TODAY) == [3]
+    assert index.deadlines.overdue(today=TODAY) == [1]
+    index.remove(3)
+    assert index.deadlines.upcoming(days=7, today=TODAY) == []
+
+
+def test_batch_updates_keep_deadlines_in_step():
+    index = ActivityIndex([{"id": i, "deadline": f"2024-05-0{i}", "status": "Belum Dimulai"} for i in range(1, 5)])
+    index.records[1]["status"] = "Selesai"
+    index.records[4]["deadline"] = "2024-05-01"
+    index.update_many([(1, {"status": "Selesai"}), (4, {"deadline": "2024-05-01"})])
+    index.remove_many([2, 9])
+
+    assert index.deadlines.upcoming(days=7, today=TODAY) == [4, 3]
+    assert index.ids(status="Belum Dimulai") == [3, 4]
+    assert 2 not in index
+
+
+def test_add_many_merges_into_deadline_index():
+    index = ActivityIndex([{"id": 1, "deadline": "2024-05-03", "status": "Belum Dimulai"}])
+    index.add_many([
+        {"id": 2, "deadline": "2024-05-02", "status": "Belum Dimulai"},
+        {"id": 3, "deadline": "2024-05-04", "status": "Selesai"},
+        {"id": 1, "deadline": "2024-05-05", "status": "Belum Dimulai"},
+    ])
+
+    assert index.deadlines.upcoming(days=7, today=TODAY) == [2, 1]
+    assert len(index.deadlines) == 2 and len(index) == 3
@@ -0,0 +1,50 @@
+# tests/test_activity_loader.py
+import json
+
+from modules.activity_loader import iter_records
+
+
+def test_jsonl_skips_broken_records(tmp_path):
+    path = tmp_path / "activities.jsonl"
+    path.write_text('{"id": 1}\n\n{"id": 2,\n[3]\n{"id": 4}\n', encoding="utf-8")
+    errors = []
+
+    assert [record['id'] for record in iter_records(str(path), errors)] == [1, 4]
+    assert [error.line for error in errors] == [3, 4]
+
+
+def test_legacy_array_is_streamed(tmp_path):
+    records = [{"id": i, "nama": f"Tugas {i}", "tag": ["a", {"b": "}"}]} for i in range(500)]
+    path = tmp_path / "activities.json"
+    path.write_text(json.dumps(records, indent=4, ensure_ascii=False), encoding="utf-8")
+
+    assert list(iter_records(str(path))) == records
+
+
+def test_legacy_array_skips_one_broken_record(tmp_path):
+    path = tmp_path / "activities.json"
+    path.write_text('[{"id": 0}, {"id": 1, "nama": }, {"id": 2}]', encoding="utf-8")
+    errors = []
+
+    assert [record['id'] for record in iter_records(str(path), errors)] == [0, 2]
+    assert len(errors) == 1
+
+
+def test_invalid_utf8_line_is_reported_not_fatal(tmp_path):
+    path = tmp_path / "activities.jsonl"
+    path.write_bytes(b'{"id": 1, "nama": "Tugas \xc3\xa9"}\n{"id": 2, "nama": "rusak \xff"}\n{"id": 3}\n')
+    errors = []
+
+    assert [record['id'] for record in iter_records(str(path), errors)] == [1, 3]
+    assert [error.line for error in errors] == [2]
+
+
+def test_invalid_utf8_in_legacy_array_skips_one_record(tmp_path):
+    records = [{"id": i, "nama": f"Tugas {i}"} for i in range(4)]
+    data = json.dumps(records, indent=4).encode("utf-8").replace(b"Tugas 2", b"Tugas \xe9")
+    path = tmp_path / "activities.json"
+    path.write_bytes(b"\xef\xbb\xbf" + data)
+    errors = []
+
+    assert [record['id'] for record in iter_records(str(path), errors)] == [0, 1, 3]
+    assert errors
@@ -0,0 +1,82 @@
+# tests/test_activity_manager.py
+from streamlit.testing.v1 import AppTest
+
+from modules import activity_service
+from modules.activity_store import SQLiteActivityStore
+
+
+# Skrip halaman daftar aktivitas untuk AppTest (dijalankan terpisah)
+def list_page():
+    from modules import activity_manager
+    activity_manager.display_activities()
+
+
+# Skrip satu klik tombol urungkan untuk AppTest
+def undo_page():
+    import streamlit as st
+    from modules import activity_manager
+    st.session_state.setdefault('undo_stack', [[7]])
+    activity_manager.undo_last_change(lambda message, kind: st.write(message))
+
+
+# Fungsi untuk store berisi `count` aktivitas
+def make_db(tmp_path, monkeypatch, count):
+    """File SQLite yang dipakai halaman lewat activity_service.get_store()"""
+    db_file = str(tmp_path / "activities.db")
+    store = SQLiteActivityStore(db_file)
+    monkeypatch.setattr(activity_service, "get_store", lambda owner=None: store)
+    store.add_many([
+        {
+            "id": activity_id, "nama": f"Tugas {activity_id}",
+            "kategori": "Organisasi" if activity_id < 3 else "Akademik",
+            "deadline": "2024-05-03", "prioritas": "Sedang", "status": "Belum Dimulai",
+            "deskripsi": "", "catatan": "",
+        }
+        for activity_id in range(count)
+    ])
+    return db_file
+
+
+def test_only_one_page_is_rendered(tmp_path, monkeypatch):
+    make_db(tmp_path, monkeypatch, 30)
+    at = AppTest.from_function(list_page, default_timeout=30).run()
+    assert not at.exception
+
+    assert len(at.selectbox(key="detail_select").options) == 25
+    at = at.number_input(key="activity_page").set_value(2).run()
+    assert at.selectbox(key="detail_select").options == [f"Tugas {i} (ID: {i})" for i in range(25, 30)]
+
+
+def test_page_is_clamped_when_filter_shrinks_results(tmp_path, monkeypatch):
+    make_db(tmp_path, monkeypatch, 30)
+    at = AppTest.from_function(list_page, default_timeout=30).run()
+    at = at.number_input(key="activity_page").set_value(2).run()
+    at = at.selectbox(key="filter_kategori").select("Organisasi").run()
+
+    assert not at.exception
+    assert at.number_input(key="activity_page").value == 1
+    assert len(at.selectbox(key="detail_select").options) == 3
+
+
+def test_status_update_reruns_only_the_row(tmp_path, monkeypatch):
+    db_file = make_db(tmp_path, monkeypatch, 30)
+    at = AppTest.from_function(list_page, default_timeout=30).run()
+    at = at.selectbox(key="status_0").select("Dalam Proses").run()
+    at = at.button(key="update_0").click().run()
+
+    assert not at.exception
+    # Notifikasi ditampilkan di dalam fragment baris, bukan lewat show_notification
+    assert "Status aktivitas 'Tugas 0' berhasil diubah menjadi 'Dalam Proses'!" in [info.value for info in at.info]
+    assert SQLiteActivityStore(db_file).get(0)['status'] == "Dalam Proses"
+
+
+def test_failed_undo_keeps_the_step(monkeypatch):
+    def fail(seqs, owner=None):
+        raise activity_service.ValidationError("sebelum", "Riwayat tidak terbaca")
+    monkeypatch.setattr(activity_service, "revert_changes", fail)
+    at = AppTest.from_function(undo_page, default_timeout=30).run()
+
+    assert not at.exception
+    assert [text.value for text in at.markdown] == ["Tidak dapat dibatalkan: Riwayat tidak terbaca"]
+    assert at.session_state.undo_stack == [[7]]
+    assert "redo_stack" not in at.session_state
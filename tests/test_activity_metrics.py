@@ -0,0 +1,54 @@
+# tests/test_activity_metrics.py
+import pytest
+
+from modules import activity_metrics
+from modules.activity_metrics import OperationStats
+
+
+@pytest.fixture
+def metrics():
+    activity_metrics.reset()
+    activity_metrics.enable()
+    yield activity_metrics
+    activity_metrics.disable()
+    activity_metrics.reset()
+
+
+def test_percentiles_come_from_log_buckets():
+    stats = OperationStats()
+    for _ in range(99):
+        stats.add(0.001)
+    stats.add(0.5)
+
+    # Batas atas bucket berjarak ~19%
+    assert 0.001 <= stats.percentile(50) < 0.0012
+    assert stats.percentile(99) < 0.0012
+    assert stats.percentile(100) == 0.5
+    assert OperationStats().percentile(50) is None
+
+
+def test_timed_records_calls_errors_and_records(metrics):
+    @metrics.timed("uji.query", records=len)
+    def query(fail=False):
+        if fail:
+            raise KeyError("x")
+        return [1, 2, 3]
+
+    query()
+    with pytest.raises(KeyError):
+        query(fail=True)
+    with metrics.timer("uji.append") as span:
+        span.bytes = 10
+
+    operations = metrics.snapshot()["operations"]
+    assert (operations["uji.query"]["calls"], operations["uji.query"]["errors"]) == (2, 1)
+    assert operations["uji.query"]["records"] == 3
+    assert operations["uji.append"]["bytes"] == 10
+
+
+def test_disabled_instrumentation_records_nothing(metrics):
+    metrics.disable()
+    with metrics.timer("uji.mati") as span:
+        span.records = 5
+
+    assert metrics.snapshot()["operations"] == {}
@@ -0,0 +1,59 @@
+# tests/test_activity_model.py
+from datetime import date, datetime
+
+import pytest
+
+from modules.activity_model import Activity, deadline_of
+
+
+RECORD = {
+    "id": 1, "nama": "Laporan", "kategori": "Akademik", "deadline": "2025-01-01",
+    "prioritas": "Tinggi", "deskripsi": "", "catatan": "", "status": "Selesai",
+    "tanggal_dibuat": "2025-01-01 10:00:00", "label": "ekstra",
+}
+
+
+def test_round_trip_keeps_json_form():
+    assert Activity.from_dict(RECORD).to_dict() == RECORD
+
+
+def test_fields_are_coded_and_parsed_once():
+    activity = Activity.from_dict(RECORD)
+
+    assert activity.kategori == 0 and activity.status == 2
+    assert activity.deadline == date(2025, 1, 1)
+    assert activity.tanggal_dibuat == datetime(2025, 1, 1, 10, 0)
+    assert activity["status"] == "Selesai" and activity["deadline"] == "2025-01-01"
+    assert deadline_of(activity) == deadline_of(RECORD) == date(2025, 1, 1)
+
+
+def test_dict_style_access():
+    activity = Activity.from_dict({"id": 1, "status": "Tidak dikenal"})
+    activity.update({"prioritas": "Rendah", "label": "baru"})
+
+    assert activity["status"] == "Tidak dikenal"
+    assert activity.get("deadline", "-") == "-" and "deadline" not in activity
+    assert activity == {"id": 1, "prioritas": "Rendah", "status": "Tidak dikenal", "label": "baru"}
+
+
+@pytest.mark.parametrize("data", [
+    {"id": 1, "deadline": "2025-01-01", "tanggal_dibuat": "2025-01-01 10:00:00", "status": "Selesai"},
+    {"id": 2, "tanggal_dibuat": "2025-01-01T10:00:00"},
+    {"id": 3, "deadline": "2025-W01-1"},
+    {"id": 4, "deadline": "20250101"},
+    {"id": 5, "catatan": None, "deadline": None, "status": "Tidak dikenal"},
+])
+def test_round_trip_is_lossless(data):
+    assert Activity.from_dict(data).to_dict() == data
+
+
+def test_only_canonical_dates_are_parsed():
+    assert Activity.from_dict({"id": 1, "deadline": "2025-01-01"}).deadline == date(2025, 1, 1)
+    assert Activity.from_dict({"id": 1, "deadline": "2025-W01-1"}).deadline == "2025-W01-1"
+
+
+def test_explicit_null_can_be_replaced():
+    activity = Activity.from_dict({"id": 1, "catatan": None})
+    assert "catatan" in activity and activity["catatan"] is None
+    activity["catatan"] = "isi"
+    assert activity.to_dict() == {"id": 1, "catatan": "isi"}
@@ -0,0 +1,50 @@
+# tests/test_activity_recurrence.py
+from datetime import date
+from itertools import islice
+
+from modules.activity_recurrence import RecurrenceStore, describe, expand, occurrence_dates
+
+RULE = {"id": 1, "nama": "Kuliah", "kategori": "Akademik", "prioritas": "Sedang",
+        "mulai": "2026-09-01", "frekuensi": "Mingguan", "interval": 2}
+
+
+def test_occurrence_dates_jump_to_window():
+    rule = dict(RULE, sampai="2026-10-31", pengecualian=["2026-09-29"])
+
+    assert list(occurrence_dates(rule)) == [date(2026, 9, 1), date(2026, 9, 15), date(2026, 10, 13),
+                                            date(2026, 10, 27)]
+    assert list(occurrence_dates(rule, date(2026, 9, 16), date(2026, 10, 20))) == [date(2026, 10, 13)]
+    assert describe(rule) == "setiap 2 minggu, 2026-09-01 s.d. 2026-10-31"
+
+
+def test_expand_merges_rules_by_deadline():
+    daily = dict(RULE, id=2, nama="Piket", frekuensi="Harian", interval=3, status_kejadian={"2026-09-04": "Selesai"})
+    occurrences = list(islice(expand([RULE, daily], date(2026, 9, 1)), 5))
+
+    assert [(a['nama'], a['deadline']) for a in occurrences] == [
+        ("Kuliah", "2026-09-01"), ("Piket", "2026-09-01"), ("Piket", "2026-09-04"),
+        ("Piket", "2026-09-07"), ("Piket", "2026-09-10")]
+    assert occurrences[2]['status'] == "Selesai" and occurrences[3]['status'] == "Belum Dimulai"
+    assert occurrences[0]['aturan'] == 1 and 'id' not in occurrences[0]
+    assert [a['deadline'] for a in expand([daily], date(2026, 9, 1), date(2026, 9, 7), include_done=False)] == [
+        "2026-09-01", "2026-09-07"]
+
+
+def test_store_keeps_status_sparse_and_persists(tmp_path):
+    path = str(tmp_path / "recurrences.jsonl")
+    store = RecurrenceStore(path)
+    rule = store.add({key: value for key, value in RULE.items() if key != 'id'})
+
+    store.set_status(rule['id'], date(2026, 9, 15), "Selesai")
+    store.set_status(rule['id'], "2026-09-15", "Belum Dimulai")
+    store.set_status(rule['id'], "2026-09-29", "Dalam Proses")
+    store.skip(rule['id'], "2026-09-29")
+
+    reloaded = RecurrenceStore(path)
+    assert reloaded.get(rule['id'])['status_kejadian'] == {}
+    assert reloaded.get(rule['id'])['pengecualian'] == ["2026-09-29"]
+    assert [a['deadline'] for a in reloaded.upcoming(days=40, today=date(2026, 9, 10))] == [
+        "2026-09-15", "2026-10-13"]
+    assert not store.is_stale()
+    assert reloaded.add(dict(rule, nama="Praktikum"))['id'] != rule['id']
+    assert store.is_stale()
@@ -0,0 +1,76 @@
+# tests/test_activity_search.py
+import pytest
+
+from modules.activity_search import SearchIndex, query_terms, rank, tokenize
+from modules.activity_store import JsonActivityStore, SQLiteActivityStore
+from modules.journal_store import ActivityJournal
+
+ACTIVITIES = [
+    {"id": 1, "nama": "Rapat himpunan", "kategori": "Organisasi", "status": "Belum Dimulai",
+     "deskripsi": "Membahas proker", "catatan": ""},
+    {"id": 2, "nama": "Tugas statistika", "kategori": "Akademik", "status": "Belum Dimulai",
+     "deskripsi": "", "catatan": "Bawa catatan rapatnya"},
+    {"id": 3, "nama": "Baca buku-buku", "kategori": "Akademik", "status": "Selesai",
+     "deskripsi": "Résumé bab 1", "catatan": ""},
+]
+
+
+def test_tokenize_normalizes_words():
+    assert tokenize("Rapatnya") == ["rapat"]
+    assert tokenize("tugas-tugas tanya-jawab") == ["tugas", "tanya", "jawab"]
+    assert tokenize("Résumé") == ["resume"]
+    assert query_terms("yang rapat dan yang") == ["rapat"]
+
+
+def test_cached_scores_follow_index_changes():
+    index = SearchIndex(ACTIVITIES)
+    assert set(index.scores("rapat")) == {1, 2}
+
+    index.remove(1)
+    index.add({"id": 4, "nama": "Rapat angkatan", "deskripsi": "", "catatan": ""})
+    assert set(index.scores("rapat")) == {2, 4}
+
+
+def test_rank_skips_ids_removed_mid_search():
+    scores = {1: 1.0, 2: 3.0, 3: 2.0}
+
+    assert rank(scores, [1, 2, 3], {1: 0, 2: 1}) == [2, 1]
+    assert rank(scores, [1, 2, 3], {1: 0, 2: 1, 3: 2}, limit=1, offset=1) == [3]
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        store = JsonActivityStore(ActivityJournal(str(tmp_path / "activities.jsonl"),
+                                                  str(tmp_path / "activities.journal"), fsync=False))
+    else:
+        store = SQLiteActivityStore(str(tmp_path / "activities.db"))
+    store.add_many(ACTIVITIES)
+    return store
+
+
+# Fungsi untuk ID hasil pencarian
+def search_ids(store, text, **filters):
+    total, activities = store.search(text, **filters)
+    assert total == len(activities)
+    return [activity['id'] for activity in activities]
+
+
+def test_match_in_nama_ranks_first(store):
+    assert search_ids(store, "rapat") == [1, 2]
+    assert search_ids(store, "rapat", kategori="Akademik") == [2]
+
+
+def test_every_word_must_match_and_last_word_is_a_prefix(store):
+    assert search_ids(store, "tugas stat") == [2]
+    assert search_ids(store, "tugas himpunan") == []
+    assert search_ids(store, "resume buku") == [3]
+
+
+def test_index_follows_updates_and_deletes(store):
+    search_ids(store, "rapat")
+    store.update(1, {"nama": "Seminar himpunan"})
+    store.delete(2)
+
+    assert search_ids(store, "rapat") == []
+    assert search_ids(store, "seminar") == [1]
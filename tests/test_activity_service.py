@@ -0,0 +1,214 @@
+# tests/test_activity_service.py
+import os
+from datetime import date
+
+import pytest
+
+from modules import activity_history, activity_service, activity_store
+
+ACTIVITY = {"nama": "Laporan", "kategori": "Akademik", "deadline": "2030-01-01", "prioritas": "Tinggi"}
+
+
+def test_validate_activity_requires_fields_only_for_new_records():
+    with pytest.raises(activity_service.ValidationError) as error:
+        activity_service.validate_activity({"nama": "Laporan"})
+    assert error.value.field == 'kategori'
+
+    assert activity_service.validate_activity({"status": "Selesai"}, partial=True) == {"status": "Selesai"}
+
+
+@pytest.mark.parametrize("data, field", [
+    ({"nama": "  "}, 'nama'),
+    ({"kategori": "Hobi"}, 'kategori'),
+    ({"catatan": 5}, 'catatan'),
+    ({"pemilik": "x"}, 'pemilik'),
+    ({"deadline": "besok"}, 'deadline'),
+    ({"deadline": None}, 'deadline'),
+])
+def test_validate_activity_rejects_bad_values(data, field):
+    with pytest.raises(activity_service.ValidationError) as error:
+        activity_service.validate_activity(data, partial=True)
+    assert error.value.field == field
+
+
+@pytest.mark.parametrize("value", ["20250101", "2025-W01-1", "2025-1-1", "2025-02-30", "2025-01-01T00:00",
+                                   " 2025-01-01", "", None, 20250101])
+def test_validate_activity_accepts_only_canonical_dates(value):
+    with pytest.raises(activity_service.ValidationError) as error:
+        activity_service.validate_activity({"deadline": value}, partial=True)
+    assert error.value.field == 'deadline'
+
+    assert activity_service.validate_activity({"deadline": "2024-02-29"}, partial=True) == {"deadline": "2024-02-29"}
+
+
+def test_create_recurrence_rejects_non_canonical_start():
+    with pytest.raises(activity_service.ValidationError) as error:
+        activity_service.create_recurrence({"nama": "Rapat", "kategori": "Organisasi", "prioritas": "Sedang",
+                                            "mulai": "2026-W01-1", "frekuensi": "Harian"}, owner="tanggal")
+    assert error.value.field == 'mulai'
+
+
+def test_create_activity_fills_defaults():
+    activity = activity_service.create_activity(dict(ACTIVITY, deadline=date(2030, 1, 2)))
+
+    assert activity['deadline'] == "2030-01-02"
+    assert (activity['status'], activity['deskripsi'], activity['catatan']) == ("Belum Dimulai", "", "")
+    assert 'tanggal_dibuat' in activity
+    assert activity_service.get_activity(activity['id'])['nama'] == "Laporan"
+
+
+def test_update_with_stale_version_conflicts():
+    activity = activity_service.create_activity(ACTIVITY)
+    updated = activity_service.update_activity(activity['id'], {"status": "Dalam Proses"})
+
+    assert updated['versi'] == 2 and 'tanggal_diperbarui' in updated
+    with pytest.raises(activity_store.ConflictError):
+        activity_service.update_activity(activity['id'], {"catatan": "x"}, version=1)
+
+
+def test_delete_unknown_activity_raises_key_error():
+    activity = activity_service.create_activity(ACTIVITY)
+    activity_service.delete_activity(activity['id'])
+
+    assert activity_service.get_activity(activity['id']) is None
+    with pytest.raises(activity_service.NotFoundError):
+        activity_service.delete_activity(activity['id'])
+    with pytest.raises(activity_service.NotFoundError):
+        activity_service.update_activity(activity['id'], {"status": "Selesai"})
+
+
+def test_partitions_are_isolated():
+    budi = activity_service.create_activity(dict(ACTIVITY, nama="Milik Budi"), owner="Budi")
+    activity_service.create_activity(dict(ACTIVITY, nama="Milik Ani"), owner="ani")
+
+    assert [a['nama'] for a in activity_service.list_activities(owner=" budi ")[1]] == ["Milik Budi"]
+    # ID hanya unik per partisi, jadi isi partisi lain diperiksa lewat nama
+    assert [a['nama'] for a in activity_service.list_activities(owner="ani")[1]] == ["Milik Ani"]
+    assert activity_service.get_activity(budi['id'], owner="budi")['nama'] == "Milik Budi"
+    assert activity_service.activity_stats(owner="ani")['total'] == 1
+    # Partisi tanpa pemilik memakai file lama di DATA_DIR
+    assert activity_service.partition_files(None)[0] == activity_service.DATA_FILE
+    assert activity_service.partition_files("budi")[0] != activity_service.DATA_FILE
+
+
+def test_reminder_store_does_not_fill_shared_cache():
+    activity = activity_service.create_activity(dict(ACTIVITY, nama="Pengingat"), owner="pengingat")
+    key = (activity_service.STORAGE_BACKEND, "pengingat")
+    activity_service.store_cache.invalidate(key)
+
+    separate = activity_service.reminder_store("pengingat")
+    assert separate.get(activity['id'])['nama'] == "Pengingat"
+    assert activity_service.store_cache.peek(key) is None
+    # Store yang sudah di cache bersama dipakai langsung
+    shared = activity_service.get_store("pengingat")
+    assert shared is not separate
+    assert activity_service.reminder_store("pengingat") is shared
+
+
+def test_upcoming_merges_recurrence_occurrences():
+    owner = "berulang"
+    today = date.today()
+    activity_service.create_activity(dict(ACTIVITY, deadline=today), owner=owner)
+    rule = activity_service.create_recurrence({"nama": "Rapat", "kategori": "Organisasi", "prioritas": "Sedang",
+                                               "mulai": today, "frekuensi": "Harian"}, owner=owner)
+    activity_service.set_occurrence_status(rule['id'], today, "Selesai", owner=owner)
+
+    upcoming = activity_service.upcoming_activities(days=2, owner=owner)
+    assert [a['nama'] for a in upcoming] == ["Laporan", "Rapat", "Rapat"]
+    assert activity_service.activity_stats(days=2, owner=owner)['aturan_berulang'] == 1
+
+    with pytest.raises(activity_service.ValidationError) as error:
+        activity_service.create_recurrence({"nama": "X", "kategori": "Akademik", "prioritas": "Sedang",
+                                            "mulai": "2026-01-01", "frekuensi": "Bulanan"}, owner=owner)
+    assert error.value.field == 'frekuensi'
+
+
+# Fungsi untuk menjalankan satu mutasi dan mengembalikan nomor entri riwayatnya
+def tracked(func, *args, **kwargs):
+    with activity_history.track() as seqs:
+        func(*args, **kwargs)
+    return seqs
+
+
+def test_revert_insert_deletes_activity():
+    owner = "revert-insert"
+    [seq] = tracked(activity_service.create_activity, ACTIVITY, owner=owner)
+
+    activity_id = activity_service.revert_change(seq, owner=owner)
+    assert activity_service.get_activity(activity_id, owner=owner) is None
+
+
+def test_revert_update_restores_old_values():
+    owner = "revert-update"
+    activity = activity_service.create_activity(ACTIVITY, owner=owner)
+    [seq] = tracked(activity_service.update_activity, activity['id'], {"status": "Selesai", "catatan": "x"},
+                    owner=owner)
+
+    activity_service.revert_change(seq, owner=owner)
+    reverted = activity_service.get_activity(activity['id'], owner=owner)
+    assert (reverted['status'], reverted['catatan']) == (activity['status'], activity['catatan'])
+
+    # Field yang sama sudah diubah lagi: pembalikan ditolak
+    [seq] = tracked(activity_service.update_activity, activity['id'], {"status": "Selesai"}, owner=owner)
+    activity_service.update_activity(activity['id'], {"status": "Dalam Proses"}, owner=owner)
+    with pytest.raises(activity_store.ConflictError):
+        activity_service.revert_change(seq, owner=owner)
+
+
+def test_revert_delete_restores_same_id():
+    owner = "revert-delete"
+    activity = activity_service.create_activity(ACTIVITY, owner=owner)
+    [seq] = tracked(activity_service.delete_activity, activity['id'], owner=owner)
+
+    [undo] = tracked(activity_service.revert_change, seq, owner=owner)
+    assert activity_service.get_activity(activity['id'], owner=owner)['nama'] == "Laporan"
+
+    # Membalik entri hasil pembalikan berarti redo
+    activity_service.revert_change(undo, owner=owner)
+    assert activity_service.list_activities(owner=owner) == (0, [])
+
+
+def test_batch_update_skips_missing_ids():
+    owner = "massal"
+    ids = [activity_service.create_activity(dict(ACTIVITY, nama=f"Tugas {i}"), owner=owner)['id'] for i in range(3)]
+
+    updated = activity_service.update_activities(ids + [-1], {"prioritas": "Rendah"}, owner=owner)
+    assert sorted(activity['id'] for activity in updated) == sorted(ids)
+    assert {activity_service.get_activity(i, owner=owner)['prioritas'] for i in ids} == {"Rendah"}
+    with pytest.raises(activity_service.ValidationError):
+        activity_service.update_activities(ids, {}, owner=owner)
+
+
+def test_revert_bulk_delete_restores_same_ids():
+    owner = "revert-massal"
+    ids = [activity_service.create_activity(dict(ACTIVITY, nama=f"Tugas {i}"), owner=owner)['id'] for i in range(3)]
+    seqs = tracked(activity_service.delete_activities, ids, owner=owner)
+
+    undo = tracked(activity_service.revert_changes, seqs, owner=owner)
+    assert [activity_service.get_activity(i, owner=owner)['nama'] for i in ids] == ["Tugas 0", "Tugas 1", "Tugas 2"]
+
+    # Membalik entri hasil pembalikan berarti redo
+    activity_service.revert_changes(undo, owner=owner)
+    assert activity_service.list_activities(owner=owner) == (0, [])
+
+
+def test_reads_for_unknown_owner_do_not_register_tenant():
+    owner = "belum-terdaftar"
+
+    assert activity_service.list_activities(owner=owner) == (0, [])
+    assert activity_service.get_activity(1, owner=owner) is None
+    assert activity_service.activity_stats(owner=owner)['total'] == 0
+    assert activity_service.update_activities([1], {"status": "Selesai"}, owner=owner) == []
+    with pytest.raises(activity_service.NotFoundError):
+        activity_service.delete_activity(1, owner=owner)
+
+    assert owner not in activity_service.shards.owners()
+    assert not os.path.exists(os.path.dirname(activity_service.partition_file(activity_service.DATA_FILE, owner)))
+
+
+def test_first_write_registers_tenant():
+    owner = "penulis-pertama"
+    activity = activity_service.create_activity(ACTIVITY, owner=owner)
+
+    assert owner in activity_service.shards.owners()
+    assert activity_service.get_activity(activity['id'], owner=owner)['nama'] == "Laporan"
@@ -0,0 +1,44 @@
+# tests/test_activity_shards.py
+import pytest
+
+from modules.activity_shards import ShardDirectory, normalize_owner, shard_name
+
+
+def test_normalize_owner():
+    assert normalize_owner("  Budi ") == "budi"
+    assert normalize_owner("   ") is None
+    assert normalize_owner(None) is None
+    for owner in ("a" * 101, "bu\x00di", 5):
+        with pytest.raises(ValueError):
+            normalize_owner(owner)
+
+
+def test_shard_name_is_a_safe_directory_name():
+    assert shard_name("budi").startswith("budi-")
+    assert shard_name("../../etc").startswith("etc-")
+    assert shard_name("段").startswith("user-")
+    assert shard_name("budi") != shard_name("budi!")
+
+
+def test_directory_is_shared_through_the_file(tmp_path):
+    first = ShardDirectory(str(tmp_path / "shards.jsonl"), str(tmp_path / "tenants"))
+    second = ShardDirectory(str(tmp_path / "shards.jsonl"), str(tmp_path / "tenants"))
+
+    assert second.shard_for("budi", create=False) is None
+    shard = first.shard_for("budi")
+    assert (tmp_path / "tenants" / shard).is_dir()
+    # Pendaftaran oleh direktori lain terbaca dari baris baru di file
+    assert second.shard_for("budi", create=False) == shard
+    assert second.shard_for("budi") == shard
+    assert len(second) == 1
+
+
+def test_incomplete_line_is_read_later(tmp_path):
+    directory_file = tmp_path / "shards.jsonl"
+    directory = ShardDirectory(str(directory_file), str(tmp_path / "tenants"))
+    directory_file.write_text('{"owner": "budi", "shard": "budi-1"}\n{"owner": "ani", ', encoding="utf-8")
+
+    assert directory.owners() == {"budi": "budi-1"}
+    with open(directory_file, "a", encoding="utf-8") as f:
+        f.write('"shard": "ani-2"}\n')
+    assert directory.owners() == {"budi": "budi-1", "ani": "ani-2"}
@@ -0,0 +1,223 @@
+# tests/test_activity_store.py
+import sqlite3
+from datetime import date
+
+import pytest
+
+from modules.activity_store import (
+    ConflictError, IdGenerator, JsonActivityStore, SQLiteActivityStore, merge_changes, migrate_json_to_sqlite,
+)
+from modules.journal_store import ActivityJournal
+
+
+TODAY = date(2024, 5, 1)
+
+
+# Fungsi untuk aktivitas contoh
+def make_activity(activity_id, **fields):
+    activity = {
+        "id": activity_id, "nama": f"Tugas {activity_id}", "kategori": "Akademik",
+        "deadline": "2024-05-03", "prioritas": "Sedang", "status": "Belum Dimulai",
+    }
+    activity.update(fields)
+    return activity
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        journal = ActivityJournal(str(tmp_path / "activities.json"), str(tmp_path / "activities.journal"), fsync=False)
+        return JsonActivityStore(journal)
+    return SQLiteActivityStore(str(tmp_path / "activities.db"))
+
+
+def test_add_update_delete_round_trip(store):
+    store.add(make_activity(1, label="ekstra"))
+    store.add(make_activity(2))
+    store.update(1, {"status": "Selesai"})
+    store.delete(2)
+
+    # Setiap update menaikkan versi record
+    assert store.get(1) == make_activity(1, label="ekstra", status="Selesai", versi=2)
+    assert store.get(2) is None
+    with pytest.raises(KeyError):
+        store.update(2, {"status": "Selesai"})
+
+
+def test_query_filters_and_paginates(store):
+    for activity_id in range(5):
+        store.add(make_activity(activity_id, kategori="Organisasi" if activity_id % 2 else "Akademik"))
+
+    assert [a['id'] for a in store.query(kategori="Akademik")] == [0, 2, 4]
+    assert [a['id'] for a in store.query(limit=2, offset=1)] == [1, 2]
+    assert [a['id'] for a in store.query(offset=3)] == [3, 4]
+    assert store.count(kategori="Organisasi") == 2
+    assert store.count_by("kategori") == {"Akademik": 3, "Organisasi": 2}
+
+
+def test_upcoming_skips_done_and_out_of_range(store):
+    store.add(make_activity(1, deadline="2024-05-06"))
+    store.add(make_activity(2, deadline="2024-05-02"))
+    store.add(make_activity(3, deadline="2024-05-02", status="Selesai"))
+    store.add(make_activity(4, deadline="2024-05-20"))
+    store.add(make_activity(5, deadline="2024-04-30"))
+
+    assert [a['id'] for a in store.upcoming(days=7, today=TODAY)] == [2, 1]
+    assert [a['id'] for a in store.upcoming(days=7, limit=1, today=TODAY)] == [2]
+
+
+def test_due_between_and_overdue(store):
+    store.add(make_activity(1, deadline="2024-04-20"))
+    store.add(make_activity(2, deadline="2024-04-30", status="Selesai"))
+    store.add(make_activity(3, deadline="2024-04-25"))
+    store.add(make_activity(4, deadline="2024-05-10"))
+
+    assert [a['id'] for a in store.overdue(today=TODAY)] == [1, 3]
+    assert [a['id'] for a in store.due_between(date(2024, 4, 21), date(2024, 5, 10))] == [3, 4]
+    assert [a['id'] for a in store.due_between(limit=2)] == [1, 3]
+
+
+def test_activities_without_status_are_not_done(store):
+    activity = make_activity(1, deadline="2024-05-02")
+    del activity['status']
+    store.add(activity)
+    store.add(make_activity(2, deadline="2024-04-20", status=None))
+
+    assert [a['id'] for a in store.upcoming(days=7, today=TODAY)] == [1]
+    assert [a['id'] for a in store.overdue(today=TODAY)] == [2]
+
+
+def test_new_ids_never_collide(store):
+    ids = [store.new_id() for _ in range(100)]
+
+    # Seratus ID dalam milidetik yang sama tetap berbeda dan naik
+    assert ids == sorted(set(ids))
+
+
+def test_add_rejects_id_in_use(store):
+    store.add(make_activity(1))
+    with pytest.raises((ValueError, sqlite3.IntegrityError)):
+        store.add(make_activity(1, nama="Lain"))
+    assert store.get(1)['nama'] == "Tugas 1"
+
+
+def test_id_generator_observes_larger_ids():
+    generator = IdGenerator()
+    first = generator.next()
+    generator.observe(first + 1000)
+
+    assert generator.next() == first + 1001
+
+
+def test_stale_base_merges_disjoint_fields_and_rejects_overlaps(store):
+    store.add(make_activity(1))
+    base = make_activity(1, versi=1)
+    store.update(1, {"catatan": "dari pihak lain"})
+
+    store.update(1, {"status": "Selesai"}, base=base)
+    with pytest.raises(ConflictError):
+        store.update(1, {"catatan": "dari saya"}, base=base)
+    assert store.get(1)['catatan'] == "dari pihak lain"
+    assert store.get(1)['versi'] == 3
+
+
+def test_batch_update_and_delete(store):
+    for activity_id in range(1, 5):
+        store.add(make_activity(activity_id))
+
+    assert list(store.get_many([3, 9, 1])) == [3, 1]
+    updated = store.update_many({1: {"status": "Selesai"}, 2: {"deadline": "2024-05-02"}, 9: {"status": "Selesai"}})
+    assert sorted(activity['id'] for activity in updated) == [1, 2]
+    assert [a['id'] for a in store.due_between(date(2024, 5, 1), date(2024, 5, 3))] == [2, 3, 4]
+    assert store.delete_many([2, 3, 3, 9]) == [2, 3]
+    assert [a['id'] for a in store.query()] == [1, 4]
+
+
+def test_batch_update_conflict_aborts_whole_batch(store):
+    store.add(make_activity(1))
+    store.add(make_activity(2))
+    base = make_activity(2, versi=1)
+    store.update(2, {"status": "Dalam Proses"})
+
+    with pytest.raises(ConflictError):
+        store.update_many({1: {"status": "Selesai"}, 2: {"status": "Selesai"}}, bases={2: base})
+    assert store.get(1)['status'] == "Belum Dimulai"
+
+
+def test_json_stores_sharing_files_see_each_others_writes(tmp_path):
+    journal_files = (str(tmp_path / "activities.json"), str(tmp_path / "activities.journal"))
+    first = JsonActivityStore(ActivityJournal(*journal_files, fsync=False))
+    second = JsonActivityStore(ActivityJournal(*journal_files, fsync=False))
+    activity = first.add(make_activity(None))
+    second.update(activity['id'], {"status": "Selesai"})
+
+    assert first.is_stale()
+    first.reload()
+    assert first.get(activity['id'])['status'] == "Selesai"
+    # ID baru tidak bentrok dengan ID yang dibuat proses lain
+    assert second.add(make_activity(None))['id'] != activity['id']
+
+
+def test_json_store_persists_through_journal(tmp_path):
+    journal_files = (str(tmp_path / "activities.json"), str(tmp_path / "activities.journal"))
+    store = JsonActivityStore(ActivityJournal(*journal_files, fsync=False))
+    store.add(make_activity(1))
+    store.update(1, {"catatan": "baru"})
+
+    reopened = JsonActivityStore(ActivityJournal(*journal_files, fsync=False))
+    assert reopened.get(1)['catatan'] == "baru"
+
+
+def test_json_batch_entries_replay(tmp_path):
+    journal_files = (str(tmp_path / "activities.json"), str(tmp_path / "activities.journal"))
+    store = JsonActivityStore(ActivityJournal(*journal_files, fsync=False))
+    store.add_many([make_activity(activity_id) for activity_id in range(1, 4)])
+    store.update_many({1: {"catatan": "a"}, 2: {"catatan": "b"}})
+    store.delete_many([3])
+
+    reopened = JsonActivityStore(ActivityJournal(*journal_files, fsync=False))
+    assert [(a['id'], a['catatan'], a['versi']) for a in reopened.query()] == [(1, "a", 2), (2, "b", 2)]
+
+
+def test_migrate_copies_snapshot_and_journal(tmp_path):
+    json_file, journal_file = str(tmp_path / "activities.json"), str(tmp_path / "activities.journal")
+    journal = ActivityJournal(json_file, journal_file, fsync=False)
+    journal.write_snapshot([make_activity(1)])
+    journal.insert(make_activity(2))
+
+    assert migrate_json_to_sqlite(json_file, str(tmp_path / "activities.db"), journal_file) == 2
+    assert SQLiteActivityStore(str(tmp_path / "activities.db")).count() == 2
+
+
+BASE = {"id": 1, "versi": 1, "nama": "Laporan", "status": "Belum Dimulai", "catatan": ""}
+
+
+def test_merge_same_version_applies_all_changes():
+    changes = {"nama": "Laporan", "status": "Selesai"}
+    assert merge_changes(dict(BASE), BASE, changes) == changes
+
+
+def test_merge_keeps_other_party_changes_on_other_fields():
+    current = dict(BASE, versi=2, catatan="ditambah pihak lain")
+    changes = {"nama": "Laporan", "status": "Selesai", "tanggal_diperbarui": "2026-01-01 10:00:00"}
+
+    # Field yang tidak diubah pengguna (nama) tidak ikut ditulis
+    assert merge_changes(current, BASE, changes) == {"status": "Selesai",
+                                                     "tanggal_diperbarui": "2026-01-01 10:00:00"}
+
+
+def test_merge_conflict_on_same_field():
+    current = dict(BASE, versi=3, status="Dalam Proses", catatan="x")
+
+    with pytest.raises(ConflictError) as error:
+        merge_changes(current, BASE, {"status": "Selesai", "catatan": "y"})
+    assert error.value.activity_id == 1
+    assert error.value.fields == ["catatan", "status"]
+
+
+def test_merge_conflict_when_other_party_removed_field():
+    current = {key: value for key, value in BASE.items() if key != "catatan"}
+    current['versi'] = 2
+
+    with pytest.raises(ConflictError):
+        merge_changes(current, BASE, {"catatan": "baru"})
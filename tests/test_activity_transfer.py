@@ -0,0 +1,69 @@
+# tests/test_activity_transfer.py
+import io
+import json
+
+import pytest
+
+from modules.activity_store import JsonActivityStore, SQLiteActivityStore
+from modules.activity_transfer import export_activities, import_activities
+from modules.journal_store import ActivityJournal
+
+CSV = (
+    "nama,kategori,deadline,prioritas,status,catatan\n"
+    "Laporan,Akademik,2030-01-01,Tinggi,,\n"
+    "Rapat,Organisasi,2030-01-02,Sedang,Selesai,bawa laptop\n"
+)
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        return JsonActivityStore(ActivityJournal(str(tmp_path / "activities.jsonl"),
+                                                 str(tmp_path / "activities.journal"), fsync=False))
+    return SQLiteActivityStore(str(tmp_path / "activities.db"))
+
+
+def test_csv_import_fills_defaults(store):
+    result = import_activities(io.StringIO(CSV), "csv", store=store)
+
+    assert (result.imported, result.rejected) == (2, 0)
+    assert [(a['nama'], a['status'], a['catatan']) for a in store.query()] == [
+        ("Laporan", "Belum Dimulai", ""), ("Rapat", "Selesai", "bawa laptop"),
+    ]
+    assert len({a['id'] for a in store.query()}) == 2
+
+
+def test_invalid_row_rejects_whole_file_unless_skipped(store):
+    data = CSV + "Rusak,Hobi,2030-01-03,Tinggi,,\n"
+
+    result = import_activities(io.StringIO(data), "csv", store=store)
+    assert (result.imported, store.count()) == (0, 0)
+    assert [error.line for error in result.errors] == [4]
+
+    result = import_activities(io.StringIO(data), "csv", skip_invalid=True, store=store)
+    assert (result.imported, result.rejected, store.count()) == (2, 1, 2)
+
+
+def test_export_can_be_imported_again(store):
+    import_activities(io.StringIO(CSV), "csv", store=store)
+    exported = io.StringIO()
+
+    assert export_activities(exported, "jsonl", status="Selesai", store=store) == 1
+    record = json.loads(exported.getvalue())
+    assert record['nama'] == "Rapat" and 'id' in record
+
+    # Kolom id/versi/tanggal hasil ekspor diabaikan saat diimpor ulang
+    exported.seek(0)
+    assert import_activities(exported, "jsonl", store=store).imported == 1
+    assert store.count(status="Selesai") == 2
+
+
+def test_batch_is_one_journal_entry(tmp_path):
+    journal = ActivityJournal(str(tmp_path / "activities.jsonl"), str(tmp_path / "activities.journal"), fsync=False)
+    import_activities(io.StringIO(CSV), "csv", store=JsonActivityStore(journal))
+
+    lines = (tmp_path / "activities.journal").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)['op'] for line in lines] == ["insert_many"]
+    assert sorted(a['nama'] for a in ActivityJournal(journal.snapshot_file, journal.journal_file).load()) == [
+        "Laporan", "Rapat",
+    ]
@@ -0,0 +1,74 @@
+# tests/test_change_feed.py
+import pytest
+
+from modules import change_feed
+from modules.activity_store import LOCAL_CHANGE, REMOTE_CHANGE, JsonActivityStore, SQLiteActivityStore
+from modules.journal_store import ActivityJournal
+
+ACTIVITY = {"nama": "Laporan", "kategori": "Akademik", "deadline": "2024-05-03", "prioritas": "Sedang",
+            "status": "Belum Dimulai"}
+
+
+# Fungsi untuk dua store (seperti dua replika) atas file yang sama
+def make_replicas(backend, tmp_path, listener):
+    if backend == "sqlite":
+        db_file = str(tmp_path / "activities.db")
+        return SQLiteActivityStore(db_file), SQLiteActivityStore(db_file, listener=listener)
+    files = str(tmp_path / "activities.jsonl"), str(tmp_path / "activities.journal")
+    return (JsonActivityStore(ActivityJournal(*files, fsync=False)),
+            JsonActivityStore(ActivityJournal(*files, fsync=False), listener=listener))
+
+
+def test_since_filters_by_owner_and_tags_session():
+    feed = change_feed.ChangeFeed()
+    with change_feed.session("sesi-1"):
+        feed.publish(None, LOCAL_CHANGE, added=[1])
+    feed.publish("budi", LOCAL_CHANGE, updated=[2])
+    feed.publish(None, REMOTE_CHANGE, deleted=[3])
+
+    events, missed = feed.since(0)
+    assert [(event['seq'], event['sesi']) for event in events] == [(1, "sesi-1"), (3, None)]
+    assert not missed
+    assert [event['seq'] for event in feed.since(1)[0]] == [3]
+    assert change_feed.changed_count(events[0]) == 1
+
+
+def test_since_reports_dropped_events():
+    feed = change_feed.ChangeFeed(size=2)
+    for activity_id in range(3):
+        feed.publish(None, LOCAL_CHANGE, added=[activity_id])
+
+    assert feed.since(0)[1]
+    assert not feed.since(1)[1]
+
+
+def test_since_reports_only_dropped_events_of_the_owner():
+    feed = change_feed.ChangeFeed(size=2)
+    feed.publish("budi", LOCAL_CHANGE, added=[1])
+    feed.publish(None, LOCAL_CHANGE, added=[2])
+    feed.publish(None, LOCAL_CHANGE, added=[3])
+
+    assert feed.since(0, owner="budi")[1]
+    assert not feed.since(1, owner="budi")[1]
+    # Partisi bersama tidak kehilangan event apa pun
+    assert not feed.since(0)[1]
+    assert [event['seq'] for event in feed.since(0)[0]] == [2, 3]
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_replica_reports_foreign_changes(backend, tmp_path):
+    changes = []
+    writer, reader = make_replicas(backend, tmp_path, lambda *change: changes.append(change))
+    first = writer.add(dict(ACTIVITY))
+    second = writer.add(dict(ACTIVITY, nama="Kuis"))
+    reader.sync_changes()
+    writer.update(first['id'], {"status": "Selesai"})
+    writer.delete(second['id'])
+
+    reader.sync_changes()
+    assert changes[-1] == (REMOTE_CHANGE, [], [first['id']], [second['id']], False)
+    assert reader.get(first['id'])['status'] == "Selesai"
+    assert reader.get(second['id']) is None
+
+    reader.add(dict(ACTIVITY, nama="Rapat"))
+    assert changes[-1][0] == LOCAL_CHANGE and len(changes[-1][1]) == 1
@@ -0,0 +1,115 @@
+# tests/test_file_lock.py
+import threading
+
+from modules.file_lock import FileLock, ReadWriteLock
+
+
+def test_lock_is_reentrant_within_a_thread(tmp_path):
+    lock = FileLock(str(tmp_path / "data.lock"))
+    with lock:
+        with lock:
+            pass
+        assert lock.acquire(blocking=False)
+        lock.release()
+
+
+def test_other_holder_blocks_non_blocking_acquire(tmp_path):
+    path = str(tmp_path / "data.lock")
+    holder, other = FileLock(path), FileLock(path)
+    results = []
+
+    with holder:
+        # Objek lain pada file yang sama berperilaku seperti proses lain
+        thread = threading.Thread(target=lambda: results.append(other.acquire(blocking=False)))
+        thread.start()
+        thread.join()
+    assert results == [False]
+    assert other.acquire(blocking=False)
+    other.release()
+
+
+def test_readers_share_and_writer_waits_for_them():
+    lock = ReadWriteLock()
+    entered, release = threading.Event(), threading.Event()
+    events = []
+
+    def reader():
+        with lock.read():
+            entered.set()
+            release.wait(5)
+            events.append("baca selesai")
+
+    def writer():
+        with lock.write():
+            events.append("tulis")
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    entered.wait(5)
+    with lock.read():
+        # Pembaca kedua tidak menunggu pembaca pertama
+        events.append("baca")
+    write_thread = threading.Thread(target=writer)
+    write_thread.start()
+    write_thread.join(0.1)
+    assert write_thread.is_alive()
+    release.set()
+    thread.join(5)
+    write_thread.join(5)
+    assert events == ["baca", "baca selesai", "tulis"]
+
+
+def test_writer_is_reentrant_and_may_read():
+    lock = ReadWriteLock()
+    events = []
+
+    def reader():
+        with lock.read():
+            events.append("baca")
+
+    with lock.write():
+        with lock.write():
+            with lock.read():
+                pass
+        thread = threading.Thread(target=reader)
+        thread.start()
+        thread.join(0.1)
+        # Pembaca lain menunggu sampai lock tulis dilepas seluruhnya
+        assert thread.is_alive()
+    thread.join(5)
+    assert events == ["baca"]
+
+
+def test_waiting_writer_goes_before_new_readers():
+    lock = ReadWriteLock()
+    first_reader, release = threading.Event(), threading.Event()
+    events = []
+
+    def reader(name, hold=None):
+        with lock.read():
+            events.append(name)
+            if hold:
+                first_reader.set()
+                hold.wait(5)
+
+    def writer():
+        with lock.write():
+            events.append("tulis")
+
+    threads = [threading.Thread(target=reader, args=("baca 1", release))]
+    threads[0].start()
+    first_reader.wait(5)
+    threads.append(threading.Thread(target=writer))
+    threads[1].start()
+    # Tunggu sampai penulis benar-benar antre
+    while not lock._writers_waiting:
+        threads[1].join(0.01)
+    threads.append(threading.Thread(target=reader, args=("baca 2",)))
+    threads[2].start()
+    threads[2].join(0.1)
+    # Pembaca baru tidak menyalip penulis yang antre
+    assert events == ["baca 1"]
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert events == ["baca 1", "tulis", "baca 2"]
@@ -0,0 +1,119 @@
+# tests/test_journal_store.py
+import json
+
+from modules.journal_store import ActivityJournal
+
+
+# Fungsi untuk jurnal baru di direktori sementara
+def make_journal(tmp_path, **kwargs):
+    return ActivityJournal(str(tmp_path / "activities.json"), str(tmp_path / "activities.journal"), fsync=False, **kwargs)
+
+
+def test_replay_applies_insert_update_and_delete(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.insert({"id": 1, "nama": "A", "status": "Belum Dimulai"})
+    journal.insert({"id": 2, "nama": "B"})
+    journal.update(1, {"status": "Selesai"})
+    journal.delete(2)
+
+    assert make_journal(tmp_path).load() == [{"id": 1, "nama": "A", "status": "Selesai"}]
+
+
+def test_compact_folds_journal_into_snapshot(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.write_snapshot([{"id": 1, "nama": "A"}])
+    journal.update(1, {"catatan": "diubah"})
+    journal.insert({"id": 2, "nama": "B"})
+    journal.compact()
+
+    assert not (tmp_path / "activities.journal").exists()
+    snapshot = json.loads((tmp_path / "activities.json").read_text(encoding="utf-8"))
+    assert snapshot == [{"id": 1, "nama": "A", "catatan": "diubah"}, {"id": 2, "nama": "B"}]
+    assert make_journal(tmp_path).load() == snapshot
+
+
+def test_threshold_triggers_background_compaction(tmp_path):
+    journal = make_journal(tmp_path, compact_threshold=3)
+    journal.load()
+    for activity_id in range(3):
+        journal.insert({"id": activity_id, "nama": f"Tugas {activity_id}"})
+    journal.compact_in_background().join()
+
+    assert journal.journal_entries == 0
+    assert sorted(activity['id'] for activity in make_journal(tmp_path).load()) == [0, 1, 2]
+
+
+def test_legacy_records_without_id_get_unique_ids(tmp_path):
+    legacy = [{"nama": f"Tugas {i}", "status": "Belum Dimulai"} for i in range(3)]
+    legacy.append({"id": 5, "nama": "Tugas lama"})
+    (tmp_path / "activities.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    activities = make_journal(tmp_path).load()
+
+    assert sorted(activity['nama'] for activity in activities) == ["Tugas 0", "Tugas 1", "Tugas 2", "Tugas lama"]
+    assert len({activity['id'] for activity in activities}) == 4
+
+
+def test_assigned_ids_survive_reload_and_compaction(tmp_path):
+    (tmp_path / "activities.json").write_text(json.dumps([{"nama": "A"}, {"nama": "B"}]), encoding="utf-8")
+    journal = make_journal(tmp_path)
+    ids = {activity['nama']: activity['id'] for activity in journal.load()}
+
+    journal.update(ids["A"], {"catatan": "diubah"})
+    journal.compact()
+
+    reloaded = {activity['id']: activity for activity in make_journal(tmp_path).load()}
+    assert {activity['nama']: activity_id for activity_id, activity in reloaded.items()} == ids
+    assert reloaded[ids["A"]]['catatan'] == "diubah"
+
+
+def test_replay_ignores_truncated_last_line(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.insert({"id": 1, "nama": "A"})
+    journal.update(1, {"catatan": "diubah"})
+    # Proses mati di tengah menulis entri berikutnya
+    with open(journal.journal_file, 'ab') as f:
+        f.write(b'{"op": "delete", "id": 1')
+
+    reopened = make_journal(tmp_path)
+    assert reopened.load() == [{"id": 1, "nama": "A", "catatan": "diubah"}]
+
+    # Entri berikutnya ditulis di baris baru, bukan menyambung baris terpotong
+    reopened.insert({"id": 2, "nama": "B"})
+    assert sorted(activity['id'] for activity in make_journal(tmp_path).load()) == [1, 2]
+
+
+def test_read_new_entries_returns_foreign_appends(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.load()
+    other = make_journal(tmp_path)
+    other.insert({"id": 1, "nama": "A"})
+
+    assert journal.has_foreign_changes()
+    assert journal.read_new_entries() == [{"op": "insert", "data": {"id": 1, "nama": "A"}}]
+    assert not journal.has_foreign_changes()
+
+    # Setelah pemadatan oleh proses lain, pembaca harus memuat ulang penuh
+    other.compact()
+    assert journal.read_new_entries() is None
+
+
+def test_legacy_json_snapshot_is_read_until_jsonl_exists(tmp_path):
+    (tmp_path / "activities.json").write_text(json.dumps([{"id": 1, "nama": "A"}]), encoding="utf-8")
+    journal = ActivityJournal(str(tmp_path / "activities.jsonl"), str(tmp_path / "activities.journal"), fsync=False)
+    journal.insert({"id": 2, "nama": "B"})
+    journal.compact()
+
+    lines = (tmp_path / "activities.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)['id'] for line in lines] == [1, 2]
+
+
+def test_corrupt_snapshot_records_are_reported_and_preserved(tmp_path):
+    snapshot = tmp_path / "activities.jsonl"
+    snapshot.write_text('{"id": 1}\n{"id": 2, rusak\n{"id": 3}\n', encoding="utf-8")
+    journal = ActivityJournal(str(snapshot), str(tmp_path / "activities.journal"), fsync=False)
+
+    assert [activity['id'] for activity in journal.load()] == [1, 3]
+    assert [error.line for error in journal.load_errors] == [2]
+    assert (tmp_path / "activities.jsonl.corrupt").read_text(encoding="utf-8") == snapshot.read_text(encoding="utf-8")
+
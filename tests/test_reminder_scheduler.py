@@ -0,0 +1,134 @@
+# tests/test_reminder_scheduler.py
+import json
+from datetime import date, datetime, timedelta
+
+from modules.activity_store import JsonActivityStore
+from modules.journal_store import ActivityJournal
+from modules.reminder_scheduler import REMINDER_TIME, ReminderScheduler
+
+TODAY = date(2026, 9, 15)
+NOW = datetime.combine(TODAY, REMINDER_TIME) + timedelta(hours=1)
+
+
+# Fungsi untuk store JSON baru di direktori sementara
+def make_store(tmp_path):
+    journal = ActivityJournal(str(tmp_path / "activities.jsonl"), str(tmp_path / "activities.journal"), fsync=False)
+    return JsonActivityStore(journal)
+
+
+def make_scheduler(tmp_path, stores):
+    """Scheduler atas {pemilik: store} dengan file status bersama di `tmp_path`"""
+    return ReminderScheduler(stores.__getitem__, str(tmp_path / "reminders.jsonl"),
+                             str(tmp_path / "reminders.state.json"), get_owners=lambda: list(stores))
+
+
+def add_due(store, name, days, status="Belum Dimulai"):
+    return store.add({"nama": name, "deadline": (TODAY + timedelta(days=days)).isoformat(), "status": status})
+
+
+def test_offsets_fire_on_their_day(tmp_path):
+    store = make_store(tmp_path)
+    add_due(store, "Laporan", 1)
+    add_due(store, "Skripsi", 7)
+    add_due(store, "Kuis", -1)
+    add_due(store, "Selesai", 1, status="Selesai")
+    scheduler = make_scheduler(tmp_path, {None: store})
+
+    sent = scheduler.tick(now=NOW)
+
+    assert sorted((reminder['nama'], reminder['jenis']) for reminder in sent) == [
+        ("Kuis", "terlambat"), ("Laporan", "H-1"), ("Skripsi", "H-7")]
+    assert [reminder['seq'] for reminder in scheduler.unseen()] == [1, 2, 3]
+    assert scheduler.unseen(since=3) == []
+    with open(tmp_path / "reminders.jsonl", encoding="utf-8") as f:
+        assert len(f.readlines()) == 3
+
+
+def test_restart_does_not_resend(tmp_path):
+    store = make_store(tmp_path)
+    add_due(store, "Laporan", 1)
+    assert len(make_scheduler(tmp_path, {None: store}).tick(now=NOW)) == 1
+
+    assert make_scheduler(tmp_path, {None: store}).tick(now=NOW + timedelta(hours=2)) == []
+    # Hari berikutnya deadline-nya hari ini: belum ada offset H, jadi masih sepi
+    assert make_scheduler(tmp_path, {None: store}).tick(now=NOW + timedelta(days=1)) == []
+    sent = make_scheduler(tmp_path, {None: store}).tick(now=NOW + timedelta(days=2))
+    assert [reminder['jenis'] for reminder in sent] == ["terlambat"]
+
+
+def test_heap_points_at_next_reminder(tmp_path):
+    store = make_store(tmp_path)
+    add_due(store, "Proposal", 10)
+    scheduler = make_scheduler(tmp_path, {None: store})
+
+    assert scheduler.tick(now=NOW) == []
+    assert scheduler._heap[0][:2] == (datetime.combine(TODAY + timedelta(days=3), REMINDER_TIME), 7)
+
+
+def test_new_activity_past_cursor_gets_missed_reminder(tmp_path):
+    store = make_store(tmp_path)
+    scheduler = make_scheduler(tmp_path, {None: store})
+    scheduler.tick(now=NOW)
+
+    activity_id = add_due(store, "Rapat", 1)['id']
+    sent = scheduler.tick([(None, activity_id)], now=NOW + timedelta(minutes=5))
+
+    assert [(reminder['nama'], reminder['jenis'], reminder['hari']) for reminder in sent] == [("Rapat", "H-1", 1)]
+
+
+def test_schedulers_sharing_state_send_each_reminder_once(tmp_path):
+    store = make_store(tmp_path)
+    add_due(store, "Laporan", 1)
+    first, second = make_scheduler(tmp_path, {None: store}), make_scheduler(tmp_path, {None: store})
+
+    # Kedua scheduler sudah berjalan (kursor di memori) sebelum pengingat jatuh tempo
+    first.tick(now=NOW - timedelta(days=1))
+    second.tick(now=NOW - timedelta(days=1))
+    sent = first.tick(now=NOW) + second.tick(now=NOW)
+
+    assert [(reminder['nama'], reminder['jenis']) for reminder in sent] == [("Laporan", "H-1")]
+    with open(tmp_path / "reminders.jsonl", encoding="utf-8") as f:
+        assert [json.loads(line)['jenis'] for line in f] == ["H-1"]
+
+
+def test_every_registered_partition_gets_reminders(tmp_path):
+    stores = {None: make_store(tmp_path), "budi": make_store(tmp_path / "budi")}
+    add_due(stores[None], "Rapat", 1)
+    add_due(stores["budi"], "Skripsi", 1)
+    scheduler = make_scheduler(tmp_path, stores)
+
+    scheduler.tick(now=NOW - timedelta(days=1))
+    sent = scheduler.tick(now=NOW)
+
+    assert sorted((reminder['pemilik'] or "", reminder['nama']) for reminder in sent) == [("", "Rapat"),
+                                                                                           ("budi", "Skripsi")]
+    assert [reminder['nama'] for reminder in scheduler.unseen(owner="budi")] == ["Skripsi"]
+    # Partisi yang tidak diperiksa tick ini tetap punya kursor di file status
+    assert make_scheduler(tmp_path, stores).tick(now=NOW, owners=[None]) == []
+    assert make_scheduler(tmp_path, stores).tick(now=NOW) == []
+
+
+def test_resync_opens_only_due_partitions(tmp_path):
+    stores = {None: make_store(tmp_path), "budi": make_store(tmp_path / "budi")}
+    add_due(stores[None], "Rapat", 1)
+    add_due(stores["budi"], "Skripsi", 20)
+    opened = []
+
+    def get_store(owner):
+        # Store dibuka di luar lock file status
+        assert scheduler.lock._depth == 0
+        opened.append(owner)
+        return stores[owner]
+
+    make_scheduler(tmp_path, stores).tick(now=NOW - timedelta(days=1))
+    # Setelah restart jadwal dibaca dari file status tanpa membuka store
+    scheduler = ReminderScheduler(get_store, str(tmp_path / "reminders.jsonl"),
+                                  str(tmp_path / "reminders.state.json"), get_owners=lambda: list(stores))
+    assert scheduler.tick(now=NOW - timedelta(days=1)) == []
+    assert opened == []
+    assert scheduler._heap[0][:2] == (datetime.combine(TODAY, REMINDER_TIME), 1)
+
+    sent = scheduler.tick(now=NOW)
+    assert opened == [None]
+    assert [(reminder['nama'], reminder['jenis']) for reminder in sent] == [("Rapat", "H-1")]
+
@@ -0,0 +1,32 @@
+# tests/test_synthetic.py
+from datetime import date
+
+from benchmarks.synthetic import make_realistic_activities
+from modules.activity_cache import deep_sizeof, estimate_sizeof
+from modules.activity_model import Activity
+
+TODAY = date(2025, 3, 1)
+
+
+def test_realistic_data_is_deterministic():
+    first = make_realistic_activities(500, seed=7, today=TODAY)
+
+    assert first == make_realistic_activities(500, seed=7, today=TODAY)
+    assert first != make_realistic_activities(500, seed=8, today=TODAY)
+
+
+def test_realistic_data_is_plausible():
+    activities = make_realistic_activities(2000, today=TODAY)
+
+    # Tanggal dibuat/diperbarui tidak pernah melewati tanggal acuan
+    assert all(a['tanggal_dibuat'] <= "2025-03-01 12:00:00" for a in activities)
+    assert all(a.get('tanggal_diperbarui', "") <= "2025-03-01 12:00:00" for a in activities)
+    assert all(a['status'] == "Belum Dimulai" or 'tanggal_diperbarui' in a for a in activities)
+    overdue = sum(a['deadline'] < TODAY.isoformat() for a in activities)
+    assert 0 < overdue < len(activities)
+
+
+def test_estimated_size_is_close_to_full_walk():
+    records = {a['id']: Activity.from_dict(a) for a in make_realistic_activities(5000, today=TODAY)}
+
+    assert abs(estimate_sizeof(records) - deep_sizeof(records)) / deep_sizeof(records) < 0.05